@@ -1,12 +1,15 @@
-"""Run backtest for all portfolio symbols."""
+"""Run a portfolio backtest of all portfolio symbols on one shared balance."""
 
 import json
 import time
+from binance.client import Client
 from src.config import Config
-from src.trading_bot import TradingBot
+from src.data_manager import DataManager
+from src.portfolio_backtest import PortfolioBacktestEngine
+from src import monte_carlo, performance_analytics
 
 print("=" * 80)
-print("PORTFOLIO BACKTEST - ALL 5 SYMBOLS")
+print("PORTFOLIO BACKTEST - ALL SYMBOLS")
 print("=" * 80)
 
 # Load config
@@ -17,104 +20,141 @@ config.run_mode = "BACKTEST"
 
 # Get portfolio symbols
 symbols = config.portfolio_symbols
+starting_balance = 10000.0
 print(f"\nBacktesting {len(symbols)} symbols: {', '.join(symbols)}")
 print(f"Backtest period: {config.backtest_days} days")
+print(f"Starting balance: ${starting_balance:,.0f} (shared)")
 print(f"Risk per trade: {config.risk_per_trade * 100}%")
 print(f"Leverage: {config.leverage}x")
 print(f"Portfolio max risk: {config.portfolio_max_total_risk * 100}%")
 print("\n" + "=" * 80)
 
-# Store results for all symbols
-all_results = {}
+# Fetch historical data for every symbol
+client = Client(config.api_key, config.api_secret)
+data_manager = DataManager(config, client)
 
-# Run backtest for each symbol
+all_results = {}
+data = {}
 for idx, symbol in enumerate(symbols, 1):
-    print(f"\n[{idx}/{len(symbols)}] BACKTESTING {symbol}")
-    print("-" * 80)
-    
+    print(f"\n[{idx}/{len(symbols)}] Fetching {symbol}...")
     try:
-        # Update config with current symbol
-        config.symbol = symbol
-        
-        # Create bot and run backtest
-        bot = TradingBot(config)
-        bot.start()
-        
-        # Get results from log file
-        with open(config.log_file, 'r') as f:
-            results = json.load(f)
-            all_results[symbol] = results
-        
-        print(f"✓ {symbol} backtest complete")
-        
-        # Add delay between symbols to avoid rate limiting
-        if idx < len(symbols):
-            delay = 2  # 2 second delay
-            print(f"\nWaiting {delay}s before next symbol...")
-            time.sleep(delay)
-    
+        data[symbol] = (
+            data_manager.fetch_historical_data(days=config.backtest_days, timeframe="15m", symbol=symbol),
+            data_manager.fetch_historical_data(days=config.backtest_days, timeframe="1h", symbol=symbol),
+        )
+        print(f"✓ {symbol}: {len(data[symbol][0])} 15m, {len(data[symbol][1])} 1h candles")
     except Exception as e:
-        print(f"✗ Error backtesting {symbol}: {e}")
+        print(f"✗ Error fetching {symbol}: {e}")
         all_results[symbol] = {"error": str(e)}
 
+# Run all symbols together on a merged timeline
+all_trades = []
+if data:
+    print(f"\nRunning portfolio backtest over {len(data)} symbols...")
+    started = time.perf_counter()
+    engine = PortfolioBacktestEngine(config)
+    combined = engine.run(data, starting_balance)
+    all_trades = engine.get_trades()
+    print(f"✓ Completed in {time.perf_counter() - started:.1f}s")
+
 # Display summary for all symbols
 print("\n" + "=" * 80)
 print("PORTFOLIO BACKTEST SUMMARY")
 print("=" * 80)
 
-print(f"\n{'Symbol':<12} {'Trades':<8} {'Win Rate':<10} {'ROI':<10} {'Sharpe':<8}")
+print(f"\n{'Symbol':<12} {'Trades':<8} {'Win Rate':<10} {'PnL':<12} {'Profit F.':<10}")
 print("-" * 60)
 
-total_trades = 0
-total_roi = 0.0
-successful_symbols = 0
-
 for symbol, results in all_results.items():
-    if "error" in results:
-        print(f"{symbol:<12} ERROR: {results['error']}")
-    else:
-        trades = results.get('total_trades', 0)
-        win_rate = results.get('win_rate', 0.0) * 100
-        roi = results.get('roi', 0.0) * 100
-        sharpe = results.get('sharpe_ratio', 0.0)
+    print(f"{symbol:<12} ERROR: {results['error']}")
+
+if data:
+    # Per-symbol figures come from the combined trade array so every column is
+    # computed the same way as the backtest engine's own metrics
+    by_symbol = combined['per_symbol']
+    for symbol, stats in by_symbol.items():
+        print(
+            f"{symbol:<12} {stats['trades']:<8} {stats['win_rate']:<9.2f}% "
+            f"${stats['total_pnl']:<11,.2f} {stats['profit_factor']:<10.2f}"
+        )
+        all_results[symbol] = stats
+    
+    print("-" * 60)
+    
+    daily = performance_analytics.daily_returns(all_trades, starting_balance)
+    daily_sharpe = performance_analytics.sharpe_ratio(daily.returns, periods_per_year=365)
+    portfolio = combined['portfolio']
+    
+    print(f"\nTotal Trades: {combined['total_trades']}")
+    print(f"Combined PnL: ${combined['total_pnl']:,.2f} (ROI {combined['roi']:.2f}% on ${starting_balance:,.0f})")
+    print(f"Win Rate: {combined['win_rate']:.2f}%")
+    print(f"Max Drawdown: ${combined['max_drawdown']:,.2f} ({combined['max_drawdown_percent']:.2f}%)")
+    print(f"Sharpe (per trade): {combined['sharpe_ratio']:.2f}  |  Sharpe (daily): {daily_sharpe:.2f}")
+    print(f"Symbols: {len(data)}/{len(symbols)}")
+    
+    print("\nPortfolio Management:")
+    print(f"  Signals: {portfolio['signals']}  |  Opened: {portfolio['opened']}")
+    print(f"  Rejected by risk limits: {portfolio['rejected_by_risk']}")
+    print(f"  Rejected (no free capital): {portfolio['rejected_by_allocation']}")
+    print(f"  Reduced by allocation/correlation: {portfolio['reduced_by_allocation']}")
+    print(f"  Max concurrent positions: {portfolio['max_concurrent_positions']}")
+    
+    print("\nBy Exit Reason:")
+    by_exit_reason = performance_analytics.breakdown(all_trades, "exit_reason")
+    for reason, stats in sorted(by_exit_reason.items(), key=lambda x: x[1]['trades'], reverse=True):
+        print(f"  {reason:<20} {stats['trades']:>5} trades  ${stats['total_pnl']:>12,.2f}  {stats['win_rate']:.1f}% win")
+    
+    all_results["_combined"] = {
+        **{k: v for k, v in combined.items() if k not in ("per_symbol", "feature_metrics")},
+        "daily_sharpe": daily_sharpe,
+        "by_symbol": by_symbol,
+        "by_exit_reason": by_exit_reason
+    }
+    
+    # Distribution of outcomes from resampled trade sequences
+    returns = monte_carlo.trade_returns(all_trades, starting_balance)
+    if len(returns) > 0:
+        leverages = sorted({1, 2, 3, 5, config.leverage, 2 * config.leverage})
+        scales = [lev / config.leverage for lev in leverages]
+        simulations = monte_carlo.simulate_many(returns, scales, n_paths=20_000, method="block", seed=42)
+        current = simulations[leverages.index(config.leverage)]
+        summary = current.summary()
         
-        print(f"{symbol:<12} {trades:<8} {win_rate:<9.2f}% {roi:<9.2f}% {sharpe:<8.2f}")
+        print(f"\nMonte Carlo ({current.n_paths:,} block-bootstrap paths x {current.n_trades} trades):")
+        print(f"  {'':<22} {'p5':>9} {'p50':>9} {'p95':>9}")
+        dd = summary["max_drawdown"]
+        print(f"  {'Max drawdown':<22} {dd['p5'] * 100:>8.1f}% {dd['p50'] * 100:>8.1f}% {dd['p95'] * 100:>8.1f}%")
+        te = summary["terminal_equity"]
+        print(f"  {'Terminal equity (x)':<22} {te['p5']:>9.2f} {te['p50']:>9.2f} {te['p95']:>9.2f}")
+        ttr = summary["time_to_recovery"]
+        print(f"  {'Recovery (trades)':<22} {ttr['p5']:>9.0f} {ttr['p50']:>9.0f} {ttr['p95']:>9.0f}")
+        print(f"  Probability of loss: {current.loss_probability * 100:.1f}%")
+        print(f"  Ruin probability (equity -{(1 - current.ruin_level) * 100:.0f}%) by leverage:")
+        for lev, result in zip(leverages, simulations):
+            marker = "  <- current" if lev == config.leverage else ""
+            print(f"    {lev:>3}x: {result.ruin_probability * 100:6.2f}%{marker}")
         
-        total_trades += trades
-        total_roi += roi
-        successful_symbols += 1
-
-print("-" * 60)
-
-if successful_symbols > 0:
-    avg_roi = total_roi / successful_symbols
-    print(f"\nTotal Trades: {total_trades}")
-    print(f"Average ROI: {avg_roi:.2f}%")
-    print(f"Successful Symbols: {successful_symbols}/{len(symbols)}")
+        all_results["_combined"]["monte_carlo"] = {
+            **summary,
+            "ruin_by_leverage": {str(lev): r.ruin_probability for lev, r in zip(leverages, simulations)}
+        }
 else:
-    print("\nNo successful backtests")
+    print("\nNo symbol data available")
 
 print("\n" + "=" * 80)
 print("IMPORTANT NOTES")
 print("=" * 80)
-print("""
-1. Each symbol was backtested INDEPENDENTLY
-2. Portfolio management was NOT simulated (no correlation checks)
-3. In live trading, portfolio manager will:
-   - Limit total risk across all symbols
-   - Reduce exposure for correlated symbols
-   - Allocate capital based on signal confidence
-   
-4. Your current settings:
-   - Risk per trade: 20%
-   - Portfolio max risk: 100%
-   - Max 5 symbols simultaneously
-   - Potential max exposure: 1000% (20% × 10x leverage × 5 symbols)
-
-5. To run TRUE portfolio backtest (all symbols together):
-   - Would need to implement multi-symbol backtest engine
-   - Would simulate correlation checks and capital allocation
-   - Would track portfolio-level metrics
+print(f"""
+1. All symbols were backtested TOGETHER on one time-ordered stream
+2. One balance and one risk state were shared across symbols:
+   - Total portfolio risk limited to portfolio_max_total_risk
+   - Correlated symbols (rolling 1h correlation) share a reduced exposure
+   - Free capital allocated across simultaneous signals by confidence
+3. Your current settings:
+   - Risk per trade: {config.risk_per_trade * 100:g}%
+   - Portfolio max risk: {config.portfolio_max_total_risk * 100:g}%
+   - Max single allocation: {config.portfolio_max_single_allocation * 100:g}%
+   - Correlation limit: {config.portfolio_correlation_max_exposure * 100:g}% combined above {config.portfolio_correlation_threshold:g}
 """)
 
 print("=" * 80)
@@ -0,0 +1,179 @@
+"""Record market WebSocket frames and replay them through the trading loop.
+
+Subcommands:
+    record      Capture REST history plus kline and mark-price frames from
+                Binance for the configured symbols
+    synthesize  Write a recording built from synthetic bars (no network)
+    replay      Run the bot in PAPER (or LIVE) mode against a recording with
+                a simulated exchange, at 1x-1000x speed or unthrottled (0)
+
+Usage:
+    python run_replay.py record --minutes 60 --output logs/session.frames
+    python run_replay.py synthesize --symbols BTCUSDT,ETHUSDT --days 5 --live-days 1 --output logs/synth.frames
+    python run_replay.py replay logs/session.frames [--speed 100] [--mode PAPER] [--balance 10000]
+    python run_replay.py replay logs/synth.frames --sweep 10,100,1000
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from src.config import Config
+from src.market_replay import (
+    FakeExchangeClient,
+    FrameRecorder,
+    ReplayDriver,
+    load_frames,
+    run_bot_replay,
+    save_frames,
+    synthesize_frames,
+)
+from src.synthetic_data import generate_multi_timeframe
+
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+TIMEFRAMES = ("5m", "15m", "1h", "4h")
+
+
+def configured_symbols(config: Config) -> list:
+    """Symbols the bot trades with this configuration."""
+    if config.enable_portfolio_management and config.portfolio_symbols:
+        return config.portfolio_symbols[:config.portfolio_max_symbols]
+    return [config.symbol]
+
+
+def record(args, config: Config):
+    """Record a live session from Binance."""
+    from binance.client import Client
+    from src.data_manager import DataManager
+
+    symbols = args.symbols.split(",") if args.symbols else configured_symbols(config)
+    data_manager = DataManager(config, Client(config.api_key, config.api_secret))
+    recorder = FrameRecorder(args.output)
+
+    for symbol in symbols:
+        for timeframe in TIMEFRAMES:
+            candles = data_manager.fetch_historical_data(days=args.history_days, timeframe=timeframe, symbol=symbol)
+            recorder.record_history(symbol, timeframe, candles)
+        print(f"Recorded history for {symbol}")
+
+    recorder.attach(data_manager)
+    for symbol in symbols:
+        data_manager.start_websocket_streams(symbol=symbol)
+
+    print(f"Recording {', '.join(symbols)} for {args.minutes} minutes to {args.output} (Ctrl+C to stop early)")
+    try:
+        time.sleep(args.minutes * 60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        data_manager.stop_websocket_streams()
+        recorder.close()
+    print(f"Wrote {recorder.frames_written} frames")
+
+
+def synthesize(args, config: Config):
+    """Write a synthetic recording."""
+    symbols = args.symbols.split(",") if args.symbols else configured_symbols(config)
+    bars_per_day = 288
+    candles = {
+        symbol: generate_multi_timeframe(args.days * bars_per_day, base_timeframe="5m", timeframes=TIMEFRAMES,
+                                         seed=args.seed + k)
+        for k, symbol in enumerate(symbols)
+    }
+    first = candles[symbols[0]]["5m"]["timestamp"]
+    live_start = int(first[(args.days - args.live_days) * bars_per_day])
+    log = synthesize_frames(candles, live_start, updates_per_bar=args.updates_per_bar)
+    save_frames(log, args.output)
+    print(f"Wrote {len(log.frames)} frames ({len(log.live())} live) for {len(symbols)} symbol(s) to {args.output}")
+
+
+def replay_once(path: str, config: Config, speed: float, balance: float) -> dict:
+    """Replay a recording through a fresh bot and return the statistics."""
+    # Imported here so record/synthesize do not pay for the full bot stack
+    from src.trading_bot import TradingBot
+
+    log = load_frames(path)
+    client = FakeExchangeClient(log, initial_balance=balance, fee_rate=config.trading_fee,
+                                slippage=config.slippage, leverage=config.leverage)
+    bot = TradingBot(config, client=client)
+    stats = run_bot_replay(bot, ReplayDriver(log, client, speed=speed))
+    return {"speed": speed, "replay": stats.to_dict(), "sustainable": stats.sustainable(),
+            "exchange": client.summary()}
+
+
+def replay(args, config: Config):
+    """Replay a recording at one or several speeds."""
+    config.run_mode = args.mode
+    config.replay_record_file = ""
+    log = load_frames(args.recording)
+    if args.symbols:
+        config.symbol = args.symbols.split(",")[0]
+    elif config.symbol not in log.symbols:
+        config.symbol = log.symbols[0]
+
+    speeds = [float(s) for s in args.sweep.split(",")] if args.sweep else [args.speed]
+    results = [replay_once(args.recording, config, speed, args.balance) for speed in speeds]
+
+    print("=" * 80)
+    print(f"REPLAY - {args.recording} ({len(log.live())} live frames, {args.mode} mode)")
+    print("=" * 80)
+    print(f"{'Speed':>8} {'Frames/s':>10} {'Achieved':>10} {'Lag p99':>10} {'Handler p99':>12} "
+          f"{'Iterations':>11} {'Sustainable':>12}")
+    for result in results:
+        stats = result["replay"]
+        print(f"{result['speed']:>7g}x {stats['frames_per_second']:>10.0f} {stats['achieved_speed']:>9.0f}x "
+              f"{stats['lag'].get('p99_ms', 0.0):>8.1f}ms {stats['handler'].get('p99_ms', 0.0):>10.3f}ms "
+              f"{stats['loop_iterations']:>11} {str(result['sustainable']):>12}")
+
+    exchange = results[-1]["exchange"]
+    print()
+    print(f"Exchange: balance ${exchange['wallet_balance']:.2f} | realized ${exchange['realized_pnl']:.2f} | "
+          f"fees ${exchange['fees_paid']:.2f} | fills {exchange['fills']} | rejections {exchange['rejections']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+def main():
+    """Parse arguments and run the subcommand."""
+    parser = argparse.ArgumentParser(description='Record and replay market WebSocket frames')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='Record a live session from Binance')
+    record_parser.add_argument('--symbols', type=str, default=None, help='Comma-separated symbols (default: config)')
+    record_parser.add_argument('--minutes', type=float, default=60, help='Recording length (default: 60)')
+    record_parser.add_argument('--history-days', type=int, default=7, help='REST history per timeframe (default: 7)')
+    record_parser.add_argument('--output', type=str, default='logs/session.frames', help='Frame file')
+
+    synth_parser = subparsers.add_parser('synthesize', help='Write a synthetic recording')
+    synth_parser.add_argument('--symbols', type=str, default=None, help='Comma-separated symbols (default: config)')
+    synth_parser.add_argument('--days', type=int, default=5, help='Total days of bars (default: 5)')
+    synth_parser.add_argument('--live-days', type=int, default=1, help='Days delivered as live frames (default: 1)')
+    synth_parser.add_argument('--updates-per-bar', type=int, default=0, help='In-progress frames per bar')
+    synth_parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    synth_parser.add_argument('--output', type=str, default='logs/synthetic.frames', help='Frame file')
+
+    replay_parser = subparsers.add_parser('replay', help='Run the bot against a recording')
+    replay_parser.add_argument('recording', type=str, help='Frame file')
+    replay_parser.add_argument('--speed', type=float, default=100, help='Speed multiplier 1-1000, 0 = unthrottled')
+    replay_parser.add_argument('--sweep', type=str, default=None, help='Comma-separated speeds to compare')
+    replay_parser.add_argument('--mode', choices=['PAPER', 'LIVE'], default='PAPER', help='Bot mode (default: PAPER)')
+    replay_parser.add_argument('--symbols', type=str, default=None, help='Symbol to trade (default: config)')
+    replay_parser.add_argument('--balance', type=float, default=10000.0, help='Simulated wallet balance')
+    replay_parser.add_argument('--output', type=str, default=None, help='Results JSON file')
+
+    args = parser.parse_args()
+    config = Config.load_from_file('config/config.json')
+    {'record': record, 'synthesize': synthesize, 'replay': replay}[args.command](args, config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Walk-forward optimization of strategy parameters across portfolio symbols.
+
+Tunes adx_threshold, rvol_threshold, stop_loss_atr_multiplier,
+trailing_stop_atr_multiplier and scaled_tp_levels on rolling in-sample
+windows and reports only the out-of-sample results of the chosen settings.
+
+Usage:
+    python run_walk_forward.py [--days 730] [--in-sample-days 90] [--out-of-sample-days 30]
+                               [--search grid|random] [--n-iter 50] [--objective sharpe_ratio]
+                               [--jobs 4] [--space space.json]
+
+The optional space file maps parameter names to lists of candidate values.
+"""
+
+import argparse
+import json
+import logging
+import os
+
+from binance.client import Client
+
+from src.config import Config
+from src.data_manager import DataManager
+from src.walk_forward import OBJECTIVES, WalkForwardOptimizer
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def default_space(config: Config) -> dict:
+    """Candidate values around the configured parameters."""
+    return {
+        "adx_threshold": [config.adx_threshold - 5, config.adx_threshold, config.adx_threshold + 5],
+        "rvol_threshold": [round(config.rvol_threshold * f, 2) for f in (0.8, 1.0, 1.2)],
+        "stop_loss_atr_multiplier": [1.5, 2.0, 2.5],
+        "trailing_stop_atr_multiplier": [1.5, 2.0, 2.5],
+        "scaled_tp_levels": [config.scaled_tp_levels],
+    }
+
+
+def main():
+    """Run the walk-forward study and save the results."""
+    parser = argparse.ArgumentParser(description='Walk-forward optimization of strategy parameters')
+    parser.add_argument('--days', type=int, default=730, help='Days of history per symbol (default: 730)')
+    parser.add_argument('--in-sample-days', type=float, default=90, help='In-sample window (default: 90)')
+    parser.add_argument('--out-of-sample-days', type=float, default=30, help='Out-of-sample window (default: 30)')
+    parser.add_argument('--search', choices=['grid', 'random'], default='grid', help='Search mode (default: grid)')
+    parser.add_argument('--n-iter', type=int, default=50, help='Combinations per fold for random search')
+    parser.add_argument('--objective', choices=OBJECTIVES, default='sharpe_ratio', help='In-sample objective')
+    parser.add_argument('--min-trades', type=int, default=10, help='Minimum in-sample trades per combination')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--space', type=str, default=None, help='JSON file with the parameter space')
+    parser.add_argument('--output', type=str, default='walk_forward_results.json', help='Results file')
+    args = parser.parse_args()
+
+    config = Config.load_from_file('config/config.json')
+    config.run_mode = "BACKTEST"
+
+    if args.space:
+        with open(args.space, 'r') as f:
+            space = json.load(f)
+    else:
+        space = default_space(config)
+
+    symbols = config.portfolio_symbols if config.enable_portfolio_management else [config.symbol]
+
+    print("=" * 80)
+    print(f"WALK-FORWARD OPTIMIZATION - {len(symbols)} SYMBOLS")
+    print("=" * 80)
+    print(f"Symbols: {', '.join(symbols)}")
+    print(f"History: {args.days} days | In-sample: {args.in_sample_days}d | Out-of-sample: {args.out_of_sample_days}d")
+    print(f"Search: {args.search} | Objective: {args.objective} | Workers: {args.jobs}")
+    for name, values in space.items():
+        print(f"  {name}: {len(values)} values")
+
+    client = Client(config.api_key, config.api_secret)
+    data_manager = DataManager(config, client)
+
+    data = {}
+    for symbol in symbols:
+        print(f"\nFetching {symbol}...")
+        data[symbol] = (
+            data_manager.fetch_historical_data(days=args.days, timeframe="15m", symbol=symbol),
+            data_manager.fetch_historical_data(days=args.days, timeframe="1h", symbol=symbol),
+        )
+
+    optimizer = WalkForwardOptimizer(
+        config,
+        space,
+        in_sample_days=args.in_sample_days,
+        out_of_sample_days=args.out_of_sample_days,
+        search=args.search,
+        n_iter=args.n_iter,
+        objective=args.objective,
+        min_trades=args.min_trades,
+        n_jobs=args.jobs
+    )
+    result = optimizer.run(data)
+
+    print("\n" + "=" * 80)
+    print("PER-FOLD RESULTS")
+    print("=" * 80)
+    print(f"\n{'Fold':<6} {'IS score':<10} {'OOS score':<10} {'OOS trades':<11} {'OOS PnL':<12} Parameters")
+    print("-" * 80)
+    for fold_result in result.folds:
+        oos = fold_result.out_of_sample_metrics
+        params = ", ".join(
+            f"{name}={value}" for name, value in fold_result.parameters.items() if name != "scaled_tp_levels"
+        )
+        print(
+            f"{fold_result.fold.index:<6} {fold_result.in_sample_score:<10.2f} "
+            f"{fold_result.out_of_sample_score:<10.2f} {oos['total_trades']:<11} "
+            f"${oos['total_pnl']:<11,.2f} {params}"
+        )
+
+    metrics = result.metrics
+    print("\n" + "=" * 80)
+    print("STITCHED OUT-OF-SAMPLE RESULTS")
+    print("=" * 80)
+    print(f"Total Trades: {metrics['total_trades']}")
+    print(f"Total PnL: ${metrics['total_pnl']:,.2f} (ROI {metrics['roi']:.2f}%)")
+    print(f"Win Rate: {metrics['win_rate']:.2f}%")
+    print(f"Profit Factor: {metrics['profit_factor']:.2f}")
+    print(f"Max Drawdown (realized): ${metrics['max_drawdown']:,.2f} ({metrics['max_drawdown_percent']:.2f}%)")
+    print(f"Sharpe (per trade): {metrics['sharpe_ratio']:.2f}")
+    print(f"Walk-forward efficiency (OOS/IS score): {result.efficiency:.2f}")
+
+    print("\nParameter stability:")
+    for name, summary in result.stability.items():
+        line = f"  {name:<30} mode={summary['mode']} ({summary['mode_frequency'] * 100:.0f}% of folds), "
+        line += f"{summary['changes']} changes"
+        if "cv" in summary:
+            line += f", cv={summary['cv']:.2f}"
+        print(line)
+
+    print(f"\nCompleted in {result.elapsed:.1f}s")
+
+    with open(args.output, 'w') as f:
+        json.dump(result.to_dict(), f, indent=2)
+    print(f"\n✓ Results saved to {args.output}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Run the benchmark suite and compare against JSON baselines.
+
+Usage:
+    python scripts/benchmarks/run_benchmarks.py list
+    python scripts/benchmarks/run_benchmarks.py run --sizes 10000 100000
+    python scripts/benchmarks/run_benchmarks.py run --only indicators backtest --output baselines/main.json
+    python scripts/benchmarks/run_benchmarks.py compare baselines/main.json results/latest.json
+    python scripts/benchmarks/run_benchmarks.py run --baseline baselines/main.json
+
+`compare` (and `run --baseline`) exits with status 1 when any benchmark is
+slower than the baseline by more than --threshold, so it can gate CI.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src import benchmark
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(SCRIPT_DIR, 'results')
+
+
+def _print_result(result):
+    if result.error:
+        print(f"  {result.key:<40} ERROR: {result.error}")
+    else:
+        line = f"  {result.key:<40} median {result.median_s * 1000:10.2f} ms  best {result.best_s * 1000:10.2f} ms"
+        if result.memory_bytes is not None:
+            line += (f"  memory {result.memory_bytes / 1024 ** 2:8.2f} MB"
+                     f" ({result.memory_bytes / max(result.n_bars, 1) / 1024:.1f} KB per n)")
+        print(line)
+
+
+def _compare_and_report(baseline_path, report, threshold, metric):
+    baseline = benchmark.load_report(baseline_path)
+    comparisons = benchmark.compare_reports(baseline, report, threshold=threshold, metric=metric)
+    print()
+    print(benchmark.format_comparison(comparisons, metric=metric))
+    if benchmark.has_regressions(comparisons):
+        print(f"\nREGRESSIONS detected (threshold {threshold * 100:.0f}%)")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+def cmd_list(args):
+    for case in benchmark.BENCHMARKS.values():
+        print(f"{case.name:<32} max_bars={case.max_bars:<10,} {case.description}")
+    print("\nSizes above a benchmark's max_bars run at max_bars.")
+    return 0
+
+
+def cmd_run(args):
+    print(f"Running benchmarks at sizes {args.sizes} ({args.repeats} repeats, seed {args.seed})")
+    report = benchmark.run_suite(
+        names=args.only,
+        sizes=args.sizes,
+        repeats=args.repeats,
+        seed=args.seed,
+        progress=_print_result
+    )
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    benchmark.save_report(report, output)
+    print()
+    print(benchmark.format_report(report))
+    print(f"\nSaved report to {output}")
+
+    if args.baseline:
+        return _compare_and_report(args.baseline, report, args.threshold, args.metric)
+    return 0
+
+
+def cmd_compare(args):
+    report = benchmark.load_report(args.current)
+    return _compare_and_report(args.baseline, report, args.threshold, args.metric)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trading bot benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="List available benchmarks")
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and save a JSON report")
+    run_parser.add_argument("--only", nargs="+", help="Benchmark name prefixes (e.g. indicators backtest)")
+    run_parser.add_argument("--sizes", nargs="+", type=int, default=list(benchmark.DEFAULT_SIZES),
+                            help="Synthetic bar counts (10000 to 5000000)")
+    run_parser.add_argument("--repeats", type=int, default=3, help="Timed runs per benchmark")
+    run_parser.add_argument("--seed", type=int, default=42, help="Synthetic data seed")
+    run_parser.add_argument("--output", help="Report path (default: scripts/benchmarks/results/...)")
+    run_parser.add_argument("--baseline", help="Compare against this baseline after running")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare a report against a baseline")
+    compare_parser.add_argument("baseline", help="Baseline report path")
+    compare_parser.add_argument("current", help="Current report path")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--threshold", type=float, default=benchmark.DEFAULT_THRESHOLD,
+                         help="Relative slowdown flagged as a regression (default 0.20)")
+        sub.add_argument("--metric", choices=["median_s", "best_s", "memory_bytes"], default="median_s",
+                         help="Timing (or retained memory) used for comparison")
+
+    args = parser.parse_args()
+    handlers = {"list": cmd_list, "run": cmd_run, "compare": cmd_compare}
+    return handlers[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
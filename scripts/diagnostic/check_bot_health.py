@@ -2,9 +2,49 @@
 """Check if the bot is healthy and processing data."""
 
 import os
+import sys
 import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.heartbeat import read_heartbeat
+
+HEARTBEAT_FILE = 'logs/heartbeat.bin'
+HEARTBEAT_STALE_SECONDS = 30
+
+
+def check_heartbeat():
+    """Report bot liveness from the heartbeat file.
+    
+    Returns:
+        True if the heartbeat shows a live bot, False otherwise
+    """
+    heartbeat = read_heartbeat(HEARTBEAT_FILE)
+    if heartbeat is None:
+        print(f"✗ No heartbeat found at {HEARTBEAT_FILE} - bot is NOT running (or predates heartbeats)")
+        return False
+    
+    alive = heartbeat.is_alive(HEARTBEAT_STALE_SECONDS)
+    print(f"Heartbeat ({HEARTBEAT_FILE}):")
+    print(f"  PID: {heartbeat.pid}")
+    print(f"  Mode: {heartbeat.mode}")
+    print(f"  Reported status: {heartbeat.status}")
+    print(f"  Loop iteration: {heartbeat.loop_iteration}")
+    print(f"  Loop latency: {heartbeat.loop_latency_ms:.1f} ms")
+    if heartbeat.last_candle_time:
+        print(f"  Last candle processed: {datetime.fromtimestamp(heartbeat.last_candle_time / 1000)}")
+    print(f"  Age: {heartbeat.age_seconds:.1f} seconds ago")
+    
+    if alive:
+        print(f"  Status: ✓ ALIVE")
+    elif heartbeat.status == "stopped":
+        print(f"  Status: ✗ STOPPED (clean shutdown)")
+    else:
+        print(f"  Status: ✗ DEAD OR HUNG (stale heartbeat or process gone)")
+    print()
+    return alive
+
+
 def check_log_activity():
     """Check if logs are being written (bot is active)."""
     log_files = ['logs/system.log', 'logs/errors.log', 'logs/trades.log']
@@ -33,20 +73,8 @@ def check_log_activity():
                 print(f"  Status: ✗ LIKELY CRASHED (no updates for {age_minutes:.1f} min)")
             print()
     
-    # Check if python process exists
-    import subprocess
-    try:
-        result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq python.exe'], 
-                              capture_output=True, text=True)
-        if 'python.exe' in result.stdout:
-            print("✓ Python process is running")
-            # Count how many
-            count = result.stdout.count('python.exe')
-            print(f"  Found {count} python.exe process(es)")
-        else:
-            print("✗ No python.exe process found - bot is NOT running")
-    except Exception as e:
-        print(f"Could not check process: {e}")
+    # Check bot liveness from its heartbeat
+    alive = check_heartbeat()
     
     print()
     print("=" * 80)
@@ -62,8 +90,10 @@ def check_log_activity():
     
     age_minutes = (time.time() - most_recent) / 60
     
-    if age_minutes < 5:
-        print("Bot appears to be running normally.")
+    if alive:
+        print("Bot heartbeat is fresh - bot is running normally.")
+    elif age_minutes < 5:
+        print("Logs are recent but no live heartbeat - bot may have just stopped.")
     elif age_minutes < 15:
         print("Bot may be stuck. Consider restarting if no activity in next 5 minutes.")
     else:
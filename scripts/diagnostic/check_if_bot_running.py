@@ -1,7 +1,13 @@
 """Check if the trading bot is currently running and processing XAGUSDT."""
 
-import psutil
+import os
 import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.heartbeat import read_heartbeat
+
+HEARTBEAT_FILE = 'logs/heartbeat.bin'
 
 def check_bot_running():
     """Check if main.py or start_paper_trading.py is running."""
@@ -10,31 +16,18 @@ def check_bot_running():
     print("CHECKING IF BOT IS RUNNING")
     print("=" * 80)
     
-    bot_processes = []
-    
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-        try:
-            cmdline = proc.info['cmdline']
-            if cmdline:
-                cmdline_str = ' '.join(cmdline)
-                
-                # Check if it's running main.py or start_paper_trading.py
-                if 'python' in cmdline_str.lower() and ('main.py' in cmdline_str or 'start_paper_trading.py' in cmdline_str):
-                    bot_processes.append({
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'cmdline': cmdline_str
-                    })
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+    heartbeat = read_heartbeat(HEARTBEAT_FILE)
     
-    if bot_processes:
-        print(f"\n✓ FOUND {len(bot_processes)} BOT PROCESS(ES) RUNNING:\n")
-        for proc in bot_processes:
-            print(f"  PID: {proc['pid']}")
-            print(f"  Name: {proc['name']}")
-            print(f"  Command: {proc['cmdline']}")
-            print()
+    if heartbeat is not None and heartbeat.is_alive():
+        print(f"\n✓ BOT HEARTBEAT IS LIVE:\n")
+        print(f"  PID: {heartbeat.pid}")
+        print(f"  Mode: {heartbeat.mode}")
+        print(f"  Loop iteration: {heartbeat.loop_iteration}")
+        print(f"  Loop latency: {heartbeat.loop_latency_ms:.1f} ms")
+        if heartbeat.last_candle_time:
+            print(f"  Last candle: {datetime.fromtimestamp(heartbeat.last_candle_time / 1000)}")
+        print(f"  Updated: {heartbeat.age_seconds:.1f} seconds ago")
+        print()
         
         print("=" * 80)
         print("BOT IS RUNNING")
@@ -47,7 +40,10 @@ def check_bot_running():
         print("4. Check if there's already an open position for XAGUSDT")
         
     else:
-        print("\n✗ NO BOT PROCESS FOUND")
+        if heartbeat is None:
+            print(f"\n✗ NO HEARTBEAT FOUND ({HEARTBEAT_FILE})")
+        else:
+            print(f"\n✗ HEARTBEAT IS {heartbeat.status.upper()} / STALE (last update {heartbeat.age_seconds:.0f}s ago, PID {heartbeat.pid})")
         print("\n" + "=" * 80)
         print("BOT IS NOT RUNNING!")
         print("=" * 80)
@@ -14,10 +14,9 @@ def test_import_without_pynput():
     """Test that trading_bot can import even if pynput is unavailable."""
     print("Testing import without pynput...")
     
-    # Temporarily hide pynput
+    # Temporarily hide pynput (a None entry also makes find_spec report it missing)
     original_pynput = sys.modules.get('pynput')
-    if 'pynput' in sys.modules:
-        del sys.modules['pynput']
+    sys.modules['pynput'] = None
     
     # Block pynput import
     import builtins
@@ -62,6 +61,8 @@ def test_import_without_pynput():
         # Restore pynput if it was loaded
         if original_pynput:
             sys.modules['pynput'] = original_pynput
+        else:
+            del sys.modules['pynput']
 
 def test_import_with_pynput():
     """Test that trading_bot still works with pynput available."""
@@ -14,6 +14,10 @@ from src.indicators import IndicatorCalculator
 from src.logger import get_logger
 
 
+# Most recent threshold adjustments kept in memory (each is also logged)
+MAX_THRESHOLD_HISTORY = 1000
+
+
 @dataclass
 class ThresholdHistory:
     """Historical record of threshold adjustments.
@@ -167,6 +171,8 @@ class AdaptiveThresholdManager:
             reason=reason
         )
         self.threshold_history.append(history_entry)
+        if len(self.threshold_history) > MAX_THRESHOLD_HISTORY:
+            del self.threshold_history[:-MAX_THRESHOLD_HISTORY]
         
         # Update last update time
         self.last_update_time = current_time
@@ -1,18 +1,41 @@
 """Backtest engine for simulating trading strategy on historical data."""
 
+import copy
+import functools
+from array import array
+from contextlib import contextmanager
 import numpy as np
 import logging
 import time
-from typing import List, Dict, Optional
-from binance.client import Client
+from typing import List, Dict, Optional, TYPE_CHECKING
 from src.config import Config
-from src.models import Candle, Trade, PerformanceMetrics, Signal, Position
+from src.models import Candle, Trade, PerformanceMetrics, Signal, Position, IndicatorState
 from src.strategy import StrategyEngine
+from src.indicators import IndicatorCalculator
 from src.risk_manager import RiskManager
 from src.scaled_tp_manager import ScaledTakeProfitManager
+from src.intrabar_resolver import IntrabarResolver, STOP
+from src.candle_array import candles_to_array
+from src import performance_analytics, vectorized_signals
+
+if TYPE_CHECKING:
+    # Type hint only: backtests never talk to Binance
+    from binance.client import Client
 
 logger = logging.getLogger(__name__)
 
+# Length of the reference (15m) bar in milliseconds
+BAR_INTERVAL_MS = 15 * 60 * 1000
+
+
+def _simulated(method):
+    """Run a BacktestEngine method inside the engine's simulation_scope()."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.simulation_scope():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class BacktestEngine:
     """Backtesting engine that simulates trading on historical data.
@@ -39,13 +62,17 @@ class BacktestEngine:
         self.strategy = strategy
         self.risk_mgr = risk_mgr
         self.trades: List[Trade] = []
-        self.equity_curve: List[float] = []
+        # Packed doubles: 8 bytes per bar instead of a float object and a pointer
+        self.equity_curve: array = array("d")
         self.initial_balance = 0.0
         self.current_balance = 0.0
         
         # Initialize ScaledTakeProfitManager (no client for backtest mode)
         self.scaled_tp_manager = ScaledTakeProfitManager(config, client=None)
         
+        # Lower-timeframe first-touch search (set by run_backtest when 5m/1m data is given)
+        self._intrabar_resolver: Optional[IntrabarResolver] = None
+        
         # Feature tracking for adaptive components
         self.feature_metrics = {
             'adaptive_thresholds': {
@@ -79,19 +106,45 @@ class BacktestEngine:
             }
         }
     
+    @contextmanager
+    def simulation_scope(self):
+        """Apply the backtest-only settings for the duration of a run.
+        
+        Volume profile refreshes run inline so results do not depend on
+        thread timing, and (with cache_indicators) indicator values are
+        shared by strategy, coordinator and regime detector within a bar.
+        Both are restored on exit, so a live bot or another engine in the
+        same process keeps its own settings.
+        """
+        background = self.strategy.background_volume_profile
+        enable_cache = self.config.cache_indicators and not IndicatorCalculator.caching_enabled()
+        self.strategy.background_volume_profile = False
+        if enable_cache:
+            IndicatorCalculator.enable_caching()
+        try:
+            yield
+        finally:
+            self.strategy.background_volume_profile = background
+            if enable_cache:
+                IndicatorCalculator.disable_caching()
+    
+    @_simulated
     def run_backtest(
         self, 
         candles_15m: List[Candle],
         candles_1h: List[Candle],
         initial_balance: float = 10000.0,
         candles_5m: Optional[List[Candle]] = None,
-        candles_4h: Optional[List[Candle]] = None
+        candles_4h: Optional[List[Candle]] = None,
+        candles_1m: Optional[List[Candle]] = None
     ) -> Dict:
         """Execute backtest on historical data.
         
         Iterates through historical candles, generates signals, simulates
         trade execution with realistic fills, and tracks performance.
         Supports multi-timeframe analysis when 5m and 4h data is provided.
+        When 1m or 5m data is provided, stop and take-profit hits are
+        resolved intrabar in the order they actually happened.
         
         Args:
             candles_15m: List of 15-minute historical candles
@@ -99,6 +152,8 @@ class BacktestEngine:
             initial_balance: Starting wallet balance in USDT
             candles_5m: Optional list of 5-minute historical candles for multi-TF analysis
             candles_4h: Optional list of 4-hour historical candles for multi-TF analysis
+            candles_1m: Optional list of 1-minute historical candles for intrabar
+                exit resolution (takes precedence over 5m candles)
             
         Returns:
             Dictionary containing performance metrics:
@@ -124,13 +179,17 @@ class BacktestEngine:
         # Initialize backtest state
         self.initial_balance = initial_balance
         self.current_balance = initial_balance
-        self.equity_curve = [initial_balance]
+        self.equity_curve = array("d", [initial_balance])
         self.trades = []
         
         # Store multi-timeframe data for synchronized access
         self._candles_5m = candles_5m if candles_5m else []
         self._candles_4h = candles_4h if candles_4h else []
         
+        # Finest available timeframe decides which exit level was touched first
+        intrabar_candles = candles_1m or self._candles_5m
+        self._intrabar_resolver = IntrabarResolver(intrabar_candles) if intrabar_candles else None
+        
         # Build synchronized timeframe indices
         # This ensures all timeframes are properly aligned by timestamp
         timeframe_indices = self._build_timeframe_indices(
@@ -193,88 +252,17 @@ class BacktestEngine:
             
             # Get current candle
             current_candle = candles_15m[i]
-            current_price = current_candle.close
             
             # Check if we have an active position
             active_position = self.risk_mgr.get_active_position(self.config.symbol)
             
             if active_position:
-                # CRITICAL FIX: Only check exit conditions if we're past the entry candle
-                # This prevents immediate stop-outs within the same candle as entry
-                # We need at least 1 candle after entry before checking stops
-                if i > active_position.entry_candle_index + 1:
-                    # Update stops and check for stop hit
-                    atr = self.strategy.current_indicators.atr_15m
-                    self.risk_mgr.update_stops(active_position, current_price, atr)
-                    
-                    # Check for scaled take profit if enabled
-                    if self.config.enable_scaled_take_profit:
-                        exit_reason = self._check_exit_conditions_scaled_tp(
-                            active_position, current_candle, current_price
-                        )
-                        
-                        if exit_reason:
-                            # Position was closed (either partially or fully)
-                            # Check if position is fully closed
-                            if active_position.quantity == 0 or exit_reason == "SCALED_TP_FINAL":
-                                # Position fully closed, reset tracking
-                                self.scaled_tp_manager.reset_tracking(active_position.symbol)
-                                active_position = None
-                    else:
-                        # Original single take profit logic
-                        exit_reason = self._check_exit_conditions_single_tp(
-                            active_position, current_candle, current_price
-                        )
-                        
-                        if exit_reason:
-                            active_position = None
-                else:
-                    # Still within entry candle or first candle after entry - skip exit checks
-                    logger.debug(f"Skipping exit check: candle {i} <= entry candle {active_position.entry_candle_index} + 1")
+                active_position = self._process_open_position(
+                    active_position, i, current_candle, self.strategy.current_indicators.atr_15m
+                )
             else:
                 # No active position, check for entry signals
-                long_signal = self.strategy.check_long_entry()
-                short_signal = self.strategy.check_short_entry()
-                
-                signal = long_signal or short_signal
-                
-                if signal:
-                    # Simulate entry execution
-                    entry_price = self.simulate_trade_execution(
-                        signal_type=signal.type,
-                        candle=current_candle,
-                        is_long=(signal.type == "LONG_ENTRY")
-                    )
-                    
-                    # Apply fees and slippage
-                    entry_price = self.apply_fees_and_slippage(
-                        entry_price,
-                        "BUY" if signal.type == "LONG_ENTRY" else "SELL"
-                    )
-                    
-                    # Update signal price with simulated execution price
-                    signal.price = entry_price
-                    
-                    # Track feature influence on this trade
-                    self._track_feature_influence(signal, current_price)
-                    
-                    # Open position
-                    atr = self.strategy.current_indicators.atr_15m
-                    position = self.risk_mgr.open_position(
-                        signal,
-                        self.current_balance,
-                        atr
-                    )
-                    
-                    # CRITICAL FIX: Store the entry candle index
-                    # This allows us to skip exit checks until we're past this candle
-                    if position:
-                        position.entry_candle_index = i
-                        logger.info(f"Position opened at candle index {i}, will check exits starting from candle {i + 2}")
-                    
-                    # Set original_quantity for scaled TP tracking
-                    if position and position.original_quantity == 0:
-                        position.original_quantity = position.quantity
+                self._try_entry(i, current_candle)
             
             # Track equity (balance + unrealized PnL)
             equity = self.current_balance
@@ -283,9 +271,489 @@ class BacktestEngine:
             self.equity_curve.append(equity)
         
         # Close any remaining open positions at the end
+        self._close_remaining_position(candles_15m[-1])
+        
+        # Calculate and return metrics
+        return self.calculate_metrics()
+    
+    @_simulated
+    def run_event_backtest(
+        self,
+        candles_15m: List[Candle],
+        candles_1h: List[Candle],
+        initial_balance: float = 10000.0,
+        candles_5m: Optional[List[Candle]] = None,
+        candles_4h: Optional[List[Candle]] = None,
+        candles_1m: Optional[List[Candle]] = None,
+        series: Optional["vectorized_signals.IndicatorSeries"] = None,
+        indicator_cache: Optional[Dict[int, IndicatorState]] = None,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Dict:
+        """Execute backtest by jumping between entry candidates and exits.
+        
+        Produces the same trades and equity curve as run_backtest, but only
+        runs the strategy on bars the vectorized entry masks flag as possible
+        entries. Open positions are walked with precomputed ATR values instead
+        of a full indicator update, and with single take profit the exit bar
+        is found by a vectorized forward search over the stop, trailing stop
+        and take-profit levels. Strategies using adaptive features (adaptive
+        thresholds, multi-timeframe, volume profile, regime detection, ML)
+        carry state across bars and fall back to run_backtest.
+        
+        Args:
+            candles_15m: List of 15-minute historical candles
+            candles_1h: List of 1-hour historical candles
+            initial_balance: Starting wallet balance in USDT
+            candles_5m: Optional list of 5-minute candles (intrabar exit resolution)
+            candles_4h: Optional list of 4-hour candles (only used by the fallback)
+            candles_1m: Optional list of 1-minute candles (intrabar exit resolution)
+            series: Optional precomputed vectorized_signals.indicator_series of
+                these candles (shared by sweeps over thresholds and exits)
+            indicator_cache: Optional dict of strategy indicator values by bar
+                index; filled on misses and reused on hits, so it can be shared
+                by runs over the same candles with different thresholds or exits
+            start: First 15m bar to trade; earlier bars only serve as history
+            end: 15m bar after the last one to trade (None for all); a position
+                still open there is closed at the last traded bar's close
+            
+        Returns:
+            Dictionary containing performance metrics (see run_backtest)
+            
+        Raises:
+            ValueError: If inputs are invalid, or a bar range is requested for
+                a configuration that needs the bar-by-bar backtest
+        """
+        if not self._supports_event_skipping():
+            if start or end is not None:
+                raise ValueError("Bar ranges require a configuration supported by the event-skipping backtest")
+            logger.info("Event-skipping backtest unavailable for this strategy configuration, running bar by bar")
+            return self.run_backtest(
+                candles_15m, candles_1h, initial_balance, candles_5m, candles_4h, candles_1m
+            )
+        
+        if initial_balance <= 0:
+            raise ValueError(f"initial_balance must be positive, got {initial_balance}")
+        
+        if not candles_15m or not candles_1h:
+            raise ValueError("Candle lists cannot be empty")
+        
+        self.initial_balance = initial_balance
+        self.current_balance = initial_balance
+        self.equity_curve = array("d", [initial_balance])
+        self.trades = []
+        
+        self._candles_5m = candles_5m if candles_5m else []
+        self._candles_4h = candles_4h if candles_4h else []
+        intrabar_candles = candles_1m or self._candles_5m
+        self._intrabar_resolver = IntrabarResolver(intrabar_candles) if intrabar_candles else None
+        
+        if series is None:
+            series = vectorized_signals.indicator_series(
+                candles_to_array(candles_15m),
+                candles_to_array(candles_1h),
+                self.config,
+                self.strategy._get_weekly_anchor
+            )
+        arrays = vectorized_signals.entry_masks(
+            series, self.config.adx_threshold, self.config.rvol_threshold, start, end
+        )
+        
+        # Positions are over the bars run_backtest evaluates; other bars record nothing
+        bars = np.flatnonzero(arrays.valid)
+        candidate_positions = np.flatnonzero(arrays.candidates[bars])
+        logger.info(
+            f"[BACKTEST] Event-skipping: {len(candidate_positions)} entry candidates "
+            f"out of {len(bars)} bars"
+        )
+        
+        pos = 0
+        while pos < len(bars):
+            # Flat bars up to the next candidate only record the unchanged balance
+            next_index = np.searchsorted(candidate_positions, pos)
+            next_pos = int(candidate_positions[next_index]) if next_index < len(candidate_positions) else len(bars)
+            self.equity_curve.extend([self.current_balance] * (next_pos - pos))
+            if next_pos >= len(bars):
+                break
+            
+            i = int(bars[next_pos])
+            self._update_indicators_at(i, candles_15m, candles_1h, indicator_cache)
+            position = self._try_entry(i, candles_15m[i])
+            self.equity_curve.append(self.current_balance)
+            pos = next_pos + 1
+            
+            if position:
+                pos = self._walk_open_position(candles_15m, bars, pos, arrays)
+        
+        if len(bars):
+            self._close_remaining_position(candles_15m[int(bars[-1])])
+        
+        return self.calculate_metrics()
+    
+    def precompute_indicators(
+        self,
+        candles_15m: List[Candle],
+        candles_1h: List[Candle],
+        bars: np.ndarray
+    ) -> Dict[int, IndicatorState]:
+        """Compute the strategy's indicator values on selected bars.
+
+        The result can be passed as run_event_backtest's indicator_cache
+        (also merged from several calls, e.g. computed in parallel chunks).
+
+        Args:
+            candles_15m: 15-minute candles
+            candles_1h: 1-hour candles
+            bars: Indices of the 15m bars to compute
+
+        Returns:
+            Indicator values by bar index
+        """
+        cache: Dict[int, IndicatorState] = {}
+        for i in bars:
+            self._update_indicators_at(int(i), candles_15m, candles_1h, cache)
+        return cache
+
+    def _update_indicators_at(
+        self,
+        i: int,
+        candles_15m: List[Candle],
+        candles_1h: List[Candle],
+        indicator_cache: Optional[Dict[int, IndicatorState]] = None
+    ) -> None:
+        """Update the strategy's indicators for bar i, reusing cached values.
+        
+        Args:
+            i: Index of the 15m bar
+            candles_15m: 15-minute candles
+            candles_1h: 1-hour candles
+            indicator_cache: Optional indicator values by bar index
+        """
+        current_candles_15m = candles_15m[max(0, i - 200):i + 1]
+        current_1h_index = min(i // 4, len(candles_1h) - 1)
+        current_candles_1h = candles_1h[max(0, current_1h_index - 100):current_1h_index + 1]
+        
+        cached = indicator_cache.get(i) if indicator_cache is not None else None
+        if cached is not None:
+            self.strategy.restore_indicators(current_candles_15m, current_candles_1h, cached)
+            return
+        
+        self.strategy.update_indicators(current_candles_15m, current_candles_1h)
+        if indicator_cache is not None:
+            indicator_cache[i] = copy.copy(self.strategy.current_indicators)
+    
+    def _supports_event_skipping(self) -> bool:
+        """Check whether the event-skipping backtest reproduces run_backtest.
+        
+        Returns:
+            True if no strategy feature carries state between bars and the
+            fixed backtest windows always hold enough data for the indicators
+        """
+        stateful_features = (
+            self.strategy.adaptive_threshold_manager,
+            self.strategy.timeframe_coordinator,
+            self.strategy.volume_profile_analyzer,
+            self.strategy.market_regime_detector,
+            self.strategy.ml_predictor,
+        )
+        if any(feature is not None for feature in stateful_features):
+            return False
+        
+        # update_indicators keeps stale values when a window is too short
+        return self.strategy._has_sufficient_data(
+            [None] * (vectorized_signals.WARMUP_15M + 1),
+            [None] * vectorized_signals.MIN_CANDLES_1H
+        )
+    
+    def _walk_open_position(
+        self,
+        candles_15m: List[Candle],
+        bars: np.ndarray,
+        pos: int,
+        arrays: "vectorized_signals.BacktestArrays"
+    ) -> int:
+        """Advance an open position bar by bar until it is closed.
+        
+        Args:
+            candles_15m: 15-minute candles
+            bars: Indices of the bars run_backtest evaluates
+            pos: Position in bars of the first bar after entry
+            arrays: Precomputed per-bar arrays
+            
+        Returns:
+            Position in bars of the first bar without an open position
+        """
+        while pos < len(bars):
+            position = self.risk_mgr.get_active_position(self.config.symbol)
+            if position is None:
+                return pos
+            
+            if self._can_search_exit(position):
+                pos = self._search_single_tp_exit(position, candles_15m, bars, pos, arrays)
+                continue
+            
+            i = int(bars[pos])
+            active_position = self._process_open_position(
+                position, i, candles_15m[i], float(arrays.atr[i])
+            )
+            equity = self.current_balance
+            if active_position:
+                equity += active_position.unrealized_pnl
+            self.equity_curve.append(equity)
+            pos += 1
+        
+        return pos
+    
+    def _can_search_exit(self, position: Position) -> bool:
+        """Check whether the vectorized exit search applies to this position.
+        
+        Args:
+            position: Open position
+            
+        Returns:
+            True for single take profit without intrabar data or advanced exits
+        """
+        return (
+            not self.config.enable_scaled_take_profit
+            and self._intrabar_resolver is None
+            and getattr(self.risk_mgr, 'advanced_exit_manager', None) is None
+            and position.side in ("LONG", "SHORT")
+        )
+    
+    def _search_single_tp_exit(
+        self,
+        position: Position,
+        candles_15m: List[Candle],
+        bars: np.ndarray,
+        pos: int,
+        arrays: "vectorized_signals.BacktestArrays"
+    ) -> int:
+        """Find a single take profit position's exit bar with a forward search.
+        
+        Replays calculate_trailing_stop over a block of bars with vectorized
+        operations: candidate stops where the activation threshold is met,
+        a running maximum (minimum for shorts) for the never-widening stop,
+        then the first bar whose close reaches the take profit or whose range
+        touches the stop. Only that bar goes through the regular exit code.
+        Blocks start small and double, so short trades stay cheap.
+        
+        Args:
+            position: Open position
+            candles_15m: 15-minute candles
+            bars: Indices of the bars run_backtest evaluates
+            pos: Position in bars to start from
+            arrays: Precomputed per-bar arrays
+            
+        Returns:
+            Position in bars after the processed block or exit bar
+        """
+        is_long = position.side == "LONG"
+        entry = position.entry_price
+        quantity = position.quantity
+        activation = getattr(self.config, 'trailing_stop_activation_atr', 2.0)
+        block = 64
+        
+        while pos < len(bars):
+            idx = bars[pos:pos + block]
+            checked = idx > position.entry_candle_index + 1
+            close = arrays.close[idx]
+            atr = arrays.atr[idx]
+            
+            if np.any(atr[checked] <= 0):
+                # Let the regular code path handle (and report) invalid ATR values
+                i = int(idx[0])
+                active_position = self._process_open_position(position, i, candles_15m[i], float(atr[0]))
+                equity = self.current_balance
+                if active_position:
+                    equity += active_position.unrealized_pnl
+                self.equity_curve.append(equity)
+                return pos + 1
+            
+            trailing_distance = self.config.trailing_stop_atr_multiplier * atr
+            activation_threshold = activation * atr
+            if is_long:
+                profit_distance = close - entry
+                candidate = np.where(
+                    checked & (profit_distance >= activation_threshold), close - trailing_distance, -np.inf
+                )
+                trailing = np.maximum(position.trailing_stop, np.maximum.accumulate(candidate))
+                profit_pct = (close - entry) / entry
+                stop_hit = arrays.low[idx] <= trailing
+                unrealized = (close - entry) * quantity
+            else:
+                profit_distance = entry - close
+                candidate = np.where(
+                    checked & (profit_distance >= activation_threshold), close + trailing_distance, np.inf
+                )
+                trailing = np.minimum(position.trailing_stop, np.minimum.accumulate(candidate))
+                profit_pct = (entry - close) / entry
+                stop_hit = arrays.high[idx] >= trailing
+                unrealized = (entry - close) * quantity
+            
+            exits = checked & ((profit_pct >= self.config.take_profit_pct) | stop_hit)
+            end = int(np.argmax(exits)) if exits.any() else len(idx)
+            
+            # Bars before the exit only move the stop and mark to market
+            equity = self.current_balance + np.where(checked[:end], unrealized[:end], position.unrealized_pnl)
+            self.equity_curve.extend(equity)
+            if end > 0:
+                position.trailing_stop = float(trailing[end - 1])
+                if checked[end - 1]:
+                    position.unrealized_pnl = float(unrealized[end - 1])
+            
+            if end < len(idx):
+                i = int(idx[end])
+                active_position = self._process_open_position(position, i, candles_15m[i], float(atr[end]))
+                equity = self.current_balance
+                if active_position:
+                    equity += active_position.unrealized_pnl
+                self.equity_curve.append(equity)
+                return pos + end + 1
+            
+            pos += len(idx)
+            block *= 2
+        
+        return pos
+    
+    def _process_open_position(
+        self,
+        position: Position,
+        i: int,
+        current_candle: Candle,
+        atr: float
+    ) -> Optional[Position]:
+        """Update stops and run exit checks for an open position on one bar.
+        
+        Args:
+            position: Active position
+            i: Index of the current 15m candle
+            current_candle: Current 15m candle
+            atr: Current 15m ATR
+            
+        Returns:
+            The position while it is still active on this bar, None once it
+            has been fully closed
+        """
+        active_position = position
+        current_price = current_candle.close
+        
+        # CRITICAL FIX: Only check exit conditions if we're past the entry candle
+        # This prevents immediate stop-outs within the same candle as entry
+        # We need at least 1 candle after entry before checking stops
+        if i > active_position.entry_candle_index + 1:
+            # Update stops and check for stop hit
+            self.risk_mgr.update_stops(active_position, current_price, atr)
+            
+            # Check for scaled take profit if enabled
+            if self.config.enable_scaled_take_profit:
+                exit_reason = self._check_exit_conditions_scaled_tp(
+                    active_position, current_candle, current_price
+                )
+                
+                if exit_reason:
+                    # Position was closed (either partially or fully)
+                    # Check if position is fully closed
+                    if active_position.quantity == 0 or exit_reason == "SCALED_TP_FINAL":
+                        # Position fully closed, reset tracking
+                        self.scaled_tp_manager.reset_tracking(active_position.symbol)
+                        active_position = None
+            else:
+                # Original single take profit logic
+                exit_reason = self._check_exit_conditions_single_tp(
+                    active_position, current_candle, current_price
+                )
+                
+                if exit_reason:
+                    active_position = None
+        else:
+            # Still within entry candle or first candle after entry - skip exit checks
+            logger.debug(f"Skipping exit check: candle {i} <= entry candle {active_position.entry_candle_index} + 1")
+        
+        return active_position
+    
+    def _try_entry(self, i: int, current_candle: Candle) -> Optional[Position]:
+        """Check entry signals on the current bar and open a position if one fires.
+        
+        Args:
+            i: Index of the current 15m candle
+            current_candle: Current 15m candle
+            
+        Returns:
+            The opened position, or None
+        """
+        long_signal = self.strategy.check_long_entry()
+        short_signal = self.strategy.check_short_entry()
+        
+        signal = long_signal or short_signal
+        
+        if signal:
+            return self._open_signal_position(i, current_candle, signal)
+        
+        return None
+    
+    def _open_signal_position(self, i: int, current_candle: Candle, signal: Signal) -> Optional[Position]:
+        """Simulate the entry fill for a signal and open the position.
+        
+        Args:
+            i: Index of the current 15m candle
+            current_candle: Current 15m candle
+            signal: Entry signal from the strategy
+            
+        Returns:
+            The opened position
+            
+        Raises:
+            RuntimeError: If portfolio risk limits would be exceeded
+        """
+        current_price = current_candle.close
+        
+        # Simulate entry execution
+        entry_price = self.simulate_trade_execution(
+            signal_type=signal.type,
+            candle=current_candle,
+            is_long=(signal.type == "LONG_ENTRY")
+        )
+        
+        # Apply fees and slippage
+        entry_price = self.apply_fees_and_slippage(
+            entry_price,
+            "BUY" if signal.type == "LONG_ENTRY" else "SELL"
+        )
+        
+        # Update signal price with simulated execution price
+        signal.price = entry_price
+        
+        # Track feature influence on this trade
+        self._track_feature_influence(signal, current_price)
+        
+        # Open position
+        atr = self.strategy.current_indicators.atr_15m
+        position = self.risk_mgr.open_position(
+            signal,
+            self.current_balance,
+            atr
+        )
+        
+        # CRITICAL FIX: Store the entry candle index
+        # This allows us to skip exit checks until we're past this candle
+        if position:
+            position.entry_candle_index = i
+            logger.info(f"Position opened at candle index {i}, will check exits starting from candle {i + 2}")
+        
+        # Set original_quantity for scaled TP tracking
+        if position and position.original_quantity == 0:
+            position.original_quantity = position.quantity
+        
+        return position
+    
+    def _close_remaining_position(self, final_candle: Candle) -> None:
+        """Close a position still open at the end of the data at the last close.
+        
+        Args:
+            final_candle: Last 15-minute candle of the backtest
+        """
         active_position = self.risk_mgr.get_active_position(self.config.symbol)
         if active_position:
-            final_candle = candles_15m[-1]
             exit_price = self.apply_fees_and_slippage(
                 final_candle.close,
                 "SELL" if active_position.side == "LONG" else "BUY"
@@ -297,9 +765,6 @@ class BacktestEngine:
             )
             self.current_balance += trade.pnl
             self.trades.append(trade)
-        
-        # Calculate and return metrics
-        return self.calculate_metrics()
     
     def simulate_trade_execution(
         self, 
@@ -388,80 +853,21 @@ class BacktestEngine:
         - Sharpe ratio
         - Average win/loss
         
+        All metrics come from the shared performance_analytics module so
+        backtest, portfolio and dashboard figures are computed identically.
+        
         Returns:
             Dictionary containing all performance metrics
         """
         if not self.trades:
-            # No trades executed
-            return {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'losing_trades': 0,
-                'win_rate': 0.0,
-                'total_pnl': 0.0,
-                'roi': 0.0,
-                'max_drawdown': 0.0,
-                'profit_factor': 0.0,
-                'sharpe_ratio': 0.0,
-                'average_win': 0.0,
-                'average_loss': 0.0,
-                'largest_win': 0.0,
-                'largest_loss': 0.0,
-                'average_trade_duration': 0,
-                'feature_metrics': self.feature_metrics
-            }
-        
-        # Basic trade statistics
-        total_trades = len(self.trades)
-        winning_trades = sum(1 for t in self.trades if t.pnl > 0)
-        losing_trades = sum(1 for t in self.trades if t.pnl <= 0)
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-        
-        # PnL calculations
-        total_pnl = sum(t.pnl for t in self.trades)
-        roi = (total_pnl / self.initial_balance * 100) if self.initial_balance > 0 else 0.0
-        
-        # Drawdown calculation
-        max_drawdown = self._calculate_max_drawdown()
-        
-        # Profit factor (gross profit / gross loss)
-        gross_profit = sum(t.pnl for t in self.trades if t.pnl > 0)
-        gross_loss = abs(sum(t.pnl for t in self.trades if t.pnl < 0))
-        profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else 0.0
-        
-        # Sharpe ratio
-        sharpe_ratio = self._calculate_sharpe_ratio()
-        
-        # Win/Loss statistics
-        wins = [t.pnl for t in self.trades if t.pnl > 0]
-        losses = [t.pnl for t in self.trades if t.pnl < 0]
-        
-        average_win = (sum(wins) / len(wins)) if wins else 0.0
-        average_loss = (sum(losses) / len(losses)) if losses else 0.0
-        largest_win = max(wins) if wins else 0.0
-        largest_loss = min(losses) if losses else 0.0
-        
-        # Trade duration
-        durations = [t.exit_time - t.entry_time for t in self.trades]
-        average_trade_duration = int(sum(durations) / len(durations)) if durations else 0
+            metrics = performance_analytics.calculate_metrics([], self.initial_balance)
+        else:
+            metrics = performance_analytics.calculate_metrics(
+                self.trades, self.initial_balance, self.equity_curve
+            )
         
-        return {
-            'total_trades': total_trades,
-            'winning_trades': winning_trades,
-            'losing_trades': losing_trades,
-            'win_rate': win_rate,
-            'total_pnl': total_pnl,
-            'roi': roi,
-            'max_drawdown': max_drawdown,
-            'profit_factor': profit_factor,
-            'sharpe_ratio': sharpe_ratio,
-            'average_win': average_win,
-            'average_loss': average_loss,
-            'largest_win': largest_win,
-            'largest_loss': largest_loss,
-            'average_trade_duration': average_trade_duration,
-            'feature_metrics': self.feature_metrics
-        }
+        metrics['feature_metrics'] = self.feature_metrics
+        return metrics
     
     def _calculate_max_drawdown(self) -> float:
         """Calculate maximum drawdown from equity curve.
@@ -469,21 +875,7 @@ class BacktestEngine:
         Returns:
             Maximum drawdown in quote currency (USDT)
         """
-        if not self.equity_curve:
-            return 0.0
-        
-        max_drawdown = 0.0
-        peak = self.equity_curve[0]
-        
-        for equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            
-            drawdown = peak - equity
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-        
-        return max_drawdown
+        return performance_analytics.max_drawdown(self.equity_curve)
     
     def _calculate_sharpe_ratio(self) -> float:
         """Calculate Sharpe ratio from trade returns.
@@ -497,31 +889,8 @@ class BacktestEngine:
         if len(self.trades) < 2:
             return 0.0
         
-        # Calculate returns as percentage of balance at trade time
-        returns = []
-        for trade in self.trades:
-            # Approximate balance at trade time
-            trade_return = trade.pnl_percent / 100  # Convert to decimal
-            returns.append(trade_return)
-        
-        if not returns:
-            return 0.0
-        
-        # Calculate mean and std deviation
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-        
-        if std_return == 0:
-            return 0.0
-        
-        # Sharpe ratio (not annualized, just per-trade)
-        sharpe = mean_return / std_return
-        
-        # Approximate annualization (assuming ~250 trading days)
-        # This is a rough approximation
-        sharpe_annualized = sharpe * np.sqrt(250)
-        
-        return sharpe_annualized
+        trades = performance_analytics.trades_to_array(self.trades)
+        return performance_analytics.sharpe_ratio(trades['pnl_percent'] / 100)
     
     def _check_stop_hit_in_candle(
         self, 
@@ -567,6 +936,9 @@ class BacktestEngine:
         Returns:
             Exit reason string if position closed, None if still open
         """
+        if self._has_intrabar_data(candle):
+            return self._resolve_scaled_tp_intrabar(position, candle)
+        
         # First check if stop was hit
         if self._check_stop_hit_in_candle(position, candle):
             exit_price = self.simulate_trade_execution(
@@ -595,108 +967,137 @@ class BacktestEngine:
         action = self.scaled_tp_manager.check_take_profit_levels(position, current_price)
         
         if action:
-            # Simulate partial close
-            result = self._simulate_partial_close(position, action, candle)
+            return self._apply_take_profit_action(position, action, candle)
+        
+        return None
+    
+    def _apply_take_profit_action(
+        self,
+        position: Position,
+        action,  # PartialCloseAction
+        candle: Candle,
+        final_exit_price: Optional[float] = None,
+        exit_time: Optional[int] = None
+    ) -> Optional[str]:
+        """Execute a scaled TP partial close and close the remainder after the last level.
+        
+        Args:
+            position: Position being partially closed
+            action: PartialCloseAction returned by the scaled TP manager
+            candle: Current candle
+            final_exit_price: Fill price for the remainder after the last level
+                (simulated from the candle when None)
+            exit_time: Time of the fill (candle timestamp when None)
             
-            if result['success']:
-                # Update position size after partial close
-                position.quantity -= result['filled_quantity']
-                
-                # Update stop loss
-                position.stop_loss = action.new_stop_loss
-                position.trailing_stop = action.new_stop_loss
-                
-                # Record TP level hit
-                if action.tp_level not in position.tp_levels_hit:
-                    position.tp_levels_hit.append(action.tp_level)
-                
-                # Record partial exit
-                partial_exit = {
-                    'tp_level': action.tp_level,
-                    'exit_time': candle.timestamp,
-                    'exit_price': result['fill_price'],
-                    'quantity_closed': result['filled_quantity'],
-                    'profit': result['realized_profit'],
-                    'profit_pct': action.profit_pct,
-                    'new_stop_loss': action.new_stop_loss
-                }
-                position.partial_exits.append(partial_exit)
-                
-                # Update balance with partial profit
-                self.current_balance += result['realized_profit']
-                
-                # Track metrics
-                self.feature_metrics['scaled_take_profit']['partial_closes'] += 1
-                self.feature_metrics['scaled_take_profit']['total_partial_profit'] += result['realized_profit']
-                
-                if action.tp_level == 1:
-                    self.feature_metrics['scaled_take_profit']['tp1_hits'] += 1
-                elif action.tp_level == 2:
-                    self.feature_metrics['scaled_take_profit']['tp2_hits'] += 1
-                elif action.tp_level == 3:
-                    self.feature_metrics['scaled_take_profit']['tp3_hits'] += 1
-                
-                # Update tracking
-                self.scaled_tp_manager.update_tracking_after_partial_close(
-                    position, action.tp_level, action.new_stop_loss
-                )
-                
-                # Check if this was the final TP level
-                if len(position.tp_levels_hit) >= len(self.config.scaled_tp_levels):
-                    # All TP levels hit, close remaining position
-                    if position.quantity > 0:
-                        exit_price = self.simulate_trade_execution(
+        Returns:
+            "SCALED_TP_FINAL" if the position was fully closed, None otherwise
+        """
+        if exit_time is None:
+            exit_time = candle.timestamp
+        
+        # Simulate partial close
+        result = self._simulate_partial_close(position, action, candle)
+        
+        if result['success']:
+            # Update position size after partial close
+            position.quantity -= result['filled_quantity']
+            
+            # Update stop loss
+            position.stop_loss = action.new_stop_loss
+            position.trailing_stop = action.new_stop_loss
+            
+            # Record TP level hit
+            if action.tp_level not in position.tp_levels_hit:
+                position.tp_levels_hit.append(action.tp_level)
+            
+            # Record partial exit
+            partial_exit = {
+                'tp_level': action.tp_level,
+                'exit_time': exit_time,
+                'exit_price': result['fill_price'],
+                'quantity_closed': result['filled_quantity'],
+                'profit': result['realized_profit'],
+                'profit_pct': action.profit_pct,
+                'new_stop_loss': action.new_stop_loss
+            }
+            position.partial_exits.append(partial_exit)
+            
+            # Update balance with partial profit
+            self.current_balance += result['realized_profit']
+            
+            # Track metrics
+            self.feature_metrics['scaled_take_profit']['partial_closes'] += 1
+            self.feature_metrics['scaled_take_profit']['total_partial_profit'] += result['realized_profit']
+            
+            if action.tp_level == 1:
+                self.feature_metrics['scaled_take_profit']['tp1_hits'] += 1
+            elif action.tp_level == 2:
+                self.feature_metrics['scaled_take_profit']['tp2_hits'] += 1
+            elif action.tp_level == 3:
+                self.feature_metrics['scaled_take_profit']['tp3_hits'] += 1
+            
+            # Update tracking
+            self.scaled_tp_manager.update_tracking_after_partial_close(
+                position, action.tp_level, action.new_stop_loss
+            )
+            
+            # Check if this was the final TP level
+            if len(position.tp_levels_hit) >= len(self.config.scaled_tp_levels):
+                # All TP levels hit, close remaining position
+                if position.quantity > 0:
+                    if final_exit_price is None:
+                        final_exit_price = self.simulate_trade_execution(
                             signal_type="EXIT",
                             candle=candle,
                             is_long=(position.side == "LONG")
                         )
-                        
-                        exit_price = self.apply_fees_and_slippage(
-                            exit_price,
-                            "SELL" if position.side == "LONG" else "BUY"
-                        )
-                        
-                        # Calculate final profit
-                        if position.side == "LONG":
-                            final_profit = (exit_price - position.entry_price) * position.quantity
-                        else:
-                            final_profit = (position.entry_price - exit_price) * position.quantity
-                        
-                        self.current_balance += final_profit
-                        
-                        # Record final partial exit
-                        final_exit = {
-                            'tp_level': len(self.config.scaled_tp_levels),
-                            'exit_time': candle.timestamp,
-                            'exit_price': exit_price,
-                            'quantity_closed': position.quantity,
-                            'profit': final_profit,
-                            'profit_pct': action.profit_pct,
-                            'new_stop_loss': action.new_stop_loss
-                        }
-                        position.partial_exits.append(final_exit)
-                        
-                        # Create trade record with all partial exits
-                        trade = Trade(
-                            symbol=position.symbol,
-                            side=position.side,
-                            entry_price=position.entry_price,
-                            exit_price=exit_price,  # Final exit price
-                            quantity=position.original_quantity,
-                            entry_time=position.entry_time,
-                            exit_time=candle.timestamp,
-                            pnl=sum(pe['profit'] for pe in position.partial_exits),
-                            pnl_percent=(sum(pe['profit'] for pe in position.partial_exits) / 
-                                       (position.entry_price * position.original_quantity) * 100),
-                            exit_reason="SCALED_TP_FINAL"
-                        )
-                        
-                        self.trades.append(trade)
-                        
-                        # Mark position as fully closed
-                        position.quantity = 0
-                        
-                        return "SCALED_TP_FINAL"
+                    
+                    exit_price = self.apply_fees_and_slippage(
+                        final_exit_price,
+                        "SELL" if position.side == "LONG" else "BUY"
+                    )
+                    
+                    # Calculate final profit
+                    if position.side == "LONG":
+                        final_profit = (exit_price - position.entry_price) * position.quantity
+                    else:
+                        final_profit = (position.entry_price - exit_price) * position.quantity
+                    
+                    self.current_balance += final_profit
+                    
+                    # Record final partial exit
+                    final_exit = {
+                        'tp_level': len(self.config.scaled_tp_levels),
+                        'exit_time': exit_time,
+                        'exit_price': exit_price,
+                        'quantity_closed': position.quantity,
+                        'profit': final_profit,
+                        'profit_pct': action.profit_pct,
+                        'new_stop_loss': action.new_stop_loss
+                    }
+                    position.partial_exits.append(final_exit)
+                    
+                    # Create trade record with all partial exits
+                    trade = Trade(
+                        symbol=position.symbol,
+                        side=position.side,
+                        entry_price=position.entry_price,
+                        exit_price=exit_price,  # Final exit price
+                        quantity=position.original_quantity,
+                        entry_time=position.entry_time,
+                        exit_time=exit_time,
+                        pnl=sum(pe['profit'] for pe in position.partial_exits),
+                        pnl_percent=(sum(pe['profit'] for pe in position.partial_exits) / 
+                                   (position.entry_price * position.original_quantity) * 100),
+                        exit_reason="SCALED_TP_FINAL"
+                    )
+                    
+                    self.trades.append(trade)
+                    
+                    # Mark position as fully closed
+                    position.quantity = 0
+                    
+                    return "SCALED_TP_FINAL"
         
         return None
     
@@ -716,6 +1117,9 @@ class BacktestEngine:
         Returns:
             Exit reason string if position closed, None if still open
         """
+        if self._has_intrabar_data(candle):
+            return self._resolve_single_tp_intrabar(position, candle)
+        
         # Calculate current profit percentage
         if position.side == "LONG":
             profit_pct = (current_price - position.entry_price) / position.entry_price
@@ -775,6 +1179,129 @@ class BacktestEngine:
         
         return None
     
+    def _has_intrabar_data(self, candle: Candle) -> bool:
+        """Check whether lower-timeframe bars exist inside this candle.
+        
+        Args:
+            candle: Current 15m candle
+            
+        Returns:
+            True if exits for this candle can be resolved intrabar
+        """
+        return (
+            self._intrabar_resolver is not None
+            and self._intrabar_resolver.covers(candle.timestamp, candle.timestamp + BAR_INTERVAL_MS)
+        )
+    
+    def _close_at_price(self, position: Position, price: float, reason: str) -> str:
+        """Close the whole position at a price (fees and slippage applied).
+        
+        Args:
+            position: Position to close
+            price: Fill price before costs
+            reason: Exit reason recorded on the trade
+            
+        Returns:
+            The exit reason
+        """
+        exit_price = self.apply_fees_and_slippage(
+            price,
+            "SELL" if position.side == "LONG" else "BUY"
+        )
+        trade = self.risk_mgr.close_position(position, exit_price, reason)
+        self.current_balance += trade.pnl
+        self.trades.append(trade)
+        return reason
+    
+    def _resolve_single_tp_intrabar(self, position: Position, candle: Candle) -> Optional[str]:
+        """Resolve stop vs take profit inside the candle from lower-timeframe bars.
+        
+        Args:
+            position: Active position to check
+            candle: Current 15m candle
+            
+        Returns:
+            Exit reason string if position closed, None if still open
+        """
+        if position.side == "LONG":
+            take_profit = position.entry_price * (1 + self.config.take_profit_pct)
+        else:
+            take_profit = position.entry_price * (1 - self.config.take_profit_pct)
+        
+        touch = self._intrabar_resolver.first_touch(
+            position.side,
+            position.trailing_stop,
+            [take_profit],
+            candle.timestamp,
+            candle.timestamp + BAR_INTERVAL_MS
+        )
+        
+        if touch is None:
+            return None
+        
+        if touch.kind == STOP:
+            return self._close_at_price(position, touch.price, "TRAILING_STOP")
+        
+        logger.info(f"[BACKTEST] TAKE PROFIT HIT! {self.config.symbol} {position.side} at {touch.price:.2f} (intrabar)")
+        return self._close_at_price(position, touch.price, "TAKE_PROFIT")
+    
+    def _resolve_scaled_tp_intrabar(self, position: Position, candle: Candle) -> Optional[str]:
+        """Walk the candle's lower-timeframe bars through the stop and TP ladder.
+        
+        Each search finds the first bar touching the current stop or any
+        pending TP level. TP touches are executed as partial closes and the
+        search resumes after that bar with the moved stop, so every level is
+        handled in the order price actually reached it.
+        
+        Args:
+            position: Active position to check
+            candle: Current 15m candle
+            
+        Returns:
+            Exit reason string if position closed, None if still open
+        """
+        start = candle.timestamp
+        end = candle.timestamp + BAR_INTERVAL_MS
+        
+        while True:
+            target_prices = self.scaled_tp_manager._calculate_target_prices(position)
+            pending = [
+                (level, price)
+                for level, price in enumerate(target_prices, start=1)
+                if level not in position.tp_levels_hit
+            ]
+            
+            touch = self._intrabar_resolver.first_touch(
+                position.side,
+                position.trailing_stop,
+                [price for _, price in pending],
+                start,
+                end
+            )
+            
+            if touch is None:
+                return None
+            
+            if touch.kind == STOP:
+                return self._close_at_price(position, touch.price, "TRAILING_STOP")
+            
+            for ladder_index in touch.levels:
+                target_price = pending[ladder_index][1]
+                action = self.scaled_tp_manager.check_take_profit_levels(position, target_price)
+                if action is None:
+                    continue
+                
+                result = self._apply_take_profit_action(
+                    position, action, candle,
+                    final_exit_price=target_price,
+                    exit_time=touch.timestamp
+                )
+                if result:
+                    return result
+            
+            # Same-bar ordering of the new stop is unknown: resume on the next bar
+            start = touch.timestamp + 1
+    
     def _simulate_partial_close(
         self,
         position: Position,
@@ -838,7 +1365,7 @@ class BacktestEngine:
         Returns:
             List of equity values throughout the backtest
         """
-        return self.equity_curve.copy()
+        return self.equity_curve.tolist()
     
     def get_trades(self) -> List[Trade]:
         """Get all trades from the backtest.
@@ -911,12 +1438,14 @@ class BacktestEngine:
     def fetch_multi_timeframe_data(
         self,
         days: int = 90,
-        client: Optional[Client] = None
+        client: Optional["Client"] = None
     ) -> Dict[str, List[Candle]]:
         """Fetch historical data for all timeframes needed for backtesting.
         
         This is a convenience method that fetches 5m, 15m, 1h, and 4h data
-        for the specified number of days.
+        for the specified number of days. When candle_base_timeframe is set,
+        only the base timeframe is fetched and the others are resampled from
+        it, matching the candles the bot builds live.
         
         Args:
             days: Number of days of historical data to fetch
@@ -936,6 +1465,18 @@ class BacktestEngine:
         # Create temporary data manager for fetching
         data_mgr = DataManager(self.config, client)
         
+        if data_mgr.base_timeframe is not None:
+            try:
+                history = data_mgr.fetch_resampled_history(days=days)
+                logger.info(
+                    f"Resampled {len(history[data_mgr.base_timeframe])} {data_mgr.base_timeframe} "
+                    f"candles for backtesting"
+                )
+                return {tf: history.get(tf, []) for tf in ['5m', '15m', '1h', '4h']}
+            except Exception as e:
+                logger.error(f"Failed to fetch {data_mgr.base_timeframe} data: {e}")
+                return {tf: [] for tf in ['5m', '15m', '1h', '4h']}
+        
         result = {}
         
         # Fetch each timeframe
@@ -0,0 +1,657 @@
+"""Benchmark suite for the trading bot's hot paths.
+
+Times indicator functions, StrategyEngine.update_indicators, end-to-end
+backtests, volume profile, ML feature extraction / training-set build, the
+portfolio correlation matrix, the multi-symbol portfolio backtest and Monte
+Carlo resampling on deterministic synthetic data, plus cold-import time of the
+bot's entry points (``python -X importtime`` in a fresh interpreter). Memory
+benchmarks also record the bytes still allocated (tracemalloc) by the object
+their callable returns, e.g. DataManager candle buffers as the number of
+symbols grows. Reports are stored as JSON baselines and compared to flag
+regressions.
+
+Run from the command line with scripts/benchmarks/run_benchmarks.py.
+"""
+
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import Config
+from src import synthetic_data
+from src.candle_array import to_candles
+
+
+logger = logging.getLogger(__name__)
+
+
+# Candles used by strategy/ML benchmarks are capped to what the bot keeps in
+# memory; backtest and training-set benchmarks use the full requested size.
+LIVE_WINDOW_BARS = 500
+
+DEFAULT_SIZES = (10_000,)
+DEFAULT_THRESHOLD = 0.20  # 20% slower than baseline is a regression
+
+# Import-time benchmarks run a fresh interpreter from the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class BenchmarkCase:
+    """A named benchmark.
+
+    Attributes:
+        name: Dotted benchmark name (e.g. "indicators.atr")
+        setup: Callable (n_bars, seed) -> zero-argument callable to time
+        max_bars: Largest size this benchmark runs at (larger sizes are clamped)
+        description: One-line description
+        track_memory: Also measure the memory retained by the callable's return value
+    """
+    name: str
+    setup: Callable[[int, int], Callable[[], Any]]
+    max_bars: int = 5_000_000
+    description: str = ""
+    track_memory: bool = False
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing (and for memory benchmarks, retained bytes) of one benchmark at one size."""
+    name: str
+    n_bars: int
+    repeats: int
+    best_s: float
+    median_s: float
+    mean_s: float
+    setup_s: float = 0.0
+    error: Optional[str] = None
+    memory_bytes: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.n_bars}"
+
+
+@dataclass
+class Comparison:
+    """Comparison of one benchmark against its baseline."""
+    key: str
+    baseline_s: Optional[float]
+    current_s: Optional[float]
+    ratio: Optional[float]
+    status: str  # OK, REGRESSION, IMPROVED, NEW, MISSING, ERROR
+
+
+def _silence_loggers():
+    """Keep per-call INFO logging from dominating benchmark timings."""
+    logging.disable(logging.INFO)
+
+
+def _candles(n_bars: int, seed: int, timeframe: str = "15m"):
+    return to_candles(synthetic_data.generate_ohlcv(n_bars, timeframe=timeframe, seed=seed))
+
+
+# ---------------------------------------------------------------------------
+# Benchmark setups
+# ---------------------------------------------------------------------------
+
+def _indicator_case(method_name: str, *args):
+    def setup(n_bars: int, seed: int):
+        from src.indicators import IndicatorCalculator
+
+        candles = _candles(n_bars, seed)
+        method = getattr(IndicatorCalculator, method_name)
+        if method_name == "calculate_vwap":
+            call_args = (candles[0].timestamp,)
+        elif method_name == "determine_trend":
+            call_args = (candles[-1].close,)
+        else:
+            call_args = args
+        return lambda: method(candles, *call_args)
+    return setup
+
+
+def _setup_update_indicators(n_bars: int, seed: int):
+    from src.strategy import StrategyEngine
+
+    bars = synthetic_data.generate_multi_timeframe(n_bars, base_timeframe="15m", timeframes=("15m", "1h"), seed=seed)
+    candles_15m = to_candles(bars["15m"][-LIVE_WINDOW_BARS:])
+    candles_1h = to_candles(bars["1h"][-LIVE_WINDOW_BARS:])
+    strategy = StrategyEngine(Config())
+    return lambda: strategy.update_indicators(candles_15m, candles_1h)
+
+
+def _setup_backtest(n_bars: int, seed: int, event_skipping: bool = False):
+    from src.backtest_engine import BacktestEngine
+    from src.position_sizer import PositionSizer
+    from src.risk_manager import RiskManager
+    from src.strategy import StrategyEngine
+
+    bars = synthetic_data.generate_multi_timeframe(n_bars, base_timeframe="15m", timeframes=("15m", "1h"), seed=seed)
+    candles_15m = to_candles(bars["15m"])
+    candles_1h = to_candles(bars["1h"])
+    config = Config()
+
+    def run():
+        strategy = StrategyEngine(config)
+        risk_manager = RiskManager(config, PositionSizer(config))
+        engine = BacktestEngine(config, strategy, risk_manager)
+        backtest = engine.run_event_backtest if event_skipping else engine.run_backtest
+        return backtest(candles_15m, candles_1h, initial_balance=10000.0)
+    return run
+
+
+def _setup_event_backtest(n_bars: int, seed: int):
+    return _setup_backtest(n_bars, seed, event_skipping=True)
+
+
+def _setup_walk_forward(n_bars: int, seed: int):
+    from src.walk_forward import WalkForwardOptimizer
+
+    bars = synthetic_data.generate_multi_timeframe(n_bars, base_timeframe="15m", timeframes=("15m", "1h"), seed=seed)
+    data = {"BTCUSDT": (to_candles(bars["15m"]), to_candles(bars["1h"]))}
+    # Three folds over the history after the indicator warmup
+    fold_days = max(1.0, (n_bars - 200) / 96 / 6)
+    space = {
+        "adx_threshold": [20.0, 25.0],
+        "rvol_threshold": [1.0, 1.2],
+        "stop_loss_atr_multiplier": [1.5, 2.0],
+        "trailing_stop_atr_multiplier": [1.5, 2.5],
+    }
+    optimizer = WalkForwardOptimizer(
+        Config(), space, in_sample_days=3 * fold_days, out_of_sample_days=fold_days, min_trades=1
+    )
+    return lambda: optimizer.run(data)
+
+
+def _setup_monte_carlo(n_bars: int, seed: int):
+    from src import monte_carlo
+
+    # n_bars is the number of trades per path
+    returns = np.random.default_rng(seed).normal(0.002, 0.02, n_bars)
+    return lambda: monte_carlo.simulate(returns, n_paths=100_000, seed=seed)
+
+
+def _setup_volume_profile(n_bars: int, seed: int):
+    from src.volume_profile_analyzer import VolumeProfileAnalyzer
+
+    candles = _candles(n_bars, seed)
+    analyzer = VolumeProfileAnalyzer(Config())
+    return lambda: analyzer.calculate_volume_profile(candles)
+
+
+def _setup_ml_features(n_bars: int, seed: int):
+    from src.ml_predictor import MLPredictor
+
+    candles = _candles(n_bars, seed)[-LIVE_WINDOW_BARS:]
+    predictor = MLPredictor(Config())
+    return lambda: predictor.extract_features(candles)
+
+
+def _setup_ml_training_set(n_bars: int, seed: int):
+    from src.ml_predictor import MLPredictor
+    from src.ml_training_pipeline import MLTrainingPipeline
+
+    config = Config()
+    candles = _candles(n_bars, seed)
+    predictor = MLPredictor(config)
+    pipeline = MLTrainingPipeline(config, data_manager=None)
+
+    def run():
+        features, valid_indices = pipeline.extract_features_for_training(candles, predictor, sample_every=4)
+        labels = pipeline.generate_labels(candles)
+        return features, labels
+    return run
+
+
+def _setup_correlation_matrix(n_bars: int, seed: int, n_symbols: int = 10):
+    from src.portfolio_manager import PortfolioManager
+
+    config = Config()
+    config.portfolio_symbols = [f"SYM{i}USDT" for i in range(n_symbols)]
+    config.portfolio_max_symbols = n_symbols
+    manager = PortfolioManager(config)
+
+    closes = synthetic_data.generate_correlated_closes(n_bars, n_symbols, seed=seed)
+    price_data = {
+        symbol: synthetic_data.closes_to_candles(closes[i])
+        for i, symbol in enumerate(manager.symbols)
+    }
+    return lambda: manager.build_correlation_matrix(price_data)
+
+
+def _setup_portfolio_backtest(n_bars: int, seed: int, n_symbols: int = 30):
+    from src.portfolio_backtest import PortfolioBacktestEngine
+
+    data = {}
+    for k in range(n_symbols):
+        bars = synthetic_data.generate_multi_timeframe(
+            n_bars, base_timeframe="15m", timeframes=("15m", "1h"), seed=seed + k
+        )
+        data[f"SYM{k}USDT"] = (bars["15m"], bars["1h"])
+    engine = PortfolioBacktestEngine(Config())
+    return lambda: engine.run(data)
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """Parse ``python -X importtime`` output.
+
+    Args:
+        output: stderr of an interpreter run with ``-X importtime``
+
+    Returns:
+        Dictionary of module name -> cumulative import time in microseconds
+    """
+    cumulative = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # column header
+        cumulative[fields[2].strip()] = int(fields[1])
+    return cumulative
+
+
+def import_time_profile(module: str) -> Dict[str, int]:
+    """Import a module in a fresh interpreter and profile its imports.
+
+    Args:
+        module: Dotted module name (e.g. "src.trading_bot")
+
+    Returns:
+        Dictionary of every module loaded -> cumulative import time in microseconds
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {proc.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(proc.stderr)
+
+
+def _setup_symbol_buffers(n_bars: int, seed: int):
+    # n_bars is the number of symbols; each gets full 500-candle buffers on the
+    # four live timeframes, built inside the callable so they are measured
+    from src.data_manager import DataManager
+
+    timeframes = ("5m", "15m", "1h", "4h")
+    bars = {
+        timeframe: synthetic_data.generate_ohlcv(LIVE_WINDOW_BARS, timeframe=timeframe, seed=seed)
+        for timeframe in timeframes
+    }
+    symbols = [f"SYM{k}USDT" for k in range(n_bars)]
+    config = Config()
+
+    def run():
+        manager = DataManager(config, client=None)
+        for symbol in symbols:
+            for timeframe in timeframes:
+                manager.load_buffer(symbol, timeframe, to_candles(bars[timeframe]))
+        return manager
+    return run
+
+
+def _import_case(module: str):
+    # n_bars and seed do not apply; each run is one cold import
+    def setup(n_bars: int, seed: int):
+        return lambda: import_time_profile(module)
+    return setup
+
+
+def _setup_generate_ohlcv(n_bars: int, seed: int):
+    return lambda: synthetic_data.generate_ohlcv(n_bars, seed=seed)
+
+
+BENCHMARKS: Dict[str, BenchmarkCase] = {
+    case.name: case for case in [
+        BenchmarkCase("startup.import_trading_bot", _import_case("src.trading_bot"), max_bars=1,
+                      description="Cold interpreter start + import src.trading_bot (bot restart)"),
+        BenchmarkCase("startup.import_backtest_engine", _import_case("src.backtest_engine"), max_bars=1,
+                      description="Cold interpreter start + import src.backtest_engine (backtest workers)"),
+        BenchmarkCase("synthetic.generate_ohlcv", _setup_generate_ohlcv,
+                      description="Synthetic GBM OHLCV generation"),
+        BenchmarkCase("indicators.vwap", _indicator_case("calculate_vwap"), max_bars=1_000_000,
+                      description="IndicatorCalculator.calculate_vwap"),
+        BenchmarkCase("indicators.atr", _indicator_case("calculate_atr", 14), max_bars=1_000_000,
+                      description="IndicatorCalculator.calculate_atr"),
+        BenchmarkCase("indicators.adx", _indicator_case("calculate_adx", 14), max_bars=1_000_000,
+                      description="IndicatorCalculator.calculate_adx"),
+        BenchmarkCase("indicators.rvol", _indicator_case("calculate_rvol", 20), max_bars=1_000_000,
+                      description="IndicatorCalculator.calculate_rvol"),
+        BenchmarkCase("indicators.squeeze_momentum", _indicator_case("calculate_squeeze_momentum"), max_bars=100_000,
+                      description="IndicatorCalculator.calculate_squeeze_momentum"),
+        BenchmarkCase("indicators.determine_trend", _indicator_case("determine_trend"), max_bars=1_000_000,
+                      description="IndicatorCalculator.determine_trend"),
+        BenchmarkCase("strategy.update_indicators", _setup_update_indicators, max_bars=1_000_000,
+                      description=f"StrategyEngine.update_indicators on the last {LIVE_WINDOW_BARS} bars"),
+        BenchmarkCase("backtest.run_backtest", _setup_backtest, max_bars=1_000,
+                      description="BacktestEngine.run_backtest end to end (15m + 1h)"),
+        BenchmarkCase("backtest.run_event_backtest", _setup_event_backtest, max_bars=50_000,
+                      description="BacktestEngine.run_event_backtest end to end (15m + 1h)"),
+        BenchmarkCase("backtest.walk_forward", _setup_walk_forward, max_bars=50_000,
+                      description="WalkForwardOptimizer, 16-combination grid over 3 folds"),
+        BenchmarkCase("analytics.monte_carlo", _setup_monte_carlo, max_bars=1_000,
+                      description="monte_carlo.simulate, 100k bootstrap paths (n = trades per path)"),
+        BenchmarkCase("volume_profile.calculate", _setup_volume_profile, max_bars=100_000,
+                      description="VolumeProfileAnalyzer.calculate_volume_profile"),
+        BenchmarkCase("ml.extract_features", _setup_ml_features, max_bars=1_000_000,
+                      description=f"MLPredictor.extract_features on the last {LIVE_WINDOW_BARS} bars"),
+        BenchmarkCase("ml.training_set", _setup_ml_training_set, max_bars=500,
+                      description="MLTrainingPipeline feature extraction + labels"),
+        BenchmarkCase("portfolio.correlation_matrix", _setup_correlation_matrix, max_bars=1_000_000,
+                      description="PortfolioManager.build_correlation_matrix for 10 symbols"),
+        BenchmarkCase("portfolio.backtest", _setup_portfolio_backtest, max_bars=1_000,
+                      description="PortfolioBacktestEngine.run over 30 symbols (n = 15m bars per symbol)"),
+        BenchmarkCase("memory.symbol_buffers", _setup_symbol_buffers, max_bars=50, track_memory=True,
+                      description=f"DataManager buffers, 4 timeframes x {LIVE_WINDOW_BARS} candles (n = symbols)"),
+    ]
+}
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+def time_callable(func: Callable[[], Any], repeats: int = 3, warmup: int = 1) -> List[float]:
+    """Time a zero-argument callable.
+
+    Args:
+        func: Callable to time
+        repeats: Number of timed runs
+        warmup: Number of untimed runs first
+
+    Returns:
+        List of run durations in seconds
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_memory(func: Callable[[], Any]) -> int:
+    """Measure the memory retained by a callable's return value.
+
+    Args:
+        func: Zero-argument callable returning the object to measure
+
+    Returns:
+        Bytes allocated during the call that are still held once it returns
+    """
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return retained
+
+
+def select_benchmarks(patterns: Optional[Iterable[str]] = None) -> List[BenchmarkCase]:
+    """Select benchmarks by name prefix.
+
+    Args:
+        patterns: Name prefixes (e.g. ["indicators", "backtest.run_backtest"]); None selects all
+
+    Returns:
+        Matching benchmark cases in registry order
+    """
+    if not patterns:
+        return list(BENCHMARKS.values())
+    patterns = list(patterns)
+    return [
+        case for name, case in BENCHMARKS.items()
+        if any(name == p or name.startswith(p.rstrip(".") + ".") for p in patterns)
+    ]
+
+
+def run_benchmark(case: BenchmarkCase, n_bars: int, repeats: int = 3, seed: int = 42) -> BenchmarkResult:
+    """Run one benchmark at one size.
+
+    Args:
+        case: Benchmark to run
+        n_bars: Number of synthetic bars
+        repeats: Number of timed runs
+        seed: Synthetic data seed
+
+    Returns:
+        BenchmarkResult (with error set if setup or a run raised)
+    """
+    try:
+        setup_start = time.perf_counter()
+        func = case.setup(n_bars, seed)
+        setup_s = time.perf_counter() - setup_start
+        warmup = 1 if repeats > 1 else 0
+        timings = time_callable(func, repeats=repeats, warmup=warmup)
+        memory_bytes = measure_memory(func) if case.track_memory else None
+    except Exception as e:
+        logger.error(f"Benchmark {case.name}@{n_bars} failed: {e}")
+        return BenchmarkResult(case.name, n_bars, repeats, 0.0, 0.0, 0.0, error=str(e))
+
+    return BenchmarkResult(
+        name=case.name,
+        n_bars=n_bars,
+        repeats=repeats,
+        best_s=min(timings),
+        median_s=statistics.median(timings),
+        mean_s=statistics.fmean(timings),
+        setup_s=setup_s,
+        memory_bytes=memory_bytes,
+    )
+
+
+def run_suite(
+    names: Optional[Iterable[str]] = None,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeats: int = 3,
+    seed: int = 42,
+    progress: Optional[Callable[[BenchmarkResult], None]] = None
+) -> Dict[str, Any]:
+    """Run the benchmark suite.
+
+    Args:
+        names: Benchmark name prefixes to run (None = all)
+        sizes: Bar counts to run each benchmark at (clamped to each case's max_bars)
+        repeats: Timed runs per benchmark
+        seed: Synthetic data seed
+        progress: Optional callback invoked after each result
+
+    Returns:
+        Report dictionary (see save_report)
+    """
+    previous_disable = logging.root.manager.disable
+    _silence_loggers()
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for case in select_benchmarks(names):
+            case_sizes = sorted({min(n_bars, case.max_bars) for n_bars in sizes})
+            for n_bars in case_sizes:
+                result = run_benchmark(case, n_bars, repeats=repeats, seed=seed)
+                results[result.key] = asdict(result)
+                if progress is not None:
+                    progress(result)
+    finally:
+        logging.disable(previous_disable)
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "machine": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "seed": seed,
+        "repeats": repeats,
+        "sizes": list(sizes),
+        "results": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    """Write a report to JSON.
+
+    Args:
+        report: Report from run_suite
+        path: Output path (parent directories are created)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Load a report written by save_report."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "median_s"
+) -> List[Comparison]:
+    """Compare two reports benchmark by benchmark.
+
+    A benchmark regresses when current / baseline > 1 + threshold and improves
+    when current / baseline < 1 / (1 + threshold).
+
+    Args:
+        baseline: Baseline report
+        current: Current report
+        threshold: Relative slowdown tolerated before flagging a regression
+        metric: Result field to compare ("median_s", "best_s" or
+            "memory_bytes"; benchmarks without the field are skipped)
+
+    Returns:
+        List of Comparison entries sorted by key
+    """
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    comparisons = []
+
+    for key in sorted(set(base_results) | set(current_results)):
+        base = base_results.get(key)
+        cur = current_results.get(key)
+        if all(r is None or (r.get(metric) is None and not r.get("error")) for r in (base, cur)):
+            continue  # Benchmark does not record this metric
+
+        if base is None:
+            comparisons.append(Comparison(key, None, cur.get(metric), None, "NEW"))
+            continue
+        if cur is None:
+            comparisons.append(Comparison(key, base.get(metric), None, None, "MISSING"))
+            continue
+        if base.get("error") or cur.get("error"):
+            comparisons.append(Comparison(key, base.get(metric), cur.get(metric), None, "ERROR"))
+            continue
+
+        base_s = base[metric]
+        cur_s = cur[metric]
+        ratio = cur_s / base_s if base_s > 0 else float("inf") if cur_s > 0 else 1.0
+        if ratio > 1.0 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1.0 / (1.0 + threshold):
+            status = "IMPROVED"
+        else:
+            status = "OK"
+        comparisons.append(Comparison(key, base_s, cur_s, ratio, status))
+
+    return comparisons
+
+
+def has_regressions(comparisons: Iterable[Comparison]) -> bool:
+    """Check whether any comparison is a regression or a new error."""
+    return any(c.status in ("REGRESSION", "ERROR") for c in comparisons)
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def _format_bytes(n_bytes: Optional[float]) -> str:
+    if n_bytes is None:
+        return "-"
+    if n_bytes < 1024:
+        return f"{n_bytes:.0f}B"
+    if n_bytes < 1024 ** 2:
+        return f"{n_bytes / 1024:.1f}KB"
+    return f"{n_bytes / 1024 ** 2:.2f}MB"
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Format a report as a fixed-width table.
+
+    Memory benchmarks add the retained memory and memory per unit of n
+    (e.g. bytes per symbol).
+    """
+    lines = [f"{'Benchmark':<40} {'Best':>12} {'Median':>12} {'Setup':>12} {'Memory':>12} {'Memory/n':>12}"]
+    lines.append("-" * len(lines[0]))
+    for key, result in report.get("results", {}).items():
+        if result.get("error"):
+            lines.append(f"{key:<40} ERROR: {result['error']}")
+            continue
+        memory = result.get("memory_bytes")
+        per_n = memory / result["n_bars"] if memory is not None and result["n_bars"] else None
+        lines.append(
+            f"{key:<40} {_format_seconds(result['best_s']):>12} "
+            f"{_format_seconds(result['median_s']):>12} {_format_seconds(result.get('setup_s')):>12} "
+            f"{_format_bytes(memory):>12} {_format_bytes(per_n):>12}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(comparisons: Iterable[Comparison], metric: str = "median_s") -> str:
+    """Format comparisons as a fixed-width table."""
+    format_value = _format_bytes if metric == "memory_bytes" else _format_seconds
+    lines = [f"{'Benchmark':<40} {'Baseline':>12} {'Current':>12} {'Ratio':>8}  Status"]
+    lines.append("-" * len(lines[0]))
+    for c in comparisons:
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "-"
+        lines.append(
+            f"{c.key:<40} {format_value(c.baseline_s):>12} {format_value(c.current_s):>12} "
+            f"{ratio:>8}  {c.status}"
+        )
+    return "\n".join(lines)
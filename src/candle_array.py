@@ -0,0 +1,155 @@
+"""Structured NumPy candle arrays shared by the bot, backtests and dashboard.
+
+Candle histories are held as structured arrays (CANDLE_DTYPE) wherever they
+are processed in bulk: the candle store, state snapshots, backtests,
+vectorized signals, resampling and data maintenance. This module holds the
+array layout, conversion to and from Candle objects, timeframe parsing and
+OHLCV aggregation so they have a single implementation.
+"""
+
+from typing import Any, Iterable, List
+
+import numpy as np
+
+from src.models import Candle
+
+
+CANDLE_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+WEEK_MS = 7 * 24 * 60 * 60 * 1000
+# The Unix epoch is a Thursday; the first Monday 00:00 UTC is 4 days later
+MONDAY_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Convert a timeframe such as "5m", "1h" or "1d" to milliseconds.
+
+    Raises:
+        ValueError: If the timeframe is not recognized
+    """
+    try:
+        value = int(timeframe[:-1])
+        if value > 0:
+            return value * _UNIT_MS[timeframe[-1]]
+    except (KeyError, ValueError, IndexError, TypeError):
+        pass
+    raise ValueError(f"Unsupported timeframe '{timeframe}'")
+
+
+def candles_to_array(candles: Iterable[Any]) -> np.ndarray:
+    """Convert Candle objects or candle dictionaries to a structured array.
+
+    Args:
+        candles: Iterable of Candle objects or dicts with OHLCV keys
+
+    Returns:
+        Structured array with CANDLE_DTYPE, in input order
+    """
+    candles = list(candles)
+    if not candles:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    if isinstance(candles[0], dict):
+        rows = [
+            (c["timestamp"], c["open"], c["high"], c["low"], c["close"], c.get("volume", 0.0))
+            for c in candles
+        ]
+    else:
+        rows = [
+            (c.timestamp, c.open, c.high, c.low, c.close, c.volume)
+            for c in candles
+        ]
+    return np.array(rows, dtype=CANDLE_DTYPE)
+
+
+def to_candles(candles: np.ndarray) -> List[Candle]:
+    """Convert a structured candle array into Candle objects.
+
+    Args:
+        candles: Structured array with CANDLE_DTYPE fields
+
+    Returns:
+        List of Candle objects
+    """
+    return [
+        Candle(timestamp=int(ts), open=float(o), high=float(h), low=float(l), close=float(c), volume=float(v))
+        for ts, o, h, l, c, v in zip(
+            candles["timestamp"].tolist(),
+            candles["open"].tolist(),
+            candles["high"].tolist(),
+            candles["low"].tolist(),
+            candles["close"].tolist(),
+            candles["volume"].tolist(),
+        )
+    ]
+
+
+def merge_candle_arrays(*arrays: np.ndarray) -> np.ndarray:
+    """Merge candle arrays into one sorted array without duplicate timestamps.
+
+    When the same open time appears more than once, the candle from the
+    later argument wins, so newer sources should be passed last.
+
+    Args:
+        *arrays: Structured candle arrays
+
+    Returns:
+        Merged structured array sorted by timestamp
+    """
+    parts = [a for a in arrays if a is not None and len(a) > 0]
+    if not parts:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    merged = np.concatenate([np.asarray(a, dtype=CANDLE_DTYPE) for a in parts])
+    order = np.lexsort((np.arange(len(merged)), merged["timestamp"]))
+    merged = merged[order]
+
+    ts = merged["timestamp"]
+    keep_last = np.append(ts[1:] != ts[:-1], True)
+    return merged[keep_last]
+
+
+def aggregate_ohlcv(candles: np.ndarray, timeframe: str) -> np.ndarray:
+    """Aggregate bars into a higher timeframe aligned to epoch boundaries.
+
+    Args:
+        candles: Structured candle array sorted by timestamp
+        timeframe: Target timeframe
+
+    Returns:
+        Structured array with one bar per target interval
+    """
+    if len(candles) == 0:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    interval_ms = timeframe_to_ms(timeframe)
+    buckets = candles["timestamp"] // interval_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(candles)] - 1
+
+    result = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    result["timestamp"] = buckets[starts] * interval_ms
+    result["open"] = candles["open"][starts]
+    result["high"] = np.maximum.reduceat(candles["high"], starts)
+    result["low"] = np.minimum.reduceat(candles["low"], starts)
+    result["close"] = candles["close"][ends]
+
+    # Volumes are summed left to right, one bar position at a time across
+    # all buckets, so the totals are bit-identical to a running sum (as kept
+    # by the incremental resampler); np.add.reduceat may add in another order
+    lengths = ends - starts + 1
+    volume = candles["volume"][starts].copy()
+    for position in range(1, int(lengths.max())):
+        longer = lengths > position
+        volume[longer] += candles["volume"][starts[longer] + position]
+    result["volume"] = volume
+    return result
@@ -0,0 +1,248 @@
+"""Bounded candle buffer keyed by open time.
+
+Replaces the ``deque(maxlen=500)`` buffers of DataManager. Every open time is
+held at most once: a candle for an open time already in the buffer replaces
+the stored one (the in-progress bar updating, or a re-fetched range), so
+repeated REST fetches and WebSocket updates no longer fill the buffer with
+copies of the same candles.
+
+Candles are kept sorted by open time in two parallel lists (open times and
+candles), so point and range lookups are a ``bisect``. Updating or appending
+the newest bar is O(1); the oldest candles beyond ``maxlen`` are dropped by
+advancing a head offset and the lists are compacted once that offset reaches
+the number of live candles, which keeps trimming amortized O(1) as well.
+
+The buffer is written by the WebSocket thread and read by the trading loop,
+so every operation takes an internal lock and reads return copies.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Union
+
+from src.models import Candle
+
+
+# Default number of candles kept per symbol/timeframe
+DEFAULT_MAXLEN = 500
+
+# Dropped entries tolerated before the lists are compacted
+_MIN_COMPACT = 64
+
+
+class CandleBuffer:
+    """Sorted, deduplicated, bounded sequence of candles.
+
+    Supports the deque operations DataManager callers rely on (len, indexing,
+    iteration, append, extend, pop, popleft, clear, maxlen) with
+    upsert-by-open-time semantics for append and extend.
+    """
+
+    def __init__(self, candles: Iterable[Candle] = (), maxlen: Optional[int] = DEFAULT_MAXLEN):
+        """Initialize the buffer.
+
+        Args:
+            candles: Initial candles in any order (duplicates: the last wins)
+            maxlen: Maximum number of candles kept (None for unbounded); the
+                oldest open times are dropped first
+        """
+        self._maxlen = maxlen
+        self._times: List[int] = []
+        self._candles: List[Candle] = []
+        self._head = 0  # Index of the oldest live entry in the lists
+        self._lock = threading.RLock()
+        self.extend(candles)
+
+    @property
+    def maxlen(self) -> Optional[int]:
+        """Maximum number of candles kept."""
+        return self._maxlen
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._times) - self._head
+
+    def __iter__(self) -> Iterator[Candle]:
+        return iter(self.to_list())
+
+    def __getitem__(self, index: Union[int, slice]):
+        with self._lock:
+            if isinstance(index, slice):
+                return self._candles[self._head:][index]
+            size = len(self._candles) - self._head
+            if index < 0:
+                index += size
+            if not 0 <= index < size:
+                raise IndexError("CandleBuffer index out of range")
+            return self._candles[self._head + index]
+
+    def __repr__(self) -> str:
+        return f"CandleBuffer(len={len(self)}, maxlen={self._maxlen})"
+
+    def to_list(self) -> List[Candle]:
+        """Get all candles, oldest first."""
+        with self._lock:
+            return self._candles[self._head:]
+
+    def timestamps(self) -> List[int]:
+        """Get all open times, oldest first."""
+        with self._lock:
+            return self._times[self._head:]
+
+    def latest(self, count: int) -> List[Candle]:
+        """Get the newest ``count`` candles, oldest first."""
+        if count <= 0:
+            return []
+        with self._lock:
+            return self._candles[max(self._head, len(self._candles) - count):]
+
+    def _trim(self) -> None:
+        """Drop the oldest candles beyond maxlen and compact (lock held)."""
+        size = len(self._times) - self._head
+        if self._maxlen is not None and size > self._maxlen:
+            self._head += size - self._maxlen
+            size = self._maxlen
+        if self._head >= max(size, _MIN_COMPACT):
+            del self._times[:self._head]
+            del self._candles[:self._head]
+            self._head = 0
+
+    def upsert(self, candle: Candle) -> bool:
+        """Insert a candle, replacing any candle with the same open time.
+
+        Args:
+            candle: Candle to store
+
+        Returns:
+            True if a new open time was added, False if a candle was replaced
+            (or the candle is older than a full buffer holds)
+        """
+        timestamp = candle.timestamp
+        with self._lock:
+            times = self._times
+            if len(times) == self._head or timestamp > times[-1]:
+                times.append(timestamp)
+                self._candles.append(candle)
+                self._trim()
+                return True
+            if timestamp == times[-1]:
+                self._candles[-1] = candle
+                return False
+
+            index = bisect_left(times, timestamp, self._head)
+            if times[index] == timestamp:
+                self._candles[index] = candle
+                return False
+            if self._maxlen is not None and len(self) >= self._maxlen and index == self._head:
+                return False  # Older than everything a full buffer keeps
+            times.insert(index, timestamp)
+            self._candles.insert(index, candle)
+            self._trim()
+            return True
+
+    # deque-compatible name; appending the same open time updates the bar
+    append = upsert
+
+    def extend(self, candles: Iterable[Candle]) -> None:
+        """Merge candles into the buffer (the given candles win on equal open times).
+
+        Args:
+            candles: Candles in any order
+        """
+        candles = list(candles)
+        if not candles:
+            return
+        with self._lock:
+            if all(a.timestamp < b.timestamp for a, b in zip(candles, candles[1:])) and (
+                    len(self) == 0 or candles[0].timestamp > self._times[-1]):
+                # Common case: a sorted range newer than anything held
+                self._times.extend(candle.timestamp for candle in candles)
+                self._candles.extend(candles)
+            else:
+                merged = dict(zip(self._times[self._head:], self._candles[self._head:]))
+                for candle in candles:
+                    merged[candle.timestamp] = candle
+                self._times = sorted(merged)
+                self._candles = [merged[timestamp] for timestamp in self._times]
+                self._head = 0
+            self._trim()
+
+    def get(self, timestamp: int) -> Optional[Candle]:
+        """Get the candle opened at exactly ``timestamp``, or None."""
+        with self._lock:
+            index = bisect_left(self._times, timestamp, self._head)
+            if index < len(self._times) and self._times[index] == timestamp:
+                return self._candles[index]
+            return None
+
+    def floor(self, timestamp: int) -> Optional[Candle]:
+        """Get the newest candle opened at or before ``timestamp``, or None."""
+        with self._lock:
+            index = bisect_right(self._times, timestamp, self._head) - 1
+            return self._candles[index] if index >= self._head else None
+
+    def nearest(self, timestamp: int) -> Optional[Candle]:
+        """Get the candle whose open time is closest to ``timestamp``.
+
+        Ties go to the older candle. Returns None if the buffer is empty.
+        """
+        with self._lock:
+            times = self._times
+            index = bisect_left(times, timestamp, self._head)
+            if index == len(times):
+                return self._candles[-1] if index > self._head else None
+            if index == self._head:
+                return self._candles[index]
+            if timestamp - times[index - 1] <= times[index] - timestamp:
+                return self._candles[index - 1]
+            return self._candles[index]
+
+    def range(self, start_time: Optional[int] = None, end_time: Optional[int] = None) -> List[Candle]:
+        """Get candles opened within an inclusive time range, oldest first.
+
+        Args:
+            start_time: Inclusive start in milliseconds (None for no bound)
+            end_time: Inclusive end in milliseconds (None for no bound)
+        """
+        with self._lock:
+            lo = self._head if start_time is None else bisect_left(self._times, start_time, self._head)
+            hi = len(self._times) if end_time is None else bisect_right(self._times, end_time, self._head)
+            return self._candles[lo:hi]
+
+    def drop_before(self, timestamp: int) -> int:
+        """Remove candles opened before ``timestamp``.
+
+        Returns:
+            Number of candles removed
+        """
+        with self._lock:
+            index = bisect_left(self._times, timestamp, self._head)
+            removed = index - self._head
+            self._head = index
+            self._trim()
+            return removed
+
+    def pop(self) -> Candle:
+        """Remove and return the newest candle (IndexError if empty)."""
+        with self._lock:
+            if len(self) == 0:
+                raise IndexError("pop from an empty CandleBuffer")
+            self._times.pop()
+            return self._candles.pop()
+
+    def popleft(self) -> Candle:
+        """Remove and return the oldest candle (IndexError if empty)."""
+        with self._lock:
+            if len(self) == 0:
+                raise IndexError("pop from an empty CandleBuffer")
+            candle = self._candles[self._head]
+            self._head += 1
+            self._trim()
+            return candle
+
+    def clear(self) -> None:
+        """Remove all candles."""
+        with self._lock:
+            self._times = []
+            self._candles = []
+            self._head = 0
@@ -0,0 +1,611 @@
+"""Chart data service for the Streamlit chart page.
+
+This module serves candle data for charting as NumPy arrays:
+- CandleStore: on-disk candle history (a memory-mapped .npy file plus a
+  small append-only tail file per symbol/timeframe) written by the bot and
+  read by the dashboard
+- OHLC-preserving downsampling (first/max/min/last per bucket) so the payload
+  is bounded by the chart's pixel width regardless of the requested range
+- Precomputed overlays (weekly anchored VWAP, ATR bands, position markers)
+  calculated at full resolution before downsampling
+"""
+
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.candle_array import (
+    CANDLE_DTYPE, MONDAY_OFFSET_MS, WEEK_MS, candles_to_array, merge_candle_arrays
+)
+from src.performance_analytics import to_milliseconds
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_POINTS = 1200
+
+# Rows appended to a tail file before it is folded into the .npy file
+DEFAULT_COMPACT_ROWS = 2048
+
+
+def slice_time_range(
+    candles: np.ndarray,
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None
+) -> np.ndarray:
+    """Select candles with start_time <= timestamp <= end_time.
+
+    Args:
+        candles: Structured candle array sorted by timestamp
+        start_time: Inclusive start in milliseconds (None for no bound)
+        end_time: Inclusive end in milliseconds (None for no bound)
+
+    Returns:
+        View of the selected candles
+    """
+    ts = candles["timestamp"]
+    lo = 0 if start_time is None else int(np.searchsorted(ts, start_time, side="left"))
+    hi = len(candles) if end_time is None else int(np.searchsorted(ts, end_time, side="right"))
+    return candles[lo:hi]
+
+
+def bucket_starts(n: int, max_points: int) -> np.ndarray:
+    """Compute bucket start indices that split n points into <= max_points buckets.
+
+    Args:
+        n: Number of points
+        max_points: Maximum number of buckets
+
+    Returns:
+        Array of bucket start indices
+    """
+    if n <= max_points:
+        return np.arange(n)
+    bucket_size = math.ceil(n / max_points)
+    return np.arange(0, n, bucket_size)
+
+
+def downsample_ohlc(candles: np.ndarray, max_points: int) -> np.ndarray:
+    """Downsample candles while preserving the OHLC envelope.
+
+    Each bucket keeps the first open, the highest high, the lowest low, the
+    last close and the summed volume, stamped with the bucket's first open
+    time. No price extreme is lost no matter how far the series is reduced.
+
+    Args:
+        candles: Structured candle array sorted by timestamp
+        max_points: Maximum number of candles to return
+
+    Returns:
+        Structured candle array with at most max_points rows
+    """
+    n = len(candles)
+    if max_points < 1:
+        raise ValueError(f"max_points must be at least 1, got {max_points}")
+    if n <= max_points:
+        return candles
+
+    starts = bucket_starts(n, max_points)
+    ends = np.append(starts[1:], n) - 1
+
+    out = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    out["timestamp"] = candles["timestamp"][starts]
+    out["open"] = candles["open"][starts]
+    out["high"] = np.maximum.reduceat(candles["high"], starts)
+    out["low"] = np.minimum.reduceat(candles["low"], starts)
+    out["close"] = candles["close"][ends]
+    out["volume"] = np.add.reduceat(candles["volume"], starts)
+    return out
+
+
+def calculate_vwap_series(candles: np.ndarray) -> np.ndarray:
+    """Calculate VWAP for every candle, anchored to Monday 00:00 UTC each week.
+
+    Uses the same anchor as StrategyEngine so the overlay matches the value
+    the strategy trades on.
+
+    Args:
+        candles: Structured candle array sorted by timestamp
+
+    Returns:
+        Array of VWAP values (NaN where cumulative volume is zero)
+    """
+    n = len(candles)
+    if n == 0:
+        return np.empty(0)
+
+    typical = (candles["high"] + candles["low"] + candles["close"]) / 3.0
+    volume = candles["volume"]
+    week_id = (candles["timestamp"] - MONDAY_OFFSET_MS) // WEEK_MS
+
+    cum_tpv = _grouped_cumsum(typical * volume, week_id)
+    cum_vol = _grouped_cumsum(volume, week_id)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(cum_vol > 0, cum_tpv / cum_vol, np.nan)
+    return vwap
+
+
+def calculate_atr_series(candles: np.ndarray, period: int = 14) -> np.ndarray:
+    """Calculate ATR for every candle.
+
+    Matches IndicatorCalculator.calculate_atr: true ranges start at the
+    second candle, the first ATR is the simple average of the first
+    ``period`` true ranges, then an EMA with multiplier 2 / (period + 1).
+
+    Args:
+        candles: Structured candle array sorted by timestamp
+        period: ATR lookback period
+
+    Returns:
+        Array of ATR values (NaN until enough data is available)
+    """
+    n = len(candles)
+    atr = np.full(n, np.nan)
+    if n < period + 1:
+        return atr
+
+    high = candles["high"]
+    low = candles["low"]
+    prev_close = candles["close"][:-1]
+    true_range = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - prev_close),
+        np.abs(low[1:] - prev_close),
+    ])
+
+    # true_range[k] belongs to candle k + 1, so the seed lands on candle `period`
+    values = true_range[period - 1:].copy()
+    values[0] = true_range[:period].mean()
+    ema = pd.Series(values).ewm(alpha=2.0 / (period + 1), adjust=False).mean().to_numpy()
+    atr[period:] = ema
+    return atr
+
+
+def _grouped_cumsum(values: np.ndarray, group_ids: np.ndarray) -> np.ndarray:
+    """Cumulative sum that restarts whenever group_ids changes."""
+    cumsum = np.cumsum(values)
+    group_start = np.flatnonzero(np.append(True, group_ids[1:] != group_ids[:-1]))
+    offsets = np.where(group_start > 0, cumsum[group_start - 1], 0.0)
+    run_lengths = np.diff(np.append(group_start, len(values)))
+    return cumsum - np.repeat(offsets, run_lengths)
+
+
+@dataclass
+class ChartData:
+    """Downsampled candles and overlays ready for plotting.
+
+    Attributes:
+        symbol: Trading symbol
+        timeframe: Candle timeframe
+        candles: Downsampled structured candle array
+        vwap: VWAP value per downsampled candle (last value in bucket)
+        atr_upper: Upper ATR band per downsampled candle (bucket maximum)
+        atr_lower: Lower ATR band per downsampled candle (bucket minimum)
+        markers: Position markers with time (ms), price, side and symbol
+        source_points: Number of candles before downsampling
+    """
+    symbol: str
+    timeframe: str
+    candles: np.ndarray
+    vwap: np.ndarray
+    atr_upper: np.ndarray
+    atr_lower: np.ndarray
+    markers: List[Dict] = field(default_factory=list)
+    source_points: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        """True if there are no candles to plot."""
+        return len(self.candles) == 0
+
+    @property
+    def datetimes(self) -> np.ndarray:
+        """Candle open times as datetime64[ms] for plotting."""
+        return self.candles["timestamp"].astype("datetime64[ms]")
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable payload."""
+        def _clean(arr: np.ndarray) -> List[Optional[float]]:
+            return [None if np.isnan(v) else float(v) for v in arr]
+
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "timestamp": self.candles["timestamp"].tolist(),
+            "open": self.candles["open"].tolist(),
+            "high": self.candles["high"].tolist(),
+            "low": self.candles["low"].tolist(),
+            "close": self.candles["close"].tolist(),
+            "volume": self.candles["volume"].tolist(),
+            "vwap": _clean(self.vwap),
+            "atr_upper": _clean(self.atr_upper),
+            "atr_lower": _clean(self.atr_lower),
+            "markers": self.markers,
+            "source_points": self.source_points
+        }
+
+
+class CandleStore:
+    """On-disk candle history per symbol/timeframe.
+
+    Each series is a sorted structured .npy file plus a ``.tail`` file of raw
+    CANDLE_DTYPE rows. Appends only write the new rows to the tail, so a
+    closed candle costs one small write however long the history is. Once
+    the tail holds compact_rows rows it is folded into the .npy file, which
+    is atomically replaced. Reads memory-map the .npy file (a binary search
+    plus a copy of the requested rows) and merge the tail over it.
+    """
+
+    def __init__(self, directory: str = "data/candles", max_rows: int = 200_000,
+                 compact_rows: int = DEFAULT_COMPACT_ROWS):
+        """Initialize the candle store.
+
+        Args:
+            directory: Directory holding the candle files
+            max_rows: Maximum candles kept per .npy file (oldest are dropped
+                when the tail is compacted); 200k rows is roughly two years
+                of 5m candles
+            compact_rows: Tail rows that trigger a compaction
+        """
+        self.directory = directory
+        self.max_rows = max_rows
+        self.compact_rows = compact_rows
+        # Serializes read-merge-write cycles (the maintenance thread rolls up files)
+        self.lock = threading.RLock()
+
+    def path(self, symbol: str, timeframe: str) -> str:
+        """Get the file path for a symbol/timeframe."""
+        return os.path.join(self.directory, f"{symbol.upper()}_{timeframe}.npy")
+
+    def tail_path(self, symbol: str, timeframe: str) -> str:
+        """Get the path of the append-only tail file of a symbol/timeframe."""
+        return os.path.join(self.directory, f"{symbol.upper()}_{timeframe}.tail")
+
+    def _load_tail(self, symbol: str, timeframe: str) -> np.ndarray:
+        """Read the tail rows, sorted and deduplicated (a partly written last row is ignored)."""
+        try:
+            with open(self.tail_path(symbol, timeframe), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        rows = len(data) // CANDLE_DTYPE.itemsize
+        return merge_candle_arrays(np.frombuffer(data[:rows * CANDLE_DTYPE.itemsize], dtype=CANDLE_DTYPE))
+
+    def load(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> np.ndarray:
+        """Load stored candles for a symbol/timeframe within a time range.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            start_time: Inclusive start in milliseconds (None for no bound)
+            end_time: Inclusive end in milliseconds (None for no bound)
+
+        Returns:
+            Structured candle array (empty if nothing is stored)
+        """
+        path = self.path(symbol, timeframe)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=CANDLE_DTYPE)
+
+        try:
+            mapped = np.load(path, mmap_mode="r")
+            selected = np.array(slice_time_range(mapped, start_time, end_time))
+            del mapped
+            tail = slice_time_range(self._load_tail(symbol, timeframe), start_time, end_time)
+            return merge_candle_arrays(selected, tail) if len(tail) else selected
+        except Exception as e:
+            logger.error(f"Failed to load candle store {path}: {e}")
+            return np.empty(0, dtype=CANDLE_DTYPE)
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Get the open time of the newest stored candle, or None."""
+        path = self.path(symbol, timeframe)
+        if not os.path.exists(path):
+            return None
+        try:
+            mapped = np.load(path, mmap_mode="r")
+            last = int(mapped["timestamp"][-1]) if len(mapped) else None
+            del mapped
+            tail = self._load_tail(symbol, timeframe)
+            if len(tail):
+                last = max(last or 0, int(tail["timestamp"][-1]))
+            return last
+        except Exception as e:
+            logger.error(f"Failed to read candle store {path}: {e}")
+            return None
+
+    def append(self, symbol: str, timeframe: str, candles: Iterable[Any]) -> int:
+        """Add candles to the store.
+
+        The rows are appended to the tail file (the .npy file is only written
+        when the series is new or the tail is due for compaction). Candles
+        with an open time already stored replace the stored ones.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            candles: Candle objects, candle dicts or a structured candle array
+
+        Returns:
+            Number of candles stored for the symbol/timeframe afterwards
+        """
+        new = candles if isinstance(candles, np.ndarray) else candles_to_array(candles)
+        if len(new) == 0:
+            return 0
+
+        with self.lock:
+            path = self.path(symbol, timeframe)
+            if not os.path.exists(path):
+                return self.replace(symbol, timeframe, merge_candle_arrays(new))
+
+            tail_path = self.tail_path(symbol, timeframe)
+            with open(tail_path, "ab") as f:
+                f.write(np.ascontiguousarray(new, dtype=CANDLE_DTYPE).tobytes())
+            if os.path.getsize(tail_path) // CANDLE_DTYPE.itemsize >= self.compact_rows:
+                return self.compact(symbol, timeframe)
+            return self._count(symbol, timeframe)
+
+    def _count(self, symbol: str, timeframe: str) -> int:
+        """Number of stored candles: .npy rows plus tail open times not in them."""
+        mapped = np.load(self.path(symbol, timeframe), mmap_mode="r")
+        stored = mapped["timestamp"]
+        tail = self._load_tail(symbol, timeframe)["timestamp"]
+        index = np.minimum(np.searchsorted(stored, tail), max(len(stored) - 1, 0))
+        present = (stored[index] == tail) if len(stored) else np.zeros(len(tail), dtype=bool)
+        count = len(stored) + int(np.count_nonzero(~present))
+        del mapped
+        return count
+
+    def compact(self, symbol: str, timeframe: str) -> int:
+        """Fold the tail file into the .npy file.
+
+        Returns:
+            Number of candles stored (at most max_rows, newest kept)
+        """
+        with self.lock:
+            return self.replace(symbol, timeframe, self.load(symbol, timeframe))
+
+    def replace(self, symbol: str, timeframe: str, candles: np.ndarray) -> int:
+        """Atomically overwrite the stored candles of a symbol/timeframe.
+
+        The tail file is removed after the .npy file is replaced, so readers
+        in between see its rows twice (merged away) rather than not at all.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            candles: Sorted structured candle array
+
+        Returns:
+            Number of candles stored (at most max_rows, newest kept)
+        """
+        if len(candles) > self.max_rows:
+            candles = candles[-self.max_rows:]
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(symbol, timeframe)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, candles)
+        os.replace(tmp_path, path)
+        tail_path = self.tail_path(symbol, timeframe)
+        if os.path.exists(tail_path):
+            os.remove(tail_path)
+        return len(candles)
+
+    def series(self) -> List[Tuple[str, str]]:
+        """List the (symbol, timeframe) pairs that have a candle file."""
+        if not os.path.isdir(self.directory):
+            return []
+        pairs = []
+        for name in sorted(os.listdir(self.directory)):
+            stem, ext = os.path.splitext(name)
+            if ext == ".npy" and "_" in stem:
+                symbol, timeframe = stem.rsplit("_", 1)
+                pairs.append((symbol, timeframe))
+        return pairs
+
+
+class ChartDataService:
+    """Builds downsampled chart payloads from the bot's buffers and candle store."""
+
+    def __init__(
+        self,
+        data_manager: Optional[Any] = None,
+        store: Optional[CandleStore] = None,
+        atr_period: int = 14,
+        atr_multiplier: float = 2.0
+    ):
+        """Initialize the chart data service.
+
+        Args:
+            data_manager: Optional DataManager whose in-memory buffers are read
+                (available when running inside the bot process)
+            store: Optional CandleStore with persisted candle history
+            atr_period: ATR period for the band overlay
+            atr_multiplier: ATR multiple for the band overlay
+        """
+        self.data_manager = data_manager
+        self.store = store
+        self.atr_period = atr_period
+        self.atr_multiplier = atr_multiplier
+
+    def get_candles(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> np.ndarray:
+        """Get full-resolution candles from the store merged with live buffers.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            start_time: Inclusive start in milliseconds (None for no bound)
+            end_time: Inclusive end in milliseconds (None for no bound)
+
+        Returns:
+            Structured candle array sorted by timestamp
+        """
+        stored = np.empty(0, dtype=CANDLE_DTYPE)
+        if self.store is not None:
+            stored = self.store.load(symbol, timeframe, start_time, end_time)
+
+        buffered = np.empty(0, dtype=CANDLE_DTYPE)
+        if self.data_manager is not None:
+            try:
+                buffer = self.data_manager.get_latest_candles(timeframe, 10_000, symbol=symbol)
+                buffered = slice_time_range(
+                    merge_candle_arrays(candles_to_array(buffer)), start_time, end_time
+                )
+            except Exception as e:
+                logger.error(f"Failed to read {symbol} {timeframe} buffer: {e}")
+
+        # Live buffers are newer than the store, so they win on overlap
+        return merge_candle_arrays(stored, buffered)
+
+    def get_chart_data(
+        self,
+        symbol: str,
+        timeframe: str,
+        max_points: int = DEFAULT_MAX_POINTS,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        positions: Optional[List[Dict]] = None
+    ) -> ChartData:
+        """Build a chart payload bounded by max_points.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            max_points: Maximum candles to return (about the chart width in pixels)
+            start_time: Inclusive start in milliseconds (None for no bound)
+            end_time: Inclusive end in milliseconds (None for no bound)
+            positions: Optional position dicts with entry_time, entry_price and side
+
+        Returns:
+            ChartData with downsampled candles and overlays
+        """
+        candles = self.get_candles(symbol, timeframe, start_time, end_time)
+        return self.build_chart_data(symbol, timeframe, candles, max_points, positions)
+
+    def build_chart_data(
+        self,
+        symbol: str,
+        timeframe: str,
+        candles: np.ndarray,
+        max_points: int = DEFAULT_MAX_POINTS,
+        positions: Optional[List[Dict]] = None
+    ) -> ChartData:
+        """Compute overlays at full resolution and downsample everything.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            candles: Full-resolution structured candle array sorted by timestamp
+            max_points: Maximum candles to return
+            positions: Optional position dicts with entry_time, entry_price and side
+
+        Returns:
+            ChartData with downsampled candles and overlays
+        """
+        n = len(candles)
+        if n == 0:
+            empty = np.empty(0)
+            return ChartData(symbol, timeframe, candles, empty, empty, empty, [], 0)
+
+        vwap = calculate_vwap_series(candles)
+        atr = calculate_atr_series(candles, self.atr_period)
+        upper = candles["close"] + self.atr_multiplier * atr
+        lower = candles["close"] - self.atr_multiplier * atr
+
+        starts = bucket_starts(n, max_points)
+        ends = np.append(starts[1:], n) - 1
+        downsampled = downsample_ohlc(candles, max_points)
+
+        if len(starts) < n:
+            # fmax/fmin ignore NaN so partially warmed-up buckets keep their band
+            vwap = vwap[ends]
+            upper = np.fmax.reduceat(upper, starts)
+            lower = np.fmin.reduceat(lower, starts)
+
+        markers = self._build_markers(symbol, candles, positions)
+
+        return ChartData(
+            symbol=symbol,
+            timeframe=timeframe,
+            candles=downsampled,
+            vwap=vwap,
+            atr_upper=upper,
+            atr_lower=lower,
+            markers=markers,
+            source_points=n
+        )
+
+    def _build_markers(
+        self,
+        symbol: str,
+        candles: np.ndarray,
+        positions: Optional[List[Dict]]
+    ) -> List[Dict]:
+        """Build position entry markers that fall inside the charted range."""
+        if not positions:
+            return []
+
+        first_ts = int(candles["timestamp"][0])
+        last_ts = int(candles["timestamp"][-1])
+
+        markers = []
+        for pos in positions:
+            pos_symbol = pos.get("symbol", symbol)
+            if pos_symbol and pos_symbol != symbol:
+                continue
+
+            entry_time = to_milliseconds(pos.get("entry_time", pos.get("timestamp")))
+            entry_price = pos.get("entry_price", 0)
+            if entry_time is None or not entry_price:
+                continue
+            if entry_time < first_ts or entry_time > last_ts:
+                continue
+
+            markers.append({
+                "time": entry_time,
+                "price": float(entry_price),
+                "side": pos.get("side", "LONG"),
+                "symbol": pos_symbol
+            })
+        return markers
+
+
+def timeframe_range(days: float, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Get a [start_time, end_time] millisecond range covering the last N days.
+
+    Args:
+        days: Number of days to cover
+        now: Reference time (defaults to the current time)
+
+    Returns:
+        Dictionary with start_time and end_time in milliseconds
+    """
+    now = now or datetime.now()
+    end_time = int(now.timestamp() * 1000)
+    return {
+        "start_time": end_time - int(days * 24 * 60 * 60 * 1000),
+        "end_time": end_time
+    }
@@ -83,10 +83,11 @@ class Config:
         "4h": 0.4
     })
     min_timeframe_alignment: int = 3  # Minimum aligned timeframes for signal
+    candle_base_timeframe: str = ""  # Stream only this timeframe ("1m"/"5m") and resample the rest ("" = off)
     
     # Volume Profile Parameters
     volume_profile_lookback_days: int = 7
-    volume_profile_update_interval: int = 14400  # seconds (4 hours)
+    volume_profile_update_interval: int = 14400  # seconds of candle time (4 hours)
     volume_profile_bin_size: float = 0.001  # 0.1% price increments
     volume_profile_value_area_pct: float = 0.70  # 70% of volume
     volume_profile_key_level_threshold: float = 0.005  # 0.5% proximity
@@ -143,6 +144,20 @@ class Config:
     data_cleanup_interval_hours: int = 6
     async_volume_profile: bool = True
     cache_indicators: bool = True
+    heartbeat_file: str = "logs/heartbeat.bin"
+    heartbeat_stale_seconds: int = 30  # Heartbeat older than this means the bot is down
+    candle_store_dir: str = "data/candles"  # Persisted candle history for the dashboard chart
+    candle_store_rollup_days: int = 30  # Stored 5m candles older than this are rolled up to 15m
+    enable_instrumentation: bool = False  # Per-stage timers and counters (near-zero cost when off)
+    instrumentation_port: int = 0  # Local text endpoint for metrics (0 = disabled)
+    replay_record_file: str = ""  # Record WebSocket frames here for offline replay ("" = off)
+    state_snapshot_file: str = ""  # Warm-restart snapshot of buffers and positions ("" = off)
+    state_snapshot_interval_seconds: int = 60
+    state_snapshot_max_age_hours: float = 24.0  # Older snapshots are ignored (cold start)
+    enable_user_data_stream: bool = True  # Cache balances, positions and fills from the user data stream
+    order_fill_timeout_seconds: float = 5.0  # Wait this long for a fill event before asking REST
+    exchange_info_file: str = "data/exchange_info.json"  # Persisted symbol filters ("" = fetch every start)
+    exchange_info_refresh_hours: float = 24.0  # Refetch step/tick sizes and minimums this often
     
     # Scaled Take Profit Parameters
     enable_scaled_take_profit: bool = False
@@ -349,6 +364,7 @@ class Config:
         else:
             self._applied_defaults.append(f"timeframe_weights (default: {self.timeframe_weights})")
         self._load_int_param(config_data, "min_timeframe_alignment")
+        self._load_str_param(config_data, "candle_base_timeframe")
         
         # Volume Profile Parameters
         self._load_int_param(config_data, "volume_profile_lookback_days")
@@ -412,6 +428,20 @@ class Config:
         self._load_int_param(config_data, "data_cleanup_interval_hours")
         self._load_bool_param(config_data, "async_volume_profile")
         self._load_bool_param(config_data, "cache_indicators")
+        self._load_str_param(config_data, "heartbeat_file")
+        self._load_int_param(config_data, "heartbeat_stale_seconds")
+        self._load_str_param(config_data, "candle_store_dir")
+        self._load_int_param(config_data, "candle_store_rollup_days")
+        self._load_bool_param(config_data, "enable_instrumentation")
+        self._load_int_param(config_data, "instrumentation_port")
+        self._load_str_param(config_data, "replay_record_file")
+        self._load_str_param(config_data, "state_snapshot_file")
+        self._load_int_param(config_data, "state_snapshot_interval_seconds")
+        self._load_float_param(config_data, "state_snapshot_max_age_hours")
+        self._load_bool_param(config_data, "enable_user_data_stream")
+        self._load_float_param(config_data, "order_fill_timeout_seconds")
+        self._load_str_param(config_data, "exchange_info_file")
+        self._load_float_param(config_data, "exchange_info_refresh_hours")
         
         # Scaled Take Profit Parameters
         self._load_bool_param(config_data, "enable_scaled_take_profit")
@@ -606,6 +636,9 @@ class Config:
         if self.min_timeframe_alignment < 1 or self.min_timeframe_alignment > 4:
             errors.append(f"Invalid min_timeframe_alignment {self.min_timeframe_alignment}. Must be between 1 and 4")
         
+        if self.candle_base_timeframe not in ("", "1m", "5m"):
+            errors.append(f"Invalid candle_base_timeframe '{self.candle_base_timeframe}'. Must be \"\", \"1m\" or \"5m\"")
+        
         # Validate timeframe weights
         if not isinstance(self.timeframe_weights, dict):
             errors.append("timeframe_weights must be a dictionary")
@@ -788,6 +821,27 @@ class Config:
         
         if self.data_cleanup_interval_hours < 1:
             errors.append(f"Invalid data_cleanup_interval_hours {self.data_cleanup_interval_hours}. Must be at least 1")
+        
+        if self.heartbeat_stale_seconds < 1:
+            errors.append(f"Invalid heartbeat_stale_seconds {self.heartbeat_stale_seconds}. Must be at least 1")
+        
+        if self.candle_store_rollup_days < 1:
+            errors.append(f"Invalid candle_store_rollup_days {self.candle_store_rollup_days}. Must be at least 1")
+        
+        if self.instrumentation_port < 0 or self.instrumentation_port > 65535:
+            errors.append(f"Invalid instrumentation_port {self.instrumentation_port}. Must be between 0 and 65535")
+        
+        if self.state_snapshot_interval_seconds < 1:
+            errors.append(f"Invalid state_snapshot_interval_seconds {self.state_snapshot_interval_seconds}. Must be at least 1")
+        
+        if self.state_snapshot_max_age_hours <= 0:
+            errors.append(f"Invalid state_snapshot_max_age_hours {self.state_snapshot_max_age_hours}. Must be positive")
+        
+        if self.order_fill_timeout_seconds <= 0:
+            errors.append(f"Invalid order_fill_timeout_seconds {self.order_fill_timeout_seconds}. Must be positive")
+        
+        if self.exchange_info_refresh_hours <= 0:
+            errors.append(f"Invalid exchange_info_refresh_hours {self.exchange_info_refresh_hours}. Must be positive")
     
     def _validate_scaled_take_profit(self, errors: list) -> None:
         """Validate scaled take profit parameters."""
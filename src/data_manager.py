@@ -1,8 +1,8 @@
 """Data management for historical and real-time market data."""
 
-from typing import List, Optional, Callable
+from dataclasses import asdict
+from typing import Dict, List, Optional, Callable, Tuple
 from datetime import datetime, timedelta
-from collections import deque
 import time
 import logging
 import threading
@@ -11,13 +11,63 @@ from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from binance import ThreadedWebsocketManager
 
+from src.candle_buffer import CandleBuffer
+from src.data_quality import DataQualityMetrics, find_issues, normalize_candles
 from src.models import Candle
 from src.config import Config
 from src.rate_limiter import RateLimiter
+from src.candle_array import timeframe_to_ms
+from src.resampler import CandleResampler, can_resample, resample_candles
+from src import instrumentation
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Klines per warm-restart tail request (Binance allows up to 1500)
+TAIL_FETCH_LIMIT = 1000
+
+# Klines per page when fetching a base timeframe history to resample
+HISTORY_PAGE_LIMIT = 1500
+
+# Timeframes the bot analyzes
+SUPPORTED_TIMEFRAMES = ['5m', '15m', '1h', '4h']
+
+# Kline intervals the bot can request or stream
+BINANCE_INTERVALS = {
+    "1m": Client.KLINE_INTERVAL_1MINUTE,
+    "3m": Client.KLINE_INTERVAL_3MINUTE,
+    "5m": Client.KLINE_INTERVAL_5MINUTE,
+    "15m": Client.KLINE_INTERVAL_15MINUTE,
+    "30m": Client.KLINE_INTERVAL_30MINUTE,
+    "1h": Client.KLINE_INTERVAL_1HOUR,
+    "2h": Client.KLINE_INTERVAL_2HOUR,
+    "4h": Client.KLINE_INTERVAL_4HOUR,
+    "6h": Client.KLINE_INTERVAL_6HOUR,
+    "8h": Client.KLINE_INTERVAL_8HOUR,
+    "12h": Client.KLINE_INTERVAL_12HOUR,
+    "1d": Client.KLINE_INTERVAL_1DAY,
+}
+
+
+def _primary_buffer_view(timeframe: str) -> property:
+    """Property exposing config.symbol's buffer for one timeframe.
+    
+    Args:
+        timeframe: Candle timeframe
+        
+    Returns:
+        Property whose setter replaces the underlying symbol buffer
+    """
+    def get_buffer(self) -> CandleBuffer:
+        return self._get_symbol_buffer(self.config.symbol, timeframe)
+    
+    def set_buffer(self, candles) -> None:
+        if not isinstance(candles, CandleBuffer):
+            candles = CandleBuffer(candles, maxlen=getattr(candles, "maxlen", None) or 500)
+        self._symbol_buffers.setdefault(self.config.symbol, {})[timeframe] = candles
+    
+    return property(get_buffer, set_buffer, doc=f"{timeframe} candles for config.symbol")
+
 
 class DataManager:
     """Manages historical and real-time market data from Binance.
@@ -26,7 +76,7 @@ class DataManager:
     - Fetching historical kline data for backtesting
     - Managing WebSocket connections for real-time data
     - Validating data completeness and detecting gaps
-    - Maintaining circular buffers for memory efficiency
+    - Maintaining bounded candle buffers keyed by open time
     """
     
     def __init__(self, config: Config, client: Optional[Client] = None):
@@ -47,14 +97,11 @@ class DataManager:
         logger.info(f"Rate limiter initialized: {config.api_rate_limit_per_minute} requests/min")
         
         # Multi-symbol support: Store buffers per symbol
-        # Structure: {symbol: {timeframe: deque}}
+        # Structure: {symbol: {timeframe: CandleBuffer}}
         self._symbol_buffers = {}
         
-        # Legacy single-symbol buffers (for backward compatibility)
-        self.candles_5m: deque = deque(maxlen=500)
-        self.candles_15m: deque = deque(maxlen=500)
-        self.candles_1h: deque = deque(maxlen=500)
-        self.candles_4h: deque = deque(maxlen=500)
+        # Legacy single-symbol buffers (candles_5m ... candles_4h) are
+        # properties over the config.symbol entries of _symbol_buffers
         
         # Cache for fetched data to avoid redundant API calls
         # Structure: {symbol: {timeframe: {'data': List[Candle], 'timestamp': float}}}
@@ -74,8 +121,20 @@ class DataManager:
         
         # Callback for candle updates (can be set externally)
         self.on_candle_callback: Optional[Callable[[Candle, str], None]] = None
+        
+        # Optional market_replay.FrameRecorder capturing every kline frame
+        self.frame_recorder = None
+        
+        # Local resampling: when a base timeframe is configured only it is
+        # streamed and fetched, and the coarser timeframes are built from it
+        self.base_timeframe: Optional[str] = config.candle_base_timeframe or None
+        self._resamplers: Dict[str, CandleResampler] = {}
+        self._resampler_lock = threading.Lock()
+        
+        # Gaps, duplicates and refetches found per (symbol, timeframe)
+        self._data_quality: Dict[Tuple[str, str], DataQualityMetrics] = {}
     
-    def _get_symbol_buffer(self, symbol: str, timeframe: str) -> deque:
+    def _get_symbol_buffer(self, symbol: str, timeframe: str) -> CandleBuffer:
         """Get or create buffer for a specific symbol and timeframe.
         
         Args:
@@ -83,16 +142,23 @@ class DataManager:
             timeframe: Timeframe (e.g., "15m")
             
         Returns:
-            Deque buffer for the symbol/timeframe combination
+            CandleBuffer for the symbol/timeframe combination
         """
         if symbol not in self._symbol_buffers:
             self._symbol_buffers[symbol] = {}
         
         if timeframe not in self._symbol_buffers[symbol]:
-            self._symbol_buffers[symbol][timeframe] = deque(maxlen=500)
+            self._symbol_buffers[symbol][timeframe] = CandleBuffer(maxlen=500)
         
         return self._symbol_buffers[symbol][timeframe]
     
+    # Legacy single-symbol buffers, kept as views so existing callers see
+    # config.symbol's candles without a second copy of every candle
+    candles_5m = _primary_buffer_view("5m")
+    candles_15m = _primary_buffer_view("15m")
+    candles_1h = _primary_buffer_view("1h")
+    candles_4h = _primary_buffer_view("4h")
+    
     def fetch_historical_data(self, days: int = 90, timeframe: str = "15m", use_cache: bool = True, symbol: Optional[str] = None) -> List[Candle]:
         """Fetch historical kline data from Binance.
         
@@ -118,7 +184,10 @@ class DataManager:
         # Check cache if enabled
         if use_cache and self._is_cache_valid(fetch_symbol, timeframe):
             logger.debug(f"Using cached data for {fetch_symbol} {timeframe}")
+            instrumentation.increment("cache.historical_data.hit", symbol=fetch_symbol)
             return self._data_cache[fetch_symbol][timeframe]['data']
+        if use_cache:
+            instrumentation.increment("cache.historical_data.miss", symbol=fetch_symbol)
         
         # Calculate start time
         end_time = datetime.now()
@@ -137,12 +206,14 @@ class DataManager:
             logger.debug(f"Fetching historical data: {fetch_symbol} {timeframe} ({days} days)")
             
             # Use futures_klines for Futures API
-            klines = self.client.futures_klines(
-                symbol=fetch_symbol,
-                interval=self._convert_timeframe_to_binance_interval(timeframe),
-                startTime=start_ms,
-                endTime=end_ms
-            )
+            instrumentation.increment("rest.futures_klines", symbol=fetch_symbol)
+            with instrumentation.timer("rest.futures_klines", symbol=fetch_symbol):
+                klines = self.client.futures_klines(
+                    symbol=fetch_symbol,
+                    interval=self._convert_timeframe_to_binance_interval(timeframe),
+                    startTime=start_ms,
+                    endTime=end_ms
+                )
             
             logger.debug(f"Received {len(klines)} klines for {fetch_symbol} {timeframe}")
             
@@ -164,29 +235,395 @@ class DataManager:
             )
             candles.append(candle)
         
-        # Validate data completeness
+        # Refetch just the missing ranges, then require a complete history
+        candles = self.repair_candles(fetch_symbol, timeframe, candles)
         self._validate_data_completeness(candles, timeframe)
         
-        # Store in symbol-specific buffer
+        # Merge into the symbol-specific buffer (re-fetched candles replace
+        # the buffered copies instead of being appended again)
         buffer = self._get_symbol_buffer(fetch_symbol, timeframe)
         buffer.extend(candles)
         
-        # Also store in legacy buffers if this is the primary symbol
-        if fetch_symbol == self.config.symbol:
-            if timeframe == "5m":
-                self.candles_5m.extend(candles)
-            elif timeframe == "15m":
-                self.candles_15m.extend(candles)
-            elif timeframe == "1h":
-                self.candles_1h.extend(candles)
-            elif timeframe == "4h":
-                self.candles_4h.extend(candles)
-        
         # Update cache
         self._update_cache(fetch_symbol, timeframe, candles)
         
         return candles
     
+    def load_buffer(self, symbol: str, timeframe: str, candles: List[Candle]) -> None:
+        """Replace a symbol/timeframe buffer with previously saved candles.
+        
+        Used on warm restart to restore buffers from a state snapshot before
+        fetching only the candles that closed while the bot was down.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            candles: Candles sorted by open time, one per open time
+        """
+        buffer = self._get_symbol_buffer(symbol, timeframe)
+        buffer.clear()
+        buffer.extend(candles)
+    
+    def fetch_tail(self, symbol: str, timeframe: str) -> int:
+        """Fetch the candles missing from the end of a restored buffer.
+        
+        Requests klines from the open time of the newest buffered candle
+        (which may have been in progress when it was saved) and replaces
+        everything from that open time on. If the buffer is empty or the gap
+        is longer than one request covers, the buffer is refilled with the
+        most recent candles instead.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            
+        Returns:
+            Number of candles received
+            
+        Raises:
+            ValueError: If the client is not initialized
+            BinanceAPIException: If the API request fails
+        """
+        if self.client is None:
+            raise ValueError("Binance client not initialized. Cannot fetch historical data.")
+        
+        buffer = self._get_symbol_buffer(symbol, timeframe)
+        candles = None
+        if buffer:
+            candles = self._request_candles(symbol, timeframe, startTime=buffer[-1].timestamp, limit=TAIL_FETCH_LIMIT)
+            if len(candles) >= TAIL_FETCH_LIMIT:
+                candles = None  # Did not reach the present
+        if candles is None:
+            buffer.clear()
+            candles = self._request_candles(symbol, timeframe, limit=buffer.maxlen)
+        if not candles:
+            return 0
+        
+        # Drop the saved copies of candles the exchange just returned; a gap
+        # between what is left and the tail means the saved candles are unusable
+        first = candles[0].timestamp
+        while buffer and buffer[-1].timestamp >= first:
+            buffer.pop()
+        if buffer and first - buffer[-1].timestamp > self._get_timeframe_milliseconds(timeframe):
+            buffer.clear()
+        buffer.extend(candles)
+        
+        logger.debug(f"Fetched {len(candles)} tail candles for {symbol} {timeframe}")
+        return len(candles)
+    
+    def _request_candles(self, symbol: str, timeframe: str, **params) -> List[Candle]:
+        """Request klines under the rate limiter and convert them to candles.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            **params: Extra futures_klines parameters (startTime, limit, ...)
+            
+        Returns:
+            List of Candle objects sorted by timestamp
+        """
+        if not self.rate_limiter.acquire(timeout=30.0):
+            raise BinanceAPIException("Rate limit timeout - too many requests")
+        
+        instrumentation.increment("rest.futures_klines", symbol=symbol)
+        with instrumentation.timer("rest.futures_klines", symbol=symbol):
+            klines = self.client.futures_klines(
+                symbol=symbol,
+                interval=self._convert_timeframe_to_binance_interval(timeframe),
+                **params
+            )
+        
+        return [
+            Candle(
+                timestamp=int(kline[0]),
+                open=float(kline[1]),
+                high=float(kline[2]),
+                low=float(kline[3]),
+                close=float(kline[4]),
+                volume=float(kline[5])
+            )
+            for kline in klines
+        ]
+    
+    def _request_range(self, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> List[Candle]:
+        """Request all klines of a time range, paging past the per-request limit.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            start_ms: Range start in milliseconds
+            end_ms: Range end in milliseconds
+            
+        Returns:
+            List of Candle objects sorted by timestamp
+        """
+        interval_ms = self._get_timeframe_milliseconds(timeframe)
+        candles: List[Candle] = []
+        while start_ms <= end_ms:
+            page = self._request_candles(
+                symbol, timeframe, startTime=start_ms, endTime=end_ms, limit=HISTORY_PAGE_LIMIT
+            )
+            candles.extend(page)
+            if len(page) < HISTORY_PAGE_LIMIT:
+                break
+            start_ms = page[-1].timestamp + interval_ms
+        return candles
+    
+    def repair_candles(self, symbol: str, timeframe: str, candles: List[Candle]) -> List[Candle]:
+        """Sort and deduplicate a history and refetch only its missing ranges.
+        
+        Findings are added to the symbol/timeframe data-quality metrics.
+        Ranges the exchange cannot fill (e.g. maintenance) stay missing.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            candles: Candles as received or buffered
+            
+        Returns:
+            Candles sorted by open time, one per open time, with the refetched
+            candles merged in (the input list itself if it was clean)
+        """
+        interval_ms = self._get_timeframe_milliseconds(timeframe)
+        report = find_issues([c.timestamp for c in candles], interval_ms)
+        metrics = self._data_quality.setdefault((symbol, timeframe), DataQualityMetrics())
+        metrics.record(report, symbol)
+        if report.is_clean:
+            return candles
+        
+        repaired = normalize_candles(candles)
+        fetched = 0
+        if self.client is not None:
+            for start_ms, end_ms in report.gaps:
+                try:
+                    page = self._request_range(symbol, timeframe, start_ms, end_ms)
+                except Exception as e:
+                    logger.warning(f"Could not refetch {symbol} {timeframe} candles {start_ms}-{end_ms}: {e}")
+                    continue
+                metrics.refetches += 1
+                fetched += len(page)
+                repaired.extend(c for c in page if start_ms <= c.timestamp <= end_ms)
+        metrics.refetched_bars += fetched
+        if fetched:
+            instrumentation.increment("data_quality.refetched_bars", fetched, symbol=symbol)
+            repaired = normalize_candles(repaired)
+        
+        remaining = find_issues([c.timestamp for c in repaired], interval_ms).gaps
+        metrics.unrepaired_gaps += len(remaining)
+        logger.info(
+            f"{symbol} {timeframe}: {len(report.gaps)} gap(s) ({report.missing_bars} bars), "
+            f"{report.duplicates} duplicate(s), {report.out_of_order} out of order; "
+            f"refetched {fetched} candles, {len(remaining)} gap(s) left"
+        )
+        return repaired
+    
+    def repair_buffers(self, symbols: Optional[List[str]] = None) -> int:
+        """Refetch the candles missing from the streamed buffers.
+        
+        Called after a WebSocket reconnect: fills holes inside each buffer
+        and the candles that closed while the stream was down.
+        
+        Args:
+            symbols: Symbols to repair (all buffered symbols if not provided)
+            
+        Returns:
+            Number of candles added to the buffers
+        """
+        added = 0
+        for symbol in list(symbols if symbols is not None else self._symbol_buffers):
+            for timeframe in self.stream_timeframes():
+                buffer = self._get_symbol_buffer(symbol, timeframe)
+                if not buffer:
+                    continue
+                try:
+                    before = len(buffer)
+                    candles = buffer.to_list()
+                    repaired = self.repair_candles(symbol, timeframe, candles)
+                    if repaired is not candles:
+                        buffer.extend(repaired)
+                    if self.client is not None:
+                        interval_ms = self._get_timeframe_milliseconds(timeframe)
+                        last_closed = (int(time.time() * 1000) // interval_ms - 1) * interval_ms
+                        if buffer[-1].timestamp < last_closed:
+                            self.fetch_tail(symbol, timeframe)
+                    added += max(0, len(buffer) - before)
+                except Exception as e:
+                    logger.warning(f"Could not repair {symbol} {timeframe} buffer: {e}")
+            if self.base_timeframe is not None:
+                try:
+                    self.seed_resampler(symbol)
+                except Exception as e:
+                    logger.warning(f"Could not rebuild {symbol} resampled candles: {e}")
+        return added
+    
+    def get_data_quality(self) -> Dict[str, Dict[str, dict]]:
+        """Get cumulative data-quality metrics.
+        
+        Returns:
+            Dictionary mapping symbol to timeframe to metric counts
+        """
+        quality: Dict[str, Dict[str, dict]] = {}
+        for (symbol, timeframe), metrics in list(self._data_quality.items()):
+            quality.setdefault(symbol, {})[timeframe] = asdict(metrics)
+        return quality
+    
+    def resampled_timeframes(self) -> List[str]:
+        """Get the timeframes built locally from the base timeframe.
+        
+        Returns:
+            The supported timeframes plus any custom timeframe_weights key
+            that is a Binance interval and a multiple of the base timeframe
+            (empty when resampling is off)
+        """
+        if self.base_timeframe is None:
+            return []
+        timeframes = SUPPORTED_TIMEFRAMES + list(self.config.timeframe_weights or {})
+        return [
+            tf for tf in dict.fromkeys(timeframes)
+            if tf in BINANCE_INTERVALS and can_resample(self.base_timeframe, tf)
+        ]
+    
+    def stream_timeframes(self) -> List[str]:
+        """Get the timeframes subscribed to over WebSocket."""
+        if self.base_timeframe is None:
+            return list(SUPPORTED_TIMEFRAMES)
+        return [self.base_timeframe]
+    
+    def _apply_base_candles(self, symbol: str, candles: List[Candle], notify: bool = False) -> int:
+        """Resample closed base candles and store the completed coarser candles.
+        
+        Args:
+            symbol: Trading symbol
+            candles: Closed base candles sorted by open time
+            notify: Pass completed candles to on_candle_callback
+            
+        Returns:
+            Number of coarser candles completed
+        """
+        with self._resampler_lock:
+            resampler = self._resamplers.get(symbol)
+            if resampler is None:
+                resampler = CandleResampler(self.base_timeframe, self.resampled_timeframes())
+                self._resamplers[symbol] = resampler
+            completed = resampler.seed(candles)
+        
+        for timeframe, candle in completed:
+            self._get_symbol_buffer(symbol, timeframe).upsert(candle)
+            if notify and self.on_candle_callback is not None:
+                try:
+                    self.on_candle_callback(candle, timeframe)
+                except Exception as e:
+                    logger.error(f"Error in candle callback: {e}")
+        return len(completed)
+    
+    def _closed_base_candles(self, symbol: str) -> List[Candle]:
+        """Get the buffered base candles that have closed."""
+        now_ms = int(time.time() * 1000)
+        base_ms = self._get_timeframe_milliseconds(self.base_timeframe)
+        buffer = self._get_symbol_buffer(symbol, self.base_timeframe)
+        return buffer.range(end_time=now_ms - base_ms)
+    
+    def seed_resampler(self, symbol: Optional[str] = None) -> int:
+        """Rebuild a symbol's resampler from its buffered base candles.
+        
+        Called after the base buffer was filled outside the stream (startup,
+        warm restart, backfill) so the in-progress buckets and the next
+        completed candles are built from the right base candles.
+        
+        Args:
+            symbol: Trading symbol (uses config.symbol if not provided)
+            
+        Returns:
+            Number of coarser candles rebuilt (0 when resampling is off)
+        """
+        if self.base_timeframe is None:
+            return 0
+        symbol = symbol if symbol is not None else self.config.symbol
+        with self._resampler_lock:
+            self._resamplers.pop(symbol, None)
+        return self._apply_base_candles(symbol, self._closed_base_candles(symbol))
+    
+    def get_partial_candle(self, timeframe: str, symbol: Optional[str] = None) -> Optional[Candle]:
+        """Get the in-progress candle of a resampled timeframe.
+        
+        Args:
+            timeframe: Resampled timeframe
+            symbol: Trading symbol (uses config.symbol if not provided)
+            
+        Returns:
+            Candle aggregated from the closed base candles of the current
+            bucket, or None if resampling is off or the bucket has none yet
+        """
+        resampler = self._resamplers.get(symbol if symbol is not None else self.config.symbol)
+        return resampler.partial(timeframe) if resampler is not None else None
+    
+    def fetch_resampled_history(self, days: int, symbol: Optional[str] = None) -> Dict[str, List[Candle]]:
+        """Fetch the base timeframe history once and resample every other timeframe.
+        
+        Args:
+            days: Number of days of history
+            symbol: Trading symbol (uses config.symbol if not provided)
+            
+        Returns:
+            Dictionary mapping timeframe to candles (the base timeframe plus
+            every resampled timeframe, complete buckets only)
+            
+        Raises:
+            ValueError: If resampling is off, the client is not initialized
+                or the base history has gaps
+            BinanceAPIException: If an API request fails
+        """
+        if self.base_timeframe is None:
+            raise ValueError("candle_base_timeframe is not set. Cannot resample history.")
+        if self.client is None:
+            raise ValueError("Binance client not initialized. Cannot fetch historical data.")
+        
+        fetch_symbol = symbol if symbol is not None else self.config.symbol
+        end_ms = int(time.time() * 1000)
+        start_ms = end_ms - days * 24 * 60 * 60 * 1000
+        
+        base_candles = self._request_range(fetch_symbol, self.base_timeframe, start_ms, end_ms)
+        base_candles = self.repair_candles(fetch_symbol, self.base_timeframe, base_candles)
+        self._validate_data_completeness(base_candles, self.base_timeframe)
+        self._get_symbol_buffer(fetch_symbol, self.base_timeframe).extend(base_candles)
+        
+        # The newest base candle is usually still open
+        closed = [c for c in base_candles if c.timestamp + self._get_timeframe_milliseconds(self.base_timeframe) <= end_ms]
+        history = {self.base_timeframe: base_candles}
+        for timeframe in self.resampled_timeframes():
+            history[timeframe] = resample_candles(closed, self.base_timeframe, timeframe)
+            self._get_symbol_buffer(fetch_symbol, timeframe).extend(history[timeframe])
+        
+        self.seed_resampler(fetch_symbol)
+        logger.debug(
+            f"Resampled {len(base_candles)} {self.base_timeframe} candles of {fetch_symbol} into "
+            f"{', '.join(self.resampled_timeframes())}"
+        )
+        return history
+    
+    def refresh_stale_base(self, symbol: Optional[str] = None) -> bool:
+        """Backfill base candles a stalled stream missed.
+        
+        Args:
+            symbol: Trading symbol (uses config.symbol if not provided)
+            
+        Returns:
+            True if candles were fetched, False if the base buffer is current
+        """
+        if self.base_timeframe is None:
+            return False
+        symbol = symbol if symbol is not None else self.config.symbol
+        base_ms = self._get_timeframe_milliseconds(self.base_timeframe)
+        last_closed = (int(time.time() * 1000) // base_ms - 1) * base_ms
+        buffer = self._get_symbol_buffer(symbol, self.base_timeframe)
+        if buffer and buffer[-1].timestamp >= last_closed:
+            return False
+        
+        logger.info(f"{symbol} {self.base_timeframe} stream is behind, fetching the missing candles")
+        self.fetch_tail(symbol, self.base_timeframe)
+        self.seed_resampler(symbol)
+        return True
+    
     def _convert_timeframe_to_binance_interval(self, timeframe: str) -> str:
         """Convert timeframe string to Binance interval constant.
         
@@ -196,25 +633,10 @@ class DataManager:
         Returns:
             Binance interval constant (e.g., Client.KLINE_INTERVAL_15MINUTE)
         """
-        interval_map = {
-            "1m": Client.KLINE_INTERVAL_1MINUTE,
-            "3m": Client.KLINE_INTERVAL_3MINUTE,
-            "5m": Client.KLINE_INTERVAL_5MINUTE,
-            "15m": Client.KLINE_INTERVAL_15MINUTE,
-            "30m": Client.KLINE_INTERVAL_30MINUTE,
-            "1h": Client.KLINE_INTERVAL_1HOUR,
-            "2h": Client.KLINE_INTERVAL_2HOUR,
-            "4h": Client.KLINE_INTERVAL_4HOUR,
-            "6h": Client.KLINE_INTERVAL_6HOUR,
-            "8h": Client.KLINE_INTERVAL_8HOUR,
-            "12h": Client.KLINE_INTERVAL_12HOUR,
-            "1d": Client.KLINE_INTERVAL_1DAY,
-        }
-        
-        if timeframe not in interval_map:
+        if timeframe not in BINANCE_INTERVALS:
             raise ValueError(f"Unsupported timeframe: {timeframe}")
         
-        return interval_map[timeframe]
+        return BINANCE_INTERVALS[timeframe]
     
     def _is_cache_valid(self, symbol: str, timeframe: str) -> bool:
         """Check if cached data is still valid.
@@ -273,7 +695,7 @@ class DataManager:
             self._data_cache[timeframe] = {'data': None, 'timestamp': 0}
             logger.debug(f"Cleared cache for {timeframe}")
     
-    def get_synchronized_candles(self, reference_timestamp: int, timeframes: Optional[List[str]] = None) -> dict:
+    def get_synchronized_candles(self, reference_timestamp: int, timeframes: Optional[List[str]] = None, symbol: Optional[str] = None) -> dict:
         """Get candles from all timeframes synchronized to a reference timestamp.
         
         This method ensures all timeframes are aligned by finding the candle that
@@ -282,6 +704,7 @@ class DataManager:
         Args:
             reference_timestamp: Reference timestamp in milliseconds
             timeframes: List of timeframes to synchronize (default: all supported)
+            symbol: Trading symbol (uses config.symbol if not provided)
             
         Returns:
             Dictionary mapping timeframe to synchronized Candle, or None if not available
@@ -292,57 +715,36 @@ class DataManager:
         result = {}
         
         for tf in timeframes:
-            candle = self._find_candle_at_timestamp(tf, reference_timestamp)
+            candle = self._find_candle_at_timestamp(tf, reference_timestamp, symbol)
             result[tf] = candle
         
         return result
     
-    def _find_candle_at_timestamp(self, timeframe: str, timestamp: int) -> Optional[Candle]:
+    def _find_candle_at_timestamp(self, timeframe: str, timestamp: int, symbol: Optional[str] = None) -> Optional[Candle]:
         """Find the candle that contains or is closest to the given timestamp.
         
         Args:
             timeframe: Timeframe to search
             timestamp: Target timestamp in milliseconds
+            symbol: Trading symbol (uses config.symbol if not provided)
             
         Returns:
             Candle object or None if not found
         """
-        # Get the appropriate buffer
-        if timeframe == '5m':
-            buffer = self.candles_5m
-        elif timeframe == '15m':
-            buffer = self.candles_15m
-        elif timeframe == '1h':
-            buffer = self.candles_1h
-        elif timeframe == '4h':
-            buffer = self.candles_4h
-        else:
+        if timeframe not in ('5m', '15m', '1h', '4h'):
             return None
         
-        if len(buffer) == 0:
+        buffer = self._symbol_buffers.get(symbol or self.config.symbol, {}).get(timeframe)
+        if not buffer:
             return None
         
-        # Get timeframe duration
-        tf_ms = self._get_timeframe_milliseconds(timeframe)
-        
-        # Find the candle that contains this timestamp
         # A candle at timestamp T covers the period [T, T + tf_ms)
-        best_candle = None
-        min_distance = float('inf')
-        
-        for candle in buffer:
-            # Check if timestamp falls within this candle's period
-            if candle.timestamp <= timestamp < candle.timestamp + tf_ms:
-                return candle
-            
-            # Track closest candle as fallback
-            distance = abs(candle.timestamp - timestamp)
-            if distance < min_distance:
-                min_distance = distance
-                best_candle = candle
+        candle = buffer.floor(timestamp)
+        if candle is not None and timestamp < candle.timestamp + self._get_timeframe_milliseconds(timeframe):
+            return candle
         
         # Return closest candle if exact match not found
-        return best_candle
+        return buffer.nearest(timestamp)
     
     def is_data_stale(self, timeframe: str, max_age_seconds: Optional[int] = None) -> bool:
         """Check if data for a timeframe is stale.
@@ -431,26 +833,11 @@ class DataManager:
             
         Returns:
             Duration in milliseconds
+            
+        Raises:
+            ValueError: If the timeframe is not recognized
         """
-        timeframe_ms = {
-            "1m": 60 * 1000,
-            "3m": 3 * 60 * 1000,
-            "5m": 5 * 60 * 1000,
-            "15m": 15 * 60 * 1000,
-            "30m": 30 * 60 * 1000,
-            "1h": 60 * 60 * 1000,
-            "2h": 2 * 60 * 60 * 1000,
-            "4h": 4 * 60 * 60 * 1000,
-            "6h": 6 * 60 * 60 * 1000,
-            "8h": 8 * 60 * 60 * 1000,
-            "12h": 12 * 60 * 60 * 1000,
-            "1d": 24 * 60 * 60 * 1000,
-        }
-        
-        if timeframe not in timeframe_ms:
-            raise ValueError(f"Unsupported timeframe: {timeframe}")
-        
-        return timeframe_ms[timeframe]
+        return timeframe_to_ms(timeframe)
     
     def _validate_data_completeness(self, candles: List[Candle], timeframe: str) -> None:
         """Validate that candle data contains no gaps.
@@ -465,36 +852,19 @@ class DataManager:
         if len(candles) < 2:
             return  # Not enough data to validate gaps
         
-        expected_interval_ms = self._get_timeframe_milliseconds(timeframe)
-        
-        # Allow 10% tolerance for timing variations
-        max_allowed_gap = expected_interval_ms * 1.1
-        
-        gaps = []
-        for i in range(1, len(candles)):
-            time_diff = candles[i].timestamp - candles[i-1].timestamp
-            
-            if time_diff > max_allowed_gap:
-                gaps.append({
-                    'index': i,
-                    'prev_timestamp': candles[i-1].timestamp,
-                    'curr_timestamp': candles[i].timestamp,
-                    'gap_ms': time_diff,
-                    'expected_ms': expected_interval_ms
-                })
+        # Gaps larger than the interval (10% tolerance for timing variations)
+        report = find_issues([c.timestamp for c in candles], self._get_timeframe_milliseconds(timeframe))
         
-        if gaps:
+        if report.gaps:
             gap_details = "\n".join([
-                f"  Gap at index {g['index']}: {g['gap_ms']}ms "
-                f"(expected {g['expected_ms']}ms) between "
-                f"{datetime.fromtimestamp(g['prev_timestamp']/1000)} and "
-                f"{datetime.fromtimestamp(g['curr_timestamp']/1000)}"
-                for g in gaps[:5]  # Show first 5 gaps
+                f"  Missing {datetime.fromtimestamp(start_ms/1000)} to "
+                f"{datetime.fromtimestamp(end_ms/1000)}"
+                for start_ms, end_ms in report.gaps[:5]  # Show first 5 gaps
             ])
             
             raise ValueError(
-                f"Historical data contains {len(gaps)} gap(s) larger than "
-                f"the {timeframe} interval:\n{gap_details}"
+                f"Historical data contains {len(report.gaps)} gap(s) larger than "
+                f"the {timeframe} interval ({report.missing_bars} missing bars):\n{gap_details}"
             )
     
     def get_latest_candles(self, timeframe: str, count: int, symbol: Optional[str] = None) -> List[Candle]:
@@ -511,26 +881,15 @@ class DataManager:
         # Use provided symbol or fall back to config symbol
         fetch_symbol = symbol if symbol is not None else self.config.symbol
         
-        # Try to get from symbol-specific buffer first
         if fetch_symbol in self._symbol_buffers and timeframe in self._symbol_buffers[fetch_symbol]:
             buffer = self._symbol_buffers[fetch_symbol][timeframe]
             result_len = min(len(buffer), count)
             logger.info(f"get_latest_candles: {fetch_symbol} {timeframe} - found in symbol_buffers, returning {result_len} candles")
         else:
-            # Fall back to legacy buffers for primary symbol
             if fetch_symbol == self.config.symbol:
-                if timeframe == "5m":
-                    buffer = self.candles_5m
-                elif timeframe == "15m":
-                    buffer = self.candles_15m
-                elif timeframe == "1h":
-                    buffer = self.candles_1h
-                elif timeframe == "4h":
-                    buffer = self.candles_4h
-                else:
+                if timeframe not in ("5m", "15m", "1h", "4h"):
                     raise ValueError(f"Unsupported timeframe: {timeframe}")
-                result_len = min(len(buffer), count)
-                logger.info(f"get_latest_candles: {fetch_symbol} {timeframe} - found in legacy buffers, returning {result_len} candles")
+                return []
             else:
                 # No data available for this symbol/timeframe
                 logger.warning(f"get_latest_candles: {fetch_symbol} {timeframe} - NOT FOUND in symbol_buffers, returning empty list")
@@ -540,15 +899,13 @@ class DataManager:
                 return []
         
         # Return last 'count' candles
-        if len(buffer) < count:
-            return list(buffer)
-        else:
-            return list(buffer)[-count:]
+        return buffer.latest(count)
     
     def start_websocket_streams(self, symbol: Optional[str] = None):
         """Initialize WebSocket connections for real-time data.
         
-        Establishes WebSocket connections for 5m, 15m, 1h, and 4h kline streams.
+        Establishes WebSocket connections for 5m, 15m, 1h, and 4h kline streams,
+        or for the base timeframe only when candle_base_timeframe is set.
         Automatically handles connection management and reconnection.
         
         Args:
@@ -576,37 +933,25 @@ class DataManager:
         if stream_symbol not in self._stream_keys:
             self._stream_keys[stream_symbol] = {}
         
-        # Start 5m kline stream
-        self._stream_keys[stream_symbol]['5m'] = self.websocket_manager.start_kline_socket(
-            callback=lambda msg: self._handle_kline_message(msg, '5m'),
-            symbol=stream_symbol.lower(),
-            interval=Client.KLINE_INTERVAL_5MINUTE
-        )
-        logger.info(f"Started 5m kline stream for {stream_symbol}")
-        
-        # Start 15m kline stream
-        self._stream_keys[stream_symbol]['15m'] = self.websocket_manager.start_kline_socket(
-            callback=lambda msg: self._handle_kline_message(msg, '15m'),
-            symbol=stream_symbol.lower(),
-            interval=Client.KLINE_INTERVAL_15MINUTE
-        )
-        logger.info(f"Started 15m kline stream for {stream_symbol}")
-        
-        # Start 1h kline stream
-        self._stream_keys[stream_symbol]['1h'] = self.websocket_manager.start_kline_socket(
-            callback=lambda msg: self._handle_kline_message(msg, '1h'),
-            symbol=stream_symbol.lower(),
-            interval=Client.KLINE_INTERVAL_1HOUR
-        )
-        logger.info(f"Started 1h kline stream for {stream_symbol}")
+        # One kline stream per timeframe, or only the base timeframe when
+        # the others are resampled locally
+        for timeframe in self.stream_timeframes():
+            self._stream_keys[stream_symbol][timeframe] = self.websocket_manager.start_kline_socket(
+                callback=lambda msg, tf=timeframe: self._handle_kline_message(msg, tf),
+                symbol=stream_symbol.lower(),
+                interval=self._convert_timeframe_to_binance_interval(timeframe)
+            )
+            logger.info(f"Started {timeframe} kline stream for {stream_symbol}")
         
-        # Start 4h kline stream
-        self._stream_keys[stream_symbol]['4h'] = self.websocket_manager.start_kline_socket(
-            callback=lambda msg: self._handle_kline_message(msg, '4h'),
-            symbol=stream_symbol.lower(),
-            interval=Client.KLINE_INTERVAL_4HOUR
-        )
-        logger.info(f"Started 4h kline stream for {stream_symbol}")
+        # Mark prices are only consumed by the replay recording
+        if self.frame_recorder is not None:
+            try:
+                self._stream_keys[stream_symbol]['markPrice'] = self.websocket_manager.start_symbol_mark_price_socket(
+                    callback=self.frame_recorder.record_mark_price,
+                    symbol=stream_symbol.lower()
+                )
+            except Exception as e:
+                logger.warning(f"Could not start mark price stream for {stream_symbol}: {e}")
         
         self._ws_connected = True
         self._ws_reconnect_attempts = 0
@@ -632,6 +977,13 @@ class DataManager:
             
             kline = msg['k']
             
+            # Record the raw frame (open and closed) for offline replay
+            if self.frame_recorder is not None:
+                try:
+                    self.frame_recorder.record_kline(msg, timeframe)
+                except Exception as e:
+                    logger.error(f"Error recording kline frame for {timeframe}: {e}")
+            
             # Extract symbol from message
             symbol = kline.get('s', self.config.symbol).upper()
             
@@ -677,21 +1029,11 @@ class DataManager:
         # Use provided symbol or fall back to config.symbol
         candle_symbol = symbol if symbol is not None else self.config.symbol
         
-        # Add to symbol-specific buffer
+        # Upsert into the symbol-specific buffer (a candle already fetched
+        # over REST is replaced rather than stored twice)
         buffer = self._get_symbol_buffer(candle_symbol, timeframe)
-        buffer.append(candle)
-        logger.debug(f"Added {timeframe} candle for {candle_symbol}: timestamp={candle.timestamp}, close={candle.close}")
-        
-        # Also update legacy buffers for backward compatibility (only for config.symbol)
-        if candle_symbol == self.config.symbol:
-            if timeframe == '5m':
-                self.candles_5m.append(candle)
-            elif timeframe == '15m':
-                self.candles_15m.append(candle)
-            elif timeframe == '1h':
-                self.candles_1h.append(candle)
-            elif timeframe == '4h':
-                self.candles_4h.append(candle)
+        buffer.upsert(candle)
+        logger.debug(f"Stored {timeframe} candle for {candle_symbol}: timestamp={candle.timestamp}, close={candle.close}")
         
         # Call external callback if set
         if self.on_candle_callback is not None:
@@ -699,6 +1041,10 @@ class DataManager:
                 self.on_candle_callback(candle, timeframe)
             except Exception as e:
                 logger.error(f"Error in candle callback: {e}")
+        
+        # Build the coarser timeframes from the base stream
+        if timeframe == self.base_timeframe:
+            self._apply_base_candles(candle_symbol, [candle], notify=True)
     
     def reconnect_websocket(self):
         """Handle WebSocket reconnection with exponential backoff.
@@ -749,6 +1095,11 @@ class DataManager:
                 self.start_websocket_streams()
                 
                 logger.info("WebSocket reconnection successful")
+                
+                # Refetch the candles missed while the stream was down
+                added = self.repair_buffers()
+                if added:
+                    logger.info(f"Refetched {added} candles missed during the disconnect")
                 return True
                 
             except Exception as e:
@@ -795,44 +1146,35 @@ class DataManager:
         """Remove data older than the specified lookback period.
         
         This method removes candles older than the lookback period to free memory.
-        Should be called periodically (e.g., every 6 hours).
+        Called by the maintenance scheduler every data_cleanup_interval_hours.
+        A timeframe never loses candles a full buffer would still span (500 4h
+        candles cover 83 days), so indicator history is not cut short.
         
         Args:
             lookback_days: Number of days to keep (default: 7)
         """
-        cutoff_timestamp = int((time.time() - (lookback_days * 24 * 60 * 60)) * 1000)
+        now_ms = int(time.time() * 1000)
+        lookback_ms = lookback_days * 24 * 60 * 60 * 1000
         
         removed_counts = {}
         
-        # Clean up each timeframe buffer
-        for timeframe, buffer_name in [
-            ('5m', 'candles_5m'),
-            ('15m', 'candles_15m'),
-            ('1h', 'candles_1h'),
-            ('4h', 'candles_4h')
-        ]:
-            buffer = getattr(self, buffer_name)
-            original_count = len(buffer)
-            
-            # Remove old candles
-            # Since deque doesn't support efficient filtering, we'll recreate it
-            new_buffer = deque(
-                (candle for candle in buffer if candle.timestamp >= cutoff_timestamp),
-                maxlen=buffer.maxlen
-            )
-            
-            setattr(self, buffer_name, new_buffer)
-            removed_count = original_count - len(new_buffer)
-            removed_counts[timeframe] = removed_count
-            
-            if removed_count > 0:
-                logger.info(
-                    f"Cleaned up {removed_count} old candles from {timeframe} buffer "
-                    f"(kept {len(new_buffer)} candles)"
-                )
+        # Clean up every symbol's timeframe buffers (counts are per timeframe)
+        for symbol, buffers in list(self._symbol_buffers.items()):
+            for timeframe, buffer in list(buffers.items()):
+                span_ms = (buffer.maxlen or 0) * self._get_timeframe_milliseconds(timeframe)
+                cutoff_timestamp = now_ms - max(lookback_ms, span_ms)
+                
+                removed_count = buffer.drop_before(cutoff_timestamp)
+                removed_counts[timeframe] = removed_counts.get(timeframe, 0) + removed_count
+                
+                if removed_count > 0:
+                    logger.info(
+                        f"Cleaned up {removed_count} old candles from {symbol} {timeframe} buffer "
+                        f"(kept {len(buffer)} candles)"
+                    )
         
-        # Clear old cache entries
-        self.clear_cache()
+        # Drop expired cache entries
+        self.evict_expired_cache()
         
         total_removed = sum(removed_counts.values())
         logger.info(
@@ -842,6 +1184,50 @@ class DataManager:
         
         return removed_counts
     
+    def evict_expired_cache(self) -> int:
+        """Remove historical-data cache entries that can no longer be served.
+        
+        Entries are evicted once they are twice the TTL old, so a reader that
+        has just validated an entry never finds it gone.
+        
+        Returns:
+            Number of cache entries removed
+        """
+        cutoff = time.time() - 2 * self._cache_ttl_seconds
+        evicted = 0
+        for symbol in list(self._data_cache):
+            entries = self._data_cache.get(symbol, {})
+            for timeframe in list(entries):
+                entry = entries.get(timeframe)
+                if isinstance(entry, dict) and entry.get('timestamp', 0) < cutoff:
+                    entries.pop(timeframe, None)
+                    evicted += 1
+            if not entries:
+                self._data_cache.pop(symbol, None)
+        return evicted
+    
+    def drop_symbols(self, active_symbols: List[str]) -> List[str]:
+        """Release buffers and cached data of symbols no longer traded.
+        
+        config.symbol is always kept since the legacy buffers point at it.
+        
+        Args:
+            active_symbols: Symbols the bot currently trades
+            
+        Returns:
+            Symbols whose data was dropped
+        """
+        keep = set(active_symbols) | {self.config.symbol}
+        dropped = [symbol for symbol in list(self._symbol_buffers) if symbol not in keep]
+        for symbol in dropped:
+            self._symbol_buffers.pop(symbol, None)
+        for symbol in list(self._data_cache):
+            if symbol not in keep:
+                self._data_cache.pop(symbol, None)
+        if dropped:
+            logger.info(f"Dropped candle buffers of symbols no longer traded: {dropped}")
+        return dropped
+    
     def get_memory_usage_estimate(self) -> dict:
         """Estimate memory usage of candle buffers.
         
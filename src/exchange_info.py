@@ -0,0 +1,325 @@
+"""Exchange symbol metadata with precision-aware quantity and price rounding.
+
+Every futures symbol has its own lot step, tick size, minimum quantity and
+minimum notional (``futures_exchange_info`` filters). Orders that ignore them
+are rejected by the exchange (-1111 precision, -4004 below minimum quantity,
+-4164 below minimum notional), so sizing code that assumed one global minimum
+wasted a request, and often a retry, on every such order.
+
+ExchangeInfoCache fetches the filters once, persists them to a JSON file so a
+restart does not refetch them, and refreshes them on a background thread.
+Lookups are a dict access per symbol and the rounding helpers accept scalars
+or NumPy arrays, so a whole price ladder is rounded in one call. Symbols with
+unknown filters are passed through unchanged.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from src import instrumentation
+
+
+logger = logging.getLogger(__name__)
+
+
+Number = Union[float, np.ndarray]
+
+# Version of the persisted file layout
+EXCHANGE_INFO_VERSION = 1
+
+# Tolerance (in steps) so 0.3 / 0.1 = 2.9999999 still floors to 3 steps
+STEP_EPSILON = 1e-9
+
+
+def _decimals(step: float) -> int:
+    """Number of decimals a step or tick size has (0.001 -> 3, 10 -> 0)."""
+    text = f"{step:.12f}".rstrip("0")
+    return len(text.split(".")[1]) if "." in text else 0
+
+
+def floor_to_step(values: Number, step: float) -> Number:
+    """Round quantities down to a multiple of the lot step.
+
+    Args:
+        values: Quantity or array of quantities
+        step: Lot step size (values are returned unchanged if not positive)
+
+    Returns:
+        Rounded value(s), same shape as the input
+    """
+    if step <= 0:
+        return values
+    rounded = np.round(np.floor(np.asarray(values, dtype=float) / step + STEP_EPSILON) * step, _decimals(step))
+    return rounded if isinstance(values, np.ndarray) else float(rounded)
+
+
+def ceil_to_step(values: Number, step: float) -> Number:
+    """Round quantities up to a multiple of the lot step."""
+    if step <= 0:
+        return values
+    rounded = np.round(np.ceil(np.asarray(values, dtype=float) / step - STEP_EPSILON) * step, _decimals(step))
+    return rounded if isinstance(values, np.ndarray) else float(rounded)
+
+
+def round_to_tick(values: Number, tick: float) -> Number:
+    """Round prices to the nearest multiple of the tick size."""
+    if tick <= 0:
+        return values
+    rounded = np.round(np.round(np.asarray(values, dtype=float) / tick) * tick, _decimals(tick))
+    return rounded if isinstance(values, np.ndarray) else float(rounded)
+
+
+def is_quantity_rounded(quantity: float, step: float) -> bool:
+    """Check whether a quantity is a whole number of lot steps."""
+    if step <= 0:
+        return True
+    steps = quantity / step
+    return math.isclose(steps, round(steps), abs_tol=1e-6)
+
+
+@dataclass(frozen=True)
+class SymbolFilters:
+    """Order filters of one futures symbol.
+
+    Attributes:
+        symbol: Trading pair symbol
+        tick_size: PRICE_FILTER tick size
+        step_size: LOT_SIZE step (limit and stop orders)
+        min_qty: LOT_SIZE minimum quantity
+        max_qty: LOT_SIZE maximum quantity
+        market_step_size: MARKET_LOT_SIZE step (market orders)
+        market_min_qty: MARKET_LOT_SIZE minimum quantity
+        market_max_qty: MARKET_LOT_SIZE maximum quantity
+        min_notional: MIN_NOTIONAL (does not apply to reduce-only orders)
+    """
+    symbol: str
+    tick_size: float
+    step_size: float
+    min_qty: float
+    max_qty: float
+    market_step_size: float
+    market_min_qty: float
+    market_max_qty: float
+    min_notional: float
+
+    @classmethod
+    def from_exchange(cls, info: Dict[str, Any]) -> "SymbolFilters":
+        """Build from one entry of the futures_exchange_info ``symbols`` list."""
+        filters = {f["filterType"]: f for f in info.get("filters", [])}
+        lot = filters.get("LOT_SIZE", {})
+        market = filters.get("MARKET_LOT_SIZE", lot)
+        notional = filters.get("MIN_NOTIONAL", {})
+        return cls(
+            symbol=info["symbol"],
+            tick_size=float(filters.get("PRICE_FILTER", {}).get("tickSize", 0.0)),
+            step_size=float(lot.get("stepSize", 0.0)),
+            min_qty=float(lot.get("minQty", 0.0)),
+            max_qty=float(lot.get("maxQty", 0.0)),
+            market_step_size=float(market.get("stepSize", 0.0)),
+            market_min_qty=float(market.get("minQty", 0.0)),
+            market_max_qty=float(market.get("maxQty", 0.0)),
+            min_notional=float(notional.get("notional", notional.get("minNotional", 0.0))),
+        )
+
+    def round_quantity(self, quantity: Number, market: bool = True) -> Number:
+        """Round quantities down to the lot step of market (or limit/stop) orders."""
+        return floor_to_step(quantity, self.market_step_size if market else self.step_size)
+
+    def round_price(self, price: Number) -> Number:
+        """Round prices to the nearest tick."""
+        return round_to_tick(price, self.tick_size)
+
+    def min_order_quantity(self, price: Optional[float] = None, market: bool = True) -> float:
+        """Smallest quantity the exchange accepts for an opening order.
+
+        Args:
+            price: Expected fill price; adds the minimum notional constraint
+            market: Use the MARKET_LOT_SIZE filter instead of LOT_SIZE
+
+        Returns:
+            Minimum quantity, a multiple of the lot step
+        """
+        step = self.market_step_size if market else self.step_size
+        minimum = self.market_min_qty if market else self.min_qty
+        if price is not None and price > 0 and self.min_notional > 0:
+            minimum = max(minimum, ceil_to_step(self.min_notional / price, step))
+        return minimum
+
+    def check_order(self, quantity: float, price: Optional[float] = None,
+                    reduce_only: bool = False, market: bool = True) -> Optional[str]:
+        """Check a (rounded) order against the filters.
+
+        Returns:
+            Reason the exchange would reject the order, or None if it passes
+        """
+        minimum = self.market_min_qty if market else self.min_qty
+        maximum = self.market_max_qty if market else self.max_qty
+        if quantity < minimum or quantity <= 0:
+            return f"quantity {quantity} below minimum {minimum} for {self.symbol}"
+        if maximum > 0 and quantity > maximum:
+            return f"quantity {quantity} above maximum {maximum} for {self.symbol}"
+        if (not reduce_only and price is not None and price > 0
+                and quantity * price < self.min_notional * (1 - STEP_EPSILON)):
+            return f"notional {quantity * price:.2f} below minimum {self.min_notional} for {self.symbol}"
+        return None
+
+
+class ExchangeInfoCache:
+    """Per-symbol order filters loaded once, persisted and refreshed in the background.
+
+    Attributes:
+        fetched_at: Unix time the filters were fetched from the exchange (0 if never)
+    """
+
+    def __init__(self, client=None, cache_file: str = "", max_age_seconds: float = 86400.0):
+        """Initialize an empty cache.
+
+        Args:
+            client: Binance client used to fetch futures_exchange_info
+            cache_file: JSON file the filters are persisted to ("" = none)
+            max_age_seconds: Age after which persisted filters are refetched;
+                also the background refresh interval
+        """
+        self.client = client
+        self.cache_file = cache_file
+        self.max_age_seconds = max_age_seconds
+        self.fetched_at = 0.0
+        self._filters: Dict[str, SymbolFilters] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def symbols(self) -> int:
+        """Number of symbols with known filters."""
+        return len(self._filters)
+
+    def load(self) -> bool:
+        """Load filters from the cache file, fetching them if it is missing or stale.
+
+        Stale filters are still used when the fetch fails.
+
+        Returns:
+            True if filters are available afterwards
+        """
+        self._read_file()
+        if not self._filters or time.time() - self.fetched_at > self.max_age_seconds:
+            self.refresh()
+        return bool(self._filters)
+
+    def refresh(self) -> bool:
+        """Fetch the filters from the exchange and persist them.
+
+        Returns:
+            True if the fetch succeeded
+        """
+        if self.client is None:
+            return False
+        try:
+            instrumentation.increment("rest.futures_exchange_info")
+            info = self.client.futures_exchange_info()
+            filters = {}
+            for entry in info.get("symbols", []):
+                try:
+                    filters[entry["symbol"]] = SymbolFilters.from_exchange(entry)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Skipping malformed exchange info for {entry.get('symbol')}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to fetch exchange info: {e}")
+            return False
+
+        # Swapped in one assignment; readers on other threads see old or new
+        self._filters = filters
+        self.fetched_at = time.time()
+        self._write_file()
+        logger.info(f"Exchange info loaded for {len(filters)} symbols")
+        return True
+
+    def _read_file(self) -> None:
+        """Load persisted filters (missing or unreadable files are ignored)."""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") != EXCHANGE_INFO_VERSION:
+                return
+            self._filters = {symbol: SymbolFilters(**fields) for symbol, fields in data["symbols"].items()}
+            self.fetched_at = float(data["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable exchange info file {self.cache_file}: {e}")
+
+    def _write_file(self) -> None:
+        """Persist the filters (tmp-then-rename so readers never see a partial file)."""
+        if not self.cache_file:
+            return
+        data = {
+            "version": EXCHANGE_INFO_VERSION,
+            "fetched_at": self.fetched_at,
+            "symbols": {symbol: asdict(filters) for symbol, filters in self._filters.items()},
+        }
+        try:
+            directory = os.path.dirname(self.cache_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.cache_file + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to persist exchange info: {e}")
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Refresh the filters every max_age_seconds on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="exchange-info", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the refresh thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Thread body: refresh once per interval until stopped."""
+        while not self._stop_event.wait(self.max_age_seconds):
+            self.refresh()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        """Get the filters of a symbol (None if unknown)."""
+        return self._filters.get(symbol)
+
+    def round_quantity(self, symbol: str, quantity: Number, market: bool = True) -> Number:
+        """Round quantities down to the symbol's lot step (unchanged if unknown)."""
+        filters = self._filters.get(symbol)
+        return filters.round_quantity(quantity, market) if filters is not None else quantity
+
+    def round_price(self, symbol: str, price: Number) -> Number:
+        """Round prices to the symbol's tick size (unchanged if unknown)."""
+        filters = self._filters.get(symbol)
+        return filters.round_price(price) if filters is not None else price
+
+    def min_order_quantity(self, symbol: str, price: Optional[float] = None,
+                           market: bool = True) -> Optional[float]:
+        """Smallest accepted opening quantity of a symbol (None if unknown)."""
+        filters = self._filters.get(symbol)
+        return filters.min_order_quantity(price, market) if filters is not None else None
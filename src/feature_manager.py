@@ -9,6 +9,8 @@ import time
 from typing import Dict, Callable, Any, Optional
 from dataclasses import dataclass, field
 
+from src import instrumentation
+
 
 logger = logging.getLogger(__name__)
 
@@ -123,7 +125,8 @@ class FeatureManager:
         
         try:
             # Execute function
-            result = func(*args, **kwargs)
+            with instrumentation.timer(f"feature.{feature_name}"):
+                result = func(*args, **kwargs)
             
             # Increment successful calls
             feature.successful_calls += 1
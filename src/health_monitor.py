@@ -5,6 +5,7 @@ This module provides health monitoring capabilities including:
 - API rate limit monitoring and throttling
 - Critical error notification system
 - Memory usage monitoring with warnings at 80%
+- Hot-path instrumentation snapshot (when instrumentation is enabled)
 """
 
 import time
@@ -15,6 +16,8 @@ from typing import Optional, Callable, Dict, List
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
+from src import instrumentation
+
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,7 @@ class HealthCheckResult:
     api_rate_limit_status: str
     websocket_connected: bool
     critical_errors: List[str] = field(default_factory=list)
+    instrumentation: Dict = field(default_factory=dict)
     
     def is_healthy(self) -> bool:
         """Check if system is healthy."""
@@ -282,7 +286,8 @@ class HealthMonitor:
             memory_warning=memory_warning,
             api_rate_limit_status=api_rate_limit_status,
             websocket_connected=self.websocket_connected,
-            critical_errors=self.critical_errors.copy()
+            critical_errors=self.critical_errors.copy(),
+            instrumentation=instrumentation.snapshot() if instrumentation.is_enabled() else {}
         )
         
         # Store result in history
@@ -0,0 +1,242 @@
+"""Bot heartbeat publishing for O(1) liveness checks.
+
+The trading bot publishes a fixed-size heartbeat record into a memory-mapped
+file once per event loop iteration. The Streamlit dashboard and diagnostic
+scripts read that record instead of scanning the process table, so a status
+query costs one small file read no matter how busy the host is.
+
+Record layout (little-endian, 64 bytes):
+    magic (4s) | version (H) | status (H) | seq (Q) | pid (I) | mode (8s) |
+    loop_iteration (Q) | last_candle_time (q) | loop_latency_ms (d) |
+    updated_at (d) | padding
+
+``seq`` works as a seqlock: the writer makes it odd before touching the
+payload and even again afterwards. Readers copy the record, then re-read
+``seq`` and only accept the copy if both values are equal and even, so a
+torn read that overlapped a write is retried.
+"""
+
+import mmap
+import os
+import struct
+import time
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import psutil
+
+
+logger = logging.getLogger(__name__)
+
+
+HEARTBEAT_MAGIC = b"BBHB"
+HEARTBEAT_VERSION = 1
+HEARTBEAT_SIZE = 64
+
+STATUS_STOPPED = 0
+STATUS_RUNNING = 1
+
+_HEADER = struct.Struct("<4sHHQ")
+_PAYLOAD = struct.Struct("<I8sQqdd")
+_SEQ_OFFSET = 8  # magic (4) + version (2) + status (2)
+_SEQ = struct.Struct("<Q")
+
+
+@dataclass
+class HeartbeatRecord:
+    """Snapshot of the bot's most recent heartbeat.
+
+    Attributes:
+        pid: Process ID of the bot that wrote the heartbeat
+        mode: Run mode ("BACKTEST", "PAPER", "LIVE")
+        status: "running" or "stopped"
+        loop_iteration: Number of completed event loop iterations
+        last_candle_time: Open time (ms) of the latest candle processed, 0 if none
+        loop_latency_ms: Duration of the last loop iteration in milliseconds
+        updated_at: Unix timestamp (seconds) when the heartbeat was written
+    """
+    pid: int
+    mode: str
+    status: str
+    loop_iteration: int
+    last_candle_time: int
+    loop_latency_ms: float
+    updated_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds elapsed since the heartbeat was written."""
+        return max(0.0, time.time() - self.updated_at)
+
+    def is_alive(self, stale_after_seconds: float = 30.0) -> bool:
+        """Check whether the heartbeat indicates a live bot.
+
+        Args:
+            stale_after_seconds: Maximum heartbeat age before the bot is
+                considered hung or dead
+
+        Returns:
+            True if the bot reported running, the heartbeat is fresh and the
+            writing process still exists
+        """
+        if self.status != "running":
+            return False
+        if self.age_seconds > stale_after_seconds:
+            return False
+        try:
+            return psutil.pid_exists(self.pid)
+        except Exception:
+            return False
+
+    def to_dict(self) -> dict:
+        """Convert the record to a JSON-serializable dictionary."""
+        return {
+            "pid": self.pid,
+            "mode": self.mode,
+            "status": self.status,
+            "loop_iteration": self.loop_iteration,
+            "last_candle_time": self.last_candle_time,
+            "loop_latency_ms": self.loop_latency_ms,
+            "updated_at": self.updated_at,
+            "age_seconds": self.age_seconds
+        }
+
+
+class HeartbeatWriter:
+    """Publishes heartbeat records into a memory-mapped file.
+
+    Only one writer (the bot process) should own a heartbeat file. Writes are
+    plain memory stores into the mapped page, so calling ``beat`` on every
+    loop iteration adds no measurable overhead.
+    """
+
+    def __init__(self, path: str, mode: str, pid: Optional[int] = None):
+        """Create or reuse the heartbeat file and map it into memory.
+
+        Args:
+            path: Path to the heartbeat file
+            mode: Bot run mode written into every record
+            pid: Process ID to publish (defaults to the current process)
+        """
+        self.path = path
+        self.mode = mode
+        self.pid = pid if pid is not None else os.getpid()
+        self._seq = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._file = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, "a+b")
+        self._file.truncate(HEARTBEAT_SIZE)
+        self._file.flush()
+        self._mm = mmap.mmap(self._file.fileno(), HEARTBEAT_SIZE)
+
+        self._write(STATUS_RUNNING, 0, 0, 0.0)
+
+    def beat(self, loop_iteration: int, last_candle_time: int = 0, loop_latency_ms: float = 0.0) -> None:
+        """Publish a running heartbeat.
+
+        Args:
+            loop_iteration: Number of completed event loop iterations
+            last_candle_time: Open time (ms) of the latest candle processed
+            loop_latency_ms: Duration of the last loop iteration in milliseconds
+        """
+        self._write(STATUS_RUNNING, loop_iteration, last_candle_time, loop_latency_ms)
+
+    def mark_stopped(self, loop_iteration: int = 0, last_candle_time: int = 0) -> None:
+        """Publish a final heartbeat that marks the bot as stopped.
+
+        Args:
+            loop_iteration: Final loop iteration count
+            last_candle_time: Open time (ms) of the latest candle processed
+        """
+        self._write(STATUS_STOPPED, loop_iteration, last_candle_time, 0.0)
+
+    def close(self) -> None:
+        """Unmap and close the heartbeat file."""
+        if self._mm is not None:
+            try:
+                self._mm.flush()
+                self._mm.close()
+            except Exception as e:
+                logger.debug(f"Error closing heartbeat mapping: {e}")
+            self._mm = None
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception as e:
+                logger.debug(f"Error closing heartbeat file: {e}")
+            self._file = None
+
+    def _write(self, status: int, loop_iteration: int, last_candle_time: int, loop_latency_ms: float) -> None:
+        """Write one record using the seqlock protocol."""
+        if self._mm is None:
+            return
+
+        # Odd sequence number marks the record as being written
+        self._seq += 1
+        _HEADER.pack_into(self._mm, 0, HEARTBEAT_MAGIC, HEARTBEAT_VERSION, status, self._seq)
+        _PAYLOAD.pack_into(
+            self._mm,
+            _HEADER.size,
+            self.pid,
+            self.mode.encode("ascii", errors="replace")[:8],
+            int(loop_iteration),
+            int(last_candle_time),
+            float(loop_latency_ms),
+            time.time()
+        )
+        self._seq += 1
+        _SEQ.pack_into(self._mm, _SEQ_OFFSET, self._seq)
+
+
+def read_heartbeat(path: str, max_retries: int = 3) -> Optional[HeartbeatRecord]:
+    """Read the latest heartbeat record.
+
+    Args:
+        path: Path to the heartbeat file
+        max_retries: Number of attempts if a write is caught in progress
+
+    Returns:
+        HeartbeatRecord, or None if the file is missing, invalid or could not
+        be read consistently
+    """
+    for _ in range(max_retries):
+        try:
+            # Unbuffered, so the second seq read goes to the file, not a cached copy
+            with open(path, "rb", buffering=0) as f:
+                data = f.read(HEARTBEAT_SIZE)
+                f.seek(_SEQ_OFFSET)
+                seq_after = f.read(_SEQ.size)
+        except (FileNotFoundError, OSError):
+            return None
+
+        if len(data) < HEARTBEAT_SIZE or len(seq_after) < _SEQ.size:
+            return None
+
+        magic, version, status, seq = _HEADER.unpack_from(data, 0)
+        if magic != HEARTBEAT_MAGIC or version != HEARTBEAT_VERSION:
+            return None
+
+        if seq % 2 == 1 or _SEQ.unpack(seq_after)[0] != seq:
+            # Writer was mid-update or wrote during the copy, try again
+            continue
+
+        pid, mode, loop_iteration, last_candle_time, loop_latency_ms, updated_at = _PAYLOAD.unpack_from(
+            data, _HEADER.size
+        )
+        return HeartbeatRecord(
+            pid=pid,
+            mode=mode.rstrip(b"\x00").decode("ascii", errors="replace"),
+            status="running" if status == STATUS_RUNNING else "stopped",
+            loop_iteration=loop_iteration,
+            last_candle_time=last_candle_time,
+            loop_latency_ms=loop_latency_ms,
+            updated_at=updated_at
+        )
+
+    return None
@@ -1,30 +1,70 @@
 """Technical indicator calculations for Binance Futures Trading Bot."""
 
-from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import Any, List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 import hashlib
+import threading
 import time
+from src import instrumentation
 from src.models import Candle
 
 
+# Indicator values kept by the shared cache (least recently used evicted first)
+DEFAULT_CACHE_ENTRIES = 2048
+
+# Squeeze momentum (LazyBear): band/regression length and band multipliers
+SQUEEZE_LENGTH = 20
+SQUEEZE_BB_MULT = 2.0
+SQUEEZE_KC_MULT = 1.5
+
+
 class IndicatorCache:
-    """Cache for indicator calculations to avoid redundant computations.
+    """Per-bar memoization of indicator values shared by every module.
     
-    Uses candle data hash and parameters as cache key.
-    Automatically invalidates cache when new data arrives.
+    Entries are keyed by content rather than by time: the active symbol
+    scope, the window bounds (first and last open time and candle count,
+    which also pin down the timeframe), a fingerprint of the first and last
+    candle and the indicator parameters. Windows that share their last
+    candle but start elsewhere, or an in-progress candle that keeps
+    changing, therefore get separate entries. Entries are evicted least
+    recently used first, and a symbol's entries are dropped when a new
+    candle of it closes.
     """
     
-    def __init__(self, ttl_seconds: int = 60):
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES, ttl_seconds: Optional[float] = None):
         """Initialize the indicator cache.
         
         Args:
-            ttl_seconds: Time-to-live for cache entries in seconds
+            max_entries: Maximum number of cached values
+            ttl_seconds: Optional time-to-live for entries in seconds
+                (None = entries live until evicted or invalidated)
         """
-        self._cache: Dict[str, Tuple[any, float]] = {}
+        self._cache: "OrderedDict[tuple, Tuple[Any, float]]" = OrderedDict()
+        self._max_entries = max_entries
         self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._scope = threading.local()
+        self.hits = 0
+        self.misses = 0
+    
+    @contextmanager
+    def scope(self, symbol: str):
+        """Attribute lookups on the current thread to a symbol.
+        
+        Args:
+            symbol: Trading symbol the candles inside the block belong to
+        """
+        previous = getattr(self._scope, "symbol", None)
+        self._scope.symbol = symbol
+        try:
+            yield
+        finally:
+            self._scope.symbol = previous
     
-    def _generate_key(self, candles: List[Candle], indicator_name: str, **params) -> str:
+    def _generate_key(self, candles: List[Candle], indicator_name: str, **params) -> tuple:
         """Generate a cache key from candles and parameters.
         
         Args:
@@ -33,23 +73,24 @@ class IndicatorCache:
             **params: Additional parameters for the indicator
             
         Returns:
-            Cache key as string
+            Cache key as tuple (symbol scope second, for invalidation)
         """
-        # Create a hash of the candle data (timestamps and closes)
+        symbol = getattr(self._scope, "symbol", None)
+        param_key = tuple(sorted(params.items()))
         if not candles:
-            return f"{indicator_name}_empty"
-        
-        # Use last candle timestamp and count as quick identifier
-        last_timestamp = candles[-1].timestamp
-        candle_count = len(candles)
-        
-        # Include parameters in key
-        param_str = "_".join(f"{k}={v}" for k, v in sorted(params.items()))
-        
-        return f"{indicator_name}_{last_timestamp}_{candle_count}_{param_str}"
+            return (indicator_name, symbol, 0, param_key)
+        
+        first = candles[0]
+        last = candles[-1]
+        return (
+            indicator_name, symbol, len(candles),
+            first.timestamp, last.timestamp,
+            first.close, last.open, last.high, last.low, last.close, last.volume,
+            param_key
+        )
     
-    def get(self, candles: List[Candle], indicator_name: str, **params) -> Optional[any]:
-        """Get cached indicator value if available and not expired.
+    def get(self, candles: List[Candle], indicator_name: str, **params) -> Optional[Any]:
+        """Get cached indicator value if available.
         
         Args:
             candles: List of candles
@@ -61,19 +102,22 @@ class IndicatorCache:
         """
         key = self._generate_key(candles, indicator_name, **params)
         
-        if key in self._cache:
-            value, timestamp = self._cache[key]
-            
-            # Check if cache entry is still valid
-            if time.time() - timestamp < self._ttl:
-                return value
-            else:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and (self._ttl is None or time.time() - entry[1] < self._ttl):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                instrumentation.increment(f"cache.indicator.{indicator_name}.hit")
+                return entry[0]
+            if entry is not None:
                 # Remove expired entry
                 del self._cache[key]
+            self.misses += 1
         
+        instrumentation.increment(f"cache.indicator.{indicator_name}.miss")
         return None
     
-    def set(self, candles: List[Candle], indicator_name: str, value: any, **params):
+    def set(self, candles: List[Candle], indicator_name: str, value: Any, **params):
         """Store indicator value in cache.
         
         Args:
@@ -83,35 +127,148 @@ class IndicatorCache:
             **params: Additional parameters for the indicator
         """
         key = self._generate_key(candles, indicator_name, **params)
-        self._cache[key] = (value, time.time())
+        with self._lock:
+            self._cache[key] = (value, time.time())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+    
+    def invalidate(self, symbol: Optional[str] = None) -> int:
+        """Drop the entries computed for a symbol (e.g. when a new candle closes).
+        
+        Args:
+            symbol: Symbol scope to drop (None drops unscoped entries)
+            
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._cache if key[1] == symbol]
+            for key in keys:
+                del self._cache[key]
+        return len(keys)
     
     def clear(self):
-        """Clear all cached values."""
-        self._cache.clear()
+        """Clear all cached values and reset the hit/miss counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
     
     def invalidate_old_entries(self):
-        """Remove expired cache entries."""
+        """Remove expired cache entries (no-op without a TTL)."""
+        if self._ttl is None:
+            return
         current_time = time.time()
-        expired_keys = [
-            key for key, (_, timestamp) in self._cache.items()
-            if current_time - timestamp >= self._ttl
-        ]
-        
-        for key in expired_keys:
-            del self._cache[key]
+        with self._lock:
+            expired_keys = [
+                key for key, (_, timestamp) in self._cache.items()
+                if current_time - timestamp >= self._ttl
+            ]
+            
+            for key in expired_keys:
+                del self._cache[key]
     
-    def get_cache_stats(self) -> Dict[str, int]:
+    def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics.
         
         Returns:
-            Dictionary with cache size and other stats
+            Dictionary with cache size, capacity, hits, misses and hit rate
         """
+        lookups = self.hits + self.misses
         return {
             'size': len(self._cache),
-            'ttl_seconds': self._ttl
+            'max_entries': self._max_entries,
+            'ttl_seconds': self._ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
         }
 
 
+def rolling_linreg(values: np.ndarray, length: int) -> np.ndarray:
+    """Least-squares line through each trailing window, evaluated at its last bar.
+    
+    Equivalent to Pine's linreg(source, length, 0). With x = 0..length-1 the
+    x sums are constants, so each window only needs sum(y) and sum(x * y):
+    slope = (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2), intercept = (Sy - slope*Sx) / n.
+    
+    Args:
+        values: Input series
+        length: Window length (at least 2)
+        
+    Returns:
+        Regression value per bar; NaN until the window is full or while it
+        contains a NaN
+    """
+    result = np.full(len(values), np.nan)
+    if length < 2 or len(values) < length:
+        return result
+    
+    windows = np.lib.stride_tricks.sliding_window_view(np.asarray(values, dtype=float), length)
+    sum_x = length * (length - 1) / 2
+    sum_xx = (length - 1) * length * (2 * length - 1) / 6
+    sum_y = windows.sum(axis=1)
+    sum_xy = windows @ np.arange(length, dtype=float)
+    slope = (length * sum_xy - sum_x * sum_y) / (length * sum_xx - sum_x ** 2)
+    intercept = (sum_y - slope * sum_x) / length
+    result[length - 1:] = intercept + slope * (length - 1)
+    return result
+
+
+def squeeze_delta(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                  length: int = SQUEEZE_LENGTH) -> np.ndarray:
+    """Close minus the average of the range midpoint and the SMA (the series LazyBear regresses).
+    
+    Returns:
+        close - avg(avg(highest high, lowest low), SMA(close)) per bar; NaN
+        until `length` bars are available
+    """
+    result = np.full(len(close), np.nan)
+    if len(close) < length:
+        return result
+    
+    highest = np.lib.stride_tricks.sliding_window_view(high, length).max(axis=1)
+    lowest = np.lib.stride_tricks.sliding_window_view(low, length).min(axis=1)
+    sma = np.lib.stride_tricks.sliding_window_view(close, length).mean(axis=1)
+    result[length - 1:] = close[length - 1:] - ((highest + lowest) / 2 + sma) / 2
+    return result
+
+
+def squeeze_momentum_series(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                            length: int = SQUEEZE_LENGTH) -> np.ndarray:
+    """LazyBear squeeze momentum of every bar: linreg(squeeze_delta, length, 0).
+    
+    Each value depends only on the last 2 * length - 1 bars, so the series
+    over a long history equals the values computed on any trailing window
+    that long.
+    
+    Args:
+        high: Highs
+        low: Lows
+        close: Closes
+        length: Range, SMA and regression length
+        
+    Returns:
+        Momentum per bar; NaN for the first 2 * length - 2 bars
+    """
+    return rolling_linreg(squeeze_delta(high, low, close, length), length)
+
+
+def squeeze_color(momentum: float, previous: Optional[float]) -> str:
+    """Histogram color of a momentum value given the previous bar's value.
+    
+    Returns:
+        'green' (positive, rising), 'blue' (positive, falling),
+        'maroon' (negative, falling) or 'gray' (negative, rising)
+    """
+    if previous is None or not np.isfinite(previous):
+        return 'green' if momentum > 0 else 'maroon'
+    if momentum > 0:
+        return 'green' if momentum > previous else 'blue'
+    return 'maroon' if momentum < previous else 'gray'
+
+
 class IndicatorCalculator:
     """Static methods for calculating technical indicators.
     
@@ -125,19 +282,30 @@ class IndicatorCalculator:
     _cache: Optional[IndicatorCache] = None
     
     @classmethod
-    def enable_caching(cls, ttl_seconds: int = 60):
+    def enable_caching(cls, max_entries: int = DEFAULT_CACHE_ENTRIES, ttl_seconds: Optional[float] = None):
         """Enable indicator caching.
         
+        Keeps the existing cache (and its counters) if one is already
+        enabled, so every module shares one cache.
+        
         Args:
-            ttl_seconds: Time-to-live for cache entries
+            max_entries: Maximum number of cached values
+            ttl_seconds: Optional time-to-live for cache entries
         """
-        cls._cache = IndicatorCache(ttl_seconds=ttl_seconds)
+        if cls._cache is not None and cls._cache._max_entries == max_entries and cls._cache._ttl == ttl_seconds:
+            return
+        cls._cache = IndicatorCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
     
     @classmethod
     def disable_caching(cls):
         """Disable indicator caching."""
         cls._cache = None
     
+    @classmethod
+    def caching_enabled(cls) -> bool:
+        """Check whether indicator caching is enabled."""
+        return cls._cache is not None
+    
     @classmethod
     def clear_cache(cls):
         """Clear all cached indicators."""
@@ -145,7 +313,35 @@ class IndicatorCalculator:
             cls._cache.clear()
     
     @classmethod
-    def get_cache_stats(cls) -> Optional[Dict[str, int]]:
+    def cache_scope(cls, symbol: str):
+        """Attribute indicator calculations inside the block to a symbol.
+        
+        Args:
+            symbol: Trading symbol
+            
+        Returns:
+            Context manager (a no-op when caching is disabled)
+        """
+        if cls._cache is None:
+            return nullcontext()
+        return cls._cache.scope(symbol)
+    
+    @classmethod
+    def invalidate(cls, symbol: Optional[str] = None) -> int:
+        """Drop a symbol's cached indicators once a new candle has closed.
+        
+        Args:
+            symbol: Symbol whose entries are dropped (None = unscoped entries)
+            
+        Returns:
+            Number of entries removed
+        """
+        if cls._cache is None:
+            return 0
+        return cls._cache.invalidate(symbol)
+    
+    @classmethod
+    def get_cache_stats(cls) -> Optional[Dict[str, Any]]:
         """Get cache statistics.
         
         Returns:
@@ -391,8 +587,11 @@ class IndicatorCalculator:
     def calculate_squeeze_momentum(candles: List[Candle]) -> Dict[str, any]:
         """Calculate Squeeze Momentum Indicator using LazyBear's methodology.
         
-        The squeeze occurs when Bollinger Bands are inside Keltner Channels.
-        Momentum is calculated using linear regression of price vs time.
+        The squeeze occurs when Bollinger Bands (20, 2 std) are inside Keltner
+        Channels (20, 1.5 x mean true range). Momentum is the 20-bar linear
+        regression of close - avg(avg(highest high, lowest low), SMA(close))
+        (see squeeze_momentum_series). Only the last 2 * 20 candles are read;
+        with fewer than 39 candles the regression covers the bars available.
         
         Args:
             candles: List of Candle objects (needs at least 20 candles for BB)
@@ -403,83 +602,54 @@ class IndicatorCalculator:
                 - is_squeezed: Whether squeeze is active (bool)
                 - color: Momentum color - 'green', 'maroon', 'blue', 'gray' (str)
         """
-        if len(candles) < 20:
+        # Check cache (callers get their own copy of the dictionary)
+        if IndicatorCalculator._cache:
+            cached = IndicatorCalculator._cache.get(candles, 'squeeze')
+            if cached is not None:
+                return dict(cached)
+        
+        length = SQUEEZE_LENGTH
+        if len(candles) < length:
             return {
                 'value': 0.0,
                 'is_squeezed': False,
                 'color': 'gray'
             }
         
-        # Convert to pandas DataFrame
-        df = pd.DataFrame([{
-            'high': c.high,
-            'low': c.low,
-            'close': c.close
-        } for c in candles])
-        
-        # Bollinger Bands (20-period, 2 std dev)
-        bb_period = 20
-        bb_std = 2
-        df['bb_basis'] = df['close'].rolling(window=bb_period).mean()
-        df['bb_std'] = df['close'].rolling(window=bb_period).std()
-        df['bb_upper'] = df['bb_basis'] + (bb_std * df['bb_std'])
-        df['bb_lower'] = df['bb_basis'] - (bb_std * df['bb_std'])
-        
-        # Keltner Channels (20-period, 1.5 × ATR)
-        kc_period = 20
-        kc_mult = 1.5
-        
-        # Calculate ATR for Keltner Channels
-        df['tr'] = df.apply(
-            lambda row: max(
-                row['high'] - row['low'],
-                abs(row['high'] - df['close'].shift(1).loc[row.name]) if row.name > 0 else 0,
-                abs(row['low'] - df['close'].shift(1).loc[row.name]) if row.name > 0 else 0
-            ),
-            axis=1
-        )
-        df['atr'] = df['tr'].rolling(window=kc_period).mean()
-        
-        df['kc_basis'] = df['close'].rolling(window=kc_period).mean()
-        df['kc_upper'] = df['kc_basis'] + (kc_mult * df['atr'])
-        df['kc_lower'] = df['kc_basis'] - (kc_mult * df['atr'])
-        
-        # Determine if squeeze is on (BB inside KC)
-        last_row = df.iloc[-1]
-        is_squeezed = (
-            last_row['bb_upper'] < last_row['kc_upper'] and
-            last_row['bb_lower'] > last_row['kc_lower']
-        )
-        
-        # Calculate momentum using linear regression
-        # Use highest high and lowest low over last 20 periods
-        lookback = min(20, len(df))
-        recent_data = df.tail(lookback)
-        
-        highest_high = recent_data['high'].max()
-        lowest_low = recent_data['low'].min()
-        avg_hl = (highest_high + lowest_low) / 2
-        avg_close = recent_data['close'].mean()
-        
-        # Simple momentum calculation
-        momentum = df['close'].iloc[-1] - avg_hl
-        
-        # Determine color based on momentum and previous momentum
-        if len(df) > 1:
-            prev_momentum = df['close'].iloc[-2] - avg_hl
-            
-            if momentum > 0:
-                color = 'green' if momentum > prev_momentum else 'blue'
-            else:
-                color = 'maroon' if momentum < prev_momentum else 'gray'
-        else:
-            color = 'green' if momentum > 0 else 'maroon'
-        
-        return {
-            'value': float(momentum),
+        recent = candles[-2 * length:]
+        high = np.array([c.high for c in recent])
+        low = np.array([c.low for c in recent])
+        close = np.array([c.close for c in recent])
+        
+        # True range (high - low on the first bar, which has no previous close)
+        tr = high - low
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])))
+        
+        # Bollinger Bands and Keltner Channels of the last bar
+        window = close[-length:]
+        basis = window.mean()
+        bb_dev = SQUEEZE_BB_MULT * window.std(ddof=1)
+        kc_range = SQUEEZE_KC_MULT * tr[-length:].mean()
+        is_squeezed = bb_dev < kc_range
+        
+        # Momentum: linreg of the delta series (shorter fit while warming up)
+        delta = squeeze_delta(high, low, close, length)[length - 1:]
+        fit = min(length, len(delta))
+        momentum = rolling_linreg(delta, fit)[fit - 1:] if fit > 1 else delta
+        value = float(momentum[-1])
+        previous = float(momentum[-2]) if len(momentum) > 1 else None
+        
+        result = {
+            'value': value,
             'is_squeezed': bool(is_squeezed),
-            'color': color
+            'color': squeeze_color(value, previous)
         }
+        
+        # Store in cache
+        if IndicatorCalculator._cache:
+            IndicatorCalculator._cache.set(candles, 'squeeze', dict(result))
+        
+        return result
     
     @staticmethod
     def determine_trend(candles: List[Candle], vwap: float) -> str:
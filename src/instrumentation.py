@@ -0,0 +1,515 @@
+"""Hot-path instrumentation for the trading loop.
+
+Provides per-stage latency histograms (optionally split per symbol) and
+counters for REST calls and cache hits. Instrumentation is process-wide and
+disabled by default; when disabled every entry point returns after a single
+attribute check so the trading loop pays almost nothing for it.
+
+Usage:
+    from src import instrumentation
+
+    with instrumentation.timer("strategy.update_indicators"):
+        ...
+
+    @instrumentation.timed("order.place_market_order")
+    def place_market_order(...):
+        ...
+
+    instrumentation.increment("rest.futures_klines")
+
+Snapshots are exported to the dashboard state file, a local plain-text
+endpoint and the HealthMonitor health check.
+"""
+
+import functools
+import json
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Histogram layout: values are recorded in microseconds into log-linear
+# buckets with 16 sub-buckets per power of two (~6% relative precision),
+# the same layout HdrHistogram uses with 1 significant digit.
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS  # 32
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT // 2  # 16
+BUCKET_COUNT = 640  # Covers values up to ~2^40 us (~12 days)
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+def _bucket_index(value_us: int) -> int:
+    """Map a microsecond value to its histogram bucket."""
+    if value_us < SUB_BUCKET_COUNT:
+        return max(value_us, 0)
+    exponent = value_us.bit_length() - SUB_BUCKET_BITS
+    index = exponent * SUB_BUCKET_HALF + (value_us >> exponent)
+    return min(index, BUCKET_COUNT - 1)
+
+
+def _bucket_midpoint(index: int) -> float:
+    """Return the representative (midpoint) microsecond value of a bucket."""
+    if index < SUB_BUCKET_COUNT:
+        return float(index)
+    exponent = index // SUB_BUCKET_HALF - 1
+    mantissa = index - exponent * SUB_BUCKET_HALF
+    low = mantissa << exponent
+    high = ((mantissa + 1) << exponent) - 1
+    return (low + high) / 2.0
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear latency histogram.
+
+    Recording is O(1) and allocation-free; percentiles are accurate to the
+    bucket width (~6%) and always clamped to the observed min/max.
+    """
+
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        """Record one duration.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        value_us = int(round(seconds * 1_000_000))
+        if value_us < 0:
+            value_us = 0
+
+        self.counts[_bucket_index(value_us)] += 1
+        if self.count == 0 or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+        self.count += 1
+        self.total_us += value_us
+
+    def percentile(self, percent: float) -> float:
+        """Get a percentile of the recorded durations.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Duration in milliseconds (0.0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count == 0:
+                continue
+            cumulative += bucket_count
+            if cumulative >= target:
+                value_us = min(max(_bucket_midpoint(index), self.min_us), self.max_us)
+                return value_us / 1000.0
+
+        return self.max_us / 1000.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """Summarize the histogram.
+
+        Returns:
+            Dictionary with count, total/mean/min/max and percentile latencies in ms
+        """
+        summary = {
+            "count": self.count,
+            "total_ms": self.total_us / 1000.0,
+            "mean_ms": (self.total_us / self.count / 1000.0) if self.count else 0.0,
+            "min_ms": self.min_us / 1000.0,
+            "max_ms": self.max_us / 1000.0,
+        }
+        for percent in DEFAULT_PERCENTILES:
+            summary[f"p{percent:g}_ms"] = self.percentile(percent)
+        return summary
+
+
+class _NullContext:
+    """Shared no-op context manager returned while instrumentation is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class _StageTimer:
+    """Context manager timing one stage execution."""
+
+    __slots__ = ("_registry", "_stage", "_symbol", "_start")
+
+    def __init__(self, registry: "Instrumentation", stage: str, symbol: Optional[str]):
+        self._registry = registry
+        self._stage = stage
+        self._symbol = symbol
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._registry.record(self._stage, time.perf_counter() - self._start, self._symbol)
+        return False
+
+
+class _SymbolScope:
+    """Context manager setting the default symbol label for the current thread."""
+
+    __slots__ = ("_local", "_symbol", "_previous")
+
+    def __init__(self, local: threading.local, symbol: Optional[str]):
+        self._local = local
+        self._symbol = symbol
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(self._local, "symbol", None)
+        self._local.symbol = self._symbol
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._local.symbol = self._previous
+        return False
+
+
+class Instrumentation:
+    """Registry of stage timers and counters.
+
+    Every timer and counter is tracked in aggregate and, when a symbol label
+    is given (explicitly or through symbol_scope), per symbol as well.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """Initialize the registry.
+
+        Args:
+            enabled: Whether recording starts enabled
+        """
+        self.enabled = enabled
+        self._timers: Dict[Tuple[str, Optional[str]], LatencyHistogram] = {}
+        self._counters: Dict[Tuple[str, Optional[str]], int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_at = time.time()
+
+    def reset(self) -> None:
+        """Drop all recorded timers and counters."""
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self._started_at = time.time()
+
+    def _current_symbol(self, symbol: Optional[str]) -> Optional[str]:
+        if symbol is not None:
+            return symbol
+        return getattr(self._local, "symbol", None)
+
+    def timer(self, stage: str, symbol: Optional[str] = None):
+        """Time a block of code.
+
+        Args:
+            stage: Stage name (dotted, e.g. "strategy.update_indicators")
+            symbol: Optional symbol label (defaults to the active symbol_scope)
+
+        Returns:
+            Context manager (a shared no-op when disabled)
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _StageTimer(self, stage, self._current_symbol(symbol))
+
+    def symbol_scope(self, symbol: str):
+        """Label all timers and counters inside the block with a symbol.
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            Context manager (a shared no-op when disabled)
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _SymbolScope(self._local, symbol)
+
+    def record(self, stage: str, seconds: float, symbol: Optional[str] = None) -> None:
+        """Record a stage duration measured elsewhere.
+
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+            symbol: Optional symbol label
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            keys = ((stage, None), (stage, symbol)) if symbol else ((stage, None),)
+            for key in keys:
+                histogram = self._timers.get(key)
+                if histogram is None:
+                    histogram = self._timers[key] = LatencyHistogram()
+                histogram.record(seconds)
+
+    def increment(self, name: str, value: int = 1, symbol: Optional[str] = None) -> None:
+        """Increment a counter.
+
+        Args:
+            name: Counter name (e.g. "rest.futures_klines", "cache.data.hit")
+            value: Amount to add
+            symbol: Optional symbol label (defaults to the active symbol_scope)
+        """
+        if not self.enabled:
+            return
+
+        symbol = self._current_symbol(symbol)
+        with self._lock:
+            self._counters[(name, None)] = self._counters.get((name, None), 0) + value
+            if symbol:
+                self._counters[(name, symbol)] = self._counters.get((name, symbol), 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Build a JSON-serializable snapshot of all metrics.
+
+        Returns:
+            Dictionary with timers, counters and cache hit rates
+        """
+        with self._lock:
+            timer_items = [(key, histogram.to_dict()) for key, histogram in self._timers.items()]
+            counter_items = list(self._counters.items())
+            started_at = self._started_at
+
+        timers: Dict[str, Dict[str, Any]] = {}
+        for (stage, symbol), summary in sorted(timer_items, key=lambda item: (item[0][0], item[0][1] or "")):
+            entry = timers.setdefault(stage, {"symbols": {}})
+            if symbol is None:
+                entry.update(summary)
+            else:
+                entry["symbols"][symbol] = summary
+
+        counters: Dict[str, Dict[str, Any]] = {}
+        for (name, symbol), value in sorted(counter_items, key=lambda item: (item[0][0], item[0][1] or "")):
+            entry = counters.setdefault(name, {"total": 0, "symbols": {}})
+            if symbol is None:
+                entry["total"] = value
+            else:
+                entry["symbols"][symbol] = value
+
+        cache_hit_rates = {}
+        for name, entry in counters.items():
+            if name.endswith(".hit"):
+                prefix = name[:-len(".hit")]
+                misses = counters.get(f"{prefix}.miss", {}).get("total", 0)
+                lookups = entry["total"] + misses
+                cache_hit_rates[prefix] = entry["total"] / lookups * 100.0 if lookups else 0.0
+
+        return {
+            "enabled": self.enabled,
+            "timestamp": time.time(),
+            "uptime_seconds": time.time() - started_at,
+            "timers": timers,
+            "counters": counters,
+            "cache_hit_rates": cache_hit_rates,
+        }
+
+
+# Process-wide registry used by the module-level helpers
+_registry = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Get the process-wide instrumentation registry."""
+    return _registry
+
+
+def configure(enabled: bool) -> Instrumentation:
+    """Enable or disable instrumentation.
+
+    Args:
+        enabled: Whether to record timers and counters
+
+    Returns:
+        The process-wide registry
+    """
+    _registry.enabled = enabled
+    logger.info(f"Instrumentation {'enabled' if enabled else 'disabled'}")
+    return _registry
+
+
+def is_enabled() -> bool:
+    """Check whether instrumentation is recording."""
+    return _registry.enabled
+
+
+def timer(stage: str, symbol: Optional[str] = None):
+    """Time a block of code with the process-wide registry."""
+    if not _registry.enabled:
+        return _NULL_CONTEXT
+    return _registry.timer(stage, symbol)
+
+
+def symbol_scope(symbol: str):
+    """Label timers and counters inside the block with a symbol."""
+    if not _registry.enabled:
+        return _NULL_CONTEXT
+    return _registry.symbol_scope(symbol)
+
+
+def increment(name: str, value: int = 1, symbol: Optional[str] = None) -> None:
+    """Increment a counter in the process-wide registry."""
+    if _registry.enabled:
+        _registry.increment(name, value, symbol)
+
+
+def snapshot() -> Dict[str, Any]:
+    """Snapshot the process-wide registry."""
+    return _registry.snapshot()
+
+
+def timed(stage: str) -> Callable:
+    """Decorator timing every call of a function as a stage.
+
+    Args:
+        stage: Stage name
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _registry.enabled:
+                return func(*args, **kwargs)
+            with _registry.timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _format_labels(**labels: Optional[str]) -> str:
+    parts = [f'{key}="{value}"' for key, value in labels.items() if value is not None]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render_text(data: Optional[Dict[str, Any]] = None) -> str:
+    """Render a snapshot as plain text (Prometheus exposition style).
+
+    Args:
+        data: Snapshot to render (defaults to the process-wide registry)
+
+    Returns:
+        Text with one metric per line
+    """
+    if data is None:
+        data = snapshot()
+
+    lines = [
+        "# Trading bot instrumentation",
+        f"instrumentation_enabled {int(bool(data.get('enabled')))}",
+        f"instrumentation_uptime_seconds {data.get('uptime_seconds', 0.0):.3f}",
+    ]
+
+    def timer_lines(stage: str, symbol: Optional[str], summary: Dict[str, float]):
+        for percent in DEFAULT_PERCENTILES:
+            labels = _format_labels(stage=stage, symbol=symbol, quantile=f"{percent / 100:g}")
+            lines.append(f"stage_latency_ms{labels} {summary.get(f'p{percent:g}_ms', 0.0):.3f}")
+        labels = _format_labels(stage=stage, symbol=symbol)
+        lines.append(f"stage_latency_ms_max{labels} {summary.get('max_ms', 0.0):.3f}")
+        lines.append(f"stage_latency_ms_sum{labels} {summary.get('total_ms', 0.0):.3f}")
+        lines.append(f"stage_latency_ms_count{labels} {summary.get('count', 0)}")
+
+    for stage, entry in data.get("timers", {}).items():
+        if "count" in entry:
+            timer_lines(stage, None, entry)
+        for symbol, summary in entry.get("symbols", {}).items():
+            timer_lines(stage, symbol, summary)
+
+    for name, entry in data.get("counters", {}).items():
+        lines.append(f"counter_total{_format_labels(name=name)} {entry.get('total', 0)}")
+        for symbol, value in entry.get("symbols", {}).items():
+            lines.append(f"counter_total{_format_labels(name=name, symbol=symbol)} {value}")
+
+    for name, rate in data.get("cache_hit_rates", {}).items():
+        lines.append(f"cache_hit_rate_percent{_format_labels(cache=name)} {rate:.2f}")
+
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves the instrumentation snapshot as text (/) or JSON (/json)."""
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/json":
+            body = json.dumps(snapshot(), indent=2).encode("utf-8")
+            content_type = "application/json"
+        elif self.path in ("/", "/metrics"):
+            body = render_text().encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep scrapes out of the bot log
+        logger.debug("Metrics request: " + format % args)
+
+
+def start_text_endpoint(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the instrumentation snapshot on a local HTTP port.
+
+    The server runs on a daemon thread and only binds to localhost by default.
+
+    Args:
+        port: TCP port (0 picks a free port)
+        host: Interface to bind
+
+    Returns:
+        The running server (use server.server_address for the bound port)
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="instrumentation-endpoint", daemon=True)
+    thread.start()
+    logger.info(f"Instrumentation endpoint listening on http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def stop_text_endpoint(server: Optional[ThreadingHTTPServer]) -> None:
+    """Stop a server started with start_text_endpoint."""
+    if server is None:
+        return
+    try:
+        server.shutdown()
+        server.server_close()
+    except Exception as e:
+        logger.error(f"Error stopping instrumentation endpoint: {e}")
@@ -0,0 +1,193 @@
+"""Intrabar first-touch resolution on lower-timeframe candles.
+
+A 15m bar whose range spans both the stop and a take-profit level does not
+say which of the two was touched first. IntrabarResolver answers that from
+aligned 5m or 1m bars: given a position's stop and TP ladder it finds the
+first lower-timeframe bar touching any level with one vectorized search over
+the window, so an entire holding period is scanned in a single call instead
+of being stepped through bar by bar.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.candle_array import CANDLE_DTYPE, candles_to_array
+from src.models import Candle
+
+
+STOP = "STOP"
+TAKE_PROFIT = "TAKE_PROFIT"
+
+
+@dataclass
+class IntrabarTouch:
+    """First level touched inside a search window.
+
+    Attributes:
+        kind: STOP or TAKE_PROFIT
+        index: Index of the touching bar in the resolver arrays
+        timestamp: Open time of the touching bar in milliseconds
+        price: Fill price of the first touched level (the bar open when the
+            bar gapped through the level)
+        levels: Indices into the TP ladder touched on that bar, nearest
+            level first (empty for STOP)
+        ambiguous: True when the bar touched both the stop and a TP level and
+            the bar open could not decide the order
+    """
+    kind: str
+    index: int
+    timestamp: int
+    price: float
+    levels: Tuple[int, ...] = ()
+    ambiguous: bool = False
+
+
+class IntrabarResolver:
+    """Vectorized first-touch search over lower-timeframe candles."""
+
+    def __init__(self, candles: Union[np.ndarray, Iterable[Candle]]):
+        """Initialize IntrabarResolver.
+
+        Args:
+            candles: Lower-timeframe candles (structured CANDLE_DTYPE array or
+                Candle objects), sorted by timestamp
+        """
+        if not isinstance(candles, np.ndarray):
+            candles = candles_to_array(candles)
+        elif candles.dtype != CANDLE_DTYPE:
+            candles = candles.astype(CANDLE_DTYPE)
+
+        self.timestamps = np.ascontiguousarray(candles["timestamp"])
+        self.open = np.ascontiguousarray(candles["open"])
+        self.high = np.ascontiguousarray(candles["high"])
+        self.low = np.ascontiguousarray(candles["low"])
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def window(self, start_ms: int, end_ms: Optional[int] = None) -> Tuple[int, int]:
+        """Return the index range of bars opening in [start_ms, end_ms).
+
+        Args:
+            start_ms: Window start in milliseconds (inclusive)
+            end_ms: Window end in milliseconds (exclusive), None for open-ended
+
+        Returns:
+            (first, last) indices suitable for slicing
+        """
+        first = int(np.searchsorted(self.timestamps, start_ms, side="left"))
+        if end_ms is None:
+            return first, len(self.timestamps)
+        last = int(np.searchsorted(self.timestamps, end_ms, side="left"))
+        return first, max(first, last)
+
+    def covers(self, start_ms: int, end_ms: Optional[int] = None) -> bool:
+        """Check whether any lower-timeframe bar opens inside the window.
+
+        Args:
+            start_ms: Window start in milliseconds (inclusive)
+            end_ms: Window end in milliseconds (exclusive)
+
+        Returns:
+            True if the window contains at least one bar
+        """
+        first, last = self.window(start_ms, end_ms)
+        return last > first
+
+    def first_touch(
+        self,
+        side: str,
+        stop: Optional[float],
+        take_profits: Sequence[float],
+        start_ms: int,
+        end_ms: Optional[int] = None
+    ) -> Optional[IntrabarTouch]:
+        """Find the first bar in the window touching the stop or any TP level.
+
+        A bar that touches both the stop and a TP level is resolved with its
+        open: if the open is already through one of the levels that level came
+        first, otherwise the stop is assumed to come first (the conservative
+        choice, since the path inside the bar is unknown).
+
+        Args:
+            side: Position side ("LONG" or "SHORT")
+            stop: Stop price, or None/0 for no stop
+            take_profits: TP ladder prices (any order)
+            start_ms: Window start in milliseconds (inclusive)
+            end_ms: Window end in milliseconds (exclusive), None for open-ended
+
+        Returns:
+            IntrabarTouch for the first touch, or None if nothing was touched
+
+        Raises:
+            ValueError: If side is invalid
+        """
+        if side not in ("LONG", "SHORT"):
+            raise ValueError(f"side must be 'LONG' or 'SHORT', got {side}")
+
+        first, last = self.window(start_ms, end_ms)
+        if last <= first:
+            return None
+
+        is_long = side == "LONG"
+        high = self.high[first:last]
+        low = self.low[first:last]
+        targets = np.asarray(take_profits, dtype=float).reshape(-1)
+
+        if stop:
+            stop_hit = low <= stop if is_long else high >= stop
+        else:
+            stop_hit = np.zeros(last - first, dtype=bool)
+
+        if len(targets):
+            tp_hit = high[:, None] >= targets if is_long else low[:, None] <= targets
+            any_tp = tp_hit.any(axis=1)
+        else:
+            tp_hit = None
+            any_tp = np.zeros(last - first, dtype=bool)
+
+        touched = stop_hit | any_tp
+        if not touched.any():
+            return None
+
+        j = int(np.argmax(touched))
+        index = first + j
+        bar_open = float(self.open[index])
+        timestamp = int(self.timestamps[index])
+
+        take_profit_first = False
+        ambiguous = False
+        if any_tp[j] and not stop_hit[j]:
+            take_profit_first = True
+        elif any_tp[j] and stop_hit[j]:
+            opened_through_stop = bar_open <= stop if is_long else bar_open >= stop
+            opened_through_tp = bool(np.any(bar_open >= targets if is_long else bar_open <= targets))
+            if opened_through_tp and not opened_through_stop:
+                take_profit_first = True
+            elif not opened_through_stop:
+                ambiguous = True
+
+        if take_profit_first:
+            levels = np.flatnonzero(tp_hit[j])
+            # Nearest level first: that is the order price reached them in
+            levels = levels[np.argsort(targets[levels] if is_long else -targets[levels], kind="stable")]
+            nearest = float(targets[levels[0]])
+            price = max(bar_open, nearest) if is_long else min(bar_open, nearest)
+            return IntrabarTouch(
+                kind=TAKE_PROFIT,
+                index=index,
+                timestamp=timestamp,
+                price=price,
+                levels=tuple(int(level) for level in levels)
+            )
+
+        price = min(bar_open, float(stop)) if is_long else max(bar_open, float(stop))
+        return IntrabarTouch(
+            kind=STOP,
+            index=index,
+            timestamp=timestamp,
+            price=price,
+            ambiguous=ambiguous
+        )
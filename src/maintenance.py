@@ -0,0 +1,350 @@
+"""Scheduled data retention and compaction.
+
+Runs on a background thread every ``data_cleanup_interval_hours`` while the
+bot trades in PAPER or LIVE mode:
+
+- trims in-memory candle buffers by time and releases symbols no longer traded
+- evicts expired historical-data cache entries
+- gzips rotated log files and removes stale ``.tmp`` files left by
+  interrupted atomic writes (state snapshot, candle store)
+- rolls old candles in the candle store up into coarser timeframes
+  (5m -> 15m -> 1h -> 4h), each tier after twice the age of the previous one
+
+Each pass is timed (wall and thread CPU) and its byte counts are recorded in
+the instrumentation registry. Every step is isolated, so a failing step is
+logged and the remaining steps still run; nothing here ever raises into the
+trading loop.
+"""
+
+import gzip
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from src import instrumentation
+from src.candle_array import aggregate_ohlcv, merge_candle_arrays, timeframe_to_ms
+from src.chart_data_service import CandleStore
+
+
+logger = logging.getLogger(__name__)
+
+
+# Timeframe each stored timeframe is rolled up into
+ROLLUP_TIMEFRAMES = {"5m": "15m", "15m": "1h", "1h": "4h"}
+
+# Days of in-memory candles kept per timeframe (full buffers are never cut)
+BUFFER_LOOKBACK_DAYS = 7
+
+# Temporary files younger than this may belong to a write in progress
+STALE_TMP_SECONDS = 3600
+
+# Rotated log files (TimedRotatingFileHandler suffix "%Y-%m-%d")
+_ROTATED_LOG = re.compile(r"\.log\.\d{4}-\d{2}-\d{2}$")
+
+
+@dataclass
+class MaintenanceReport:
+    """Outcome and cost of one maintenance pass.
+
+    Attributes:
+        started_at: Unix timestamp (seconds) when the pass started
+        wall_s: Elapsed wall-clock time in seconds
+        cpu_s: CPU time spent by the maintenance thread in seconds
+        candles_trimmed: In-memory candles removed
+        symbols_dropped: Symbols whose buffers were released
+        cache_entries_evicted: Expired cache entries removed
+        logs_compressed: Rotated log files gzipped
+        temp_files_removed: Stale temporary files removed
+        candles_rolled_up: Stored candles folded into a coarser timeframe
+        bytes_read: Bytes read from disk
+        bytes_written: Bytes written to disk
+        bytes_freed: Net disk space released
+        errors: Steps that failed, with their error message
+    """
+    started_at: float
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    candles_trimmed: int = 0
+    symbols_dropped: List[str] = field(default_factory=list)
+    cache_entries_evicted: int = 0
+    logs_compressed: int = 0
+    temp_files_removed: int = 0
+    candles_rolled_up: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    bytes_freed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _file_size(path: str) -> int:
+    """Get a file's size in bytes, 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def compress_rotated_logs(log_dir: str, report: MaintenanceReport) -> None:
+    """Gzip rotated log files in place (``trades.log.2024-01-31`` -> ``.gz``).
+
+    The gzipped names still match the rotation handler's backup pattern, so
+    backupCount keeps pruning them.
+
+    Args:
+        log_dir: Log directory
+        report: Report to update
+    """
+    if not os.path.isdir(log_dir):
+        return
+
+    for name in sorted(os.listdir(log_dir)):
+        if not _ROTATED_LOG.search(name):
+            continue
+        path = os.path.join(log_dir, name)
+        gz_path = path + ".gz"
+        tmp_path = gz_path + ".tmp"
+        size = _file_size(path)
+        with open(path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, gz_path)
+        os.remove(path)
+
+        written = _file_size(gz_path)
+        report.logs_compressed += 1
+        report.bytes_read += size
+        report.bytes_written += written
+        report.bytes_freed += size - written
+
+
+def remove_stale_temp_files(
+    directories: List[str],
+    report: MaintenanceReport,
+    max_age_seconds: float = STALE_TMP_SECONDS
+) -> None:
+    """Remove ``.tmp`` files left behind by interrupted atomic writes.
+
+    Args:
+        directories: Directories to scan (missing ones are skipped)
+        report: Report to update
+        max_age_seconds: Only files not modified for this long are removed
+    """
+    cutoff = time.time() - max_age_seconds
+    for directory in directories:
+        if not directory or not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if not name.endswith(".tmp") or not os.path.isfile(path):
+                continue
+            if os.path.getmtime(path) >= cutoff:
+                continue
+            size = _file_size(path)
+            os.remove(path)
+            report.temp_files_removed += 1
+            report.bytes_freed += size
+
+
+def roll_up_candle_store(
+    store: CandleStore,
+    rollup_days: int,
+    report: MaintenanceReport,
+    now_ms: Optional[int] = None
+) -> None:
+    """Fold old candles of each stored timeframe into the next coarser one.
+
+    5m candles older than ``rollup_days`` become 15m candles, 15m candles
+    older than twice that become 1h candles and 1h candles older than four
+    times that become 4h candles. Cutoffs are aligned to the coarse interval
+    so only complete buckets are rolled up, and candles already stored in
+    the coarse timeframe (fetched from the exchange) are kept over rolled-up
+    ones.
+
+    Args:
+        store: Candle store to compact
+        rollup_days: Age in days after which 5m candles are rolled up
+        report: Report to update
+        now_ms: Current time in milliseconds (defaults to the clock)
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+
+    symbols = sorted({symbol for symbol, _ in store.series()})
+    for symbol in symbols:
+        # Finest first, so rolled-up candles can move on to the next tier
+        for tier, (fine_tf, coarse_tf) in enumerate(ROLLUP_TIMEFRAMES.items()):
+            fine_path = store.path(symbol, fine_tf)
+            if not os.path.exists(fine_path):
+                continue
+
+            coarse_ms = timeframe_to_ms(coarse_tf)
+            age_ms = rollup_days * (2 ** tier) * 24 * 60 * 60 * 1000
+            cutoff = (now_ms - age_ms) // coarse_ms * coarse_ms
+
+            with store.lock:
+                fine = store.load(symbol, fine_tf)
+                report.bytes_read += fine.nbytes
+                old_count = int(np.searchsorted(fine["timestamp"], cutoff, side="left"))
+                if old_count == 0:
+                    continue
+
+                coarse_path = store.path(symbol, coarse_tf)
+                size_before = (_file_size(fine_path) + _file_size(coarse_path)
+                               + _file_size(store.tail_path(symbol, fine_tf))
+                               + _file_size(store.tail_path(symbol, coarse_tf)))
+
+                existing = store.load(symbol, coarse_tf)
+                rolled = aggregate_ohlcv(fine[:old_count], coarse_tf)
+                store.replace(symbol, coarse_tf, merge_candle_arrays(rolled, existing))
+                store.replace(symbol, fine_tf, fine[old_count:])
+
+                size_after = _file_size(fine_path) + _file_size(coarse_path)
+                report.candles_rolled_up += old_count
+                report.bytes_read += existing.nbytes
+                report.bytes_written += size_after
+                report.bytes_freed += size_before - size_after
+
+
+class MaintenanceScheduler:
+    """Runs data retention and compaction on a background thread."""
+
+    def __init__(
+        self,
+        config,
+        data_manager=None,
+        candle_store: Optional[CandleStore] = None,
+        symbols_provider: Optional[Callable[[], List[str]]] = None,
+        log_dir: str = "logs"
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            config: Bot configuration (data_cleanup_interval_hours,
+                candle_store_rollup_days, state_snapshot_file)
+            data_manager: DataManager whose buffers and cache are trimmed
+            candle_store: CandleStore to roll up
+            symbols_provider: Returns the symbols currently traded; buffers of
+                other symbols are released
+            log_dir: Directory holding the rotated log files
+        """
+        self.config = config
+        self.data_manager = data_manager
+        self.candle_store = candle_store
+        self.symbols_provider = symbols_provider
+        self.log_dir = log_dir
+        self.interval_seconds = config.data_cleanup_interval_hours * 3600
+        self.last_report: Optional[MaintenanceReport] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background thread (first pass after one interval)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="maintenance", daemon=True)
+        self._thread.start()
+        logger.info(f"Data maintenance scheduled every {self.config.data_cleanup_interval_hours}h")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread, waiting for a running pass to finish.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Thread body: one pass per interval until stopped."""
+        while not self._stop_event.wait(self.interval_seconds):
+            self.run_once()
+
+    def _temp_directories(self) -> List[str]:
+        """Directories written with the tmp-then-rename pattern."""
+        directories = [self.log_dir]
+        if self.candle_store is not None:
+            directories.append(self.candle_store.directory)
+        if self.config.state_snapshot_file:
+            directories.append(os.path.dirname(self.config.state_snapshot_file) or ".")
+        return directories
+
+    def _trim_buffers(self, report: MaintenanceReport) -> None:
+        """Trim candle buffers and release untraded symbols."""
+        if self.data_manager is None:
+            return
+        if self.symbols_provider is not None:
+            report.symbols_dropped = self.data_manager.drop_symbols(self.symbols_provider())
+        removed = self.data_manager.cleanup_old_data(BUFFER_LOOKBACK_DAYS)
+        report.candles_trimmed = sum(removed.values())
+
+    def _evict_cache(self, report: MaintenanceReport) -> None:
+        """Evict expired historical-data cache entries."""
+        if self.data_manager is not None:
+            report.cache_entries_evicted = self.data_manager.evict_expired_cache()
+
+    def _roll_up(self, report: MaintenanceReport) -> None:
+        """Roll up old candles in the candle store."""
+        if self.candle_store is not None:
+            roll_up_candle_store(self.candle_store, self.config.candle_store_rollup_days, report)
+
+    def run_once(self) -> MaintenanceReport:
+        """Run every maintenance step once.
+
+        Returns:
+            MaintenanceReport of the pass (also kept as last_report)
+        """
+        report = MaintenanceReport(started_at=time.time())
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+
+        steps: Dict[str, Callable[[], None]] = {
+            "evict_cache": lambda: self._evict_cache(report),
+            "trim_buffers": lambda: self._trim_buffers(report),
+            "compress_logs": lambda: compress_rotated_logs(self.log_dir, report),
+            "remove_temp_files": lambda: remove_stale_temp_files(self._temp_directories(), report),
+            "roll_up_candles": lambda: self._roll_up(report),
+        }
+        for name, step in steps.items():
+            try:
+                step()
+            except Exception as e:
+                logger.error(f"Maintenance step {name} failed: {e}")
+                report.errors.append(f"{name}: {e}")
+
+        report.wall_s = time.perf_counter() - wall_start
+        report.cpu_s = time.thread_time() - cpu_start
+        self.last_report = report
+        self._record_metrics(report)
+
+        logger.info(
+            f"Maintenance pass: {report.candles_trimmed} candles trimmed, "
+            f"{report.cache_entries_evicted} cache entries evicted, "
+            f"{report.logs_compressed} logs compressed, "
+            f"{report.candles_rolled_up} candles rolled up, "
+            f"{report.bytes_freed / 1024:.0f} KB freed in {report.wall_s:.2f}s "
+            f"({report.cpu_s:.2f}s CPU)"
+        )
+        return report
+
+    @staticmethod
+    def _record_metrics(report: MaintenanceReport) -> None:
+        """Publish the pass cost to the instrumentation registry."""
+        registry = instrumentation.get_instrumentation()
+        registry.record("maintenance.run", report.wall_s)
+        registry.record("maintenance.cpu", report.cpu_s)
+        registry.increment("maintenance.bytes_read", report.bytes_read)
+        registry.increment("maintenance.bytes_written", report.bytes_written)
+        registry.increment("maintenance.bytes_freed", report.bytes_freed)
+        registry.increment("maintenance.candles_trimmed", report.candles_trimmed)
+        registry.increment("maintenance.candles_rolled_up", report.candles_rolled_up)
+        registry.increment("maintenance.errors", len(report.errors))
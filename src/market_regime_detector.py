@@ -12,6 +12,12 @@ from src.config import Config
 import time
 
 
+# Regime history is pruned to this window and capped at this many entries so a
+# short regime_update_interval cannot grow it without bound
+REGIME_HISTORY_SECONDS = 24 * 3600
+MAX_REGIME_HISTORY = 1000
+
+
 @dataclass
 class RegimeParameters:
     """Parameters for trading in a specific market regime.
@@ -103,17 +109,7 @@ class MarketRegimeDetector:
             
             # Update regime history
             current_time = int(time.time())
-            self.regime_history.append({
-                'timestamp': current_time,
-                'regime': regime
-            })
-            
-            # Keep only recent history (last 24 hours)
-            cutoff_time = current_time - (24 * 3600)
-            self.regime_history = [
-                entry for entry in self.regime_history
-                if entry['timestamp'] > cutoff_time
-            ]
+            self.record_regime(regime, current_time)
             
             self.current_regime = regime
             self.last_update = current_time
@@ -227,6 +223,26 @@ class MarketRegimeDetector:
         # Default to UNCERTAIN if no clear regime
         return "UNCERTAIN"
     
+    def record_regime(self, regime: str, timestamp: int) -> None:
+        """Append a regime observation and prune the history.
+        
+        Keeps only the last 24 hours, and at most MAX_REGIME_HISTORY entries.
+        
+        Args:
+            regime: Observed regime
+            timestamp: Unix timestamp in seconds
+        """
+        self.regime_history.append({
+            'timestamp': timestamp,
+            'regime': regime
+        })
+        
+        cutoff_time = timestamp - REGIME_HISTORY_SECONDS
+        self.regime_history = [
+            entry for entry in self.regime_history[-MAX_REGIME_HISTORY:]
+            if entry['timestamp'] > cutoff_time
+        ]
+    
     def is_regime_stable(self) -> bool:
         """Check if current regime has been stable for required duration.
         
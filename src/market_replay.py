@@ -0,0 +1,1262 @@
+"""Record and replay market WebSocket frames against the live trading loop.
+
+FrameRecorder captures kline and mark-price frames (plus the REST history
+the bot loads at startup) into fixed-width binary records, about 70 bytes
+per frame instead of ~350 bytes of JSON. ReplayDriver feeds a recording back
+into DataManager._handle_kline_message through ReplayWebsocketManager at
+1x-1000x speed (or unthrottled), while FakeExchangeClient serves klines up
+to the replay clock and simulates fills, stops, fees and account state. The
+unmodified PAPER/LIVE code paths therefore run offline, which is used to
+load-test the loop, measure its maximum sustainable message rate and
+reproduce production incidents.
+
+Usage:
+    log = load_frames("logs/incident.frames")
+    client = FakeExchangeClient(log, initial_balance=10000.0)
+    bot = TradingBot(config, client=client)
+    stats = run_bot_replay(bot, ReplayDriver(log, client, speed=100))
+"""
+
+import bisect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from src.instrumentation import LatencyHistogram
+from src.models import Candle
+from src.candle_array import timeframe_to_ms
+
+if TYPE_CHECKING:
+    from binance.exceptions import BinanceAPIException
+
+
+logger = logging.getLogger(__name__)
+
+
+FRAME_KLINE = 0
+FRAME_MARK_PRICE = 1
+FRAME_HISTORY = 2
+
+# One packed record per frame. Mark-price frames reuse the price columns:
+# close = mark price, open = index price, high = estimated settle price,
+# low = funding rate and open_time = next funding time.
+FRAME_DTYPE = np.dtype([
+    ("kind", "u1"),
+    ("closed", "u1"),
+    ("interval", "u1"),
+    ("symbol", "<u2"),
+    ("recv_time", "<i8"),
+    ("event_time", "<i8"),
+    ("open_time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+FRAME_FORMAT = "bb-frames"
+FRAME_FORMAT_VERSION = 1
+
+MAX_SPEED = 1000.0
+DEFAULT_KLINE_LIMIT = 500
+MAX_KLINE_LIMIT = 1500
+MAX_BATCH_ORDERS = 5
+
+# Symbol filters reported by futures_exchange_info unless overridden
+DEFAULT_SYMBOL_FILTERS = {
+    "tick_size": 0.01,
+    "step_size": 0.001,
+    "min_qty": 0.001,
+    "max_qty": 1000.0,
+    "min_notional": 5.0,
+}
+
+
+def _header_path(path: str) -> str:
+    """Path of the JSON sidecar holding the symbol and interval tables."""
+    return path + ".json"
+
+
+@dataclass
+class FrameLog:
+    """A recording loaded into memory.
+
+    Attributes:
+        frames: Structured FRAME_DTYPE array in recording order
+        symbols: Symbol table indexed by frames["symbol"]
+        intervals: Interval table indexed by frames["interval"]
+    """
+    frames: np.ndarray
+    symbols: List[str]
+    intervals: List[str] = field(default_factory=list)
+
+    def history(self) -> np.ndarray:
+        """Frames describing the REST history available before replay."""
+        return self.frames[self.frames["kind"] == FRAME_HISTORY]
+
+    def live(self) -> np.ndarray:
+        """Frames delivered over the WebSocket, in delivery order."""
+        return self.frames[self.frames["kind"] != FRAME_HISTORY]
+
+    def streams(self) -> List[str]:
+        """Kline stream names present in the live frames."""
+        live = self.live()
+        klines = live[live["kind"] == FRAME_KLINE]
+        pairs = set(zip(klines["symbol"].tolist(), klines["interval"].tolist()))
+        return sorted(
+            kline_stream_name(self.symbols[s], self.intervals[i]) for s, i in pairs
+        )
+
+
+def kline_stream_name(symbol: str, interval: str) -> str:
+    """Binance stream name of a kline socket."""
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+def mark_price_stream_name(symbol: str) -> str:
+    """Binance stream name of a 1s mark-price socket."""
+    return f"{symbol.lower()}@markPrice@1s"
+
+
+def save_frames(log: FrameLog, path: str) -> None:
+    """Write a recording to disk.
+
+    Args:
+        log: Recording to write
+        path: Frame file path; the tables go to path + ".json"
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    log.frames.astype(FRAME_DTYPE, copy=False).tofile(path)
+    _write_header(path, log.symbols, log.intervals)
+
+
+def _write_header(path: str, symbols: List[str], intervals: List[str]) -> None:
+    """Write the JSON sidecar of a frame file."""
+    header = {
+        "format": FRAME_FORMAT,
+        "version": FRAME_FORMAT_VERSION,
+        "record_size": FRAME_DTYPE.itemsize,
+        "symbols": symbols,
+        "intervals": intervals,
+    }
+    tmp_path = _header_path(path) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(header, f)
+    os.replace(tmp_path, _header_path(path))
+
+
+def load_frames(path: str) -> FrameLog:
+    """Load a recording written by FrameRecorder or save_frames.
+
+    Args:
+        path: Frame file path
+
+    Returns:
+        FrameLog with the frames and lookup tables
+
+    Raises:
+        ValueError: If the file is not a frame recording of this version
+    """
+    with open(_header_path(path), "r") as f:
+        header = json.load(f)
+    if header.get("format") != FRAME_FORMAT or header.get("version") != FRAME_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FRAME_FORMAT_VERSION} frame recording")
+    if header.get("record_size") != FRAME_DTYPE.itemsize:
+        raise ValueError(f"{path} has {header.get('record_size')}-byte records, expected {FRAME_DTYPE.itemsize}")
+
+    # A recorder killed mid-write can leave a torn trailing record
+    frames = np.fromfile(path, dtype=np.uint8)
+    usable = len(frames) - len(frames) % FRAME_DTYPE.itemsize
+    return FrameLog(
+        frames=frames[:usable].view(FRAME_DTYPE),
+        symbols=list(header["symbols"]),
+        intervals=list(header["intervals"]),
+    )
+
+
+def frame_to_kline_message(frame: np.void, symbols: List[str], intervals: List[str]) -> Dict[str, Any]:
+    """Rebuild the Binance kline WebSocket message of a frame."""
+    symbol = symbols[frame["symbol"]]
+    interval = intervals[frame["interval"]]
+    open_time = int(frame["open_time"])
+    return {
+        "e": "kline",
+        "E": int(frame["event_time"]),
+        "s": symbol,
+        "k": {
+            "t": open_time,
+            "T": open_time + timeframe_to_ms(interval) - 1,
+            "s": symbol,
+            "i": interval,
+            "o": str(float(frame["open"])),
+            "c": str(float(frame["close"])),
+            "h": str(float(frame["high"])),
+            "l": str(float(frame["low"])),
+            "v": str(float(frame["volume"])),
+            "x": bool(frame["closed"]),
+        },
+    }
+
+
+def frame_to_mark_price_message(frame: np.void, symbols: List[str]) -> Dict[str, Any]:
+    """Rebuild the Binance markPriceUpdate WebSocket message of a frame."""
+    return {
+        "e": "markPriceUpdate",
+        "E": int(frame["event_time"]),
+        "s": symbols[frame["symbol"]],
+        "p": str(float(frame["close"])),
+        "i": str(float(frame["open"])),
+        "P": str(float(frame["high"])),
+        "r": str(float(frame["low"])),
+        "T": int(frame["open_time"]),
+    }
+
+
+def synthesize_frames(
+    candles: Dict[str, Dict[str, np.ndarray]],
+    live_start: int,
+    updates_per_bar: int = 0,
+) -> FrameLog:
+    """Build a recording from candle arrays, e.g. synthetic or downloaded bars.
+
+    Bars closing before live_start become REST history; later bars are
+    delivered as closed kline frames at their close time, each preceded by
+    updates_per_bar in-progress frames. Every bar of a symbol's smallest
+    interval also produces a mark-price frame at its close.
+
+    Args:
+        candles: {symbol: {interval: structured CANDLE_DTYPE array}}; every
+            bar is treated as complete
+        live_start: Replay start time in milliseconds
+        updates_per_bar: In-progress frames per live bar
+
+    Returns:
+        FrameLog sorted by delivery time
+    """
+    symbols = sorted(candles)
+    intervals = sorted({tf for per_symbol in candles.values() for tf in per_symbol}, key=timeframe_to_ms)
+    parts = []
+
+    for s, symbol in enumerate(symbols):
+        smallest = min(candles[symbol], key=timeframe_to_ms)
+        for interval, bars in candles[symbol].items():
+            interval_ms = timeframe_to_ms(interval)
+            close_time = bars["timestamp"] + interval_ms - 1
+            is_live = close_time >= live_start
+
+            history = _frames_from_bars(bars[~is_live], close_time[~is_live], FRAME_HISTORY, s, intervals.index(interval))
+            live_bars = bars[is_live]
+            live_close = close_time[is_live]
+            parts.append(history)
+
+            for j in range(1, updates_per_bar + 1):
+                fraction = j / (updates_per_bar + 1)
+                price = live_bars["open"] + (live_bars["close"] - live_bars["open"]) * fraction
+                partial = live_bars.copy()
+                partial["high"] = np.maximum(live_bars["open"], price)
+                partial["low"] = np.minimum(live_bars["open"], price)
+                partial["close"] = price
+                partial["volume"] = live_bars["volume"] * fraction
+                update_time = live_bars["timestamp"] + int(interval_ms * fraction)
+                frames = _frames_from_bars(partial, update_time, FRAME_KLINE, s, intervals.index(interval))
+                frames["closed"] = 0
+                parts.append(frames)
+
+            parts.append(_frames_from_bars(live_bars, live_close, FRAME_KLINE, s, intervals.index(interval)))
+
+            if interval == smallest:
+                marks = np.zeros(len(live_bars), dtype=FRAME_DTYPE)
+                marks["kind"] = FRAME_MARK_PRICE
+                marks["symbol"] = s
+                marks["recv_time"] = live_close
+                marks["event_time"] = live_close
+                marks["close"] = live_bars["close"]
+                marks["open"] = live_bars["close"]
+                marks["high"] = live_bars["close"]
+                parts.append(marks)
+
+    frames = np.concatenate(parts) if parts else np.empty(0, dtype=FRAME_DTYPE)
+    # History first, then live frames in delivery order; mark updates follow
+    # the kline frames they were derived from
+    order = np.lexsort((frames["kind"] == FRAME_MARK_PRICE, frames["recv_time"], frames["kind"] != FRAME_HISTORY))
+    return FrameLog(frames=frames[order], symbols=symbols, intervals=intervals)
+
+
+def _frames_from_bars(bars: np.ndarray, times: np.ndarray, kind: int, symbol: int, interval: int) -> np.ndarray:
+    """Closed kline frames of candle bars delivered at the given times."""
+    frames = np.zeros(len(bars), dtype=FRAME_DTYPE)
+    frames["kind"] = kind
+    frames["closed"] = 1
+    frames["interval"] = interval
+    frames["symbol"] = symbol
+    frames["recv_time"] = times
+    frames["event_time"] = times
+    frames["open_time"] = bars["timestamp"]
+    for column in ("open", "high", "low", "close", "volume"):
+        frames[column] = bars[column]
+    return frames
+
+
+class FrameRecorder:
+    """Append kline and mark-price frames to a frame file.
+
+    Frames are buffered and written in blocks, so recording costs one small
+    structured-array assignment per message on the WebSocket thread. The
+    JSON sidecar is rewritten whenever a new symbol or interval appears.
+    """
+
+    def __init__(self, path: str, flush_every: int = 1024):
+        """Initialize FrameRecorder, truncating any existing recording.
+
+        Args:
+            path: Frame file path
+            flush_every: Frames buffered before a write
+        """
+        self.path = path
+        self.frames_written = 0
+        self._lock = threading.Lock()
+        self._buffer = np.zeros(max(1, flush_every), dtype=FRAME_DTYPE)
+        self._pending = 0
+        self._symbols: Dict[str, int] = {}
+        self._intervals: Dict[str, int] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "wb")
+        _write_header(path, [], [])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _index(self, table: Dict[str, int], key: str) -> int:
+        """Index of a table entry, adding it (and rewriting the header) if new."""
+        index = table.get(key)
+        if index is None:
+            index = table[key] = len(table)
+            _write_header(self.path, list(self._symbols), list(self._intervals))
+        return index
+
+    def _append(self, kind: int, symbol: str, interval: str, closed: bool, recv_time: int,
+                event_time: int, open_time: int, prices: Tuple[float, float, float, float, float]) -> None:
+        """Buffer one frame, flushing when the buffer is full."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer[self._pending] = (
+                kind, closed, self._index(self._intervals, interval) if interval else 0,
+                self._index(self._symbols, symbol), recv_time, event_time, open_time, *prices
+            )
+            self._pending += 1
+            if self._pending == len(self._buffer):
+                self._flush_locked()
+
+    def record_kline(self, msg: Dict[str, Any], timeframe: Optional[str] = None) -> None:
+        """Record a kline WebSocket message.
+
+        Args:
+            msg: Message as received from the kline socket
+            timeframe: Stream interval (taken from the message if omitted)
+        """
+        kline = msg["k"]
+        recv_time = int(time.time() * 1000)
+        self._append(
+            FRAME_KLINE, kline["s"].upper(), kline.get("i", timeframe), bool(kline["x"]),
+            recv_time, int(msg.get("E", recv_time)), int(kline["t"]),
+            (float(kline["o"]), float(kline["h"]), float(kline["l"]), float(kline["c"]), float(kline["v"])),
+        )
+
+    def record_mark_price(self, msg: Dict[str, Any]) -> None:
+        """Record a markPriceUpdate WebSocket message (plain or multiplexed)."""
+        data = msg.get("data", msg)
+        if data.get("e") != "markPriceUpdate":
+            return
+        recv_time = int(time.time() * 1000)
+        self._append(
+            FRAME_MARK_PRICE, data["s"].upper(), "", False,
+            recv_time, int(data.get("E", recv_time)), int(data.get("T", 0)),
+            (float(data.get("i", 0.0)), float(data.get("P", 0.0)), float(data.get("r", 0.0)), float(data["p"]), 0.0),
+        )
+
+    def record_history(self, symbol: str, timeframe: str, candles: List[Candle]) -> None:
+        """Record REST history available to the bot when the recording starts.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle interval
+            candles: Closed candles sorted by timestamp
+        """
+        interval_ms = timeframe_to_ms(timeframe)
+        for candle in candles:
+            close_time = candle.timestamp + interval_ms - 1
+            self._append(
+                FRAME_HISTORY, symbol.upper(), timeframe, True, close_time, close_time, candle.timestamp,
+                (candle.open, candle.high, candle.low, candle.close, candle.volume),
+            )
+
+    def attach(self, data_manager, symbols: Optional[List[str]] = None) -> None:
+        """Record every kline the DataManager receives, plus mark prices.
+
+        Attach before starting the streams so no frame is missed; the
+        DataManager then opens a mark-price socket with each symbol's
+        klines. Streams already running get their mark-price sockets here.
+
+        Args:
+            data_manager: DataManager to record
+            symbols: Symbols whose streams are already running
+        """
+        data_manager.frame_recorder = self
+        manager = data_manager.websocket_manager
+        if manager is None:
+            return
+        for symbol in symbols or []:
+            try:
+                manager.start_symbol_mark_price_socket(callback=self.record_mark_price, symbol=symbol.lower())
+            except Exception as e:
+                logger.warning(f"Could not record mark price for {symbol}: {e}")
+
+    def _flush_locked(self) -> None:
+        """Write buffered frames; caller holds the lock."""
+        if self._pending and self._file is not None:
+            self._file.write(self._buffer[:self._pending].tobytes())
+            self._file.flush()
+            self.frames_written += self._pending
+            self._pending = 0
+
+    def flush(self) -> None:
+        """Write buffered frames to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush and close the recording."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush_locked()
+            self._file.close()
+            self._file = None
+            _write_header(self.path, list(self._symbols), list(self._intervals))
+        logger.info(f"Recorded {self.frames_written} frames to {self.path}")
+
+
+def _api_error(code: int, message: str) -> "BinanceAPIException":
+    """Binance API error as raised by python-binance."""
+    # Deferred: importing python-binance costs about a second (dateparser)
+    from binance.exceptions import BinanceAPIException
+
+    return BinanceAPIException(None, 400, json.dumps({"code": code, "msg": message}))
+
+
+def _fmt(value: float) -> str:
+    """Format a number the way Binance returns it."""
+    return repr(float(value))
+
+
+class FakeExchangeClient:
+    """In-memory stand-in for binance.client.Client driven by a recording.
+
+    Serves the REST calls the bot makes (klines, account, orders) from the
+    frames applied so far. Market orders fill at the latest price with
+    slippage and taker fees; STOP_MARKET / TAKE_PROFIT_MARKET orders trigger
+    on the last price (or mark price with workingType=MARK_PRICE). Positions
+    use one-way mode with a single USDT wallet. Funding and liquidation are
+    not simulated.
+    """
+
+    API_URL = "https://fake-exchange.invalid/api"
+
+    def __init__(
+        self,
+        log: Optional[FrameLog] = None,
+        initial_balance: float = 10000.0,
+        fee_rate: float = 0.0005,
+        slippage: float = 0.0002,
+        leverage: int = 20,
+        symbol_filters: Optional[Dict[str, Dict[str, float]]] = None,
+    ):
+        """Initialize FakeExchangeClient.
+
+        Args:
+            log: Recording whose history frames seed the kline store
+            initial_balance: Starting USDT wallet balance
+            fee_rate: Taker fee as a fraction of notional
+            slippage: Adverse price move applied to every fill
+            leverage: Default leverage per symbol
+            symbol_filters: Per-symbol overrides of DEFAULT_SYMBOL_FILTERS;
+                orders for these symbols are rejected like on Binance when
+                they break the lot step, tick size or minimums
+        """
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.default_leverage = leverage
+        self.wallet_balance = float(initial_balance)
+        self.initial_balance = float(initial_balance)
+        self.fees_paid = 0.0
+        self.realized_pnl = 0.0
+        self.fills: List[Dict[str, Any]] = []
+        self.rejections = 0
+        self.clock_ms = 0
+
+        self._lock = threading.RLock()
+        self._order_ids = itertools.count(1)
+        self._orders: Dict[int, Dict[str, Any]] = {}
+        self._open_stops: Dict[str, List[int]] = {}
+        self._positions: Dict[str, Dict[str, float]] = {}
+        self._leverage: Dict[str, int] = {}
+        self._injected_failures: Dict[str, List[int]] = {}
+        self._symbol_filters = {
+            symbol.upper(): {**DEFAULT_SYMBOL_FILTERS, **filters} for symbol, filters in (symbol_filters or {}).items()
+        }
+        self._last_price: Dict[str, float] = {}
+        self._mark_price: Dict[str, float] = {}
+        # (symbol, interval) -> [open times, rows, in-progress row]
+        self._klines: Dict[Tuple[str, str], List[Any]] = {}
+
+        self._symbols: List[str] = []
+        self._intervals: List[str] = []
+        if log is not None:
+            self.load_history(log)
+
+    def load_history(self, log: FrameLog) -> None:
+        """Seed the kline store with the history frames of a recording."""
+        with self._lock:
+            self._symbols = log.symbols
+            self._intervals = log.intervals
+            for frame in log.history():
+                self.apply_frame(frame)
+
+    # ------------------------------------------------------------------
+    # Market data
+    # ------------------------------------------------------------------
+
+    def apply_frame(self, frame: np.void, symbols: Optional[List[str]] = None,
+                    intervals: Optional[List[str]] = None) -> None:
+        """Advance the exchange state by one recorded frame.
+
+        Args:
+            frame: FRAME_DTYPE record
+            symbols: Symbol table (defaults to the loaded recording's)
+            intervals: Interval table (defaults to the loaded recording's)
+        """
+        symbol = (symbols or self._symbols)[frame["symbol"]]
+        with self._lock:
+            self.clock_ms = max(self.clock_ms, int(frame["event_time"]))
+
+            if frame["kind"] == FRAME_MARK_PRICE:
+                self._mark_price[symbol] = float(frame["close"])
+                self._check_stops(symbol)
+                return
+
+            interval = (intervals or self._intervals)[frame["interval"]]
+            open_time = int(frame["open_time"])
+            row = [
+                open_time, _fmt(frame["open"]), _fmt(frame["high"]), _fmt(frame["low"]),
+                _fmt(frame["close"]), _fmt(frame["volume"]), open_time + timeframe_to_ms(interval) - 1,
+                "0", 0, "0", "0", "0",
+            ]
+            times, rows, _ = store = self._klines.setdefault((symbol, interval), [[], [], None])
+
+            if frame["closed"]:
+                if times and times[-1] == open_time:
+                    rows[-1] = row
+                elif not times or open_time > times[-1]:
+                    times.append(open_time)
+                    rows.append(row)
+                if store[2] is not None and store[2][0] <= open_time:
+                    store[2] = None
+            elif not times or open_time > times[-1]:
+                store[2] = row
+
+            if frame["kind"] == FRAME_KLINE:
+                self._last_price[symbol] = float(frame["close"])
+                self._check_stops(symbol)
+
+    def futures_klines(self, symbol: str, interval: str, startTime: Optional[int] = None,
+                       endTime: Optional[int] = None, limit: int = DEFAULT_KLINE_LIMIT, **kwargs) -> List[list]:
+        """Klines known at the replay clock.
+
+        Windows ending in the future (the bot computes them from wall-clock
+        time) are shifted to end at the replay clock, keeping their length.
+        """
+        limit = min(int(limit), MAX_KLINE_LIMIT)
+        with self._lock:
+            if endTime is None or endTime > self.clock_ms:
+                if startTime is not None and endTime is not None:
+                    startTime = self.clock_ms - (endTime - startTime)
+                endTime = self.clock_ms
+
+            times, rows, current = self._klines.get((symbol.upper(), interval), [[], [], None])
+            stop = bisect.bisect_right(times, endTime)
+            if startTime is None:
+                start = max(0, stop - limit)
+            else:
+                start = bisect.bisect_left(times, startTime)
+                stop = min(stop, start + limit)
+            result = [list(row) for row in rows[start:stop]]
+
+            if current is not None and current[0] <= endTime and (
+                    startTime is None or (current[0] >= startTime and len(result) < limit)):
+                result.append(list(current))
+            if startTime is None and len(result) > limit:
+                result = result[-limit:]
+            return result
+
+    def futures_mark_price(self, symbol: Optional[str] = None, **kwargs):
+        """Latest mark price per symbol (falls back to the last price)."""
+        with self._lock:
+            def entry(sym):
+                return {"symbol": sym, "markPrice": _fmt(self._price(sym, mark=True)), "time": self.clock_ms}
+            if symbol is not None:
+                return entry(symbol.upper())
+            return [entry(sym) for sym in sorted(set(self._last_price) | set(self._mark_price))]
+
+    def _price(self, symbol: str, mark: bool = False) -> float:
+        """Last traded (or mark) price of a symbol."""
+        if mark and symbol in self._mark_price:
+            return self._mark_price[symbol]
+        if symbol in self._last_price:
+            return self._last_price[symbol]
+        if symbol in self._mark_price:
+            return self._mark_price[symbol]
+        raise _api_error(-1121, f"No price for symbol {symbol}.")
+
+    # ------------------------------------------------------------------
+    # Account
+    # ------------------------------------------------------------------
+
+    def _unrealized(self, symbol: str) -> float:
+        position = self._positions.get(symbol)
+        if not position or position["amt"] == 0:
+            return 0.0
+        return (self._price(symbol, mark=True) - position["entry"]) * position["amt"]
+
+    def _margin(self, symbol: str) -> float:
+        position = self._positions.get(symbol)
+        if not position or position["amt"] == 0:
+            return 0.0
+        return abs(position["amt"]) * position["entry"] / self._leverage.get(symbol, self.default_leverage)
+
+    def _available_balance(self) -> float:
+        unrealized = sum(self._unrealized(s) for s in self._positions)
+        margin = sum(self._margin(s) for s in self._positions)
+        return self.wallet_balance + unrealized - margin
+
+    def futures_account(self, **kwargs) -> Dict[str, Any]:
+        """Account snapshot in the futures_account response format."""
+        with self._lock:
+            unrealized = sum(self._unrealized(s) for s in self._positions)
+            margin = sum(self._margin(s) for s in self._positions)
+            available = self.wallet_balance + unrealized - margin
+            return {
+                "canTrade": True,
+                "totalWalletBalance": _fmt(self.wallet_balance),
+                "totalUnrealizedProfit": _fmt(unrealized),
+                "totalMarginBalance": _fmt(self.wallet_balance + unrealized),
+                "totalPositionInitialMargin": _fmt(margin),
+                "availableBalance": _fmt(available),
+                "assets": [{
+                    "asset": "USDT",
+                    "walletBalance": _fmt(self.wallet_balance),
+                    "unrealizedProfit": _fmt(unrealized),
+                    "marginBalance": _fmt(self.wallet_balance + unrealized),
+                    "initialMargin": _fmt(margin),
+                    "availableBalance": _fmt(available),
+                }],
+                "positions": self.futures_position_information(),
+            }
+
+    def futures_position_information(self, symbol: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        """Open positions in the positionRisk response format."""
+        with self._lock:
+            symbols = [symbol.upper()] if symbol else sorted(self._positions)
+            return [{
+                "symbol": sym,
+                "positionAmt": _fmt(self._positions.get(sym, {}).get("amt", 0.0)),
+                "entryPrice": _fmt(self._positions.get(sym, {}).get("entry", 0.0)),
+                "markPrice": _fmt(self._price(sym, mark=True)) if sym in self._last_price or sym in self._mark_price else "0.0",
+                "unRealizedProfit": _fmt(self._unrealized(sym)),
+                "leverage": str(self._leverage.get(sym, self.default_leverage)),
+                "positionSide": "BOTH",
+            } for sym in symbols]
+
+    def get_account_api_permissions(self, **kwargs) -> Dict[str, Any]:
+        return {"enableReading": True, "enableFutures": True, "enableWithdrawals": False}
+
+    def futures_change_leverage(self, symbol: str, leverage: int, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self._leverage[symbol.upper()] = int(leverage)
+        return {"symbol": symbol.upper(), "leverage": int(leverage), "maxNotionalValue": "1000000"}
+
+    def futures_change_margin_type(self, symbol: str, marginType: str, **kwargs) -> Dict[str, Any]:
+        return {"code": 200, "msg": "success"}
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def futures_create_order(self, symbol: str, side: str, type: str, quantity: Optional[float] = None,
+                             stopPrice: Optional[float] = None, reduceOnly: bool = False,
+                             closePosition: bool = False, workingType: str = "CONTRACT_PRICE",
+                             **kwargs) -> Dict[str, Any]:
+        """Place a MARKET, STOP_MARKET or TAKE_PROFIT_MARKET order."""
+        symbol = symbol.upper()
+        reduce_only = str(reduceOnly).lower() == "true"
+        close_position = str(closePosition).lower() == "true"
+        with self._lock:
+            failures = self._injected_failures.get(symbol)
+            if failures:
+                code = failures.pop(0)
+                raise _api_error(code, f"Injected failure {code}.")
+            if side not in ("BUY", "SELL"):
+                raise _api_error(-1117, "Invalid side.")
+            if not close_position and (quantity is None or float(quantity) <= 0):
+                raise _api_error(-4003, "Quantity less than or equal to zero.")
+            if symbol in self._symbol_filters:
+                self._check_filters(symbol, type, quantity, stopPrice, reduce_only or close_position)
+
+            order = {
+                "orderId": next(self._order_ids),
+                "symbol": symbol,
+                "status": "NEW",
+                "clientOrderId": kwargs.get("newClientOrderId", ""),
+                "price": "0",
+                "avgPrice": "0.0",
+                "origQty": _fmt(quantity or 0.0),
+                "executedQty": "0.0",
+                "cumQuote": "0.0",
+                "timeInForce": "GTC",
+                "type": type,
+                "origType": type,
+                "reduceOnly": reduce_only or close_position,
+                "closePosition": close_position,
+                "side": side,
+                "positionSide": "BOTH",
+                "stopPrice": _fmt(stopPrice or 0.0),
+                "workingType": workingType,
+                "updateTime": self.clock_ms,
+            }
+
+            if type == "MARKET":
+                self._fill(order, self._price(symbol))
+                if order["status"] == "REJECTED":
+                    self._orders[order["orderId"]] = order
+                    raise order.pop("_error")
+            elif type in ("STOP_MARKET", "TAKE_PROFIT_MARKET"):
+                if stopPrice is None or float(stopPrice) <= 0:
+                    raise _api_error(-2021, "Order would immediately trigger.")
+                self._open_stops.setdefault(symbol, []).append(order["orderId"])
+            else:
+                raise _api_error(-1116, f"Invalid orderType {type}.")
+
+            self._orders[order["orderId"]] = order
+            return dict(order)
+
+    def _check_filters(self, symbol: str, type: str, quantity: Optional[float],
+                       stop_price: Optional[float], reduce_only: bool) -> None:
+        """Reject an order that breaks the symbol's configured filters."""
+        filters = self._symbol_filters[symbol]
+        if quantity is not None:
+            quantity = float(quantity)
+            steps = quantity / filters["step_size"]
+            if abs(steps - round(steps)) > 1e-6:
+                self.rejections += 1
+                raise _api_error(-1111, "Precision is over the maximum defined for this asset.")
+            if quantity < filters["min_qty"] or quantity > filters["max_qty"]:
+                self.rejections += 1
+                raise _api_error(-4004 if quantity < filters["min_qty"] else -4005, "Quantity out of range.")
+            if type == "MARKET" and not reduce_only and quantity * self._price(symbol) < filters["min_notional"]:
+                self.rejections += 1
+                raise _api_error(
+                    -4164, f"Order's notional must be no smaller than {filters['min_notional']} "
+                    "(unless you choose reduce only)."
+                )
+        if stop_price is not None:
+            ticks = float(stop_price) / filters["tick_size"]
+            if abs(ticks - round(ticks)) > 1e-6:
+                self.rejections += 1
+                raise _api_error(-4014, "Price not increased by tick size.")
+
+    def futures_exchange_info(self, **kwargs) -> Dict[str, Any]:
+        """Symbol filters in the futures_exchange_info response format."""
+        with self._lock:
+            symbols = sorted(set(self._symbols) | set(self._last_price) | set(self._symbol_filters))
+            entries = []
+            for symbol in symbols:
+                filters = self._symbol_filters.get(symbol, DEFAULT_SYMBOL_FILTERS)
+                lot = {"stepSize": _fmt(filters["step_size"]), "minQty": _fmt(filters["min_qty"]),
+                       "maxQty": _fmt(filters["max_qty"])}
+                entries.append({
+                    "symbol": symbol,
+                    "status": "TRADING",
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "tickSize": _fmt(filters["tick_size"])},
+                        {"filterType": "LOT_SIZE", **lot},
+                        {"filterType": "MARKET_LOT_SIZE", **lot},
+                        {"filterType": "MIN_NOTIONAL", "notional": _fmt(filters["min_notional"])},
+                    ],
+                })
+            return {"serverTime": self.clock_ms, "symbols": entries}
+
+    def futures_place_batch_order(self, batchOrders: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """Place up to MAX_BATCH_ORDERS orders; each leg succeeds or fails on its own.
+
+        Returns:
+            One entry per order: the order, or {"code", "msg"} if it failed
+        """
+        from binance.exceptions import BinanceAPIException
+
+        if not 0 < len(batchOrders) <= MAX_BATCH_ORDERS:
+            raise _api_error(-1130, "Data sent for parameter 'batchOrders' is not valid.")
+        results: List[Dict[str, Any]] = []
+        for params in batchOrders:
+            try:
+                results.append(self.futures_create_order(**params))
+            except BinanceAPIException as e:
+                results.append({"code": e.code, "msg": e.message})
+        return results
+
+    def fail_next_orders(self, symbol: str, count: int = 1, code: int = -1001) -> None:
+        """Make the next ``count`` orders for a symbol fail with an API error.
+
+        Used to reproduce transient (e.g. -1001 disconnected) or permanent
+        failures of single legs of a batch.
+        """
+        with self._lock:
+            self._injected_failures.setdefault(symbol.upper(), []).extend([code] * count)
+
+    def futures_get_order(self, symbol: str, orderId: Optional[int] = None,
+                          origClientOrderId: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Look up an order by exchange order ID or client order ID."""
+        with self._lock:
+            if orderId is not None:
+                order = self._orders.get(int(orderId))
+            else:
+                order = next((o for o in reversed(self._orders.values())
+                              if origClientOrderId and o["clientOrderId"] == origClientOrderId), None)
+            if order is None or order["symbol"] != symbol.upper():
+                raise _api_error(-2013, "Order does not exist.")
+            return dict(order)
+
+    def futures_get_open_orders(self, symbol: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        with self._lock:
+            symbols = [symbol.upper()] if symbol else list(self._open_stops)
+            return [dict(self._orders[i]) for sym in symbols for i in self._open_stops.get(sym, [])]
+
+    def futures_cancel_order(self, symbol: str, orderId: int, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            order = self._orders.get(int(orderId))
+            if order is None or order["symbol"] != symbol.upper() or order["status"] != "NEW":
+                raise _api_error(-2011, "Unknown order sent.")
+            self._open_stops[order["symbol"]].remove(order["orderId"])
+            order["status"] = "CANCELED"
+            order["updateTime"] = self.clock_ms
+            return dict(order)
+
+    def futures_cancel_all_open_orders(self, symbol: str, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            for order_id in self._open_stops.pop(symbol.upper(), []):
+                self._orders[order_id]["status"] = "CANCELED"
+                self._orders[order_id]["updateTime"] = self.clock_ms
+        return {"code": 200, "msg": "The operation of cancel all open order is done."}
+
+    def _check_stops(self, symbol: str) -> None:
+        """Trigger resting stop orders crossed by the latest price."""
+        for order_id in list(self._open_stops.get(symbol, [])):
+            order = self._orders[order_id]
+            price = self._price(symbol, mark=order["workingType"] == "MARK_PRICE")
+            stop_price = float(order["stopPrice"])
+            # Stops sell below / buy above the trigger; take-profits the reverse
+            falling = (order["side"] == "SELL") == (order["origType"] == "STOP_MARKET")
+            if (price <= stop_price) if falling else (price >= stop_price):
+                self._open_stops[symbol].remove(order_id)
+                order["type"] = "MARKET"
+                self._fill(order, self._price(symbol))
+                order.pop("_error", None)
+
+    def _fill(self, order: Dict[str, Any], price: float) -> None:
+        """Execute an order at price plus slippage and update the account."""
+        symbol = order["symbol"]
+        position = self._positions.setdefault(symbol, {"amt": 0.0, "entry": 0.0})
+        direction = 1.0 if order["side"] == "BUY" else -1.0
+        quantity = float(order["origQty"])
+
+        if order["reduceOnly"]:
+            if position["amt"] == 0 or (position["amt"] > 0) == (direction > 0):
+                return self._reject(order, _api_error(-2022, "ReduceOnly Order is rejected."))
+            quantity = abs(position["amt"]) if order["closePosition"] else min(quantity, abs(position["amt"]))
+
+        fill_price = price * (1.0 + direction * self.slippage)
+        notional = fill_price * quantity
+        closing = min(quantity, abs(position["amt"])) if position["amt"] * direction < 0 else 0.0
+        opening = quantity - closing
+        leverage = self._leverage.get(symbol, self.default_leverage)
+        if opening > 0 and opening * fill_price / leverage > self._available_balance():
+            return self._reject(order, _api_error(-2019, "Margin is insufficient."))
+
+        realized = closing * (fill_price - position["entry"]) * (-direction)
+        fee = notional * self.fee_rate
+        if opening > 0:
+            held = abs(position["amt"]) - closing
+            position["entry"] = (position["entry"] * held + fill_price * opening) / (held + opening)
+        position["amt"] += direction * quantity
+        if abs(position["amt"]) < 1e-12:
+            position["amt"] = 0.0
+            position["entry"] = 0.0
+
+        self.wallet_balance += realized - fee
+        self.realized_pnl += realized
+        self.fees_paid += fee
+        order.update({
+            "status": "FILLED",
+            "avgPrice": _fmt(fill_price),
+            "executedQty": _fmt(quantity),
+            "cumQuote": _fmt(notional),
+            "updateTime": self.clock_ms,
+        })
+        self.fills.append({
+            "time": self.clock_ms, "symbol": symbol, "side": order["side"], "type": order["origType"],
+            "quantity": quantity, "price": fill_price, "fee": fee, "realized_pnl": realized,
+            "order_id": order["orderId"],
+        })
+
+    def _reject(self, order: Dict[str, Any], error: "BinanceAPIException") -> None:
+        self.rejections += 1
+        order["status"] = "REJECTED" if order["type"] == order["origType"] else "EXPIRED"
+        order["updateTime"] = self.clock_ms
+        order["_error"] = error
+
+    def summary(self) -> Dict[str, Any]:
+        """Account totals for reporting."""
+        with self._lock:
+            return {
+                "initial_balance": self.initial_balance,
+                "wallet_balance": self.wallet_balance,
+                "realized_pnl": self.realized_pnl,
+                "fees_paid": self.fees_paid,
+                "fills": len(self.fills),
+                "rejections": self.rejections,
+                "open_orders": sum(len(ids) for ids in self._open_stops.values()),
+                "open_positions": {s: p["amt"] for s, p in self._positions.items() if p["amt"] != 0},
+            }
+
+
+class ReplayWebsocketManager:
+    """Stand-in for ThreadedWebsocketManager whose sockets are fed by a ReplayDriver."""
+
+    def __init__(self):
+        self._callbacks: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._changed = threading.Condition()
+
+    def start(self) -> None:
+        return None
+
+    def stop(self) -> None:
+        """Close every socket, like stopping the real manager."""
+        with self._changed:
+            self._callbacks.clear()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        return None
+
+    def _register(self, name: str, callback: Callable[[Dict[str, Any]], None]) -> str:
+        with self._changed:
+            self._callbacks[name] = callback
+            self._changed.notify_all()
+        return name
+
+    def start_kline_socket(self, callback: Callable, symbol: str, interval: str = "1m") -> str:
+        return self._register(kline_stream_name(symbol, interval), callback)
+
+    def start_kline_futures_socket(self, callback: Callable, symbol: str, interval: str = "1m", **kwargs) -> str:
+        return self._register(kline_stream_name(symbol, interval), callback)
+
+    def start_symbol_mark_price_socket(self, callback: Callable, symbol: str, fast: bool = True, **kwargs) -> str:
+        return self._register(mark_price_stream_name(symbol), callback)
+
+    def stop_socket(self, socket_name: str) -> None:
+        with self._changed:
+            self._callbacks.pop(socket_name, None)
+
+    def callback(self, name: str) -> Optional[Callable[[Dict[str, Any]], None]]:
+        """Callback registered for a stream, if any."""
+        return self._callbacks.get(name)
+
+    def wait_for_streams(self, names: List[str], timeout: float) -> bool:
+        """Block until all named streams are subscribed.
+
+        Returns:
+            True if all streams were subscribed before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while not all(name in self._callbacks for name in names):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+            return True
+
+
+@dataclass
+class ReplayStats:
+    """Outcome of a replay run.
+
+    Attributes:
+        frames: Live frames dispatched
+        closed_candles: Closed kline frames among them
+        dropped: Frames with no subscribed socket
+        handler_errors: Frames whose callback raised
+        wall_seconds: Wall-clock duration of the dispatch
+        market_seconds: Recorded time covered by the dispatched frames
+        handler: Callback latency summary (LatencyHistogram.to_dict)
+        lag: Delay behind the replay schedule (LatencyHistogram.to_dict)
+        loop_iterations: Event loop iterations during the replay (bot runs only)
+    """
+    frames: int = 0
+    closed_candles: int = 0
+    dropped: int = 0
+    handler_errors: int = 0
+    wall_seconds: float = 0.0
+    market_seconds: float = 0.0
+    handler: Dict[str, float] = field(default_factory=dict)
+    lag: Dict[str, float] = field(default_factory=dict)
+    loop_iterations: int = 0
+
+    @property
+    def frames_per_second(self) -> float:
+        """Achieved dispatch rate."""
+        return self.frames / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def achieved_speed(self) -> float:
+        """Recorded seconds replayed per wall-clock second."""
+        return self.market_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def sustainable(self, max_lag_ms: float = 1000.0) -> bool:
+        """Whether the consumer kept up with the schedule (p99 lag within budget)."""
+        return self.lag.get("p99_ms", 0.0) <= max_lag_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "closed_candles": self.closed_candles,
+            "dropped": self.dropped,
+            "handler_errors": self.handler_errors,
+            "wall_seconds": self.wall_seconds,
+            "market_seconds": self.market_seconds,
+            "frames_per_second": self.frames_per_second,
+            "achieved_speed": self.achieved_speed,
+            "handler": self.handler,
+            "lag": self.lag,
+            "loop_iterations": self.loop_iterations,
+        }
+
+
+class ReplayDriver:
+    """Dispatch recorded frames to subscribed sockets on the recorded schedule.
+
+    Frames are spaced by their recorded receive times divided by speed;
+    speed 0 dispatches back-to-back, which measures the highest message rate
+    the handlers sustain. The exchange client sees each frame before the
+    socket callback so REST reads made from the callback are consistent.
+    """
+
+    def __init__(
+        self,
+        log: FrameLog,
+        client: Optional[FakeExchangeClient] = None,
+        speed: float = 1.0,
+        websocket_manager: Optional[ReplayWebsocketManager] = None,
+        stream_timeout: float = 30.0,
+        on_finish: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize ReplayDriver.
+
+        Args:
+            log: Recording to replay
+            client: Fake exchange advanced by every frame (optional)
+            speed: Replay speed multiplier (1-1000), or 0 for unthrottled
+            websocket_manager: Socket registry (a new one if omitted)
+            stream_timeout: Seconds to wait for the recorded streams to be
+                subscribed before dispatching anyway
+            on_finish: Called from the driver thread after the last frame
+
+        Raises:
+            ValueError: If speed is outside [0, MAX_SPEED]
+        """
+        if speed < 0 or speed > MAX_SPEED:
+            raise ValueError(f"Replay speed must be between 0 and {MAX_SPEED:g}, got {speed}")
+        self.log = log
+        self.client = client
+        self.speed = speed
+        self.websocket_manager = websocket_manager or ReplayWebsocketManager()
+        self.stream_timeout = stream_timeout
+        self.on_finish = on_finish
+        self.stats = ReplayStats()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Replay in a background thread."""
+        self._thread = threading.Thread(target=self.run, name="market-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop dispatching after the current frame."""
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self) -> ReplayStats:
+        """Replay every live frame; blocks until done or stopped."""
+        frames = self.log.live()
+        symbols, intervals = self.log.symbols, self.log.intervals
+        manager = self.websocket_manager
+        handler, lag = LatencyHistogram(), LatencyHistogram()
+        stats = self.stats
+
+        streams = self.log.streams()
+        deadline = time.monotonic() + self.stream_timeout
+        while not manager.wait_for_streams(streams, 0.1):
+            if self._stop.is_set() or time.monotonic() >= deadline:
+                logger.warning("Not all recorded streams were subscribed; unmatched frames will be dropped")
+                break
+
+        names = _stream_names(frames, symbols, intervals)
+        recv_times = frames["recv_time"]
+        first_recv = int(recv_times[0]) if len(frames) else 0
+        start = time.perf_counter()
+
+        try:
+            for i in range(len(frames)):
+                if self._stop.is_set():
+                    break
+                frame = frames[i]
+
+                if self.speed > 0:
+                    due = start + (int(recv_times[i]) - first_recv) / 1000.0 / self.speed
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        self._stop.wait(delay)
+                    lag.record(max(0.0, time.perf_counter() - due))
+
+                if self.client is not None:
+                    self.client.apply_frame(frame, symbols, intervals)
+
+                stats.frames += 1
+                callback = manager.callback(names[i])
+                if callback is None:
+                    stats.dropped += 1
+                    continue
+
+                if frame["kind"] == FRAME_MARK_PRICE:
+                    message = frame_to_mark_price_message(frame, symbols)
+                else:
+                    message = frame_to_kline_message(frame, symbols, intervals)
+                    stats.closed_candles += int(frame["closed"])
+
+                began = time.perf_counter()
+                try:
+                    callback(message)
+                except Exception as e:
+                    stats.handler_errors += 1
+                    logger.error(f"Replay callback for {names[i]} failed: {e}")
+                handler.record(time.perf_counter() - began)
+        finally:
+            stats.wall_seconds = time.perf_counter() - start
+            if stats.frames:
+                stats.market_seconds = (int(recv_times[stats.frames - 1]) - first_recv) / 1000.0
+            stats.handler = handler.to_dict()
+            stats.lag = lag.to_dict()
+            logger.info(
+                f"Replayed {stats.frames} frames in {stats.wall_seconds:.2f}s "
+                f"({stats.frames_per_second:.0f} frames/s, {stats.achieved_speed:.0f}x)"
+            )
+            if self.on_finish is not None:
+                self.on_finish()
+        return stats
+
+
+def _stream_names(frames: np.ndarray, symbols: List[str], intervals: List[str]) -> List[str]:
+    """Stream name of every frame, computed once per distinct stream."""
+    kline_names = {}
+    names = []
+    for kind, symbol, interval in zip(frames["kind"].tolist(), frames["symbol"].tolist(), frames["interval"].tolist()):
+        key = (kind, symbol, interval)
+        name = kline_names.get(key)
+        if name is None:
+            if kind == FRAME_MARK_PRICE:
+                name = mark_price_stream_name(symbols[symbol])
+            else:
+                name = kline_stream_name(symbols[symbol], intervals[interval])
+            kline_names[key] = name
+        names.append(name)
+    return names
+
+
+def run_bot_replay(bot, driver: ReplayDriver, drain_timeout: float = 30.0) -> ReplayStats:
+    """Run a TradingBot against a replay until the recording is exhausted.
+
+    The bot must have been built with the driver's FakeExchangeClient. Its
+    DataManager subscribes to the driver's sockets; once the last frame is
+    dispatched the loop gets one more iteration to act on it and the bot is
+    stopped and shut down normally.
+
+    Args:
+        bot: TradingBot in PAPER or LIVE mode
+        driver: Replay driver to run
+        drain_timeout: Seconds to wait for the loop after the last frame
+
+    Returns:
+        Replay statistics including the loop iteration count
+    """
+    bot.data_manager.websocket_manager = driver.websocket_manager
+    errors: List[BaseException] = []
+
+    def run_bot():
+        try:
+            bot.start()
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            driver.stop()
+
+    bot_thread = threading.Thread(target=run_bot, name="replay-bot", daemon=True)
+    iterations_before = bot._loop_iteration
+    bot_thread.start()
+    driver.run()
+
+    # Let the loop start and act on the final frames before stopping it
+    deadline = time.monotonic() + drain_timeout
+    last_seen = bot._loop_iteration
+    while bot_thread.is_alive() and time.monotonic() < deadline:
+        if bot.running and bot._loop_iteration > last_seen:
+            break
+        time.sleep(0.01)
+    bot.running = False
+    bot_thread.join(drain_timeout)
+
+    driver.stats.loop_iterations = bot._loop_iteration - iterations_before
+    if errors:
+        raise errors[0]
+    return driver.stats
@@ -1,9 +1,30 @@
 """Data models and core types for Binance Futures Trading Bot."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Optional, Dict, List
 
 
+def _slotted(cls):
+    """Rebuild a dataclass with __slots__ instead of a per-instance __dict__.
+
+    Equivalent to dataclass(slots=True), which needs Python 3.10. The
+    generated __init__ already holds the field defaults, so the class
+    attributes that would clash with the slot descriptors can be dropped.
+    Slotted instances reject attributes that are not declared fields.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+# Candles, positions, trades and signals exist in the hundreds of thousands
+# across symbol buffers and backtests; slots cut each instance by its __dict__.
+@_slotted
 @dataclass
 class Candle:
     """Represents a single candlestick/kline with OHLCV data.
@@ -24,6 +45,7 @@ class Candle:
     volume: float
 
 
+@_slotted
 @dataclass
 class Position:
     """Represents an open trading position.
@@ -119,6 +141,7 @@ class TPStatus:
     next_tp_price: Optional[float]
 
 
+@_slotted
 @dataclass
 class Trade:
     """Represents a completed trade with entry and exit details.
@@ -147,6 +170,7 @@ class Trade:
     exit_reason: str
 
 
+@_slotted
 @dataclass
 class Signal:
     """Represents a trading signal generated by the strategy.
@@ -167,6 +191,7 @@ class Signal:
     symbol: Optional[str] = None  # Optional symbol for multi-symbol support
 
 
+@_slotted
 @dataclass
 class IndicatorState:
     """Holds all technical indicator values for the current market state.
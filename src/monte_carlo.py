@@ -0,0 +1,330 @@
+"""Monte Carlo trade resampling for drawdown and risk-of-ruin distributions.
+
+A backtest yields a single equity path, so its max drawdown and Sharpe
+ratio say little about the range of outcomes the same edge can produce.
+This module resamples the per-trade returns of a backtest into many
+alternative trade sequences and reports the distribution of:
+
+- maximum drawdown (fraction of the running peak)
+- terminal equity (multiple of the starting balance)
+- time to recovery (longest stretch of trades spent below a prior peak)
+- ruin probability (equity ever falling to ruin_level of the start)
+
+Returns are compounded, so scaling them by new_leverage / backtest_leverage
+answers "what if the same trades ran at a different leverage". Paths are
+built as index matrices into the return table and evaluated in log space
+with cumulative sums and running maxima over whole chunks of paths; only
+chunking (to bound memory) runs in Python.
+
+Resampling methods:
+- "bootstrap": trades drawn independently with replacement
+- "block": circular block bootstrap, keeping runs of block_size consecutive
+  trades together so streaks and volatility clustering survive
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src import performance_analytics
+
+
+METHODS = ("bootstrap", "block")
+
+# Percentiles reported by MonteCarloResult.summary
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Matrix elements (paths x trades) evaluated per chunk (small enough to stay in cache)
+CHUNK_ELEMENTS = 1_000_000
+
+# Equity multiple a trade losing 100% or more leaves (log-safe stand-in for zero);
+# it is far enough below RUIN_FLOOR that later gains cannot climb back above it
+WIPEOUT_EQUITY = 1e-300
+
+# Lowest ruin level used (a ruin_level of 0 means "wiped out")
+RUIN_FLOOR = 1e-12
+
+
+@dataclass
+class MonteCarloResult:
+    """Per-path outcomes of a Monte Carlo run.
+
+    Attributes:
+        method: Resampling method ("bootstrap" or "block")
+        n_paths: Number of simulated paths
+        n_trades: Trades per path
+        leverage_scale: Factor applied to every trade return
+        ruin_level: Equity multiple at or below which a path counts as ruined
+        max_drawdown: Maximum drawdown of each path (fraction of the peak)
+        terminal_equity: Final equity of each path (multiple of the start)
+        time_to_recovery: Longest run of trades below a prior peak per path
+            (a drawdown still open at the end counts up to the last trade)
+        ruined: Whether each path reached the ruin level
+        block_size: Block length for the block bootstrap
+    """
+    method: str
+    n_paths: int
+    n_trades: int
+    leverage_scale: float
+    ruin_level: float
+    max_drawdown: np.ndarray
+    terminal_equity: np.ndarray
+    time_to_recovery: np.ndarray
+    ruined: np.ndarray
+    block_size: Optional[int] = None
+
+    @property
+    def ruin_probability(self) -> float:
+        """Share of paths that reached the ruin level."""
+        return float(self.ruined.mean()) if self.n_paths else 0.0
+
+    @property
+    def loss_probability(self) -> float:
+        """Share of paths ending below the starting balance."""
+        return float((self.terminal_equity < 1.0).mean()) if self.n_paths else 0.0
+
+    def percentiles(self, values: np.ndarray, q: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+        """Percentiles of a per-path array keyed like "p50"."""
+        if len(values) == 0:
+            return {f"p{p:g}": 0.0 for p in q}
+        return {f"p{p:g}": float(v) for p, v in zip(q, np.percentile(values, q))}
+
+    def summary(self, q: Sequence[float] = PERCENTILES) -> Dict[str, Any]:
+        """Summarize the distributions as a JSON-serializable dictionary."""
+        return {
+            "method": self.method,
+            "block_size": self.block_size,
+            "n_paths": self.n_paths,
+            "n_trades": self.n_trades,
+            "leverage_scale": self.leverage_scale,
+            "ruin_level": self.ruin_level,
+            "ruin_probability": self.ruin_probability,
+            "loss_probability": self.loss_probability,
+            "max_drawdown": self.percentiles(self.max_drawdown, q),
+            "terminal_equity": self.percentiles(self.terminal_equity, q),
+            "time_to_recovery": self.percentiles(self.time_to_recovery, q),
+        }
+
+
+def trade_returns(trades: Any, initial_balance: float) -> np.ndarray:
+    """Convert trades into returns on the equity before each trade.
+
+    Args:
+        trades: Trade objects, trade dicts or a structured trade array
+        initial_balance: Starting balance of the backtest
+
+    Returns:
+        Per-trade returns in exit-time order (-1.0 where equity was gone)
+
+    Raises:
+        ValueError: If initial_balance is not positive
+    """
+    if initial_balance <= 0:
+        raise ValueError(f"initial_balance must be positive, got {initial_balance}")
+
+    trades = performance_analytics.trades_to_array(trades)
+    if len(trades) == 0:
+        return np.zeros(0)
+
+    order = np.argsort(trades["exit_time"], kind="stable")
+    equity_before = performance_analytics.equity_from_trades(trades, initial_balance)[:-1]
+    pnl = trades["pnl"][order]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(equity_before > 0, pnl / equity_before, -1.0)
+    return returns
+
+
+def resample_indices(
+    rng: np.random.Generator,
+    n_returns: int,
+    n_paths: int,
+    n_trades: int,
+    method: str = "bootstrap",
+    block_size: int = 20
+) -> np.ndarray:
+    """Draw a (n_paths, n_trades) matrix of indices into the return table.
+
+    Args:
+        rng: Random generator
+        n_returns: Number of observed trade returns
+        n_paths: Number of paths
+        n_trades: Trades per path
+        method: "bootstrap" or "block"
+        block_size: Block length for the circular block bootstrap
+
+    Returns:
+        int32 index matrix
+    """
+    if method == "bootstrap":
+        return rng.integers(0, n_returns, size=(n_paths, n_trades), dtype=np.int32)
+
+    block_size = max(1, min(block_size, n_returns))
+    n_blocks = math.ceil(n_trades / block_size)
+    starts = rng.integers(0, n_returns, size=(n_paths, n_blocks, 1), dtype=np.int32)
+    offsets = np.arange(block_size, dtype=np.int32)
+    indices = (starts + offsets) % n_returns
+    return indices.reshape(n_paths, n_blocks * block_size)[:, :n_trades]
+
+
+def _path_stats(log_returns: np.ndarray, indices: np.ndarray, log_ruin: float):
+    """Evaluate drawdown, terminal equity, recovery time and ruin per path."""
+    n_paths, n_trades = indices.shape
+
+    # Log equity after each trade, with the starting point (0) prepended
+    log_equity = np.empty((n_paths, n_trades + 1))
+    log_equity[:, 0] = 0.0
+    np.cumsum(log_returns[indices], axis=1, out=log_equity[:, 1:])
+
+    terminal_equity = np.exp(log_equity[:, -1])
+    ruined = log_equity.min(axis=1) <= log_ruin
+
+    # Distance below the running peak (computed in place of the peak)
+    below_peak = np.maximum.accumulate(log_equity, axis=1)
+    np.subtract(log_equity, below_peak, out=below_peak)
+    max_drawdown = -np.expm1(below_peak.min(axis=1))
+
+    # Trades since the last peak; its maximum is the longest underwater stretch
+    steps = np.arange(n_trades + 1, dtype=np.int32)
+    last_peak = np.maximum.accumulate(np.where(below_peak >= 0, steps, np.int32(0)), axis=1)
+    time_to_recovery = (steps - last_peak).max(axis=1)
+
+    return max_drawdown, terminal_equity, time_to_recovery, ruined
+
+
+def simulate_many(
+    returns: Sequence[float],
+    leverage_scales: Sequence[float],
+    n_paths: int = 100_000,
+    n_trades: Optional[int] = None,
+    method: str = "bootstrap",
+    block_size: int = 20,
+    ruin_level: float = 0.5,
+    seed: Optional[int] = None
+) -> List[MonteCarloResult]:
+    """Run one set of resampled paths at several leverage scales.
+
+    All scales share the same resampled trade sequences (common random
+    numbers), so differences between them come from leverage alone.
+
+    Args:
+        returns: Per-trade returns on equity (see trade_returns)
+        leverage_scales: Factors applied to every return, one result each
+        n_paths: Number of paths
+        n_trades: Trades per path (defaults to the number of returns)
+        method: "bootstrap" or "block"
+        block_size: Block length for the block bootstrap
+        ruin_level: Equity multiple at or below which a path is ruined
+        seed: Random seed
+
+    Returns:
+        One MonteCarloResult per leverage scale, in order
+
+    Raises:
+        ValueError: If the method, sizes or ruin level are invalid
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method}")
+    if n_paths < 1:
+        raise ValueError(f"n_paths must be at least 1, got {n_paths}")
+    if block_size < 1:
+        raise ValueError(f"block_size must be at least 1, got {block_size}")
+    if not 0 <= ruin_level < 1:
+        raise ValueError(f"ruin_level must be in [0, 1), got {ruin_level}")
+
+    returns = np.asarray(returns, dtype=float).reshape(-1)
+    n_trades = len(returns) if n_trades is None else n_trades
+    if len(returns) == 0 or n_trades < 1:
+        raise ValueError("At least one trade return is required")
+
+    log_ruin = math.log(max(ruin_level, RUIN_FLOOR))
+    log_tables = [
+        np.log(np.maximum(1.0 + scale * returns, WIPEOUT_EQUITY)) for scale in leverage_scales
+    ]
+
+    outputs = [
+        (np.empty(n_paths), np.empty(n_paths), np.empty(n_paths, dtype=np.int64), np.empty(n_paths, dtype=bool))
+        for _ in leverage_scales
+    ]
+
+    rng = np.random.default_rng(seed)
+    chunk = max(1, CHUNK_ELEMENTS // (n_trades + 1))
+    for start in range(0, n_paths, chunk):
+        stop = min(start + chunk, n_paths)
+        indices = resample_indices(rng, len(returns), stop - start, n_trades, method, block_size)
+        for log_returns, arrays in zip(log_tables, outputs):
+            for target, values in zip(arrays, _path_stats(log_returns, indices, log_ruin)):
+                target[start:stop] = values
+
+    return [
+        MonteCarloResult(
+            method=method,
+            n_paths=n_paths,
+            n_trades=n_trades,
+            leverage_scale=float(scale),
+            ruin_level=ruin_level,
+            max_drawdown=max_drawdown,
+            terminal_equity=terminal_equity,
+            time_to_recovery=time_to_recovery,
+            ruined=ruined,
+            block_size=block_size if method == "block" else None
+        )
+        for scale, (max_drawdown, terminal_equity, time_to_recovery, ruined) in zip(leverage_scales, outputs)
+    ]
+
+
+def simulate(
+    returns: Sequence[float],
+    n_paths: int = 100_000,
+    n_trades: Optional[int] = None,
+    method: str = "bootstrap",
+    block_size: int = 20,
+    leverage_scale: float = 1.0,
+    ruin_level: float = 0.5,
+    seed: Optional[int] = None
+) -> MonteCarloResult:
+    """Resample trade returns into n_paths equity paths.
+
+    Args:
+        returns: Per-trade returns on equity (see trade_returns)
+        n_paths: Number of paths
+        n_trades: Trades per path (defaults to the number of returns)
+        method: "bootstrap" or "block"
+        block_size: Block length for the block bootstrap
+        leverage_scale: Factor applied to every return
+        ruin_level: Equity multiple at or below which a path is ruined
+        seed: Random seed
+
+    Returns:
+        MonteCarloResult with per-path outcomes
+    """
+    return simulate_many(
+        returns, [leverage_scale], n_paths, n_trades, method, block_size, ruin_level, seed
+    )[0]
+
+
+def ruin_by_leverage(
+    returns: Sequence[float],
+    backtest_leverage: float,
+    leverages: Sequence[float],
+    **kwargs
+) -> Dict[float, float]:
+    """Ruin probability of the backtest's trades run at other leverages.
+
+    Args:
+        returns: Per-trade returns on equity at backtest_leverage
+        backtest_leverage: Leverage the trades were produced with
+        leverages: Leverages to evaluate
+        **kwargs: Passed to simulate_many (n_paths, method, ruin_level, ...)
+
+    Returns:
+        Ruin probability per leverage
+
+    Raises:
+        ValueError: If backtest_leverage is not positive
+    """
+    if backtest_leverage <= 0:
+        raise ValueError(f"backtest_leverage must be positive, got {backtest_leverage}")
+    results = simulate_many(returns, [lev / backtest_leverage for lev in leverages], **kwargs)
+    return {lev: result.ruin_probability for lev, result in zip(leverages, results)}
@@ -2,16 +2,93 @@
 
 import time
 import logging
-from typing import Optional, Dict, Any
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, Set
 from binance.client import Client
 from binance.exceptions import BinanceAPIException, BinanceRequestException
 
 from src.config import Config
+from src.exchange_info import ExchangeInfoCache
+from src.models import Position
+from src import instrumentation
+from src.user_data_stream import AccountStateCache, FINAL_ORDER_STATUSES
 
 
 logger = logging.getLogger(__name__)
 
 
+# Maximum orders per futures batch order request
+BATCH_ORDER_LIMIT = 5
+
+# Batch requests sent concurrently
+MAX_BATCH_WORKERS = 4
+
+# Exchange error codes that mean the order was not accepted and can be
+# resubmitted as is (too many requests, server overloaded)
+RETRYABLE_ERROR_CODES = frozenset({-1003, -1008})
+
+# Exchange error codes after which the order may or may not have been placed
+# (disconnected, timeout); such legs are looked up before being resubmitted
+AMBIGUOUS_ERROR_CODES = frozenset({-1001, -1007})
+
+# futures_get_order error code for an order the exchange has never seen
+ORDER_NOT_FOUND_CODE = -2013
+
+# Prefix of the client order IDs given to batch legs
+CLIENT_ORDER_ID_PREFIX = "bb"
+
+
+@dataclass
+class BatchOrderResult:
+    """Outcome of one order of a batch.
+    
+    Attributes:
+        request: Order parameters as submitted
+        order: Exchange order response (None if the order failed)
+        error: Last error message (None on success)
+        error_code: Last exchange error code (None on success or network error)
+        attempts: Number of times the order was submitted (lookups of a leg
+            whose outcome was unknown do not count)
+    """
+    request: Dict[str, Any]
+    order: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    error_code: Optional[int] = None
+    attempts: int = 0
+    
+    @property
+    def success(self) -> bool:
+        """Whether the exchange accepted the order."""
+        return self.order is not None
+
+
+@dataclass
+class OrderStats:
+    """Order submission outcomes used to track rejection and retry rates.
+    
+    Attributes:
+        submitted: Orders sent to the exchange (every attempt counts)
+        rejected: Submissions the exchange (or the network) failed
+        retried: Submissions that repeated a failed one
+        blocked: Orders stopped before sending because they break the
+            symbol's exchange filters
+    """
+    submitted: int = 0
+    rejected: int = 0
+    retried: int = 0
+    blocked: int = 0
+    
+    def per_thousand(self) -> Dict[str, float]:
+        """Get rejections and retries per 1000 submitted orders."""
+        scale = 1000.0 / self.submitted if self.submitted else 0.0
+        return {
+            "rejected_per_1k": self.rejected * scale,
+            "retried_per_1k": self.retried * scale,
+        }
+
+
 class OrderExecutor:
     """Handles order execution and Binance API interactions.
     
@@ -49,6 +126,20 @@ class OrderExecutor:
         self.base_backoff = 1.0  # seconds
         self._authenticated = False
         self._permissions_validated = False
+        
+        # Set by the bot once the user data stream is live; balances,
+        # positions and fills are then read from memory instead of REST
+        self.account_cache: Optional[AccountStateCache] = None
+        
+        # Set by the bot once symbol filters are loaded; quantities and
+        # prices are then rounded and checked before an order is sent
+        self.exchange_info: Optional[ExchangeInfoCache] = None
+        self.order_stats = OrderStats()
+        
+        # Batch legs get a client order ID unique to this executor so a leg
+        # whose submission timed out can be looked up instead of resent
+        self._client_order_session = f"{CLIENT_ORDER_ID_PREFIX}{int(time.time() * 1000):x}"
+        self._client_order_seq = itertools.count(1)
     
     def validate_authentication(self) -> bool:
         """Validate API authentication at startup.
@@ -66,6 +157,7 @@ class OrderExecutor:
         try:
             # Test authentication by fetching account info
             logger.info("Validating API authentication...")
+            instrumentation.increment("rest.futures_account")
             account_info = self.client.futures_account()
             
             if account_info and 'assets' in account_info:
@@ -106,14 +198,17 @@ class OrderExecutor:
             
             # Check if API key has futures trading permissions
             # Try to get account info (requires read permission)
+            instrumentation.increment("rest.futures_account")
             account_info = self.client.futures_account()
             
             # Try to get current open orders (requires read permission)
+            instrumentation.increment("rest.futures_get_open_orders")
             open_orders = self.client.futures_get_open_orders()
             
             # For LIVE mode, we need trading permissions
             # We can't test this without actually placing an order,
             # so we check the API key restrictions
+            instrumentation.increment("rest.get_account_api_permissions")
             api_key_permissions = self.client.get_account_api_permissions()
             
             # Check if futures trading is enabled
@@ -187,6 +282,7 @@ class OrderExecutor:
         logger.info(f"Setting leverage to {leverage}x for {symbol}")
         
         try:
+            instrumentation.increment("rest.futures_change_leverage")
             response = self.client.futures_change_leverage(
                 symbol=symbol,
                 leverage=leverage
@@ -223,6 +319,7 @@ class OrderExecutor:
         logger.info(f"Setting margin type to {margin_type} for {symbol}")
         
         try:
+            instrumentation.increment("rest.futures_change_margin_type")
             response = self.client.futures_change_margin_type(
                 symbol=symbol,
                 marginType=margin_type
@@ -238,6 +335,7 @@ class OrderExecutor:
                 logger.error(f"Failed to set margin type: {e}")
                 raise
     
+    @instrumentation.timed("order.place_market_order")
     def place_market_order(
         self,
         symbol: str,
@@ -289,11 +387,15 @@ class OrderExecutor:
         if quantity <= 0:
             raise ValueError(f"Invalid quantity {quantity}. Must be positive")
         
+        quantity = self._prepare_quantity(symbol, quantity, reduce_only=reduce_only)
+        
         logger.info(f"Placing market {side} order for {quantity} {symbol}")
         logger.info("Calling Binance API...")
         
         for attempt in range(self.max_retries):
             try:
+                instrumentation.increment("rest.futures_create_order")
+                self._record_submission(retry=attempt > 0)
                 order = self.client.futures_create_order(
                     symbol=symbol,
                     side=side,
@@ -302,9 +404,10 @@ class OrderExecutor:
                     reduceOnly=reduce_only
                 )
                 logger.info(f"Order placed successfully: {order}")
-                return order
+                return self._await_fill(order)
             
             except (BinanceAPIException, BinanceRequestException) as e:
+                self._record_rejection()
                 logger.warning(f"Order placement attempt {attempt + 1} failed: {e}")
                 
                 if attempt < self.max_retries - 1:
@@ -317,6 +420,62 @@ class OrderExecutor:
                     logger.error(f"Order placement failed after {self.max_retries} attempts")
                     raise
     
+    def _await_fill(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the fill reported on the user data stream into an order response.
+        
+        Market orders are usually acknowledged as NEW; the fill arrives as an
+        ORDER_TRADE_UPDATE event moments later. Without a live stream the
+        response is returned unchanged.
+        
+        Args:
+            order: futures_create_order response
+            
+        Returns:
+            The response updated with the final status, executedQty and avgPrice
+        """
+        if self.account_cache is None or order.get("status") in FINAL_ORDER_STATUSES:
+            return order
+        
+        with instrumentation.timer("order.await_fill"):
+            state = self.account_cache.wait_for_order(order.get("orderId"), self.config.order_fill_timeout_seconds)
+        return self._merge_fill(order, state)
+    
+    def _await_fills(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge the fills of several orders, all awaited against one deadline.
+        
+        Waiting for all legs together bounds a batch close by a single
+        order_fill_timeout_seconds, however many fill events go missing.
+        
+        Args:
+            orders: futures_create_order responses
+            
+        Returns:
+            The responses updated as by _await_fill, in the order given
+        """
+        waiting = [order.get("orderId") for order in orders if order.get("status") not in FINAL_ORDER_STATUSES]
+        if self.account_cache is None or not waiting:
+            return orders
+        
+        with instrumentation.timer("order.await_fill"):
+            states = self.account_cache.wait_for_orders(waiting, self.config.order_fill_timeout_seconds)
+        return [
+            order if order.get("status") in FINAL_ORDER_STATUSES
+            else self._merge_fill(order, states.get(order.get("orderId")))
+            for order in orders
+        ]
+    
+    def _merge_fill(self, order: Dict[str, Any], state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge a user data stream order state into an order response."""
+        if state is None:
+            logger.warning(f"No fill event for order {order.get('orderId')} within {self.config.order_fill_timeout_seconds}s")
+            return order
+        
+        merged = dict(order)
+        merged.update({key: state[key] for key in ("status", "executedQty", "avgPrice", "updateTime")})
+        logger.info(f"Order {merged.get('orderId')} {merged['status']}: {merged['executedQty']} @ {merged['avgPrice']}")
+        return merged
+    
+    @instrumentation.timed("order.place_stop_loss_order")
     def place_stop_loss_order(
         self,
         symbol: str,
@@ -351,9 +510,14 @@ class OrderExecutor:
         if stop_price <= 0:
             raise ValueError(f"Invalid stop price {stop_price}. Must be positive")
         
+        quantity = self._prepare_quantity(symbol, quantity, reduce_only=True, market=False)
+        stop_price = self._prepare_price(symbol, stop_price)
+        
         logger.info(f"Placing stop-loss {side} order at {stop_price} for {quantity} {symbol}")
         
         try:
+            instrumentation.increment("rest.futures_create_order")
+            self._record_submission()
             order = self.client.futures_create_order(
                 symbol=symbol,
                 side=side,
@@ -366,9 +530,342 @@ class OrderExecutor:
             return order
         
         except BinanceAPIException as e:
+            self._record_rejection()
             logger.error(f"Failed to place stop-loss order: {e}")
             raise
     
+    def place_batch_orders(self, orders: List[Dict[str, Any]]) -> List[BatchOrderResult]:
+        """Submit several orders through the batch order endpoint.
+        
+        Orders are grouped into requests of up to BATCH_ORDER_LIMIT and the
+        requests are sent concurrently. Each leg gets a newClientOrderId (unless
+        one is given). Legs the exchange turned away because it was overloaded
+        are resubmitted, again batched, with exponential backoff. Legs whose
+        outcome is unknown (network error, disconnect, timeout) may have been
+        placed anyway, so before each resubmission they are looked up by
+        client order ID and only resent if the exchange has no such order;
+        legs the exchange rejects for good (e.g. a reduce-only order with no
+        position left) are reported immediately.
+        Quantities and stop prices are first rounded to the symbol filters;
+        legs that break them anyway fail without being sent.
+        
+        Args:
+            orders: Order parameters as for futures_create_order (symbol,
+                side, type, quantity, and stopPrice/reduceOnly as needed)
+            
+        Returns:
+            One result per order, in the order given
+            
+        Raises:
+            ValueError: If client is not initialized or an order is invalid
+        """
+        if self.client is None:
+            raise ValueError("Binance client not initialized. Cannot place orders in BACKTEST mode.")
+        
+        for order in orders:
+            if order.get("side") not in ["BUY", "SELL"]:
+                raise ValueError(f"Invalid order side '{order.get('side')}'. Must be 'BUY' or 'SELL'")
+            if float(order.get("quantity", 0)) <= 0:
+                raise ValueError(f"Invalid quantity {order.get('quantity')}. Must be positive")
+        
+        if not orders:
+            return []
+        
+        self.ensure_authenticated()
+        self.ensure_permissions_validated()
+        
+        # Round each leg to its symbol's filters; legs the exchange would
+        # reject anyway fail here without being sent
+        orders = [dict(order) for order in orders]
+        results = [BatchOrderResult(request=order) for order in orders]
+        pending = []
+        for index, order in enumerate(orders):
+            order.setdefault("newClientOrderId", self._next_client_order_id())
+            try:
+                self._prepare_order(order)
+                pending.append(index)
+            except ValueError as e:
+                results[index].error = str(e)
+        
+        # Legs whose last submission may or may not have reached the book
+        unknown: Set[int] = set()
+        for attempt in range(self.max_retries):
+            if not pending:
+                break
+            if attempt > 0:
+                backoff_delay = self.base_backoff * (2 ** (attempt - 1))
+                logger.info(f"Retrying {len(pending)} failed order(s) in {backoff_delay} seconds...")
+                time.sleep(backoff_delay)
+                self._resolve_unknown_legs(orders, results, pending, unknown)
+                pending = [index for index in pending if not results[index].success]
+            
+            # Legs the lookup could not settle wait for the next attempt
+            send = [index for index in pending if index not in unknown]
+            retry = [index for index in pending if index in unknown]
+            if not send:
+                pending = retry
+                continue
+            
+            chunks = [send[i:i + BATCH_ORDER_LIMIT] for i in range(0, len(send), BATCH_ORDER_LIMIT)]
+            with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(chunks)),
+                                    thread_name_prefix="batch-order") as pool:
+                responses = list(pool.map(
+                    lambda chunk: self._submit_batch([orders[i] for i in chunk]), chunks
+                ))
+            
+            for chunk, chunk_responses in zip(chunks, responses):
+                for index, response in zip(chunk, chunk_responses):
+                    result = results[index]
+                    result.attempts += 1
+                    self._record_submission(retry=attempt > 0)
+                    if "orderId" in response:
+                        result.order = response
+                        result.error = None
+                        result.error_code = None
+                    else:
+                        self._record_rejection()
+                        result.error = response.get("msg", "Unknown error")
+                        result.error_code = response.get("code")
+                        if result.error_code is None or result.error_code in AMBIGUOUS_ERROR_CODES:
+                            unknown.add(index)
+                            retry.append(index)
+                        elif result.error_code in RETRYABLE_ERROR_CODES:
+                            retry.append(index)
+            
+            pending = retry
+        
+        # Out of retries: a leg that timed out on its last attempt may still
+        # have been placed
+        self._resolve_unknown_legs(orders, results, pending, unknown)
+        
+        # Resting stops stay NEW; only market orders have a fill to wait for
+        market = [i for i, result in enumerate(results) if result.success and orders[i].get("type") == "MARKET"]
+        for index, order in zip(market, self._await_fills([results[i].order for i in market])):
+            results[index].order = order
+        
+        failed = [r for r in results if not r.success]
+        if failed:
+            logger.error(
+                f"{len(failed)}/{len(results)} batch order(s) failed: "
+                + ", ".join(f"{r.request.get('symbol')} ({r.error})" for r in failed)
+            )
+        logger.info(f"Batch of {len(results)} order(s) placed, {len(results) - len(failed)} succeeded")
+        return results
+    
+    def _next_client_order_id(self) -> str:
+        """Get a client order ID no other order of this executor uses."""
+        return f"{self._client_order_session}-{next(self._client_order_seq)}"
+    
+    def _resolve_unknown_legs(
+        self,
+        orders: List[Dict[str, Any]],
+        results: List[BatchOrderResult],
+        indexes: List[int],
+        unknown: Set[int]
+    ) -> None:
+        """Look up the batch legs whose submission outcome is unknown.
+        
+        A leg found on the exchange is marked successful. A leg the exchange
+        does not know (or rejected) leaves ``unknown`` and may be resent; a
+        leg that cannot be looked up stays in ``unknown``.
+        
+        Args:
+            orders: Batch legs as sent
+            results: Results of the legs, updated in place
+            indexes: Legs to consider (others in ``unknown`` are left alone)
+            unknown: Indexes of legs whose outcome is unknown, updated in place
+        """
+        for index in indexes:
+            if index not in unknown:
+                continue
+            placed, settled = self._lookup_order(orders[index])
+            if placed is not None and placed.get("status") not in ("REJECTED", "EXPIRED"):
+                logger.info(f"Order {orders[index]['newClientOrderId']} was placed despite the failed request")
+                result = results[index]
+                result.order = placed
+                result.error = None
+                result.error_code = None
+                unknown.discard(index)
+            elif placed is not None or settled:
+                unknown.discard(index)
+    
+    def _lookup_order(self, order: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Find a batch leg on the exchange by its client order ID.
+        
+        The account cache is checked first; a miss there proves nothing (the
+        event may not have arrived yet), so the exchange is then asked.
+        
+        Returns:
+            (order, settled): the exchange order (None if not found) and
+            whether the answer is definite (False if the lookup failed)
+        """
+        client_order_id = order["newClientOrderId"]
+        if self.account_cache is not None:
+            cached = self.account_cache.find_order_by_client_id(client_order_id)
+            if cached is not None:
+                return cached, True
+        
+        try:
+            instrumentation.increment("rest.futures_get_order")
+            return self.client.futures_get_order(symbol=order["symbol"], origClientOrderId=client_order_id), True
+        except BinanceAPIException as e:
+            if e.code == ORDER_NOT_FOUND_CODE:
+                return None, True
+            logger.warning(f"Could not look up order {client_order_id}: {e}")
+        except Exception as e:
+            logger.warning(f"Could not look up order {client_order_id}: {e}")
+        return None, False
+    
+    def _prepare_quantity(
+        self,
+        symbol: str,
+        quantity: float,
+        price: Optional[float] = None,
+        reduce_only: bool = False,
+        market: bool = True
+    ) -> float:
+        """Round a quantity to the symbol's lot step and check its minimums.
+        
+        Args:
+            symbol: Trading pair symbol
+            quantity: Requested quantity
+            price: Order price for the minimum notional check (None = skip)
+            reduce_only: Reduce-only orders are exempt from the minimum notional
+            market: Use the MARKET_LOT_SIZE filter instead of LOT_SIZE
+            
+        Returns:
+            Rounded quantity (unchanged if the symbol's filters are unknown)
+            
+        Raises:
+            ValueError: If the exchange would reject the rounded quantity
+        """
+        filters = self.exchange_info.get(symbol) if self.exchange_info is not None else None
+        if filters is None:
+            return quantity
+        
+        rounded = filters.round_quantity(quantity, market)
+        reason = filters.check_order(rounded, price, reduce_only, market)
+        if reason is not None:
+            self.order_stats.blocked += 1
+            instrumentation.increment("order.blocked", symbol=symbol)
+            raise ValueError(f"Order not sent: {reason}")
+        if rounded != quantity:
+            logger.info(f"Rounded {symbol} quantity {quantity} to {rounded}")
+        return rounded
+    
+    def _prepare_price(self, symbol: str, price: float) -> float:
+        """Round a price to the symbol's tick size (unchanged if unknown)."""
+        if self.exchange_info is None:
+            return price
+        return self.exchange_info.round_price(symbol, price)
+    
+    def _prepare_order(self, order: Dict[str, Any]) -> None:
+        """Round the quantity and stop price of a batch leg in place.
+        
+        Raises:
+            ValueError: If the exchange would reject the rounded leg
+        """
+        symbol = order["symbol"]
+        reduce_only = str(order.get("reduceOnly", False)).lower() == "true"
+        market = order.get("type") == "MARKET"
+        if "stopPrice" in order:
+            order["stopPrice"] = self._prepare_price(symbol, float(order["stopPrice"]))
+        order["quantity"] = self._prepare_quantity(
+            symbol, float(order["quantity"]), price=order.get("stopPrice"),
+            reduce_only=reduce_only, market=market
+        )
+    
+    def _record_submission(self, retry: bool = False) -> None:
+        """Count one order sent to the exchange."""
+        self.order_stats.submitted += 1
+        instrumentation.increment("order.submitted")
+        if retry:
+            self.order_stats.retried += 1
+            instrumentation.increment("order.retried")
+    
+    def _record_rejection(self) -> None:
+        """Count one failed order submission."""
+        self.order_stats.rejected += 1
+        instrumentation.increment("order.rejected")
+    
+    def _submit_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send one batch request.
+        
+        Returns:
+            One entry per order: the order response, or {"code", "msg"} for a
+            failed leg (a failed request fails every leg with code None, as
+            the exchange may or may not have placed them)
+        """
+        batch = [
+            {key: (str(value).lower() if isinstance(value, bool) else str(value)) for key, value in order.items()}
+            for order in orders
+        ]
+        try:
+            instrumentation.increment("rest.futures_place_batch_order")
+            with instrumentation.timer("order.batch_request"):
+                responses = self.client.futures_place_batch_order(batchOrders=batch)
+        except BinanceAPIException as e:
+            return [{"code": e.code, "msg": str(e)} for _ in orders]
+        except Exception as e:
+            # Network errors: whether the legs were placed is unknown
+            return [{"code": None, "msg": str(e)} for _ in orders]
+        
+        if len(responses) != len(orders):
+            return [{"code": None, "msg": f"Expected {len(orders)} responses, got {len(responses)}"} for _ in orders]
+        return responses
+    
+    def close_positions(self, positions: List[Position]) -> Dict[str, BatchOrderResult]:
+        """Close positions with reduce-only market orders sent as batches.
+        
+        Args:
+            positions: Positions to close
+            
+        Returns:
+            Dictionary of symbol -> order result
+        """
+        orders = [
+            {
+                "symbol": position.symbol,
+                "side": "SELL" if position.side == "LONG" else "BUY",
+                "type": "MARKET",
+                "quantity": position.quantity,
+                "reduceOnly": True,
+            }
+            for position in positions
+        ]
+        results = self.place_batch_orders(orders)
+        return {position.symbol: result for position, result in zip(positions, results)}
+    
+    def place_stop_loss_orders(self, positions: List[Position]) -> Dict[str, BatchOrderResult]:
+        """Place the stop-loss order of several positions as batches.
+        
+        Args:
+            positions: Positions whose current stop (trailing stop, or the
+                initial stop loss if none) should rest on the exchange
+            
+        Returns:
+            Dictionary of symbol -> order result
+            
+        Raises:
+            ValueError: If a stop price is not positive
+        """
+        orders = []
+        for position in positions:
+            stop_price = position.trailing_stop or position.stop_loss
+            if stop_price <= 0:
+                raise ValueError(f"Invalid stop price {stop_price}. Must be positive")
+            orders.append({
+                "symbol": position.symbol,
+                "side": "SELL" if position.side == "LONG" else "BUY",
+                "type": "STOP_MARKET",
+                "stopPrice": stop_price,
+                "quantity": position.quantity,
+                "reduceOnly": True,
+            })
+        results = self.place_batch_orders(orders)
+        return {position.symbol: result for position, result in zip(positions, results)}
+    
+    @instrumentation.timed("order.cancel_order")
     def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
         """Cancel pending order.
         
@@ -389,6 +886,7 @@ class OrderExecutor:
         logger.info(f"Cancelling order {order_id} for {symbol}")
         
         try:
+            instrumentation.increment("rest.futures_cancel_order")
             response = self.client.futures_cancel_order(
                 symbol=symbol,
                 orderId=order_id
@@ -400,9 +898,12 @@ class OrderExecutor:
             logger.error(f"Failed to cancel order: {e}")
             raise
     
+    @instrumentation.timed("order.get_account_balance")
     def get_account_balance(self) -> float:
         """Get current USDT balance from futures account.
         
+        Served from the user data stream cache while its snapshot is fresh;
+        otherwise fetched over REST (which also refreshes the cache).
         Implements retry logic with exponential backoff for network resilience.
         
         Returns:
@@ -415,13 +916,23 @@ class OrderExecutor:
         if self.client is None:
             raise ValueError("Binance client not initialized. Cannot get balance in BACKTEST mode.")
         
+        if self.account_cache is not None:
+            cached_balance = self.account_cache.get_available_balance("USDT")
+            if cached_balance is not None:
+                instrumentation.increment("cache.account_balance.hit")
+                return cached_balance
+            instrumentation.increment("cache.account_balance.miss")
+        
         max_retries = 3
         retry_delay = 1.0  # Start with 1 second
         
         for attempt in range(max_retries):
             try:
                 logger.info(f"Fetching account balance (attempt {attempt + 1}/{max_retries})...")
+                instrumentation.increment("rest.futures_account")
                 account_info = self.client.futures_account()
+                if self.account_cache is not None:
+                    self.account_cache.seed_account(account_info)
                 
                 # Find USDT balance
                 for asset in account_info['assets']:
@@ -455,6 +966,34 @@ class OrderExecutor:
                     logger.error(f"Failed to get account balance after {attempt + 1} attempts: {e}")
                     raise
     
+    def get_position_amounts(self) -> Dict[str, float]:
+        """Get signed open position sizes from the exchange (or the user data stream cache).
+        
+        Returns:
+            Dictionary of symbol -> position amount (positive long, negative
+            short) for symbols with an open position
+        
+        Raises:
+            BinanceAPIException: If API request fails
+            ValueError: If client is not initialized
+        """
+        if self.client is None:
+            raise ValueError("Binance client not initialized. Cannot get positions in BACKTEST mode.")
+        
+        if self.account_cache is not None:
+            cached_amounts = self.account_cache.get_position_amounts()
+            if cached_amounts is not None:
+                return cached_amounts
+        
+        instrumentation.increment("rest.futures_position_information")
+        positions = self.client.futures_position_information()
+        amounts = {}
+        for position in positions:
+            amount = float(position['positionAmt'])
+            if amount != 0:
+                amounts[position['symbol']] = amount
+        return amounts
+    
     def validate_margin_availability(
         self,
         symbol: str,
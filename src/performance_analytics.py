@@ -0,0 +1,496 @@
+"""Vectorized performance analytics for Binance Futures Trading Bot.
+
+Trades are converted once into a structured NumPy array (TRADE_DTYPE) and
+every metric is computed from column arrays, so the backtester, the portfolio
+runner and the dashboard all report identical numbers and stay fast on sweeps
+that produce millions of trades.
+
+Provides:
+- Summary metrics (win rate, PnL, ROI, drawdown, profit factor, Sharpe, ...)
+- Equity and underwater curves
+- Daily (time-bucketed) returns and rolling Sharpe ratio
+- Per-symbol, per-side and per-exit-reason breakdowns
+
+Conventions (shared by every caller):
+- A winning trade has pnl > 0; every other trade counts as losing
+- average_loss and largest_loss are negative numbers
+- sharpe_ratio is mean / population std of per-trade pnl_percent,
+  annualized with sqrt(250)
+- average_trade_duration is in milliseconds
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.models import PerformanceMetrics
+
+
+TRADE_DTYPE = np.dtype([
+    ("symbol", "<U20"),
+    ("side", "<U5"),
+    ("entry_price", "<f8"),
+    ("exit_price", "<f8"),
+    ("quantity", "<f8"),
+    ("pnl", "<f8"),
+    ("pnl_percent", "<f8"),
+    ("entry_time", "<i8"),
+    ("exit_time", "<i8"),
+    ("exit_reason", "<U32"),
+])
+
+DAY_MS = 24 * 60 * 60 * 1000
+TRADE_SHARPE_PERIODS = 250
+
+
+@dataclass
+class DailyReturns:
+    """Trade PnL bucketed by UTC calendar day of exit.
+
+    Attributes:
+        day: Day start timestamps in milliseconds (contiguous, no gaps)
+        pnl: Realized PnL per day
+        returns: PnL divided by equity at the start of the day
+        equity: Equity at the end of each day
+    """
+    day: np.ndarray
+    pnl: np.ndarray
+    returns: np.ndarray
+    equity: np.ndarray
+
+
+def to_milliseconds(value: Any) -> Optional[int]:
+    """Convert a timestamp (ms number, datetime or ISO string) to milliseconds.
+
+    Args:
+        value: Timestamp value
+
+    Returns:
+        Milliseconds since epoch, or None if the value cannot be parsed
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else int(value)
+    if isinstance(value, str) and not value:
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    if ts is pd.NaT:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value // 1_000_000)
+
+
+def trades_to_array(trades: Iterable[Any]) -> np.ndarray:
+    """Convert Trade objects or trade dictionaries to a structured array.
+
+    Trade dictionaries (as written to the trade logs) may use ISO strings for
+    entry_time/exit_time and return_percentage instead of pnl_percent.
+
+    Args:
+        trades: Iterable of Trade objects, trade dicts, or a TRADE_DTYPE array
+
+    Returns:
+        Structured array with TRADE_DTYPE, in input order
+    """
+    if isinstance(trades, np.ndarray) and trades.dtype == TRADE_DTYPE:
+        return trades
+
+    trades = list(trades)
+    if not trades:
+        return np.empty(0, dtype=TRADE_DTYPE)
+
+    if isinstance(trades[0], dict):
+        rows = [
+            (
+                t.get("symbol", ""),
+                t.get("side", ""),
+                t.get("entry_price", 0.0) or 0.0,
+                t.get("exit_price", 0.0) or 0.0,
+                t.get("quantity", 0.0) or 0.0,
+                t.get("pnl", 0.0) or 0.0,
+                t.get("pnl_percent", t.get("return_percentage", 0.0)) or 0.0,
+                to_milliseconds(t.get("entry_time")) or 0,
+                to_milliseconds(t.get("exit_time", t.get("timestamp"))) or 0,
+                t.get("exit_reason", "UNKNOWN") or "UNKNOWN",
+            )
+            for t in trades
+        ]
+    else:
+        rows = [
+            (
+                t.symbol, t.side, t.entry_price, t.exit_price, t.quantity,
+                t.pnl, t.pnl_percent, t.entry_time, t.exit_time, t.exit_reason
+            )
+            for t in trades
+        ]
+    return np.array(rows, dtype=TRADE_DTYPE)
+
+
+def equity_from_trades(trades: np.ndarray, initial_balance: float) -> np.ndarray:
+    """Build the equity curve realized trade by trade, in exit-time order.
+
+    Args:
+        trades: Structured trade array
+        initial_balance: Starting balance
+
+    Returns:
+        Equity array of length len(trades) + 1, starting at initial_balance
+    """
+    order = np.argsort(trades["exit_time"], kind="stable")
+    return initial_balance + np.concatenate(([0.0], np.cumsum(trades["pnl"][order])))
+
+
+def underwater_curve(equity: Sequence[float], percent: bool = False) -> np.ndarray:
+    """Calculate the distance below the running equity peak at every point.
+
+    Args:
+        equity: Equity values
+        percent: If True, return drawdown as a percentage of the running peak
+
+    Returns:
+        Array of values <= 0 (0 at new equity highs)
+    """
+    equity = np.asarray(equity, dtype=float)
+    if len(equity) == 0:
+        return equity
+    peak = np.maximum.accumulate(equity)
+    underwater = equity - peak
+    if percent:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            underwater = np.where(peak > 0, underwater / peak * 100, 0.0)
+    return underwater
+
+
+def max_drawdown(equity: Sequence[float]) -> float:
+    """Calculate the maximum peak-to-trough drawdown in quote currency.
+
+    Args:
+        equity: Equity values
+
+    Returns:
+        Maximum drawdown as a positive number (0.0 if empty)
+    """
+    if len(equity) == 0:
+        return 0.0
+    return float(-underwater_curve(equity).min())
+
+
+def max_drawdown_percent(equity: Sequence[float]) -> float:
+    """Calculate the maximum drawdown as a percentage of the running peak.
+
+    Args:
+        equity: Equity values
+
+    Returns:
+        Maximum drawdown percentage as a positive number (0.0 if empty)
+    """
+    if len(equity) == 0:
+        return 0.0
+    return float(-underwater_curve(equity, percent=True).min())
+
+
+def sharpe_ratio(returns: Sequence[float], periods_per_year: float = TRADE_SHARPE_PERIODS) -> float:
+    """Calculate the annualized Sharpe ratio (risk-free rate 0).
+
+    Args:
+        returns: Per-period returns as decimals
+        periods_per_year: Annualization factor
+
+    Returns:
+        Sharpe ratio, or 0.0 with fewer than 2 returns or zero volatility
+    """
+    returns = np.asarray(returns, dtype=float)
+    if len(returns) < 2:
+        return 0.0
+    std = returns.std()
+    if std == 0:
+        return 0.0
+    return float(returns.mean() / std * np.sqrt(periods_per_year))
+
+
+def rolling_sharpe(
+    returns: Sequence[float],
+    window: int,
+    periods_per_year: float = 365
+) -> np.ndarray:
+    """Calculate the rolling annualized Sharpe ratio with O(n) cumulative sums.
+
+    Args:
+        returns: Per-period returns as decimals
+        window: Rolling window length
+        periods_per_year: Annualization factor (365 for daily crypto returns)
+
+    Returns:
+        Array the same length as returns, NaN until the window is full
+        and where the window has zero volatility
+    """
+    returns = np.asarray(returns, dtype=float)
+    n = len(returns)
+    result = np.full(n, np.nan)
+    if window < 2 or n < window:
+        return result
+
+    csum = np.concatenate(([0.0], np.cumsum(returns)))
+    csum_sq = np.concatenate(([0.0], np.cumsum(returns * returns)))
+    window_sum = csum[window:] - csum[:-window]
+    window_sum_sq = csum_sq[window:] - csum_sq[:-window]
+
+    mean = window_sum / window
+    variance = np.maximum(window_sum_sq / window - mean * mean, 0.0)
+    std = np.sqrt(variance)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 1e-12, mean / std * np.sqrt(periods_per_year), np.nan)
+    result[window - 1:] = sharpe
+    return result
+
+
+def daily_returns(trades: Any, initial_balance: float) -> DailyReturns:
+    """Bucket realized PnL by UTC day of exit and convert it to returns.
+
+    Days without exits are included with zero PnL so the series is
+    contiguous, which keeps rolling statistics on a calendar basis.
+
+    Args:
+        trades: Trade objects, trade dicts or a structured trade array
+        initial_balance: Starting balance
+
+    Returns:
+        DailyReturns with one entry per calendar day
+    """
+    trades = trades_to_array(trades)
+    if len(trades) == 0:
+        empty = np.empty(0)
+        return DailyReturns(np.empty(0, dtype=np.int64), empty, empty, empty)
+
+    day_index = trades["exit_time"] // DAY_MS
+    first_day = int(day_index.min())
+    num_days = int(day_index.max()) - first_day + 1
+
+    pnl = np.bincount(day_index - first_day, weights=trades["pnl"], minlength=num_days)
+    equity = initial_balance + np.cumsum(pnl)
+    start_equity = np.concatenate(([initial_balance], equity[:-1]))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(start_equity > 0, pnl / start_equity, 0.0)
+
+    days = (first_day + np.arange(num_days, dtype=np.int64)) * DAY_MS
+    return DailyReturns(day=days, pnl=pnl, returns=returns, equity=equity)
+
+
+def group_stats(keys: np.ndarray, pnl: np.ndarray) -> Dict[Any, Dict[str, float]]:
+    """Aggregate PnL statistics for each distinct key.
+
+    Args:
+        keys: Group key per trade
+        pnl: PnL per trade
+
+    Returns:
+        Dictionary mapping each key to trades, winning_trades, win_rate,
+        total_pnl, average_pnl, gross_profit, gross_loss and profit_factor
+    """
+    if len(keys) == 0:
+        return {}
+
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    size = len(unique_keys)
+    counts = np.bincount(inverse, minlength=size)
+    wins = np.bincount(inverse, weights=(pnl > 0).astype(float), minlength=size)
+    totals = np.bincount(inverse, weights=pnl, minlength=size)
+    gross_profit = np.bincount(inverse, weights=np.where(pnl > 0, pnl, 0.0), minlength=size)
+    gross_loss = -np.bincount(inverse, weights=np.where(pnl < 0, pnl, 0.0), minlength=size)
+
+    result = {}
+    for i, key in enumerate(unique_keys.tolist()):
+        result[key] = {
+            "trades": int(counts[i]),
+            "winning_trades": int(wins[i]),
+            "win_rate": float(wins[i] / counts[i] * 100),
+            "total_pnl": float(totals[i]),
+            "average_pnl": float(totals[i] / counts[i]),
+            "gross_profit": float(gross_profit[i]),
+            "gross_loss": float(gross_loss[i]),
+            "profit_factor": float(gross_profit[i] / gross_loss[i]) if gross_loss[i] > 0 else 0.0
+        }
+    return result
+
+
+def breakdown(trades: Any, by: str) -> Dict[str, Dict[str, float]]:
+    """Break trade statistics down by a trade field.
+
+    Args:
+        trades: Trade objects, trade dicts or a structured trade array
+        by: Field to group by ("symbol", "side" or "exit_reason")
+
+    Returns:
+        Dictionary mapping each field value to its statistics (see group_stats)
+    """
+    if by not in ("symbol", "side", "exit_reason"):
+        raise ValueError(f"Unsupported breakdown field: {by}")
+    trades = trades_to_array(trades)
+    return group_stats(trades[by], trades["pnl"])
+
+
+def calculate_metrics(
+    trades: Any,
+    initial_balance: float,
+    equity_curve: Optional[Sequence[float]] = None
+) -> Dict:
+    """Calculate summary performance metrics.
+
+    Args:
+        trades: Trade objects, trade dicts or a structured trade array
+        initial_balance: Starting balance (used for ROI and trade equity)
+        equity_curve: Optional mark-to-market equity curve for drawdown;
+            when omitted, drawdown uses equity realized trade by trade
+
+    Returns:
+        Dictionary with total_trades, winning_trades, losing_trades, win_rate,
+        total_pnl, roi, max_drawdown, max_drawdown_percent, profit_factor,
+        sharpe_ratio, average_win, average_loss, largest_win, largest_loss
+        and average_trade_duration
+    """
+    trades = trades_to_array(trades)
+    total_trades = len(trades)
+
+    if total_trades == 0:
+        return {
+            "total_trades": 0,
+            "winning_trades": 0,
+            "losing_trades": 0,
+            "win_rate": 0.0,
+            "total_pnl": 0.0,
+            "roi": 0.0,
+            "max_drawdown": 0.0,
+            "max_drawdown_percent": 0.0,
+            "profit_factor": 0.0,
+            "sharpe_ratio": 0.0,
+            "average_win": 0.0,
+            "average_loss": 0.0,
+            "largest_win": 0.0,
+            "largest_loss": 0.0,
+            "average_trade_duration": 0
+        }
+
+    pnl = trades["pnl"]
+    win_mask = pnl > 0
+    loss_mask = pnl < 0
+    wins = pnl[win_mask]
+    losses = pnl[loss_mask]
+
+    winning_trades = int(win_mask.sum())
+    total_pnl = float(pnl.sum())
+    gross_profit = float(wins.sum())
+    gross_loss = float(-losses.sum())
+
+    if equity_curve is not None and len(equity_curve) > 0:
+        equity = np.asarray(equity_curve, dtype=float)
+    else:
+        equity = equity_from_trades(trades, initial_balance)
+
+    durations = trades["exit_time"] - trades["entry_time"]
+
+    return {
+        "total_trades": total_trades,
+        "winning_trades": winning_trades,
+        "losing_trades": total_trades - winning_trades,
+        "win_rate": winning_trades / total_trades * 100,
+        "total_pnl": total_pnl,
+        "roi": (total_pnl / initial_balance * 100) if initial_balance > 0 else 0.0,
+        "max_drawdown": max_drawdown(equity),
+        "max_drawdown_percent": max_drawdown_percent(equity),
+        "profit_factor": (gross_profit / gross_loss) if gross_loss > 0 else 0.0,
+        "sharpe_ratio": sharpe_ratio(trades["pnl_percent"] / 100),
+        "average_win": float(wins.mean()) if len(wins) else 0.0,
+        "average_loss": float(losses.mean()) if len(losses) else 0.0,
+        "largest_win": float(wins.max()) if len(wins) else 0.0,
+        "largest_loss": float(losses.min()) if len(losses) else 0.0,
+        "average_trade_duration": int(durations.mean())
+    }
+
+
+def metrics_from_totals(totals: Dict[str, float], initial_balance: float, recent_trades: Any = ()) -> Dict:
+    """Calculate summary metrics from running trade totals.
+
+    For sessions that only keep their most recent trades in memory: counts,
+    P&L, win/loss figures and drawdown come from totals over every trade,
+    the Sharpe ratio from the trades still held.
+
+    Args:
+        totals: RiskManager.get_trade_totals() output
+        initial_balance: Balance before the first trade
+        recent_trades: Trades still held (Trade objects, dicts or array)
+
+    Returns:
+        Dictionary with the keys of calculate_metrics; max_drawdown_percent
+        is the percent of the largest drawdown in quote currency
+    """
+    count = int(totals["count"])
+    if count == 0:
+        return calculate_metrics((), initial_balance)
+
+    winning = int(totals["winning"])
+    losses = int(totals["losses"])
+    total_pnl = float(totals["pnl"])
+    gross_loss = float(totals["gross_loss"])
+    drawdown_peak = initial_balance + totals["drawdown_peak_pnl"]
+    recent = trades_to_array(recent_trades)
+
+    return {
+        "total_trades": count,
+        "winning_trades": winning,
+        "losing_trades": count - winning,
+        "win_rate": winning / count * 100,
+        "total_pnl": total_pnl,
+        "roi": (total_pnl / initial_balance * 100) if initial_balance > 0 else 0.0,
+        "max_drawdown": float(totals["max_drawdown"]),
+        "max_drawdown_percent": (totals["max_drawdown"] / drawdown_peak * 100) if drawdown_peak > 0 else 0.0,
+        "profit_factor": (totals["gross_profit"] / gross_loss) if gross_loss > 0 else 0.0,
+        "sharpe_ratio": sharpe_ratio(recent["pnl_percent"] / 100),
+        "average_win": (totals["gross_profit"] / winning) if winning else 0.0,
+        "average_loss": (-gross_loss / losses) if losses else 0.0,
+        "largest_win": float(totals["largest_win"]),
+        "largest_loss": float(totals["largest_loss"]),
+        "average_trade_duration": int(totals["duration"] / count)
+    }
+
+
+def to_performance_metrics(metrics: Dict, initial_balance: float = 0.0) -> PerformanceMetrics:
+    """Convert a metrics dictionary to a PerformanceMetrics record.
+
+    Args:
+        metrics: Output of calculate_metrics
+        initial_balance: Starting balance for total_pnl_percent
+
+    Returns:
+        PerformanceMetrics (average_trade_duration converted to seconds)
+    """
+    total_pnl = metrics["total_pnl"]
+    return PerformanceMetrics(
+        total_trades=metrics["total_trades"],
+        winning_trades=metrics["winning_trades"],
+        losing_trades=metrics["losing_trades"],
+        win_rate=metrics["win_rate"],
+        total_pnl=total_pnl,
+        total_pnl_percent=(total_pnl / initial_balance * 100) if initial_balance > 0 else 0.0,
+        roi=metrics["roi"],
+        max_drawdown=metrics["max_drawdown"],
+        max_drawdown_percent=metrics.get("max_drawdown_percent", 0.0),
+        profit_factor=metrics["profit_factor"],
+        sharpe_ratio=metrics["sharpe_ratio"],
+        average_win=metrics["average_win"],
+        average_loss=metrics["average_loss"],
+        largest_win=metrics["largest_win"],
+        largest_loss=metrics["largest_loss"],
+        average_trade_duration=metrics["average_trade_duration"] // 1000
+    )
@@ -0,0 +1,452 @@
+"""Portfolio backtest over a merged multi-symbol timeline.
+
+BacktestEngine simulates one symbol with its own balance. Running it per
+symbol and adding up the PnL ignores everything that happens between
+symbols: capital tied up in other positions, PortfolioManager allocation
+and correlation limits, portfolio_max_total_risk and
+RiskManager.can_open_position_for_symbol. PortfolioBacktestEngine instead
+merges all symbols' 15m bars into one time-ordered event stream that
+shares a single balance, RiskManager and PortfolioManager.
+
+Per timestamp it:
+- walks every open position through its exit checks (using each symbol's
+  precomputed ATR, no indicator update)
+- runs the strategy on the symbols whose vectorized entry masks flag the
+  bar, collecting the signals of all symbols as one batch
+- refreshes the rolling correlation matrix (at most once per simulated
+  hour, like the live loop) and splits the free capital across the batch
+  with PortfolioManager.calculate_allocation
+- opens the allocated signals in order of allocation, subject to the
+  portfolio risk checks, capping each position's margin at its allocation
+
+Candles are kept as structured arrays; Candle objects are only built for
+the strategy windows of the bars being evaluated, so memory grows with the
+array data and the active windows rather than with per-candle objects.
+Strategy configurations that need the bar-by-bar backtest (adaptive
+features) are not supported.
+"""
+
+import copy
+import logging
+from array import array
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src import performance_analytics, vectorized_signals
+from src.backtest_engine import BAR_INTERVAL_MS, BacktestEngine
+from src.candle_array import CANDLE_DTYPE, candles_to_array, to_candles
+from src.config import Config
+from src.models import Candle, Signal, Trade
+from src.position_sizer import PositionSizer
+from src.risk_manager import RiskManager
+from src.strategy import StrategyEngine
+
+logger = logging.getLogger(__name__)
+
+# Simulated time between correlation matrix refreshes (the live loop uses 1 hour)
+CORRELATION_UPDATE_MS = 60 * 60 * 1000
+
+# 1h closes per symbol used for correlations (as PortfolioManager.calculate_correlation)
+CORRELATION_WINDOW = 30
+
+HOUR_MS = 60 * 60 * 1000
+
+
+@dataclass
+class SymbolState:
+    """Per-symbol arrays and engine of a portfolio backtest.
+
+    Attributes:
+        symbol: Trading pair symbol
+        engine: BacktestEngine running this symbol's strategy and exits
+        candles_15m: 15m candles (CANDLE_DTYPE)
+        candles_1h: 1h candles (CANDLE_DTYPE)
+        bars: Indices of the 15m bars the backtest evaluates
+        bar_steps: Position of each evaluated bar on the merged timeline
+        candidates: Indices of the bars flagged by the entry masks
+        atr: 15m ATR of every bar's strategy window
+    """
+    symbol: str
+    engine: BacktestEngine
+    candles_15m: np.ndarray
+    candles_1h: np.ndarray
+    bars: np.ndarray
+    bar_steps: np.ndarray
+    candidates: np.ndarray
+    atr: np.ndarray
+
+    def candle(self, i: int) -> Candle:
+        """Build the Candle object of 15m bar i."""
+        return to_candles(self.candles_15m[i:i + 1])[0]
+
+    def windows(self, i: int) -> Tuple[List[Candle], List[Candle]]:
+        """Build the strategy windows of bar i (as BacktestEngine._update_indicators_at)."""
+        index_1h = min(i // 4, len(self.candles_1h) - 1)
+        return (
+            to_candles(self.candles_15m[max(0, i - 200):i + 1]),
+            to_candles(self.candles_1h[max(0, index_1h - 100):index_1h + 1])
+        )
+
+
+def _as_array(candles: Any) -> np.ndarray:
+    """Return candles as a CANDLE_DTYPE array (Candle lists are converted)."""
+    if isinstance(candles, np.ndarray) and candles.dtype == CANDLE_DTYPE:
+        return candles
+    return candles_to_array(candles)
+
+
+class PortfolioBacktestEngine:
+    """Backtests several symbols together with shared capital and risk state.
+
+    Every symbol gets its own StrategyEngine and BacktestEngine (for the
+    entry fill and exit logic), while all of them share one RiskManager
+    with portfolio management enabled over the backtested symbols, one
+    balance, one trade list and one equity curve.
+    """
+
+    def __init__(self, config: Config):
+        """Initialize PortfolioBacktestEngine.
+
+        Args:
+            config: Configuration object with strategy, risk and portfolio
+                parameters (portfolio_symbols is replaced by the symbols
+                passed to run)
+        """
+        self.config = config
+        self.risk_mgr: Optional[RiskManager] = None
+        self.states: List[SymbolState] = []
+        self.trades: List[Trade] = []
+        # Packed doubles: 8 bytes per bar instead of a float object and a pointer
+        self.equity_curve: array = array("d")
+        self.initial_balance = 0.0
+        self.current_balance = 0.0
+        self.stats: Dict[str, int] = {}
+        self._last_correlation_update: Optional[int] = None
+
+    def run(
+        self,
+        data: Dict[str, Tuple[Any, Any]],
+        initial_balance: float = 10000.0
+    ) -> Dict:
+        """Run the portfolio backtest.
+
+        Args:
+            data: Dictionary mapping symbols to (15m candles, 1h candles), as
+                Candle lists or CANDLE_DTYPE arrays
+            initial_balance: Starting balance shared by all symbols
+
+        Returns:
+            Performance metrics of the combined trades and equity curve (see
+            BacktestEngine.run_backtest), plus:
+                - per_symbol: performance_analytics.breakdown by symbol
+                - portfolio: event, signal, allocation and rejection counts
+
+        Raises:
+            ValueError: If inputs are invalid or the strategy configuration
+                needs the bar-by-bar backtest
+        """
+        if initial_balance <= 0:
+            raise ValueError(f"initial_balance must be positive, got {initial_balance}")
+        if not data:
+            raise ValueError("At least one symbol is required")
+
+        self._setup(data)
+        with ExitStack() as stack:
+            for state in self.states:
+                stack.enter_context(state.engine.simulation_scope())
+            return self._run(initial_balance)
+
+    def _run(self, initial_balance: float) -> Dict:
+        """Walk the merged timeline once the symbol engines are set up."""
+        self.initial_balance = initial_balance
+        self.current_balance = initial_balance
+        self.equity_curve = array("d", [initial_balance])
+
+        timeline = np.unique(np.concatenate([
+            state.candles_15m["timestamp"][state.bars] for state in self.states
+        ]))
+        for state in self.states:
+            state.bar_steps = np.searchsorted(timeline, state.candles_15m["timestamp"][state.bars])
+
+        # Entry candidates of all symbols as one stream ordered by time, then symbol
+        event_steps = np.concatenate([
+            np.searchsorted(timeline, state.candles_15m["timestamp"][state.candidates])
+            for state in self.states
+        ])
+        event_symbols = np.concatenate([
+            np.full(len(state.candidates), k) for k, state in enumerate(self.states)
+        ])
+        event_bars = np.concatenate([state.candidates for state in self.states])
+        order = np.lexsort((event_symbols, event_steps))
+        event_steps, event_symbols, event_bars = event_steps[order], event_symbols[order], event_bars[order]
+        self.stats['timeline_bars'] = len(timeline)
+        self.stats['entry_candidates'] = len(event_steps)
+        logger.info(
+            f"[PORTFOLIO BACKTEST] {len(self.states)} symbols, {len(timeline)} timeline bars, "
+            f"{len(event_steps)} entry candidates"
+        )
+
+        # Symbol index -> position in its bars of the next bar to walk
+        walking: Dict[int, int] = {}
+        event = 0
+        step = 0
+        while step < len(timeline):
+            if not walking:
+                # Flat stretches up to the next candidate only record the balance
+                next_step = int(event_steps[event]) if event < len(event_steps) else len(timeline)
+                self.equity_curve.extend([self.current_balance] * (next_step - step))
+                step = next_step
+                if step >= len(timeline):
+                    break
+
+            held = set(walking)
+            self._walk_positions(step, walking)
+
+            batch_end = int(np.searchsorted(event_steps, step, side="right"))
+            batch = [
+                (int(event_symbols[e]), int(event_bars[e]))
+                for e in range(event, batch_end)
+                if int(event_symbols[e]) not in held
+            ]
+            event = batch_end
+            if batch:
+                self._enter_batch(int(timeline[step]), batch, walking)
+
+            equity = self.current_balance + sum(
+                position.unrealized_pnl for position in self.risk_mgr.get_all_active_positions()
+            )
+            self.equity_curve.append(equity)
+            self.stats['max_concurrent_positions'] = max(
+                self.stats['max_concurrent_positions'], len(walking)
+            )
+            step += 1
+
+        for k in sorted(walking):
+            state = self.states[k]
+            self._call(state.engine, state.engine._close_remaining_position, state.candle(int(state.bars[-1])))
+
+        return self.calculate_metrics()
+
+    def _setup(self, data: Dict[str, Tuple[Any, Any]]) -> None:
+        """Create the shared risk state and the per-symbol engines and arrays.
+
+        Args:
+            data: Dictionary mapping symbols to (15m candles, 1h candles)
+
+        Raises:
+            ValueError: If a symbol's data is empty or the strategy needs the
+                bar-by-bar backtest
+        """
+        symbols = list(data)
+        portfolio_config = copy.copy(self.config)
+        portfolio_config.enable_portfolio_management = True
+        portfolio_config.portfolio_symbols = symbols
+        portfolio_config.portfolio_max_symbols = len(symbols)
+
+        self.risk_mgr = RiskManager(portfolio_config, PositionSizer(portfolio_config))
+        self.trades = []
+        self.states = []
+        self.stats = {
+            'timeline_bars': 0,
+            'entry_candidates': 0,
+            'signals': 0,
+            'opened': 0,
+            'rejected_by_risk': 0,
+            'rejected_by_allocation': 0,
+            'reduced_by_allocation': 0,
+            'correlation_updates': 0,
+            'max_concurrent_positions': 0,
+        }
+        self._last_correlation_update = None
+
+        for symbol in symbols:
+            candles_15m, candles_1h = data[symbol]
+            candles_15m = _as_array(candles_15m)
+            candles_1h = _as_array(candles_1h)
+            if len(candles_15m) == 0 or len(candles_1h) == 0:
+                raise ValueError(f"Candle lists cannot be empty ({symbol})")
+
+            symbol_config = copy.copy(portfolio_config)
+            symbol_config.symbol = symbol
+            strategy = StrategyEngine(symbol_config)
+            engine = BacktestEngine(symbol_config, strategy, self.risk_mgr)
+            if not engine._supports_event_skipping():
+                raise ValueError(
+                    "Portfolio backtest requires a strategy configuration supported by the "
+                    "event-skipping backtest (no adaptive features)"
+                )
+            # All engines append to one trade list
+            engine.trades = self.trades
+
+            arrays = vectorized_signals.entry_candidates(
+                candles_15m, candles_1h, symbol_config, strategy._get_weekly_anchor
+            )
+            bars = np.flatnonzero(arrays.valid)
+            self.states.append(SymbolState(
+                symbol=symbol,
+                engine=engine,
+                candles_15m=candles_15m,
+                candles_1h=candles_1h,
+                bars=bars,
+                bar_steps=np.zeros(0, dtype=np.int64),
+                candidates=bars[arrays.candidates[bars]],
+                atr=arrays.atr
+            ))
+
+    def _call(self, engine: BacktestEngine, method, *args):
+        """Run an engine method against the shared balance."""
+        engine.current_balance = self.current_balance
+        result = method(*args)
+        self.current_balance = engine.current_balance
+        return result
+
+    def _walk_positions(self, step: int, walking: Dict[int, int]) -> None:
+        """Run the exit checks of every open position that has a bar at this step.
+
+        Args:
+            step: Position on the merged timeline
+            walking: Symbol index -> position in its bars of the next bar to walk
+        """
+        for k in sorted(walking):
+            state = self.states[k]
+            pos = walking[k]
+            if pos >= len(state.bars) or state.bar_steps[pos] != step:
+                continue
+
+            position = self.risk_mgr.get_active_position(state.symbol)
+            if position is not None:
+                i = int(state.bars[pos])
+                self._call(
+                    state.engine, state.engine._process_open_position,
+                    position, i, state.candle(i), float(state.atr[i])
+                )
+
+            if self.risk_mgr.get_active_position(state.symbol) is None:
+                del walking[k]
+            else:
+                walking[k] = pos + 1
+
+    def _enter_batch(self, timestamp: int, batch: List[Tuple[int, int]], walking: Dict[int, int]) -> None:
+        """Evaluate the entry candidates of one timestamp and open the allocated signals.
+
+        Args:
+            timestamp: Open time of the current 15m bar
+            batch: (symbol index, bar index) of each flat symbol's candidate
+            walking: Symbol index -> position in its bars of the next bar to walk
+        """
+        signals: Dict[str, Signal] = {}
+        entries: Dict[str, Tuple[int, int]] = {}
+        for k, i in batch:
+            state = self.states[k]
+            strategy = state.engine.strategy
+            strategy.update_indicators(*state.windows(i))
+            signal = strategy.check_long_entry() or strategy.check_short_entry()
+            if signal:
+                # calculate_allocation reads the confidence from the indicator snapshot
+                signal.indicators.setdefault('confidence', signal.confidence)
+                signals[state.symbol] = signal
+                entries[state.symbol] = (k, i)
+
+        if not signals:
+            return
+        self.stats['signals'] += len(signals)
+
+        portfolio_manager = self.risk_mgr.portfolio_manager
+        self._update_correlations(timestamp)
+        free_capital = self.current_balance - sum(
+            position.quantity * position.entry_price / position.leverage
+            for position in self.risk_mgr.get_all_active_positions()
+        )
+        if free_capital > 0:
+            allocations = portfolio_manager.calculate_allocation(signals, free_capital)
+        else:
+            allocations = {}
+
+        for symbol in sorted(signals, key=lambda s: (-allocations.get(s, 0.0), s)):
+            allocation = allocations.get(symbol, 0.0)
+            if allocation <= 0:
+                self.stats['rejected_by_allocation'] += 1
+                continue
+            if not self.risk_mgr.can_open_position_for_symbol(symbol, self.current_balance):
+                self.stats['rejected_by_risk'] += 1
+                continue
+
+            k, i = entries[symbol]
+            state = self.states[k]
+            try:
+                position = self._call(
+                    state.engine, state.engine._open_signal_position, i, state.candle(i), signals[symbol]
+                )
+            except RuntimeError as e:
+                logger.debug(f"[PORTFOLIO BACKTEST] {e}")
+                self.stats['rejected_by_risk'] += 1
+                continue
+
+            # Margin may not exceed the capital allocated to the symbol
+            max_quantity = allocation * position.leverage / position.entry_price
+            if position.quantity > max_quantity:
+                position.quantity = max_quantity
+                position.original_quantity = max_quantity
+                self.stats['reduced_by_allocation'] += 1
+
+            self.stats['opened'] += 1
+            walking[k] = int(np.searchsorted(state.bars, i, side="right"))
+
+    def _update_correlations(self, timestamp: int) -> None:
+        """Refresh the correlation matrix from closed 1h candles if it is due.
+
+        Args:
+            timestamp: Open time of the current 15m bar
+        """
+        if (
+            self._last_correlation_update is not None
+            and timestamp - self._last_correlation_update < CORRELATION_UPDATE_MS
+        ):
+            return
+
+        # 1h candles that have closed by the end of the current 15m bar
+        cutoff = timestamp + BAR_INTERVAL_MS - HOUR_MS
+        closes = {}
+        for state in self.states:
+            end = int(np.searchsorted(state.candles_1h["timestamp"], cutoff, side="right"))
+            closes[state.symbol] = state.candles_1h["close"][max(0, end - CORRELATION_WINDOW):end]
+
+        self.risk_mgr.portfolio_manager.update_correlation_matrix(closes, CORRELATION_WINDOW)
+        self._last_correlation_update = timestamp
+        self.stats['correlation_updates'] += 1
+
+    def calculate_metrics(self) -> Dict:
+        """Calculate performance metrics of the combined trades and equity curve.
+
+        Returns:
+            Dictionary of performance metrics with per_symbol and portfolio entries
+        """
+        if not self.trades:
+            metrics = performance_analytics.calculate_metrics([], self.initial_balance)
+        else:
+            metrics = performance_analytics.calculate_metrics(
+                self.trades, self.initial_balance, self.equity_curve
+            )
+
+        metrics['per_symbol'] = performance_analytics.breakdown(self.trades, "symbol")
+        metrics['portfolio'] = dict(self.stats, symbols=len(self.states))
+        return metrics
+
+    def get_equity_curve(self) -> List[float]:
+        """Get the combined equity curve (one value per timeline bar).
+
+        Returns:
+            List of equity values throughout the backtest
+        """
+        return self.equity_curve.tolist()
+
+    def get_trades(self) -> List[Trade]:
+        """Get all trades from the backtest in the order they closed.
+
+        Returns:
+            List of Trade objects
+        """
+        return self.trades.copy()
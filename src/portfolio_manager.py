@@ -133,7 +133,42 @@ class PortfolioManager:
                 self.correlation_matrix[(symbol2, symbol1)] = correlation  # Symmetric
         
         logger.debug(f"Built correlation matrix with {len(self.correlation_matrix)} entries")
-    
+
+    def update_correlation_matrix(self, closes: Dict[str, np.ndarray], window: int = 30) -> None:
+        """Rebuild the correlation matrix from close prices in one vectorized pass.
+
+        Produces the same coefficients as build_correlation_matrix (returns of
+        the last window closes, 0.0 for symbols with fewer closes or zero
+        variance) with a single np.corrcoef call instead of one per pair, so
+        it stays cheap for many symbols and frequent rolling updates.
+
+        Args:
+            closes: Dictionary mapping symbols to close prices, oldest first
+            window: Number of most recent closes used per symbol
+        """
+        self.correlation_matrix.clear()
+
+        included = [
+            symbol for symbol in self.symbols
+            if symbol in closes and len(closes[symbol]) >= window
+        ]
+        matrix = np.zeros((len(included), len(included)))
+        if len(included) >= 2 and window >= 3:
+            prices = np.array([np.asarray(closes[symbol], dtype=float)[-window:] for symbol in included])
+            returns = np.diff(prices, axis=1) / prices[:, :-1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                matrix = np.nan_to_num(np.corrcoef(returns), nan=0.0)
+
+        position = {symbol: k for k, symbol in enumerate(included)}
+        for i, symbol1 in enumerate(self.symbols):
+            for symbol2 in self.symbols[i+1:]:
+                if symbol1 in position and symbol2 in position:
+                    correlation = float(matrix[position[symbol1], position[symbol2]])
+                else:
+                    correlation = 0.0
+                self.correlation_matrix[(symbol1, symbol2)] = correlation
+                self.correlation_matrix[(symbol2, symbol1)] = correlation
+
     def calculate_allocation(
         self, 
         signals: Dict[str, Signal], 
@@ -1,7 +1,8 @@
 """Position sizing and risk calculations for Binance Futures Trading Bot."""
 
-from typing import Dict
+from typing import Dict, Optional
 from src.config import Config
+from src.exchange_info import ExchangeInfoCache
 from src.models import Position
 
 
@@ -20,14 +21,19 @@ class PositionSizer:
         """
         self.config = config
         # Binance minimum order size for BTCUSDT (in BTC)
-        # This is a typical minimum, actual value should be fetched from exchange info
+        # Fallback for symbols without exchange info
         self.min_order_size = 0.001
+        
+        # Set by the bot once symbol filters are loaded; quantities are then
+        # rounded to each symbol's lot step and minimums
+        self.exchange_info: Optional[ExchangeInfoCache] = None
     
     def calculate_position_size(
         self, 
         wallet_balance: float, 
         entry_price: float, 
-        atr: float
+        atr: float,
+        symbol: Optional[str] = None
     ) -> Dict[str, float]:
         """Calculate position size based on 1% risk rule with 2x ATR stop.
         
@@ -41,6 +47,8 @@ class PositionSizer:
             wallet_balance: Current wallet balance in quote currency (USDT)
             entry_price: Intended entry price for the position
             atr: Current Average True Range value
+            symbol: Trading pair; with known exchange filters the quantity is
+                rounded down to its lot step and raised to its minimum
             
         Returns:
             Dictionary containing:
@@ -71,11 +79,15 @@ class PositionSizer:
         # Therefore: Quantity = Risk Amount / Stop Distance
         quantity = risk_amount / stop_loss_distance
         
+        # Symbol filters (lot step, minimum quantity and notional) if known
+        filters = self.exchange_info.get(symbol) if self.exchange_info is not None and symbol else None
+        min_order_size = filters.min_order_quantity(entry_price) if filters is not None else self.min_order_size
+        
         # Validate minimum order size
-        if quantity < self.min_order_size:
+        if quantity < min_order_size:
             # If calculated size is below minimum, use minimum size
             # This means we'll risk slightly more than 1% in this case
-            quantity = self.min_order_size
+            quantity = min_order_size
         
         # Calculate margin required (accounting for leverage)
         # Margin = (Position Value) / Leverage
@@ -91,6 +103,12 @@ class PositionSizer:
             position_notional_value = quantity * entry_price
             margin_required = position_notional_value / self.config.leverage
         
+        # Round down to the lot step so the exchange accepts the order as is
+        if filters is not None:
+            quantity = filters.round_quantity(quantity)
+            position_notional_value = quantity * entry_price
+            margin_required = position_notional_value / self.config.leverage
+        
         # Calculate stop-loss price (for reference, not used in actual orders)
         # This is just for logging/display purposes
         stop_loss_price = entry_price - stop_loss_distance
@@ -0,0 +1,207 @@
+"""Local multi-timeframe resampling from one base candle stream.
+
+Instead of subscribing to (and polling) every timeframe separately, the bot
+can stream a single base timeframe (5m or 1m) per symbol and build the
+coarser candles locally. Buckets are aligned to the epoch like Binance's own
+klines, so a 1h candle built here covers the same open time as the 1h kline.
+Because every timeframe comes from the same base candles, the timeframes
+cannot disagree at bucket boundaries.
+
+A coarse candle is only emitted once it is complete: its first base candle
+opens at the bucket start and either the base candle filling the last slot
+has closed or a base candle of a later bucket has arrived (a gap in the base
+stream). The in-progress bucket is available as a partial candle.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.candle_array import aggregate_ohlcv, candles_to_array, timeframe_to_ms, to_candles
+from src.models import Candle
+
+
+logger = logging.getLogger(__name__)
+
+
+# Base timeframes the resampler can be fed with
+BASE_TIMEFRAMES = ("1m", "5m")
+
+
+def bucket_start(timestamp: int, interval_ms: int) -> int:
+    """Get the open time of the epoch-aligned bucket containing a timestamp."""
+    return timestamp // interval_ms * interval_ms
+
+
+def can_resample(base_timeframe: str, timeframe: str) -> bool:
+    """Check whether a timeframe is a whole multiple (> 1) of the base timeframe."""
+    try:
+        base_ms = timeframe_to_ms(base_timeframe)
+        target_ms = timeframe_to_ms(timeframe)
+    except ValueError:
+        return False
+    return target_ms > base_ms and target_ms % base_ms == 0
+
+
+def resample_candles(
+    candles: List[Candle],
+    base_timeframe: str,
+    timeframe: str,
+    include_partial: bool = False
+) -> List[Candle]:
+    """Resample a base candle history into a coarser timeframe.
+
+    Buckets missing their first base candle (the history starts mid-bucket)
+    are skipped, as is the last bucket while it is still filling unless
+    ``include_partial`` is set. These are the same rules the incremental
+    CandleResampler applies, so backtests see the bars the bot sees live.
+
+    Args:
+        candles: Base candles sorted by open time, one per open time
+        base_timeframe: Timeframe of the given candles
+        timeframe: Target timeframe (a multiple of the base timeframe)
+        include_partial: Also return the trailing incomplete bucket
+
+    Returns:
+        Resampled candles sorted by open time
+
+    Raises:
+        ValueError: If the target is not a multiple of the base timeframe
+    """
+    if not can_resample(base_timeframe, timeframe):
+        raise ValueError(f"Cannot resample {base_timeframe} candles into {timeframe}")
+
+    base_ms = timeframe_to_ms(base_timeframe)
+    interval_ms = timeframe_to_ms(timeframe)
+    bars = candles_to_array(candles)
+    if len(bars) == 0:
+        return []
+
+    # Drop the base candles of buckets that miss their first candle, and of
+    # the last bucket while it is still filling
+    buckets = bars["timestamp"] // interval_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    keep = bars["timestamp"][starts] == buckets[starts] * interval_ms
+    if not include_partial and bars["timestamp"][-1] + base_ms != (buckets[-1] + 1) * interval_ms:
+        keep[-1] = False
+    rows = np.repeat(keep, np.diff(np.r_[starts, len(bars)]))
+    return to_candles(aggregate_ohlcv(bars[rows], timeframe))
+
+
+class _Bucket:
+    """Base candles of one in-progress coarse candle."""
+
+    __slots__ = ("start", "timeframe", "candles", "latest", "bar", "emitted")
+
+    def __init__(self, start: int, timeframe: str):
+        self.start = start
+        self.timeframe = timeframe
+        self.candles: Dict[int, Candle] = {}
+        self.latest = -1  # Open time of the newest base candle
+        self.bar: Optional[Candle] = None
+        self.emitted = False
+
+    def add(self, candle: Candle) -> None:
+        """Add or replace a base candle and update the running bar."""
+        self.candles[candle.timestamp] = candle
+        if self.bar is not None and candle.timestamp > self.latest:
+            # In-order append: extend the running bar in O(1)
+            bar = self.bar
+            self.bar = Candle(
+                timestamp=self.start,
+                open=bar.open,
+                high=max(bar.high, candle.high),
+                low=min(bar.low, candle.low),
+                close=candle.close,
+                volume=bar.volume + candle.volume,
+            )
+        else:
+            # First candle, replacement or out-of-order candle: rebuild
+            candles = candles_to_array(self.candles[t] for t in sorted(self.candles))
+            self.bar = to_candles(aggregate_ohlcv(candles, self.timeframe))[0]
+        self.latest = max(self.latest, candle.timestamp)
+
+    @property
+    def aligned(self) -> bool:
+        """Whether the bucket holds its first base candle."""
+        return self.start in self.candles
+
+
+class CandleResampler:
+    """Incrementally builds coarser candles of one symbol from base candles."""
+
+    def __init__(self, base_timeframe: str, timeframes: Iterable[str]):
+        """Initialize the resampler.
+
+        Args:
+            base_timeframe: Timeframe of the candles fed in ("1m" or "5m")
+            timeframes: Target timeframes; those that are not a multiple of
+                the base timeframe are ignored
+
+        Raises:
+            ValueError: If the base timeframe is not supported
+        """
+        if base_timeframe not in BASE_TIMEFRAMES:
+            raise ValueError(f"Unsupported base timeframe {base_timeframe}, expected one of {BASE_TIMEFRAMES}")
+
+        self.base_timeframe = base_timeframe
+        self._base_ms = timeframe_to_ms(base_timeframe)
+        self.timeframes = [tf for tf in dict.fromkeys(timeframes) if can_resample(base_timeframe, tf)]
+        self._interval_ms = {tf: timeframe_to_ms(tf) for tf in self.timeframes}
+        self._buckets: Dict[str, Optional[_Bucket]] = {tf: None for tf in self.timeframes}
+
+    def update(self, candle: Candle) -> List[Tuple[str, Candle]]:
+        """Feed one closed base candle.
+
+        Args:
+            candle: Closed base candle (a repeated open time replaces the
+                earlier copy)
+
+        Returns:
+            (timeframe, candle) pairs completed by this base candle
+        """
+        completed = []
+        for timeframe in self.timeframes:
+            interval_ms = self._interval_ms[timeframe]
+            start = bucket_start(candle.timestamp, interval_ms)
+            bucket = self._buckets[timeframe]
+
+            if bucket is None or start > bucket.start:
+                # A later bucket began; emit the previous one if the last
+                # slot never arrived (gap in the base stream)
+                if bucket is not None and not bucket.emitted and bucket.aligned:
+                    completed.append((timeframe, bucket.bar))
+                bucket = self._buckets[timeframe] = _Bucket(start, timeframe)
+            elif start < bucket.start:
+                continue  # Late candle of an already emitted bucket
+
+            bucket.add(candle)
+            if bucket.aligned and (bucket.emitted or candle.timestamp + self._base_ms == start + interval_ms):
+                # Complete (or a corrected candle of a completed bucket)
+                completed.append((timeframe, bucket.bar))
+                bucket.emitted = True
+        return completed
+
+    def partial(self, timeframe: str) -> Optional[Candle]:
+        """Get the in-progress candle of a timeframe built from the base candles so far.
+
+        Returns:
+            Partial candle, or None if the current bucket is missing its
+            first base candle or is already complete
+        """
+        bucket = self._buckets.get(timeframe)
+        if bucket is None or bucket.emitted or not bucket.aligned:
+            return None
+        return bucket.bar
+
+    def seed(self, candles: Iterable[Candle]) -> List[Tuple[str, Candle]]:
+        """Feed a base candle history (sorted by open time).
+
+        Returns:
+            All (timeframe, candle) pairs completed along the way
+        """
+        completed = []
+        for candle in candles:
+            completed.extend(self.update(candle))
+        return completed
@@ -2,17 +2,25 @@
 
 import time
 import logging
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional, TYPE_CHECKING
 from src.config import Config
 from src.models import Position, Trade, Signal
 from src.position_sizer import PositionSizer
 from src.advanced_exit_manager import AdvancedExitManager
-from src.portfolio_manager import PortfolioManager
 from src.feature_manager import FeatureManager
+from src.performance_analytics import to_milliseconds
+
+if TYPE_CHECKING:
+    from src.portfolio_manager import PortfolioManager
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Closed trades kept in memory; every trade is also written to the trade log
+# and counted in RiskManager.trade_totals
+MAX_CLOSED_TRADES = 1000
+
 
 class RiskManager:
     """Manages open positions, stop-loss levels, and risk controls.
@@ -37,7 +45,12 @@ class RiskManager:
         self.config = config
         self.position_sizer = position_sizer
         self.active_positions: Dict[str, Position] = {}
-        self.closed_trades: List[Trade] = []
+        self.closed_trades: Deque[Trade] = deque(maxlen=MAX_CLOSED_TRADES)
+        self.trade_totals = {
+            "count": 0, "winning": 0, "losses": 0, "pnl": 0.0,
+            "gross_profit": 0.0, "gross_loss": 0.0, "largest_win": 0.0, "largest_loss": 0.0,
+            "duration": 0, "peak_pnl": 0.0, "max_drawdown": 0.0, "drawdown_peak_pnl": 0.0,
+        }
         self._signal_generation_enabled = True
         
         # Initialize feature manager for error isolation
@@ -55,9 +68,10 @@ class RiskManager:
                 self.feature_manager.register_feature("advanced_exits", enabled=False)
         
         # Initialize PortfolioManager if enabled
-        self.portfolio_manager: Optional[PortfolioManager] = None
+        self.portfolio_manager: Optional["PortfolioManager"] = None
         if config.enable_portfolio_management:
             try:
+                from src.portfolio_manager import PortfolioManager
                 self.portfolio_manager = PortfolioManager(config)
                 self.feature_manager.register_feature("portfolio_management", enabled=True)
                 logger.info("PortfolioManager initialized")
@@ -106,7 +120,8 @@ class RiskManager:
         sizing_result = self.position_sizer.calculate_position_size(
             wallet_balance=wallet_balance,
             entry_price=signal.price,
-            atr=atr
+            atr=atr,
+            symbol=signal.symbol if signal.symbol is not None else self.config.symbol
         )
         
         # Calculate initial stop-loss price based on position side
@@ -371,7 +386,7 @@ class RiskManager:
         )
         
         # Store trade
-        self.closed_trades.append(trade)
+        self._record_trade(trade)
         
         # Reduce position size
         position.quantity -= close_quantity
@@ -450,7 +465,7 @@ class RiskManager:
         )
         
         # Store trade in closed trades
-        self.closed_trades.append(trade)
+        self._record_trade(trade)
         
         # Update portfolio manager if enabled
         if self.portfolio_manager and self.feature_manager.is_feature_enabled("portfolio_management"):
@@ -485,7 +500,12 @@ class RiskManager:
         
         return trade
     
-    def close_all_positions(self, current_price: float) -> List[Trade]:
+    def close_all_positions(
+        self,
+        current_price: float,
+        exit_prices: Optional[Dict[str, float]] = None,
+        keep_symbols: Optional[List[str]] = None
+    ) -> List[Trade]:
         """Emergency close all positions (panic button).
         
         Closes all active positions at current market price with "PANIC" reason.
@@ -493,27 +513,32 @@ class RiskManager:
         
         Args:
             current_price: Current market price for closing positions
+            exit_prices: Per-symbol exit prices (e.g. actual fill prices) that
+                take precedence over current_price
+            keep_symbols: Symbols to leave open (e.g. whose close order failed)
             
         Returns:
             List of Trade objects for all closed positions
             
         Raises:
-            ValueError: If current_price is invalid
+            ValueError: If current_price is invalid and needed for a position
         """
-        if current_price <= 0:
-            raise ValueError(f"current_price must be positive, got {current_price}")
-        
         trades = []
+        exit_prices = exit_prices or {}
+        keep = set(keep_symbols or [])
         
         # Close all active positions
         # Create a copy of keys to avoid modifying dict during iteration
-        symbols = list(self.active_positions.keys())
+        symbols = [symbol for symbol in self.active_positions if symbol not in keep]
+        
+        if current_price <= 0 and (not symbols or any(symbol not in exit_prices for symbol in symbols)):
+            raise ValueError(f"current_price must be positive, got {current_price}")
         
         for symbol in symbols:
             position = self.active_positions[symbol]
             trade = self.close_position(
                 position=position,
-                exit_price=current_price,
+                exit_price=exit_prices.get(symbol, current_price),
                 reason="PANIC"
             )
             trades.append(trade)
@@ -561,13 +586,53 @@ class RiskManager:
         """
         return list(self.active_positions.values())
     
+    def _record_trade(self, trade: Trade) -> None:
+        """Keep a closed trade and add it to the running totals."""
+        self.closed_trades.append(trade)
+        totals = self.trade_totals
+        totals["count"] += 1
+        totals["pnl"] += trade.pnl
+        if trade.pnl > 0:
+            totals["winning"] += 1
+            totals["gross_profit"] += trade.pnl
+            totals["largest_win"] = max(totals["largest_win"], trade.pnl)
+        elif trade.pnl < 0:
+            totals["losses"] += 1
+            totals["gross_loss"] -= trade.pnl
+            totals["largest_loss"] = min(totals["largest_loss"], trade.pnl)
+        entry_ms = to_milliseconds(trade.entry_time)
+        exit_ms = to_milliseconds(trade.exit_time)
+        if entry_ms is not None and exit_ms is not None:
+            totals["duration"] += exit_ms - entry_ms
+        
+        # Drawdown of realized P&L from its running peak
+        totals["peak_pnl"] = max(totals["peak_pnl"], totals["pnl"])
+        drawdown = totals["peak_pnl"] - totals["pnl"]
+        if drawdown > totals["max_drawdown"]:
+            totals["max_drawdown"] = drawdown
+            totals["drawdown_peak_pnl"] = totals["peak_pnl"]
+    
     def get_closed_trades(self) -> List[Trade]:
-        """Get all closed trades.
+        """Get closed trades.
+        
+        Returns:
+            List of the most recent MAX_CLOSED_TRADES closed Trade objects
+        """
+        return list(self.closed_trades)
+    
+    def get_trade_totals(self) -> Dict[str, float]:
+        """Get totals over every trade closed this session.
+        
+        Unlike get_closed_trades() these are not limited to the trades still
+        held in memory.
         
         Returns:
-            List of all closed Trade objects
+            Dictionary with count, winning, losses (pnl below zero), pnl,
+            gross_profit, gross_loss, largest_win, largest_loss, duration
+            (summed, in ms), peak_pnl, max_drawdown and drawdown_peak_pnl
+            (the P&L peak the largest drawdown fell from)
         """
-        return self.closed_trades.copy()
+        return dict(self.trade_totals)
 
     def get_portfolio_metrics(self, wallet_balance: float):
         """Get portfolio-level metrics.
@@ -5,9 +5,13 @@ It calculates metrics like average profit per TP level, hit rates, and compariso
 scaled TP and single TP performance.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
+from src.performance_analytics import group_stats
+
 
 @dataclass
 class TPLevelMetrics:
@@ -76,12 +80,59 @@ class StrategyComparison:
 
 
 class ScaledTPAnalytics:
-    """Analytics calculator for scaled take profit strategy."""
+    """Analytics calculator for scaled take profit strategy.
+    
+    Trade dictionaries and their partial exits are flattened into NumPy
+    arrays once per call; all aggregation is vectorized.
+    """
     
     def __init__(self):
         """Initialize the analytics calculator."""
         pass
     
+    def _split_trades(self, trades: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract PnL and a scaled-TP mask for each trade.
+        
+        Args:
+            trades: List of trade dictionaries
+            
+        Returns:
+            Tuple of (pnl array, boolean mask of trades with partial exits)
+        """
+        pnl = np.array([t.get('pnl', 0.0) for t in trades], dtype=float)
+        is_scaled = np.array([bool(t.get('partial_exits')) for t in trades], dtype=bool)
+        return pnl, is_scaled
+    
+    def _flatten_partial_exits(self, scaled_trades: List[Dict]) -> Dict[str, np.ndarray]:
+        """Flatten partial exits of scaled TP trades into column arrays.
+        
+        Args:
+            scaled_trades: Trade dictionaries that have partial_exits
+            
+        Returns:
+            Dictionary with trade_index, tp_level, profit and profit_pct arrays
+        """
+        rows = [
+            (i, pe.get('tp_level') or 0, pe.get('profit') or 0.0, pe.get('profit_pct') or 0.0)
+            for i, trade in enumerate(scaled_trades)
+            for pe in trade.get('partial_exits', [])
+        ]
+        if not rows:
+            return {
+                'trade_index': np.empty(0, dtype=np.int64),
+                'tp_level': np.empty(0, dtype=np.int64),
+                'profit': np.empty(0),
+                'profit_pct': np.empty(0)
+            }
+        
+        columns = np.array(rows, dtype=float)
+        return {
+            'trade_index': columns[:, 0].astype(np.int64),
+            'tp_level': columns[:, 1].astype(np.int64),
+            'profit': columns[:, 2],
+            'profit_pct': columns[:, 3]
+        }
+    
     def calculate_tp_level_metrics(
         self,
         trades: List[Dict],
@@ -103,39 +154,35 @@ class ScaledTPAnalytics:
             return []
         
         total_scaled_trades = len(scaled_trades)
+        exits = self._flatten_partial_exits(scaled_trades)
         
-        # Initialize metrics for each TP level
-        tp_metrics = []
+        # Only the first exit per (trade, level) counts as a hit
+        levels = exits['tp_level']
+        in_range = (levels >= 1) & (levels <= num_tp_levels)
+        keys = exits['trade_index'][in_range] * (num_tp_levels + 1) + levels[in_range]
+        _, first = np.unique(keys, return_index=True)
+        
+        hit_levels = levels[in_range][first]
+        hit_profit = exits['profit'][in_range][first]
+        hit_profit_pct = exits['profit_pct'][in_range][first]
         
+        size = num_tp_levels + 1
+        hit_counts = np.bincount(hit_levels, minlength=size)
+        total_profits = np.bincount(hit_levels, weights=hit_profit, minlength=size)
+        total_profit_pcts = np.bincount(hit_levels, weights=hit_profit_pct, minlength=size)
+        
+        tp_metrics = []
         for level in range(1, num_tp_levels + 1):
-            hit_count = 0
-            total_profit = 0.0
-            total_profit_pct = 0.0
-            
-            # Count hits and sum profits for this TP level
-            for trade in scaled_trades:
-                partial_exits = trade.get('partial_exits', [])
-                
-                # Find this TP level in partial exits
-                for exit_data in partial_exits:
-                    if exit_data.get('tp_level') == level:
-                        hit_count += 1
-                        total_profit += exit_data.get('profit', 0.0)
-                        total_profit_pct += exit_data.get('profit_pct', 0.0)
-                        break
-            
-            # Calculate averages
-            avg_profit = total_profit / hit_count if hit_count > 0 else 0.0
-            avg_profit_pct = (total_profit_pct / hit_count * 100) if hit_count > 0 else 0.0
-            hit_rate = (hit_count / total_scaled_trades * 100) if total_scaled_trades > 0 else 0.0
+            hit_count = int(hit_counts[level])
+            total_profit = float(total_profits[level])
             
             tp_metrics.append(TPLevelMetrics(
                 level=level,
                 hit_count=hit_count,
                 total_profit=total_profit,
-                avg_profit=avg_profit,
-                avg_profit_pct=avg_profit_pct,
-                hit_rate=hit_rate
+                avg_profit=total_profit / hit_count if hit_count > 0 else 0.0,
+                avg_profit_pct=(float(total_profit_pcts[level]) / hit_count * 100) if hit_count > 0 else 0.0,
+                hit_rate=hit_count / total_scaled_trades * 100
             ))
         
         return tp_metrics
@@ -161,49 +208,26 @@ class ScaledTPAnalytics:
             return None
         
         total_trades = len(scaled_trades)
+        exits = self._flatten_partial_exits(scaled_trades)
         
-        # Calculate total profit from scaled TP trades
-        total_profit = 0.0
-        total_tp_levels_hit = 0
-        full_exit_count = 0
+        # Final PnL includes the partial exits; fall back to the partial sum
+        # when the trade was closed entirely by TP levels
+        partial_profit = np.bincount(exits['trade_index'], weights=exits['profit'], minlength=total_trades)
+        final_pnl = np.array([t.get('pnl', 0.0) for t in scaled_trades], dtype=float)
+        total_profit = float(np.where(final_pnl != 0, final_pnl, partial_profit).sum())
         
-        for trade in scaled_trades:
-            # Sum profit from all partial exits
-            partial_exits = trade.get('partial_exits', [])
-            trade_profit = sum(pe.get('profit', 0.0) for pe in partial_exits)
-            
-            # Add final exit profit if there was remaining quantity
-            final_pnl = trade.get('pnl', 0.0)
-            if final_pnl != 0:
-                # This includes the final exit
-                total_profit += final_pnl
-            else:
-                # No final exit, just sum partials
-                total_profit += trade_profit
-            
-            # Count TP levels hit
-            tp_levels_hit = trade.get('tp_levels_hit', [])
-            total_tp_levels_hit += len(tp_levels_hit)
-            
-            # Check if all TP levels were hit
-            if len(tp_levels_hit) >= num_tp_levels:
-                full_exit_count += 1
-        
-        # Calculate averages
-        avg_profit_per_trade = total_profit / total_trades if total_trades > 0 else 0.0
-        avg_tp_levels_hit = total_tp_levels_hit / total_trades if total_trades > 0 else 0.0
-        full_exit_rate = (full_exit_count / total_trades * 100) if total_trades > 0 else 0.0
+        levels_hit = np.array([len(t.get('tp_levels_hit', [])) for t in scaled_trades])
         
         # Get TP level metrics
-        tp_level_metrics = self.calculate_tp_level_metrics(trades, num_tp_levels)
+        tp_level_metrics = self.calculate_tp_level_metrics(scaled_trades, num_tp_levels)
         
         return ScaledTPPerformance(
             total_trades=total_trades,
             total_profit=total_profit,
-            avg_profit_per_trade=avg_profit_per_trade,
+            avg_profit_per_trade=total_profit / total_trades,
             tp_level_metrics=tp_level_metrics,
-            avg_tp_levels_hit=avg_tp_levels_hit,
-            full_exit_rate=full_exit_rate
+            avg_tp_levels_hit=float(levels_hit.mean()),
+            full_exit_rate=float((levels_hit >= num_tp_levels).mean() * 100)
         )
     
     def compare_strategies(
@@ -218,42 +242,33 @@ class ScaledTPAnalytics:
         Returns:
             StrategyComparison object with comparison metrics, or None if insufficient data
         """
-        # Separate trades by strategy
-        scaled_trades = [t for t in trades if t.get('partial_exits')]
-        single_trades = [t for t in trades if not t.get('partial_exits')]
+        if not trades:
+            return None
+        
+        pnl, is_scaled = self._split_trades(trades)
+        stats = group_stats(is_scaled, pnl)
         
         # Need both types of trades for comparison
-        if not scaled_trades or not single_trades:
+        if True not in stats or False not in stats:
             return None
         
-        # Calculate metrics for scaled TP trades
-        scaled_count = len(scaled_trades)
-        scaled_profit = sum(t.get('pnl', 0.0) for t in scaled_trades)
-        scaled_wins = sum(1 for t in scaled_trades if t.get('pnl', 0.0) > 0)
-        scaled_win_rate = (scaled_wins / scaled_count * 100) if scaled_count > 0 else 0.0
-        scaled_avg_profit = scaled_profit / scaled_count if scaled_count > 0 else 0.0
-        
-        # Calculate metrics for single TP trades
-        single_count = len(single_trades)
-        single_profit = sum(t.get('pnl', 0.0) for t in single_trades)
-        single_wins = sum(1 for t in single_trades if t.get('pnl', 0.0) > 0)
-        single_win_rate = (single_wins / single_count * 100) if single_count > 0 else 0.0
-        single_avg_profit = single_profit / single_count if single_count > 0 else 0.0
+        scaled = stats[True]
+        single = stats[False]
         
         # Calculate improvement
-        if single_avg_profit != 0:
-            profit_improvement = ((scaled_avg_profit - single_avg_profit) / abs(single_avg_profit)) * 100
+        if single['average_pnl'] != 0:
+            profit_improvement = ((scaled['average_pnl'] - single['average_pnl']) / abs(single['average_pnl'])) * 100
         else:
             profit_improvement = 0.0
         
         return StrategyComparison(
-            scaled_tp_trades=scaled_count,
-            single_tp_trades=single_count,
-            scaled_tp_profit=scaled_profit,
-            single_tp_profit=single_profit,
-            scaled_tp_win_rate=scaled_win_rate,
-            single_tp_win_rate=single_win_rate,
-            scaled_tp_avg_profit=scaled_avg_profit,
-            single_tp_avg_profit=single_avg_profit,
+            scaled_tp_trades=scaled['trades'],
+            single_tp_trades=single['trades'],
+            scaled_tp_profit=scaled['total_pnl'],
+            single_tp_profit=single['total_pnl'],
+            scaled_tp_win_rate=scaled['win_rate'],
+            single_tp_win_rate=single['win_rate'],
+            scaled_tp_avg_profit=scaled['average_pnl'],
+            single_tp_avg_profit=single['average_pnl'],
             profit_improvement=profit_improvement
         )
@@ -4,12 +4,16 @@ This module implements a scaled (partial) take profit strategy that progressivel
 locks in profits at multiple price levels while letting winning positions run.
 """
 
-from typing import Optional, Dict, List
-from binance.client import Client
+from typing import Optional, Dict, List, TYPE_CHECKING
 
 from src.config import Config
+from src.exchange_info import ExchangeInfoCache
 from src.models import Position, PartialCloseAction, PartialCloseResult, TPStatus
 from src.logger import TradingLogger
+from src.user_data_stream import AccountStateCache, FINAL_ORDER_STATUSES
+
+if TYPE_CHECKING:
+    from binance.client import Client
 
 
 class ScaledTakeProfitManager:
@@ -26,7 +30,7 @@ class ScaledTakeProfitManager:
         _tp_tracking: Dictionary tracking TP status by symbol
     """
     
-    def __init__(self, config: Config, client: Optional[Client] = None):
+    def __init__(self, config: Config, client: Optional["Client"] = None):
         """Initialize the Scaled Take Profit Manager.
         
         Args:
@@ -38,6 +42,14 @@ class ScaledTakeProfitManager:
         self.logger = TradingLogger(log_dir="logs", config=config)
         self._tp_tracking: Dict[str, TPStatus] = {}
         
+        # Set by the bot once the user data stream is live; fills are then
+        # awaited as events instead of queried over REST
+        self.account_cache: Optional[AccountStateCache] = None
+        
+        # Set by the bot once symbol filters are loaded; partial quantities
+        # are then rounded to each symbol's lot step and minimum
+        self.exchange_info: Optional[ExchangeInfoCache] = None
+        
         # Validate and log configuration (Requirement 7.5)
         config_errors = self._validate_configuration()
         
@@ -183,8 +195,8 @@ class ScaledTakeProfitManager:
                         level="WARNING"
                     )
                 
-                # Calculate quantity to close
-                quantity = self._calculate_partial_quantity(position, close_pct)
+                # Calculate quantity to close (rounded down to the lot step)
+                quantity = self._round_quantity(position.symbol, self._calculate_partial_quantity(position, close_pct))
                 
                 # Check minimum order size
                 min_size_result = self._check_minimum_order_size(
@@ -195,7 +207,7 @@ class ScaledTakeProfitManager:
                 if min_size_result["action"] == "skip":
                     self.logger.log_system_event(
                         f"TP{tp_level} skipped for {position.symbol}: "
-                        f"quantity {quantity:.4f} below minimum {self.config.scaled_tp_min_order_size:.4f}"
+                        f"quantity {quantity:.4f} below minimum {self._min_order_size(position.symbol):.4f}"
                     )
                     continue
                 
@@ -211,7 +223,7 @@ class ScaledTakeProfitManager:
                 if min_size_result["action"] == "fallback":
                     self.logger.log_system_event(
                         f"SCALED TP FALLBACK for {position.symbol}: "
-                        f"All partial closes below minimum order size ({self.config.scaled_tp_min_order_size}), "
+                        f"All partial closes below minimum order size ({self._min_order_size(position.symbol)}), "
                         f"reverting to single take profit strategy",
                         level="WARNING"
                     )
@@ -376,6 +388,30 @@ class ScaledTakeProfitManager:
         
         return quantity
     
+    def _min_order_size(self, symbol: str) -> float:
+        """Get the minimum partial close quantity of a symbol.
+        
+        Partial closes are reduce-only, so the minimum notional does not
+        apply; only the symbol's minimum market quantity does.
+        
+        Args:
+            symbol: Trading pair symbol
+            
+        Returns:
+            Exchange minimum if known, otherwise scaled_tp_min_order_size
+        """
+        if self.exchange_info is not None:
+            minimum = self.exchange_info.min_order_quantity(symbol)
+            if minimum is not None:
+                return minimum
+        return self.config.scaled_tp_min_order_size
+    
+    def _round_quantity(self, symbol: str, quantity: float) -> float:
+        """Round a quantity down to the symbol's lot step (unchanged if unknown)."""
+        if self.exchange_info is None:
+            return quantity
+        return self.exchange_info.round_quantity(symbol, quantity)
+    
     def _check_minimum_order_size(
         self,
         position: Position,
@@ -401,7 +437,7 @@ class ScaledTakeProfitManager:
                 - action: "proceed", "skip", "close_remaining", or "fallback"
                 - adjusted_quantity: Modified quantity if action is "close_remaining"
         """
-        min_size = self.config.scaled_tp_min_order_size
+        min_size = self._min_order_size(position.symbol)
         
         # Check if this partial close is below minimum
         if quantity < min_size:
@@ -410,7 +446,9 @@ class ScaledTakeProfitManager:
                 # Check if ALL partial closes would be below minimum
                 all_below_minimum = True
                 for tp_config in self.config.scaled_tp_levels:
-                    test_qty = position.original_quantity * tp_config["close_pct"]
+                    test_qty = self._round_quantity(
+                        position.symbol, position.original_quantity * tp_config["close_pct"]
+                    )
                     if test_qty >= min_size:
                         all_below_minimum = False
                         break
@@ -481,6 +519,10 @@ class ScaledTakeProfitManager:
         - Order status verification
         - Retry logic (1 retry on failure)
         
+        Partial closes are sent as single orders, not through
+        OrderExecutor.place_batch_orders: each one triggers while its own
+        symbol is processed, so there is no set of legs to batch.
+        
         Args:
             position: Position to partially close
             action: Partial close action with details
@@ -505,8 +547,9 @@ class ScaledTakeProfitManager:
             )
         
         # Check minimum order size
-        if action.quantity < self.config.scaled_tp_min_order_size:
-            error_msg = f"Quantity {action.quantity:.4f} below minimum {self.config.scaled_tp_min_order_size:.4f}"
+        min_size = self._min_order_size(position.symbol)
+        if action.quantity < min_size:
+            error_msg = f"Quantity {action.quantity:.4f} below minimum {min_size:.4f}"
             self.logger.log_system_event(
                 f"PARTIAL CLOSE SKIPPED: TP{action.tp_level} for {position.symbol} - {error_msg}",
                 level="WARNING"
@@ -648,7 +691,11 @@ class ScaledTakeProfitManager:
         )
     
     def _verify_order_status(self, symbol: str, order_id: int) -> Optional[dict]:
-        """Verify the status of an order by querying Binance API.
+        """Verify the status of an order.
+        
+        Waits for the fill event on the user data stream when it is live and
+        queries the Binance API otherwise (or if no final state arrives in
+        time).
         
         Args:
             symbol: Trading symbol
@@ -657,6 +704,15 @@ class ScaledTakeProfitManager:
         Returns:
             Order status dict if successful, None if failed
         """
+        if self.account_cache is not None:
+            order_status = self.account_cache.wait_for_order(order_id, self.config.order_fill_timeout_seconds)
+            if order_status is not None and order_status.get("status") in FINAL_ORDER_STATUSES:
+                self.logger.log_system_event(
+                    f"Order status verified from user data stream: order_id={order_id}, "
+                    f"status={order_status.get('status')}"
+                )
+                return order_status
+        
         try:
             order_status = self.client.futures_get_order(
                 symbol=symbol,
@@ -0,0 +1,222 @@
+"""Persisted bot state for warm restarts.
+
+In PAPER and LIVE mode the bot periodically writes a compact snapshot of
+everything it would otherwise rebuild or lose on restart: the per-symbol
+candle buffers, open positions, scaled take-profit tracking and the strategy
+state that cannot be recomputed from candles (regime history, adaptive
+thresholds, ML accuracy). On startup a recent snapshot is restored and only
+the candles that closed while the bot was down are fetched.
+
+File layout: a single uncompressed NumPy .npz archive holding one structured
+candle array (candle_array.CANDLE_DTYPE) per symbol/timeframe plus a
+JSON document for the remaining state. It is written to a temporary file and
+atomically renamed, so a crash mid-write leaves the previous snapshot intact.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.candle_array import CANDLE_DTYPE, candles_to_array, to_candles
+from src.models import Position, TPStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_VERSION = 1
+
+_STATE_KEY = "state"
+_CANDLE_PREFIX = "candles:"
+
+
+@dataclass
+class BotSnapshot:
+    """Bot state at one point in time.
+
+    Attributes:
+        created_at: Unix timestamp (seconds) when the snapshot was taken
+        run_mode: Run mode of the bot that wrote it ("PAPER" or "LIVE")
+        candles: {symbol: {timeframe: structured candle array}}
+        positions: Open positions
+        tp_tracking: Scaled take profit status per symbol
+        strategy_state: StrategyEngine.get_state() output
+        risk_state: RiskManager regime state
+    """
+    created_at: float
+    run_mode: str
+    candles: Dict[str, Dict[str, np.ndarray]] = field(default_factory=dict)
+    positions: List[Position] = field(default_factory=list)
+    tp_tracking: Dict[str, TPStatus] = field(default_factory=dict)
+    strategy_state: Dict[str, Any] = field(default_factory=dict)
+    risk_state: Dict[str, Any] = field(default_factory=dict)
+
+    def age_seconds(self, now: Optional[float] = None) -> float:
+        """Seconds elapsed since the snapshot was taken."""
+        return (time.time() if now is None else now) - self.created_at
+
+
+def capture_snapshot(
+    run_mode: str,
+    data_manager,
+    strategy,
+    risk_manager,
+    scaled_tp_manager,
+    symbols: Iterable[str]
+) -> BotSnapshot:
+    """Collect the bot's restorable state.
+
+    Args:
+        run_mode: Current run mode
+        data_manager: DataManager whose symbol buffers are saved
+        strategy: StrategyEngine
+        risk_manager: RiskManager holding the open positions
+        scaled_tp_manager: ScaledTakeProfitManager holding TP tracking
+        symbols: Symbols whose candle buffers are saved
+
+    Returns:
+        BotSnapshot (candle arrays are sorted with one candle per open time,
+        as the buffers hold them)
+    """
+    candles = {}
+    for symbol in symbols:
+        buffers = data_manager._symbol_buffers.get(symbol, {})
+        candles[symbol] = {
+            timeframe: candles_to_array(buffer.to_list())
+            for timeframe, buffer in buffers.items()
+            if buffer
+        }
+
+    return BotSnapshot(
+        created_at=time.time(),
+        run_mode=run_mode,
+        candles=candles,
+        positions=list(risk_manager.active_positions.values()),
+        tp_tracking=dict(scaled_tp_manager._tp_tracking),
+        strategy_state=strategy.get_state(),
+        risk_state={
+            "current_regime": risk_manager.current_regime,
+            "previous_regime": risk_manager.previous_regime,
+        },
+    )
+
+
+def save_snapshot(snapshot: BotSnapshot, path: str) -> None:
+    """Write a snapshot atomically.
+
+    Args:
+        snapshot: Snapshot to write
+        path: Destination file (parent directories are created)
+    """
+    state = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": snapshot.created_at,
+        "run_mode": snapshot.run_mode,
+        "positions": [asdict(position) for position in snapshot.positions],
+        "tp_tracking": {symbol: asdict(status) for symbol, status in snapshot.tp_tracking.items()},
+        "strategy": snapshot.strategy_state,
+        "risk": snapshot.risk_state,
+    }
+    arrays = {_STATE_KEY: np.array(json.dumps(state))}
+    for symbol, timeframes in snapshot.candles.items():
+        for timeframe, candles in timeframes.items():
+            arrays[f"{_CANDLE_PREFIX}{symbol}:{timeframe}"] = np.asarray(candles, dtype=CANDLE_DTYPE)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> Optional[BotSnapshot]:
+    """Read a snapshot written by save_snapshot.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        BotSnapshot, or None if the file is missing, unreadable or from an
+        incompatible version
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as archive:
+            state = json.loads(str(archive[_STATE_KEY]))
+            if state.get("version") != SNAPSHOT_VERSION:
+                logger.warning(f"Ignoring state snapshot {path} with version {state.get('version')}")
+                return None
+
+            candles: Dict[str, Dict[str, np.ndarray]] = {}
+            for key in archive.files:
+                if key.startswith(_CANDLE_PREFIX):
+                    symbol, timeframe = key[len(_CANDLE_PREFIX):].split(":")
+                    candles.setdefault(symbol, {})[timeframe] = archive[key]
+
+        return BotSnapshot(
+            created_at=state["created_at"],
+            run_mode=state["run_mode"],
+            candles=candles,
+            positions=[Position(**position) for position in state["positions"]],
+            tp_tracking={symbol: TPStatus(**status) for symbol, status in state["tp_tracking"].items()},
+            strategy_state=state["strategy"],
+            risk_state=state["risk"],
+        )
+    except Exception as e:
+        logger.error(f"Failed to load state snapshot {path}: {e}")
+        return None
+
+
+def restore_snapshot(
+    snapshot: BotSnapshot,
+    data_manager,
+    strategy,
+    risk_manager,
+    scaled_tp_manager,
+    symbols: Iterable[str]
+) -> List[tuple]:
+    """Load a snapshot into the bot's components.
+
+    Positions, TP tracking and candles for symbols the bot no longer trades
+    are skipped.
+
+    Args:
+        snapshot: Snapshot to restore
+        data_manager: DataManager to load candle buffers into
+        strategy: StrategyEngine
+        risk_manager: RiskManager to restore open positions into
+        scaled_tp_manager: ScaledTakeProfitManager to restore TP tracking into
+        symbols: Symbols the bot trades
+
+    Returns:
+        (symbol, timeframe) pairs whose candle buffers were restored
+    """
+    symbols = set(symbols)
+    restored = []
+    for symbol, timeframes in snapshot.candles.items():
+        if symbol not in symbols:
+            continue
+        for timeframe, candles in timeframes.items():
+            data_manager.load_buffer(symbol, timeframe, to_candles(candles))
+            restored.append((symbol, timeframe))
+
+    for position in snapshot.positions:
+        if position.symbol in symbols:
+            risk_manager.active_positions[position.symbol] = position
+    for symbol, status in snapshot.tp_tracking.items():
+        if symbol in risk_manager.active_positions:
+            scaled_tp_manager._tp_tracking[symbol] = status
+
+    strategy.restore_state(snapshot.strategy_state)
+    risk_manager.current_regime = snapshot.risk_state.get("current_regime", risk_manager.current_regime)
+    risk_manager.previous_regime = snapshot.risk_state.get("previous_regime", risk_manager.previous_regime)
+    return restored
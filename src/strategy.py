@@ -4,12 +4,9 @@ from typing import List, Optional, Dict
 from src.models import Candle, Signal, IndicatorState
 from src.indicators import IndicatorCalculator
 from src.config import Config
-from src.adaptive_threshold_manager import AdaptiveThresholdManager
-from src.timeframe_coordinator import TimeframeCoordinator
-from src.volume_profile_analyzer import VolumeProfileAnalyzer
-from src.market_regime_detector import MarketRegimeDetector
-from src.ml_predictor import MLPredictor
 from src.feature_manager import FeatureManager
+from src import instrumentation
+import copy
 import time
 import logging
 
@@ -39,14 +36,22 @@ class StrategyEngine:
         self._last_candle_close_time = 0
         self._candle_just_closed = False
         
+        # Symbol of the latest update_indicators call (None when not given)
+        self._symbol: Optional[str] = None
+        
         # Initialize feature manager for error isolation
         self.feature_manager = FeatureManager(max_errors=3, error_window=300.0)
         
+        # Optional feature modules are imported only when their flag is set so
+        # a restart with them disabled skips their dependencies (scikit-learn
+        # for the ML predictor, the volume profile thread pool).
+        
         # Initialize adaptive threshold manager if enabled
         self.adaptive_threshold_manager = None
         self._last_threshold_update = 0
         if config.enable_adaptive_thresholds:
             try:
+                from src.adaptive_threshold_manager import AdaptiveThresholdManager
                 self.adaptive_threshold_manager = AdaptiveThresholdManager(config)
                 self.feature_manager.register_feature("adaptive_thresholds", enabled=True)
                 logger.info("Adaptive threshold manager initialized")
@@ -58,6 +63,7 @@ class StrategyEngine:
         self.timeframe_coordinator = None
         if config.enable_multi_timeframe:
             try:
+                from src.timeframe_coordinator import TimeframeCoordinator
                 self.timeframe_coordinator = TimeframeCoordinator(config, self.indicator_calc)
                 # Register as critical feature - don't auto-disable on errors
                 self.feature_manager.register_feature("multi_timeframe", enabled=True, auto_disable=False)
@@ -66,10 +72,13 @@ class StrategyEngine:
                 logger.error(f"Failed to initialize timeframe coordinator: {e}")
                 self.feature_manager.register_feature("multi_timeframe", enabled=False, auto_disable=False)
         
-        # Initialize volume profile analyzer if enabled
+        # Initialize volume profile analyzer if enabled; profiles are recomputed
+        # off the trading thread unless disabled (BacktestEngine turns this off)
         self.volume_profile_analyzer = None
+        self.background_volume_profile = config.async_volume_profile
         if config.enable_volume_profile:
             try:
+                from src.volume_profile_analyzer import VolumeProfileAnalyzer
                 self.volume_profile_analyzer = VolumeProfileAnalyzer(config)
                 self.feature_manager.register_feature("volume_profile", enabled=True)
                 logger.info("Volume profile analyzer initialized")
@@ -82,6 +91,7 @@ class StrategyEngine:
         self.current_regime_params = None
         if config.enable_regime_detection:
             try:
+                from src.market_regime_detector import MarketRegimeDetector
                 self.market_regime_detector = MarketRegimeDetector(config, self.indicator_calc)
                 self.feature_manager.register_feature("regime_detection", enabled=True)
                 logger.info("Market regime detector initialized")
@@ -94,6 +104,7 @@ class StrategyEngine:
         self.ml_prediction = 0.5  # Neutral by default
         if config.enable_ml_prediction:
             try:
+                from src.ml_predictor import MLPredictor
                 self.ml_predictor = MLPredictor(config)
                 self.feature_manager.register_feature("ml_prediction", enabled=True)
                 logger.info("ML predictor initialized")
@@ -106,7 +117,8 @@ class StrategyEngine:
         candles_15m: List[Candle], 
         candles_1h: List[Candle],
         candles_5m: Optional[List[Candle]] = None,
-        candles_4h: Optional[List[Candle]] = None
+        candles_4h: Optional[List[Candle]] = None,
+        symbol: Optional[str] = None
     ) -> None:
         """Recalculate all indicators with latest candle data.
         
@@ -119,10 +131,13 @@ class StrategyEngine:
             candles_1h: List of 1-hour candles
             candles_5m: Optional list of 5-minute candles (for multi-timeframe)
             candles_4h: Optional list of 4-hour candles (for multi-timeframe)
+            symbol: Optional symbol the candles belong to (keeps per-symbol
+                multi-timeframe caches apart when one engine trades several)
         """
         # Store candles for momentum continuation check
         self._candles_15m = candles_15m
         self._candles_1h = candles_1h
+        self._symbol = symbol
         
         # Check if a new candle just closed (for signal generation timing)
         if candles_15m and len(candles_15m) > 0:
@@ -160,7 +175,7 @@ class StrategyEngine:
                 self.timeframe_analysis = self.feature_manager.execute_feature(
                     "multi_timeframe",
                     self.timeframe_coordinator.analyze_all_timeframes,
-                    candles_5m, candles_15m, candles_1h, candles_4h,
+                    candles_5m, candles_15m, candles_1h, candles_4h, symbol,
                     default_value=None
                 )
             else:
@@ -170,22 +185,19 @@ class StrategyEngine:
                 if candles_4h is None or len(candles_4h) == 0:
                     logger.debug("Multi-timeframe: 4h data not available yet")
         
-        # Update volume profile if enabled (every 4 hours by default)
+        # Refresh the volume profile once the candles advanced by the update interval
+        # (4 hours of candle time by default); in the background the previous
+        # profile stays in use until the new one is published
         if self.volume_profile_analyzer and self.feature_manager.is_feature_enabled("volume_profile"):
-            current_time_sec = int(time.time())
-            if current_time_sec - self.volume_profile_analyzer.last_update >= self.config.volume_profile_update_interval:
-                # Use 15m candles for volume profile (covers 7 days with enough granularity)
-                profile = self.feature_manager.execute_feature(
-                    "volume_profile",
-                    self.volume_profile_analyzer.calculate_volume_profile,
-                    candles_15m,
-                    default_value=None
-                )
-                if profile is not None:
-                    self.volume_profile_analyzer.current_profile = profile
-                    self.volume_profile_analyzer.last_update = current_time_sec
-                else:
-                    logger.warning("Volume profile calculation failed, using previous profile")
+            # Use 15m candles for volume profile (covers 7 days with enough granularity)
+            self.feature_manager.execute_feature(
+                "volume_profile",
+                self.volume_profile_analyzer.refresh,
+                candles_15m,
+                symbol,
+                background=self.background_volume_profile,
+                default_value=False
+            )
         
         # Update market regime if enabled (every 15 minutes by default)
         if self.market_regime_detector and self.feature_manager.is_feature_enabled("regime_detection"):
@@ -199,10 +211,7 @@ class StrategyEngine:
                 )
                 
                 # Update regime history
-                self.market_regime_detector.regime_history.append({
-                    'timestamp': current_time_sec,
-                    'regime': regime
-                })
+                self.market_regime_detector.record_regime(regime, current_time_sec)
                 
                 # Only update current regime if stable
                 if self.market_regime_detector.is_regime_stable():
@@ -242,39 +251,44 @@ class StrategyEngine:
         self.current_indicators.weekly_anchor_time = self._get_weekly_anchor(current_time)
         
         # Calculate VWAP for both timeframes
-        self.current_indicators.vwap_15m = self.indicator_calc.calculate_vwap(
-            candles_15m, 
-            self.current_indicators.weekly_anchor_time
-        )
-        self.current_indicators.vwap_1h = self.indicator_calc.calculate_vwap(
-            candles_1h, 
-            self.current_indicators.weekly_anchor_time
-        )
+        with instrumentation.timer("indicator.vwap"):
+            self.current_indicators.vwap_15m = self.indicator_calc.calculate_vwap(
+                candles_15m, 
+                self.current_indicators.weekly_anchor_time
+            )
+            self.current_indicators.vwap_1h = self.indicator_calc.calculate_vwap(
+                candles_1h, 
+                self.current_indicators.weekly_anchor_time
+            )
         
         # Calculate ATR for both timeframes
-        self.current_indicators.atr_15m = self.indicator_calc.calculate_atr(
-            candles_15m, 
-            self.config.atr_period
-        )
-        self.current_indicators.atr_1h = self.indicator_calc.calculate_atr(
-            candles_1h, 
-            self.config.atr_period
-        )
+        with instrumentation.timer("indicator.atr"):
+            self.current_indicators.atr_15m = self.indicator_calc.calculate_atr(
+                candles_15m, 
+                self.config.atr_period
+            )
+            self.current_indicators.atr_1h = self.indicator_calc.calculate_atr(
+                candles_1h, 
+                self.config.atr_period
+            )
         
         # Calculate ADX on 15m timeframe
-        self.current_indicators.adx = self.indicator_calc.calculate_adx(
-            candles_15m, 
-            self.config.adx_period
-        )
+        with instrumentation.timer("indicator.adx"):
+            self.current_indicators.adx = self.indicator_calc.calculate_adx(
+                candles_15m, 
+                self.config.adx_period
+            )
         
         # Calculate RVOL on 15m timeframe
-        self.current_indicators.rvol = self.indicator_calc.calculate_rvol(
-            candles_15m, 
-            self.config.rvol_period
-        )
+        with instrumentation.timer("indicator.rvol"):
+            self.current_indicators.rvol = self.indicator_calc.calculate_rvol(
+                candles_15m, 
+                self.config.rvol_period
+            )
         
         # Calculate Squeeze Momentum on 15m timeframe
-        squeeze_result = self.indicator_calc.calculate_squeeze_momentum(candles_15m)
+        with instrumentation.timer("indicator.squeeze_momentum"):
+            squeeze_result = self.indicator_calc.calculate_squeeze_momentum(candles_15m)
         self.current_indicators.squeeze_value = squeeze_result['value']
         self.current_indicators.is_squeezed = squeeze_result['is_squeezed']
         self.current_indicators.previous_squeeze_color = self._previous_squeeze_color
@@ -284,21 +298,115 @@ class StrategyEngine:
         self._previous_squeeze_color = squeeze_result['color']
         
         # Determine trends
-        self.current_indicators.trend_15m = self.indicator_calc.determine_trend(
-            candles_15m, 
-            self.current_indicators.vwap_15m
-        )
-        self.current_indicators.trend_1h = self.indicator_calc.determine_trend(
-            candles_1h, 
-            self.current_indicators.vwap_1h
-        )
+        with instrumentation.timer("indicator.trend"):
+            self.current_indicators.trend_15m = self.indicator_calc.determine_trend(
+                candles_15m, 
+                self.current_indicators.vwap_15m
+            )
+            self.current_indicators.trend_1h = self.indicator_calc.determine_trend(
+                candles_1h, 
+                self.current_indicators.vwap_1h
+            )
         
         # Determine price vs VWAP
         if self.current_indicators.current_price > self.current_indicators.vwap_15m:
             self.current_indicators.price_vs_vwap = "ABOVE"
         else:
             self.current_indicators.price_vs_vwap = "BELOW"
-    
+
+    def restore_indicators(
+        self,
+        candles_15m: List[Candle],
+        candles_1h: List[Candle],
+        state: IndicatorState
+    ) -> None:
+        """Load indicator values previously computed for the same windows.
+
+        Equivalent to update_indicators(candles_15m, candles_1h) when state
+        is a copy of current_indicators after that call and no adaptive
+        feature is enabled. Lets backtest sweeps reuse indicator values
+        across parameter settings that do not change them.
+
+        Args:
+            candles_15m: List of 15-minute candles
+            candles_1h: List of 1-hour candles
+            state: Indicator values for these windows (copied, not aliased)
+        """
+        self._candles_15m = candles_15m
+        self._candles_1h = candles_1h
+
+        latest_candle_time = candles_15m[-1].timestamp
+        self._candle_just_closed = latest_candle_time != self._last_candle_close_time
+        self._last_candle_close_time = latest_candle_time
+
+        self.timeframe_analysis = None
+        self.current_indicators = copy.copy(state)
+        self._previous_squeeze_color = state.squeeze_color
+
+    def get_state(self) -> Dict:
+        """Export the state that indicators cannot recompute from candles.
+
+        Covers the last processed candle, squeeze color transition, adaptive
+        thresholds, regime history and ML accuracy tracking, so a restarted
+        bot resumes with them instead of from defaults.
+
+        Returns:
+            JSON-serializable dictionary (see restore_state)
+        """
+        state = {
+            "last_candle_close_time": self._last_candle_close_time,
+            "previous_squeeze_color": self._previous_squeeze_color,
+            "last_threshold_update": self._last_threshold_update,
+        }
+        if self.adaptive_threshold_manager is not None:
+            state["adaptive_thresholds"] = {
+                "current_thresholds": dict(self.adaptive_threshold_manager.current_thresholds),
+                "volatility_percentile": self.adaptive_threshold_manager.volatility_percentile,
+                "last_update_time": self.adaptive_threshold_manager.last_update_time,
+            }
+        if self.market_regime_detector is not None:
+            state["regime"] = {
+                "current_regime": self.market_regime_detector.current_regime,
+                "regime_history": list(self.market_regime_detector.regime_history),
+                "last_update": self.market_regime_detector.last_update,
+            }
+        if self.ml_predictor is not None:
+            state["ml_accuracy"] = list(self.ml_predictor.accuracy_tracker)
+        return state
+
+    def restore_state(self, state: Dict) -> None:
+        """Restore state exported by get_state.
+
+        Entries for features that are disabled in this configuration are
+        ignored.
+
+        Args:
+            state: Dictionary from get_state
+        """
+        self._last_candle_close_time = state.get("last_candle_close_time", 0)
+        self._previous_squeeze_color = state.get("previous_squeeze_color", "gray")
+        self._last_threshold_update = state.get("last_threshold_update", 0)
+
+        thresholds = state.get("adaptive_thresholds")
+        if thresholds and self.adaptive_threshold_manager is not None:
+            self.adaptive_threshold_manager.current_thresholds.update(thresholds["current_thresholds"])
+            self.adaptive_threshold_manager.volatility_percentile = thresholds["volatility_percentile"]
+            self.adaptive_threshold_manager.last_update_time = thresholds["last_update_time"]
+
+        regime = state.get("regime")
+        if regime and self.market_regime_detector is not None:
+            self.market_regime_detector.current_regime = regime["current_regime"]
+            self.market_regime_detector.regime_history = list(regime["regime_history"])
+            self.market_regime_detector.last_update = regime["last_update"]
+            self.current_regime_params = self.market_regime_detector.get_regime_parameters(
+                regime["current_regime"]
+            )
+
+        accuracy = state.get("ml_accuracy")
+        if accuracy is not None and self.ml_predictor is not None:
+            self.ml_predictor.accuracy_tracker.clear()
+            self.ml_predictor.accuracy_tracker.extend(accuracy)
+
     def _check_momentum_continuation(self, candles_15m: List[Candle], direction: str) -> bool:
         """Check if momentum allows entry (improved version - less restrictive).
         
@@ -630,11 +738,12 @@ class StrategyEngine:
         
         # Volume profile
         if self.volume_profile_analyzer and self.feature_manager.is_feature_enabled("volume_profile"):
-            if self.volume_profile_analyzer.current_profile:
+            profile = self.volume_profile_analyzer.get_profile(self._symbol)
+            if profile:
                 data['volume_profile'] = {
-                    'poc': self.volume_profile_analyzer.current_profile.poc,
-                    'vah': self.volume_profile_analyzer.current_profile.vah,
-                    'val': self.volume_profile_analyzer.current_profile.val
+                    'poc': profile.poc,
+                    'vah': profile.vah,
+                    'val': profile.val
                 }
         
         # Adaptive thresholds
@@ -653,7 +762,10 @@ class StrategyEngine:
         Returns:
             Size multiplier (0.5 for low volume areas, 1.0 otherwise)
         """
-        if not self.volume_profile_analyzer or not self.volume_profile_analyzer.current_profile:
+        if not self.volume_profile_analyzer:
+            return 1.0
+        profile = self.volume_profile_analyzer.get_profile(self._symbol)
+        if not profile:
             return 1.0
         
         current_price = self.current_indicators.current_price
@@ -661,16 +773,16 @@ class StrategyEngine:
             return 1.0
         
         # Check if price is near key levels (POC, VAH, VAL)
-        if self.volume_profile_analyzer.is_near_key_level(current_price):
+        if self.volume_profile_analyzer.is_near_key_level(current_price, symbol=self._symbol):
             # Near key levels - good for entries
             return 1.0
         
         # Check if we're in a low volume area
-        volume_at_price = self.volume_profile_analyzer.get_volume_at_price(current_price)
+        volume_at_price = self.volume_profile_analyzer.get_volume_at_price(current_price, symbol=self._symbol)
         
-        if self.volume_profile_analyzer.current_profile.total_volume > 0:
+        if profile.total_volume > 0:
             # Calculate volume percentile at current price
-            sorted_volumes = sorted(self.volume_profile_analyzer.current_profile.volumes, reverse=True)
+            sorted_volumes = sorted(profile.volumes, reverse=True)
             if sorted_volumes:
                 median_volume = sorted_volumes[len(sorted_volumes) // 2]
                 
@@ -5,17 +5,20 @@ Creates interactive charts for the dashboard using Plotly.
 Provides price charts, PnL charts, and other visualizations.
 """
 
+import numpy as np
 import plotly.graph_objects as go
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime
 
+from src.chart_data_service import ChartData
+
 
 class ChartGenerator:
     """Generates charts for the dashboard."""
     
     def create_price_chart(
         self,
-        candles: List[Dict],
+        candles: Union[List[Dict], ChartData],
         positions: Optional[List[Dict]] = None,
         atr_bands: Optional[Dict] = None
     ) -> go.Figure:
@@ -23,54 +26,44 @@ class ChartGenerator:
         Create candlestick chart with overlays.
         
         Args:
-            candles: List of candle dictionaries with OHLC data
+            candles: List of candle dictionaries with OHLC data, or a
+                ChartData payload from ChartDataService (already downsampled,
+                with VWAP/ATR overlays and position markers)
             positions: Optional list of position dictionaries
             atr_bands: Optional dictionary with ATR band data
             
         Returns:
             Plotly Figure object
         """
+        if isinstance(candles, ChartData):
+            return self._create_price_chart_from_data(candles, positions)
+        
         fig = go.Figure()
         
         if not candles:
-            fig.add_annotation(
-                text="No data available",
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=0.5,
-                showarrow=False
-            )
+            self._add_no_data_annotation(fig)
             return fig
         
+        # Single pass over the candle dicts, then hand column arrays to Plotly
+        x = [c.get('timestamp', c.get('time', '')) for c in candles]
+        ohlc = np.array(
+            [(c['open'], c['high'], c['low'], c['close']) for c in candles],
+            dtype=float
+        )
+        
         # Add candlesticks
         fig.add_trace(go.Candlestick(
-            x=[c.get('timestamp', c.get('time', '')) for c in candles],
-            open=[c['open'] for c in candles],
-            high=[c['high'] for c in candles],
-            low=[c['low'] for c in candles],
-            close=[c['close'] for c in candles],
+            x=x,
+            open=ohlc[:, 0],
+            high=ohlc[:, 1],
+            low=ohlc[:, 2],
+            close=ohlc[:, 3],
             name="Price"
         ))
         
         # Add ATR bands if provided
         if atr_bands and 'timestamps' in atr_bands:
-            fig.add_trace(go.Scatter(
-                x=atr_bands['timestamps'],
-                y=atr_bands.get('upper', []),
-                name="ATR Upper",
-                line=dict(dash='dash', color='gray'),
-                opacity=0.5
-            ))
-            fig.add_trace(go.Scatter(
-                x=atr_bands['timestamps'],
-                y=atr_bands.get('lower', []),
-                name="ATR Lower",
-                line=dict(dash='dash', color='gray'),
-                opacity=0.5,
-                fill='tonexty',
-                fillcolor='rgba(128, 128, 128, 0.1)'
-            ))
+            self._add_atr_bands(fig, atr_bands['timestamps'], atr_bands.get('upper', []), atr_bands.get('lower', []))
         
         # Mark position entries
         if positions:
@@ -80,30 +73,133 @@ class ChartGenerator:
                 side = pos.get('side', 'LONG')
                 
                 if entry_time and entry_price:
-                    fig.add_trace(go.Scatter(
-                        x=[entry_time],
-                        y=[entry_price],
-                        mode='markers',
-                        marker=dict(
-                            size=12,
-                            symbol='triangle-up' if side == 'LONG' else 'triangle-down',
-                            color='green' if side == 'LONG' else 'red',
-                            line=dict(width=2, color='white')
-                        ),
-                        name=f"{side} Entry",
-                        showlegend=True
-                    ))
+                    self._add_entry_marker(fig, entry_time, entry_price, side)
+        
+        self._apply_price_layout(fig)
+        
+        return fig
+    
+    def _create_price_chart_from_data(
+        self,
+        data: ChartData,
+        positions: Optional[List[Dict]] = None
+    ) -> go.Figure:
+        """
+        Create candlestick chart from a precomputed ChartData payload.
+        
+        Args:
+            data: Downsampled candles and overlays
+            positions: Optional extra position dictionaries to mark
+            
+        Returns:
+            Plotly Figure object
+        """
+        fig = go.Figure()
         
+        if data.is_empty:
+            self._add_no_data_annotation(fig)
+            return fig
+        
+        x = data.datetimes
+        
+        fig.add_trace(go.Candlestick(
+            x=x,
+            open=data.candles['open'],
+            high=data.candles['high'],
+            low=data.candles['low'],
+            close=data.candles['close'],
+            name="Price"
+        ))
+        
+        if len(data.vwap) and not np.all(np.isnan(data.vwap)):
+            fig.add_trace(go.Scatter(
+                x=x,
+                y=data.vwap,
+                name="VWAP",
+                line=dict(color='orange', width=1.5)
+            ))
+        
+        if len(data.atr_upper) and not np.all(np.isnan(data.atr_upper)):
+            self._add_atr_bands(fig, x, data.atr_upper, data.atr_lower)
+        
+        for marker in data.markers:
+            self._add_entry_marker(
+                fig,
+                np.datetime64(marker['time'], 'ms'),
+                marker['price'],
+                marker['side']
+            )
+        
+        if positions:
+            for pos in positions:
+                entry_time = pos.get('entry_time', pos.get('timestamp', ''))
+                entry_price = pos.get('entry_price', 0)
+                if entry_time and entry_price:
+                    self._add_entry_marker(fig, entry_time, entry_price, pos.get('side', 'LONG'))
+        
+        title = f"{data.symbol} {data.timeframe}"
+        if data.source_points > len(data.candles):
+            title += f" ({data.source_points:,} candles, downsampled to {len(data.candles):,})"
+        self._apply_price_layout(fig, title=title)
+        
+        return fig
+    
+    def _add_no_data_annotation(self, fig: go.Figure) -> None:
+        """Add a centered "No data available" annotation."""
+        fig.add_annotation(
+            text="No data available",
+            xref="paper",
+            yref="paper",
+            x=0.5,
+            y=0.5,
+            showarrow=False
+        )
+    
+    def _add_atr_bands(self, fig: go.Figure, x, upper, lower) -> None:
+        """Add upper and lower ATR band traces."""
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=upper,
+            name="ATR Upper",
+            line=dict(dash='dash', color='gray'),
+            opacity=0.5
+        ))
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=lower,
+            name="ATR Lower",
+            line=dict(dash='dash', color='gray'),
+            opacity=0.5,
+            fill='tonexty',
+            fillcolor='rgba(128, 128, 128, 0.1)'
+        ))
+    
+    def _add_entry_marker(self, fig: go.Figure, entry_time, entry_price: float, side: str) -> None:
+        """Add a position entry marker trace."""
+        fig.add_trace(go.Scatter(
+            x=[entry_time],
+            y=[entry_price],
+            mode='markers',
+            marker=dict(
+                size=12,
+                symbol='triangle-up' if side == 'LONG' else 'triangle-down',
+                color='green' if side == 'LONG' else 'red',
+                line=dict(width=2, color='white')
+            ),
+            name=f"{side} Entry",
+            showlegend=True
+        ))
+    
+    def _apply_price_layout(self, fig: go.Figure, title: str = "Price Chart") -> None:
+        """Apply the standard price chart layout."""
         fig.update_layout(
-            title="Price Chart",
+            title=title,
             xaxis_title="Time",
             yaxis_title="Price (USDT)",
             height=600,
             xaxis_rangeslider_visible=False,
             hovermode='x unified'
         )
-        
-        return fig
     
     def create_pnl_chart(self, trades: List[Dict]) -> go.Figure:
         """
@@ -204,3 +300,56 @@ class ChartGenerator:
         )
         
         return fig
+    
+    def create_underwater_chart(self, days, underwater, rolling_sharpe=None) -> go.Figure:
+        """
+        Create underwater (drawdown) chart with optional rolling Sharpe ratio.
+        
+        Args:
+            days: Day start timestamps in milliseconds
+            underwater: Drawdown below the running equity peak per day (<= 0)
+            rolling_sharpe: Optional rolling Sharpe ratio per day
+            
+        Returns:
+            Plotly Figure object
+        """
+        fig = go.Figure()
+        
+        if len(days) == 0:
+            self._add_no_data_annotation(fig)
+            return fig
+        
+        x = np.asarray(days, dtype=np.int64).astype('datetime64[ms]')
+        
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=underwater,
+            mode='lines',
+            fill='tozeroy',
+            fillcolor='rgba(255, 0, 0, 0.2)',
+            line=dict(color='red', width=2),
+            name="Drawdown"
+        ))
+        
+        if rolling_sharpe is not None and not np.all(np.isnan(rolling_sharpe)):
+            fig.add_trace(go.Scatter(
+                x=x,
+                y=rolling_sharpe,
+                mode='lines',
+                line=dict(color='royalblue', width=1.5, dash='dot'),
+                name="Rolling Sharpe",
+                yaxis='y2'
+            ))
+            fig.update_layout(
+                yaxis2=dict(title="Sharpe", overlaying='y', side='right', showgrid=False)
+            )
+        
+        fig.update_layout(
+            title="Underwater Curve (Daily)",
+            xaxis_title="Date",
+            yaxis_title="Drawdown (USDT)",
+            height=400,
+            hovermode='x unified'
+        )
+        
+        return fig
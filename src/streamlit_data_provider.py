@@ -5,13 +5,15 @@ Provides data to the Streamlit dashboard by reading bot state from files.
 Implements caching to avoid excessive file I/O operations.
 """
 
+import gzip
 import json
 import time
-import psutil
 from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
 
+from src.heartbeat import HeartbeatRecord, read_heartbeat
+
 
 class StreamlitDataProvider:
     """Provides data to Streamlit dashboard by reading bot files."""
@@ -20,7 +22,8 @@ class StreamlitDataProvider:
         self,
         config_path: str = "config/config.json",
         results_path: str = "binance_results.json",
-        logs_dir: str = "logs"
+        logs_dir: str = "logs",
+        heartbeat_path: Optional[str] = None
     ):
         """
         Initialize the data provider.
@@ -29,10 +32,13 @@ class StreamlitDataProvider:
             config_path: Path to configuration file
             results_path: Path to results file
             logs_dir: Directory containing log files
+            heartbeat_path: Path to the bot heartbeat file
+                (defaults to heartbeat.bin inside logs_dir)
         """
         self.config_path = config_path
         self.results_path = results_path
         self.logs_dir = logs_dir
+        self.heartbeat_path = heartbeat_path or str(Path(logs_dir) / "heartbeat.bin")
         self._cache = {}
         self._cache_timestamps = {}
         self._cache_ttl = 5  # seconds
@@ -53,13 +59,22 @@ class StreamlitDataProvider:
         Returns:
             Dictionary with bot status information
         """
-        is_running = self._is_bot_process_running()
-        last_update = self._get_last_log_timestamp()
+        heartbeat = read_heartbeat(self.heartbeat_path)
+        is_running = self._is_heartbeat_alive(heartbeat)
+        
+        if heartbeat is not None:
+            last_update = datetime.fromtimestamp(heartbeat.updated_at)
+        else:
+            last_update = self._get_last_log_timestamp()
         
         return {
             "is_running": is_running,
             "last_update": last_update,
-            "status": "Running" if is_running else "Stopped"
+            "status": "Running" if is_running else "Stopped",
+            "pid": heartbeat.pid if heartbeat else None,
+            "loop_iteration": heartbeat.loop_iteration if heartbeat else 0,
+            "loop_latency_ms": heartbeat.loop_latency_ms if heartbeat else 0.0,
+            "last_candle_time": heartbeat.last_candle_time if heartbeat else 0
         }
     
     def get_balance_and_pnl(self) -> Dict:
@@ -152,22 +167,28 @@ class StreamlitDataProvider:
         """
         Check if bot process is running.
         
+        Reads the heartbeat the bot publishes every loop iteration instead of
+        scanning the process table, so the check is O(1).
+        
         Returns:
             True if bot is running, False otherwise
         """
-        try:
-            for proc in psutil.process_iter(['name', 'cmdline']):
-                try:
-                    cmdline = proc.info.get('cmdline', [])
-                    if cmdline and len(cmdline) > 0:
-                        cmdline_str = ' '.join(str(c) for c in cmdline)
-                        if 'python' in cmdline_str.lower() and 'main.py' in cmdline_str:
-                            return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-        except Exception:
-            pass
-        return False
+        return self._is_heartbeat_alive(read_heartbeat(self.heartbeat_path))
+    
+    def _is_heartbeat_alive(self, heartbeat: Optional[HeartbeatRecord]) -> bool:
+        """
+        Check whether a heartbeat record belongs to a live bot.
+        
+        Args:
+            heartbeat: Heartbeat record or None if unavailable
+            
+        Returns:
+            True if the heartbeat is fresh and reports the bot running
+        """
+        if heartbeat is None:
+            return False
+        stale_after = self.get_config().get("heartbeat_stale_seconds", 30)
+        return heartbeat.is_alive(stale_after)
     
     def _get_last_log_timestamp(self) -> Optional[datetime]:
         """
@@ -234,7 +255,9 @@ class StreamlitDataProvider:
             
             for trade_file in trade_files:
                 try:
-                    with open(trade_file, 'r', encoding='utf-8', errors='ignore') as f:
+                    # Rotated logs are gzipped by the maintenance scheduler
+                    opener = gzip.open if trade_file.suffix == '.gz' else open
+                    with opener(trade_file, 'rt', encoding='utf-8', errors='ignore') as f:
                         for line in f:
                             # Parse trade entries from log
                             # Format: YYYY-MM-DD HH:MM:SS - trading_bot.trades - INFO - TRADE_EXECUTED: {json}
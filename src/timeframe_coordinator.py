@@ -1,10 +1,11 @@
 """Timeframe Coordinator for multi-timeframe analysis."""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from src.models import Candle
 from src.indicators import IndicatorCalculator
 from src.config import Config
+from src import instrumentation
 
 
 @dataclass
@@ -50,6 +51,11 @@ class TimeframeCoordinator:
     
     Analyzes 5m, 15m, 1h, and 4h timeframes to generate confidence-weighted
     trading signals based on timeframe alignment.
+    
+    Each timeframe's TimeframeData is cached per symbol and recomputed only
+    when that timeframe's candle window changes, so a 4h analysis is reused
+    for the 16 15m bars (48 5m bars) it spans. When no timeframe changed the
+    previous TimeframeAnalysis is returned as is.
     """
     
     def __init__(self, config: Config, indicator_calc: IndicatorCalculator):
@@ -65,30 +71,84 @@ class TimeframeCoordinator:
         
         # Timeframe weights from config (4h=40%, 1h=30%, 15m=20%, 5m=10%)
         self.weights = config.timeframe_weights
+        
+        # Per symbol: timeframe -> (window fingerprint, analysis), and the last combined analysis
+        self._timeframe_cache: Dict[Optional[str], Dict[str, Tuple[tuple, Optional[TimeframeData]]]] = {}
+        self._analysis_cache: Dict[Optional[str], TimeframeAnalysis] = {}
+    
+    @staticmethod
+    def _window_key(candles: Optional[List[Candle]]) -> tuple:
+        """Fingerprint a candle window by its bounds and latest candle.
+        
+        Args:
+            candles: Candle window (may be None or empty)
+            
+        Returns:
+            Tuple that changes whenever a new candle closes, the window
+            slides, or the latest candle is revised
+        """
+        if not candles:
+            return ()
+        first = candles[0]
+        last = candles[-1]
+        return (len(candles), first.timestamp, last.timestamp, last.open, last.high, last.low, last.close, last.volume)
+    
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop the cached analyses of a symbol, forcing a full recompute.
+        
+        Args:
+            symbol: Symbol to drop (None drops the unscoped entries)
+        """
+        self._timeframe_cache.pop(symbol, None)
+        self._analysis_cache.pop(symbol, None)
     
     def analyze_all_timeframes(
         self,
         candles_5m: List[Candle],
         candles_15m: List[Candle],
         candles_1h: List[Candle],
-        candles_4h: List[Candle]
+        candles_4h: List[Candle],
+        symbol: Optional[str] = None
     ) -> TimeframeAnalysis:
         """Analyze all timeframes and return consolidated analysis.
         
+        Only timeframes whose candle window changed since the previous call
+        for the same symbol are recomputed.
+        
         Args:
             candles_5m: List of 5-minute candles
             candles_15m: List of 15-minute candles
             candles_1h: List of 1-hour candles
             candles_4h: List of 4-hour candles
+            symbol: Symbol the candles belong to (keeps per-symbol caches apart)
             
         Returns:
             TimeframeAnalysis with complete multi-timeframe analysis
         """
-        # Analyze each timeframe
-        tf_5m = self._analyze_timeframe(candles_5m, "5m") if candles_5m else None
-        tf_15m = self._analyze_timeframe(candles_15m, "15m") if candles_15m else None
-        tf_1h = self._analyze_timeframe(candles_1h, "1h") if candles_1h else None
-        tf_4h = self._analyze_timeframe(candles_4h, "4h") if candles_4h else None
+        cache = self._timeframe_cache.setdefault(symbol, {})
+        dirty = False
+        results: Dict[str, Optional[TimeframeData]] = {}
+        for timeframe, candles in (("5m", candles_5m), ("15m", candles_15m), ("1h", candles_1h), ("4h", candles_4h)):
+            key = self._window_key(candles)
+            cached = cache.get(timeframe)
+            if cached is not None and cached[0] == key:
+                instrumentation.increment("cache.timeframe_analysis.hit", symbol=symbol)
+                results[timeframe] = cached[1]
+                continue
+            
+            instrumentation.increment("cache.timeframe_analysis.miss", symbol=symbol)
+            results[timeframe] = self._analyze_timeframe(candles, timeframe) if candles else None
+            cache[timeframe] = (key, results[timeframe])
+            dirty = True
+        
+        previous = self._analysis_cache.get(symbol)
+        if not dirty and previous is not None:
+            return previous
+        
+        tf_5m = results["5m"]
+        tf_15m = results["15m"]
+        tf_1h = results["1h"]
+        tf_4h = results["4h"]
         
         # Create analysis object
         analysis = TimeframeAnalysis(
@@ -106,6 +166,7 @@ class TimeframeCoordinator:
         analysis.confidence = self.calculate_signal_confidence(analysis)
         analysis.overall_direction = self._determine_overall_direction(analysis)
         
+        self._analysis_cache[symbol] = analysis
         return analysis
     
     def _analyze_timeframe(self, candles: List[Candle], timeframe: str) -> TimeframeData:
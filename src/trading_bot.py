@@ -5,20 +5,14 @@ and implements the main event loop for real-time trading.
 """
 
 import time
+import importlib.util
 import logging
 import signal
 import sys
-from typing import Optional, List, Dict
+from dataclasses import asdict
+from typing import Optional, List, Dict, TYPE_CHECKING
 from binance.client import Client
 
-# Try to import pynput for keyboard listener (optional for headless servers)
-try:
-    from pynput import keyboard
-    KEYBOARD_AVAILABLE = True
-except ImportError:
-    KEYBOARD_AVAILABLE = False
-    keyboard = None
-
 from src.config import Config
 from src.data_manager import DataManager
 from src.strategy import StrategyEngine
@@ -26,11 +20,30 @@ from src.risk_manager import RiskManager
 from src.position_sizer import PositionSizer
 from src.order_executor import OrderExecutor
 from src.ui_display import UIDisplay
-from src.backtest_engine import BacktestEngine
 from src.logger import get_logger, TradingLogger
-from src.models import PerformanceMetrics
-from src.portfolio_manager import PortfolioManager
+from src.models import PerformanceMetrics, Position
+from src import performance_analytics
 from src.scaled_tp_manager import ScaledTakeProfitManager
+from src.chart_data_service import CandleStore
+from src import state_snapshot
+from src import instrumentation
+from src.user_data_stream import AccountStateCache
+from src.exchange_info import ExchangeInfoCache
+from src.indicators import IndicatorCalculator
+
+# Subsystems that only some modes or config flags use are imported where they
+# are constructed, so a PAPER/LIVE restart does not load the backtest engines,
+# the portfolio manager, psutil, pynput or the replay recorder unless it needs
+# them. UIDisplay and ScaledTakeProfitManager are built for every run mode.
+if TYPE_CHECKING:
+    from src.backtest_engine import BacktestEngine
+    from src.heartbeat import HeartbeatWriter
+    from src.maintenance import MaintenanceScheduler
+    from src.market_replay import FrameRecorder
+    from src.portfolio_manager import PortfolioManager
+
+# pynput is optional (absent on headless servers); checked without importing it
+KEYBOARD_AVAILABLE = importlib.util.find_spec("pynput") is not None
 
 
 # Configure logging with BOTH file and console output
@@ -47,6 +60,10 @@ logger.info("=" * 80)
 logger.info("TRADING BOT STARTING")
 logger.info("=" * 80)
 
+# Two days of resampled candles read per loop when candle_base_timeframe is set
+CANDLES_15M_2_DAYS = 192
+CANDLES_1H_2_DAYS = 48
+
 
 class TradingBot:
     """Main trading bot orchestrator.
@@ -65,11 +82,13 @@ class TradingBot:
     - LIVE: Real-time trading with actual order execution
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, client: Optional[Client] = None):
         """Initialize TradingBot with configuration.
         
         Args:
             config: Configuration object with all parameters
+            client: Exchange client to use instead of a new Binance client
+                (e.g. a market_replay.FakeExchangeClient)
         """
         self.config = config
         self.running = False
@@ -79,8 +98,10 @@ class TradingBot:
         self.logger = get_logger(config=config)
         
         # Initialize Binance client (needed for all modes to fetch data)
-        self.client: Optional[Client] = None
-        if config.api_key and config.api_secret:
+        self.client: Optional[Client] = client
+        if client is not None:
+            logger.info("Using provided exchange client")
+        elif config.api_key and config.api_secret:
             self.client = Client(config.api_key, config.api_secret)
             logger.info("Binance client initialized")
         elif config.run_mode in ["PAPER", "LIVE"]:
@@ -95,8 +116,9 @@ class TradingBot:
         self.ui_display = UIDisplay()
         
         # Initialize portfolio manager (if enabled)
-        self.portfolio_manager: Optional[PortfolioManager] = None
+        self.portfolio_manager: Optional["PortfolioManager"] = None
         if config.enable_portfolio_management:
+            from src.portfolio_manager import PortfolioManager
             self.portfolio_manager = PortfolioManager(config)
             logger.info(f"Portfolio Manager initialized with {len(config.portfolio_symbols)} symbols")
         
@@ -106,8 +128,9 @@ class TradingBot:
             logger.info(f"Scaled TP Manager initialized with {len(config.scaled_tp_levels)} levels")
         
         # Initialize backtest engine (only for BACKTEST mode)
-        self.backtest_engine: Optional[BacktestEngine] = None
+        self.backtest_engine: Optional["BacktestEngine"] = None
         if config.run_mode == "BACKTEST":
+            from src.backtest_engine import BacktestEngine
             self.backtest_engine = BacktestEngine(config, self.strategy, self.risk_manager)
         
         # Keyboard listener for panic close (optional, only on systems with display)
@@ -119,6 +142,43 @@ class TradingBot:
         # Per-symbol indicator storage for dashboard
         self._symbol_indicators: Dict[str, Dict[str, float]] = {}
         
+        # Heartbeat published once per event loop iteration (PAPER/LIVE only)
+        self._heartbeat: Optional["HeartbeatWriter"] = None
+        self._loop_iteration = 0
+        self._last_candle_processed = 0
+        
+        # Candle history persisted for the dashboard chart page
+        self.candle_store = CandleStore(config.candle_store_dir)
+        self._candle_store_last_ts: Dict[tuple, int] = {}
+        
+        # Hot-path instrumentation (timers are no-ops unless enabled)
+        instrumentation.configure(config.enable_instrumentation)
+        self._metrics_server = None
+        
+        # Indicator values shared by strategy, coordinator, regime detector and
+        # ML features within a bar; a symbol's entries are dropped on each new 15m close
+        if config.cache_indicators:
+            IndicatorCalculator.enable_caching()
+        else:
+            IndicatorCalculator.disable_caching()
+        self._indicator_bar: Dict[str, int] = {}
+        
+        # Optional WebSocket frame recording for offline replay
+        self._frame_recorder: Optional["FrameRecorder"] = None
+        
+        # Background data retention and compaction (PAPER/LIVE only)
+        self._maintenance: Optional["MaintenanceScheduler"] = None
+        
+        # Balances, positions and fills pushed by the user data stream (PAPER/LIVE only)
+        self._account_cache: Optional[AccountStateCache] = None
+        
+        # Per-symbol lot step, tick size and minimums (PAPER/LIVE only)
+        self._exchange_info: Optional[ExchangeInfoCache] = None
+        
+        # Warm restart: periodic state snapshots restored on the next start
+        self._last_snapshot_time = 0.0
+        self._warm_started = False
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -140,6 +200,14 @@ class TradingBot:
                     logger.info(f"Waiting {delay}s before fetching {symbol} data...")
                     time.sleep(delay)
                 
+                if self.data_manager.base_timeframe is not None:
+                    # One paged base history; every other timeframe is resampled from it
+                    logger.info(f"Fetching {self.data_manager.base_timeframe} data for {symbol}...")
+                    history = self.data_manager.fetch_resampled_history(days=days, symbol=symbol)
+                    counts = ", ".join(f"{len(candles)} {tf}" for tf, candles in history.items())
+                    logger.info(f"[OK] Fetched and resampled historical data for {symbol}: {counts}")
+                    continue
+                
                 logger.info(f"Fetching 15m data for {symbol}...")
                 candles_15m = self.data_manager.fetch_historical_data(days=days, timeframe="15m", symbol=symbol)
                 logger.info(f"  Fetched {len(candles_15m)} candles for {symbol} 15m")
@@ -165,6 +233,140 @@ class TradingBot:
                 logger.error(f"[X] Error fetching data for {symbol}: {e}", exc_info=True)
                 raise  # Re-raise to stop execution if data fetch fails
     
+    def _load_initial_data(self, symbols: List[str]):
+        """Load startup candle history, from the state snapshot when possible.
+        
+        Args:
+            symbols: Symbols to load data for
+        """
+        if self._restore_state_snapshot(symbols):
+            for symbol in symbols:
+                self.data_manager.seed_resampler(symbol)
+            return
+        self._fetch_multi_symbol_data(symbols, days=7)
+    
+    def _required_timeframes(self) -> List[str]:
+        """Timeframes the bot keeps buffers for."""
+        if self.config.enable_multi_timeframe:
+            timeframes = ["5m", "15m", "1h", "4h"]
+        else:
+            timeframes = ["15m", "1h"]
+        base_timeframe = self.data_manager.base_timeframe
+        if base_timeframe is not None and base_timeframe not in timeframes:
+            timeframes.insert(0, base_timeframe)
+        return timeframes
+    
+    def _restore_state_snapshot(self, symbols: List[str]) -> bool:
+        """Restore the last state snapshot and fetch only the missing candles.
+        
+        Args:
+            symbols: Symbols the bot trades
+            
+        Returns:
+            True if the bot was warm started, False if history must be fetched in full
+        """
+        path = self.config.state_snapshot_file
+        if not path:
+            return False
+        
+        snapshot = state_snapshot.load_snapshot(path)
+        if snapshot is None:
+            logger.info(f"No usable state snapshot at {path}, fetching full history")
+            return False
+        
+        age = snapshot.age_seconds()
+        if snapshot.run_mode != self.config.run_mode:
+            logger.info(f"State snapshot was written in {snapshot.run_mode} mode, fetching full history")
+            return False
+        if age > self.config.state_snapshot_max_age_hours * 3600:
+            logger.info(f"State snapshot is {age / 3600:.1f}h old, fetching full history")
+            return False
+        
+        timeframes = self._required_timeframes()
+        for symbol in symbols:
+            saved = snapshot.candles.get(symbol, {})
+            if any(len(saved.get(timeframe, ())) == 0 for timeframe in timeframes):
+                logger.info(f"State snapshot has no {symbol} candles for every timeframe, fetching full history")
+                return False
+        
+        try:
+            state_snapshot.restore_snapshot(
+                snapshot, self.data_manager, self.strategy, self.risk_manager, self.scaled_tp_manager, symbols
+            )
+            if self.config.run_mode == "LIVE":
+                self._reconcile_restored_positions()
+            fetched = self._fetch_tail_data([(symbol, timeframe) for symbol in symbols for timeframe in timeframes])
+        except Exception as e:
+            logger.error(f"Warm restart failed, fetching full history: {e}", exc_info=True)
+            for symbol in symbols:
+                for timeframe in timeframes:
+                    self.data_manager.load_buffer(symbol, timeframe, [])
+            return False
+        
+        self._warm_started = True
+        positions = len(self.risk_manager.active_positions)
+        logger.info(
+            f"[OK] Warm start from {age:.0f}s old snapshot: {fetched} new candles, {positions} open position(s) restored"
+        )
+        self.ui_display.show_notification(
+            f"Restored state snapshot ({age:.0f}s old, {positions} open position(s))", "SUCCESS"
+        )
+        return True
+    
+    def _fetch_tail_data(self, pairs: List[tuple]) -> int:
+        """Fetch the candles missing from restored buffers in parallel.
+        
+        Args:
+            pairs: (symbol, timeframe) buffers to extend
+            
+        Returns:
+            Total number of candles received
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(pairs)), thread_name_prefix="tail-fetch") as pool:
+            counts = list(pool.map(lambda pair: self.data_manager.fetch_tail(*pair), pairs))
+        return sum(counts)
+    
+    def _reconcile_restored_positions(self):
+        """Drop restored positions that are no longer open on the exchange (LIVE).
+        
+        A position may have been closed by its exchange-side stop while the
+        bot was down. Positions still open take the exchange's size.
+        """
+        try:
+            amounts = self.order_executor.get_position_amounts()
+        except Exception as e:
+            logger.error(f"Could not verify restored positions, discarding them: {e}")
+            amounts = {}
+        
+        for symbol, position in list(self.risk_manager.active_positions.items()):
+            amount = amounts.get(symbol, 0.0)
+            side = "LONG" if amount > 0 else "SHORT"
+            if amount == 0 or side != position.side:
+                logger.warning(f"Restored {position.side} position for {symbol} is no longer open on the exchange")
+                del self.risk_manager.active_positions[symbol]
+                self.scaled_tp_manager.reset_tracking(symbol)
+            else:
+                position.quantity = abs(amount)
+    
+    def _save_state_snapshot(self, symbols: List[str]):
+        """Write the warm-restart snapshot.
+        
+        Args:
+            symbols: Symbols whose candle buffers are saved
+        """
+        try:
+            with instrumentation.timer("loop.state_snapshot"):
+                snapshot = state_snapshot.capture_snapshot(
+                    self.config.run_mode, self.data_manager, self.strategy,
+                    self.risk_manager, self.scaled_tp_manager, symbols
+                )
+                state_snapshot.save_snapshot(snapshot, self.config.state_snapshot_file)
+        except Exception as e:
+            # Snapshots only speed up restarts; never block trading on them
+            logger.error(f"Failed to save state snapshot: {e}")
+    
     def _get_trading_symbols(self) -> List[str]:
         """Get list of symbols to trade.
         
@@ -232,6 +434,13 @@ class TradingBot:
             total_pnl = 0.0
             total_balance = 10000.0  # Starting balance
             
+            # Portfolios share one balance and risk state on a merged timeline
+            # unless the strategy needs the bar-by-bar backtest
+            use_portfolio_engine = (
+                len(symbols_to_test) > 1 and self.backtest_engine._supports_event_skipping()
+            )
+            portfolio_data = {}
+            
             # Run backtest for each symbol
             for symbol_idx, symbol in enumerate(symbols_to_test, 1):
                 self.ui_display.show_notification(
@@ -248,35 +457,49 @@ class TradingBot:
                     "INFO"
                 )
                 
-                candles_15m = self.data_manager.fetch_historical_data(
-                    days=self.config.backtest_days,
-                    timeframe="15m",
-                    symbol=symbol
-                )
-                
-                candles_1h = self.data_manager.fetch_historical_data(
-                    days=self.config.backtest_days,
-                    timeframe="1h",
-                    symbol=symbol
-                )
-                
                 # Fetch additional timeframes if multi-timeframe is enabled
                 candles_5m = None
                 candles_4h = None
                 
-                if self.config.enable_multi_timeframe:
-                    candles_5m = self.data_manager.fetch_historical_data(
+                if self.data_manager.base_timeframe is not None:
+                    # Same resampled bars the bot builds live
+                    history = self.data_manager.fetch_resampled_history(
+                        days=self.config.backtest_days,
+                        symbol=symbol
+                    )
+                    candles_15m = history["15m"]
+                    candles_1h = history["1h"]
+                    if self.config.enable_multi_timeframe:
+                        candles_5m = history["5m"]
+                        candles_4h = history["4h"]
+                else:
+                    candles_15m = self.data_manager.fetch_historical_data(
                         days=self.config.backtest_days,
-                        timeframe="5m",
+                        timeframe="15m",
                         symbol=symbol
                     )
                     
-                    candles_4h = self.data_manager.fetch_historical_data(
+                    candles_1h = self.data_manager.fetch_historical_data(
                         days=self.config.backtest_days,
-                        timeframe="4h",
+                        timeframe="1h",
                         symbol=symbol
                     )
                     
+                    if self.config.enable_multi_timeframe:
+                        candles_5m = self.data_manager.fetch_historical_data(
+                            days=self.config.backtest_days,
+                            timeframe="5m",
+                            symbol=symbol
+                        )
+                        
+                        candles_4h = self.data_manager.fetch_historical_data(
+                            days=self.config.backtest_days,
+                            timeframe="4h",
+                            symbol=symbol
+                        )
+                
+                if self.config.enable_multi_timeframe:
+                    
                     self.ui_display.show_notification(
                         f"[{symbol}] Fetched {len(candles_15m)} 15m, {len(candles_1h)} 1h, "
                         f"{len(candles_5m)} 5m, {len(candles_4h)} 4h candles",
@@ -288,6 +511,10 @@ class TradingBot:
                         "SUCCESS"
                     )
                 
+                if use_portfolio_engine:
+                    portfolio_data[symbol] = (candles_15m, candles_1h)
+                    continue
+                
                 # Run backtest for this symbol
                 self.ui_display.show_notification(f"Running backtest for {symbol}...", "INFO")
                 
@@ -297,7 +524,8 @@ class TradingBot:
                 else:
                     symbol_balance = total_balance
                 
-                results = self.backtest_engine.run_backtest(
+                # Event-skipping backtest falls back to bar by bar for stateful features
+                results = self.backtest_engine.run_event_backtest(
                     candles_15m=candles_15m,
                     candles_1h=candles_1h,
                     initial_balance=symbol_balance,
@@ -319,68 +547,34 @@ class TradingBot:
             # Restore original symbol
             self.config.symbol = original_symbol
             
-            # Calculate aggregate metrics
-            winning_trades = sum(1 for t in all_trades if t.pnl > 0)
-            losing_trades = sum(1 for t in all_trades if t.pnl < 0)
-            total_trades = len(all_trades)
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-            roi = (total_pnl / total_balance * 100) if total_balance > 0 else 0.0
-            
-            # Calculate other metrics
-            wins = [t.pnl for t in all_trades if t.pnl > 0]
-            losses = [abs(t.pnl) for t in all_trades if t.pnl < 0]
-            
-            average_win = sum(wins) / len(wins) if wins else 0.0
-            average_loss = sum(losses) / len(losses) if losses else 0.0
-            largest_win = max(wins) if wins else 0.0
-            largest_loss = max(losses) if losses else 0.0
-            
-            gross_profit = sum(wins)
-            gross_loss = sum(losses)
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0.0
-            
-            # Calculate max drawdown
-            equity = total_balance
-            peak = equity
-            max_dd = 0.0
-            for trade in all_trades:
-                equity += trade.pnl
-                if equity > peak:
-                    peak = equity
-                drawdown = peak - equity
-                if drawdown > max_dd:
-                    max_dd = drawdown
-            
-            # Calculate Sharpe ratio (simplified)
-            if all_trades:
-                returns = [t.pnl / total_balance for t in all_trades]
-                avg_return = sum(returns) / len(returns)
-                std_return = (sum((r - avg_return) ** 2 for r in returns) / len(returns)) ** 0.5
-                sharpe_ratio = (avg_return / std_return * (252 ** 0.5)) if std_return > 0 else 0.0
-            else:
-                sharpe_ratio = 0.0
-            
-            # Calculate average trade duration
-            durations = [(t.exit_time - t.entry_time) / 1000 / 3600 for t in all_trades]  # hours
-            avg_duration = sum(durations) / len(durations) if durations else 0.0
-            
-            # Convert results to PerformanceMetrics
-            metrics = PerformanceMetrics(
-                total_trades=total_trades,
-                winning_trades=winning_trades,
-                losing_trades=losing_trades,
-                win_rate=win_rate,
-                total_pnl=total_pnl,
-                roi=roi,
-                max_drawdown=max_dd,
-                profit_factor=profit_factor,
-                sharpe_ratio=sharpe_ratio,
-                average_win=average_win,
-                average_loss=average_loss,
-                largest_win=largest_win,
-                largest_loss=largest_loss,
-                average_trade_duration=avg_duration
-            )
+            if use_portfolio_engine:
+                self.ui_display.show_notification(
+                    f"Running portfolio backtest over {len(portfolio_data)} symbols...", "INFO"
+                )
+                from src.portfolio_backtest import PortfolioBacktestEngine
+                portfolio_engine = PortfolioBacktestEngine(self.config)
+                results = portfolio_engine.run(portfolio_data, total_balance)
+                all_trades = portfolio_engine.get_trades()
+                total_pnl = results['total_pnl']
+                
+                for symbol, stats in results['per_symbol'].items():
+                    self.ui_display.show_notification(
+                        f"[{symbol}] Completed: {stats['trades']} trades, "
+                        f"PnL: ${stats['total_pnl']:,.2f}, Win Rate: {stats['win_rate']:.1f}%",
+                        "SUCCESS"
+                    )
+                portfolio_stats = results['portfolio']
+                self.ui_display.show_notification(
+                    f"Portfolio: {portfolio_stats['opened']}/{portfolio_stats['signals']} signals opened, "
+                    f"{portfolio_stats['rejected_by_risk']} rejected by risk limits, "
+                    f"{portfolio_stats['reduced_by_allocation']} reduced by allocation",
+                    "INFO"
+                )
+            
+            # Calculate aggregate metrics over the combined trade list
+            aggregate = performance_analytics.calculate_metrics(all_trades, total_balance)
+            metrics = performance_analytics.to_performance_metrics(aggregate, total_balance)
+            total_trades = metrics.total_trades
             
             # Display results
             self.ui_display.display_backtest_results(metrics, total_balance)
@@ -454,7 +648,7 @@ class TradingBot:
                 "INFO"
             )
             
-            self._fetch_multi_symbol_data(trading_symbols, days=7)
+            self._load_initial_data(trading_symbols)
             
             # Verify data was fetched successfully and wait if needed
             logger.info("Verifying all symbol data is loaded...")
@@ -500,16 +694,23 @@ class TradingBot:
                 "INFO"
             )
             
+            self._start_frame_recorder(trading_symbols)
+            
             for symbol in trading_symbols:
                 self.data_manager.start_websocket_streams(symbol=symbol)
                 logger.info(f"Started WebSocket for {symbol}")
             
+            self._start_exchange_info()
+            self._start_user_data_stream()
+            
             # Give WebSocket streams time to connect and receive initial data
-            self.ui_display.show_notification(
-                "Waiting for WebSocket connections to stabilize...",
-                "INFO"
-            )
-            time.sleep(3)  # Wait 3 seconds for WebSocket to connect and receive data
+            # (a warm start already holds current candles)
+            if not self._warm_started:
+                self.ui_display.show_notification(
+                    "Waiting for WebSocket connections to stabilize...",
+                    "INFO"
+                )
+                time.sleep(3)  # Wait 3 seconds for WebSocket to connect and receive data
             
             # Start keyboard listener for panic close
             self._start_keyboard_listener()
@@ -598,7 +799,7 @@ class TradingBot:
                 "INFO"
             )
             
-            self._fetch_multi_symbol_data(trading_symbols, days=7)
+            self._load_initial_data(trading_symbols)
             
             # Verify data was fetched successfully
             for symbol in trading_symbols:
@@ -614,16 +815,23 @@ class TradingBot:
                 "INFO"
             )
             
+            self._start_frame_recorder(trading_symbols)
+            
             for symbol in trading_symbols:
                 self.data_manager.start_websocket_streams(symbol=symbol)
                 logger.info(f"Started WebSocket for {symbol}")
             
+            self._start_exchange_info()
+            self._start_user_data_stream()
+            
             # Give WebSocket streams time to connect and receive initial data
-            self.ui_display.show_notification(
-                "Waiting for WebSocket connections to stabilize...",
-                "INFO"
-            )
-            time.sleep(3)  # Wait 3 seconds for WebSocket to connect and receive data
+            # (a warm start already holds current candles)
+            if not self._warm_started:
+                self.ui_display.show_notification(
+                    "Waiting for WebSocket connections to stabilize...",
+                    "INFO"
+                )
+                time.sleep(3)  # Wait 3 seconds for WebSocket to connect and receive data
             
             # Start keyboard listener for panic close
             self._start_keyboard_listener()
@@ -671,13 +879,19 @@ class TradingBot:
         # Get list of symbols to trade
         trading_symbols = self._get_trading_symbols()
         
+        self._start_heartbeat()
+        self._start_metrics_endpoint()
+        self._start_maintenance()
+        
         try:
             while self.running and not self._panic_triggered:
                 current_time = time.time()
+                loop_start = time.perf_counter()
                 
                 # Update dashboard at regular intervals
                 if current_time - last_update_time >= update_interval:
-                    self._update_dashboard()
+                    with instrumentation.timer("loop.update_dashboard"):
+                        self._update_dashboard()
                     last_update_time = current_time
                 
                 # Update correlation matrix if portfolio management is enabled
@@ -687,12 +901,30 @@ class TradingBot:
                 
                 # Process each symbol
                 for symbol in trading_symbols:
-                    self._process_symbol(symbol, simulate_execution)
+                    with instrumentation.symbol_scope(symbol), instrumentation.timer("loop.process_symbol"):
+                        self._process_symbol(symbol, simulate_execution)
                 
                 # Rebalance portfolio if enabled
                 if self.portfolio_manager:
                     self._rebalance_portfolio(trading_symbols, simulate_execution)
                 
+                # Resubscribe the account cache after a WebSocket reconnect
+                if self._account_cache is not None:
+                    self._account_cache.ensure_attached(self.data_manager.websocket_manager, self.client)
+                
+                # Publish heartbeat for dashboard and diagnostics
+                self._loop_iteration += 1
+                loop_latency = time.perf_counter() - loop_start
+                instrumentation.get_instrumentation().record("loop.iteration", loop_latency)
+                if self._heartbeat is not None:
+                    self._heartbeat.beat(self._loop_iteration, self._last_candle_processed, loop_latency * 1000.0)
+                
+                # Persist state for a warm restart
+                if (self.config.state_snapshot_file
+                        and current_time - self._last_snapshot_time >= self.config.state_snapshot_interval_seconds):
+                    self._save_state_snapshot(trading_symbols)
+                    self._last_snapshot_time = current_time
+                
                 # Sleep briefly to avoid busy-waiting
                 time.sleep(0.1)
         
@@ -704,6 +936,175 @@ class TradingBot:
             self.ui_display.show_notification(f"Event loop error: {str(e)}", "ERROR")
             raise
     
+    def _start_heartbeat(self):
+        """Open the heartbeat file so external tools can check liveness in O(1)."""
+        if self._heartbeat is not None:
+            return
+        
+        try:
+            from src.heartbeat import HeartbeatWriter
+            self._heartbeat = HeartbeatWriter(self.config.heartbeat_file, self.config.run_mode)
+            logger.info(f"Publishing heartbeat to {self.config.heartbeat_file}")
+        except Exception as e:
+            # Heartbeat is diagnostic only; never block trading on it
+            logger.error(f"Failed to start heartbeat: {e}")
+            self._heartbeat = None
+    
+    def _start_metrics_endpoint(self):
+        """Serve the instrumentation snapshot on localhost if configured."""
+        if self._metrics_server is not None:
+            return
+        if not self.config.enable_instrumentation or self.config.instrumentation_port <= 0:
+            return
+        
+        try:
+            self._metrics_server = instrumentation.start_text_endpoint(self.config.instrumentation_port)
+        except Exception as e:
+            # Metrics are diagnostic only; never block trading on them
+            logger.error(f"Failed to start instrumentation endpoint: {e}")
+    
+    def _start_maintenance(self):
+        """Schedule buffer trimming, cache eviction and file compaction."""
+        if self._maintenance is not None:
+            return
+        
+        try:
+            from src.maintenance import MaintenanceScheduler
+            self._maintenance = MaintenanceScheduler(
+                self.config,
+                data_manager=self.data_manager,
+                candle_store=self.candle_store,
+                symbols_provider=self._get_trading_symbols,
+                log_dir=self.logger.log_dir
+            )
+            self._maintenance.start()
+        except Exception as e:
+            # Maintenance only reclaims memory and disk; never block trading on it
+            logger.error(f"Failed to start data maintenance: {e}")
+            self._maintenance = None
+    
+    def _stop_maintenance(self):
+        """Stop the maintenance thread."""
+        if self._maintenance is None:
+            return
+        
+        try:
+            self._maintenance.stop()
+        except Exception as e:
+            logger.error(f"Failed to stop data maintenance: {e}")
+        finally:
+            self._maintenance = None
+    
+    def _start_exchange_info(self):
+        """Load symbol filters so quantities and prices match each symbol's precision."""
+        if self._exchange_info is not None or self.client is None:
+            return
+        
+        try:
+            cache = ExchangeInfoCache(
+                self.client,
+                cache_file=self.config.exchange_info_file,
+                max_age_seconds=self.config.exchange_info_refresh_hours * 3600
+            )
+            if not cache.load():
+                logger.warning("No exchange info available; using configured minimum order sizes")
+                return
+            cache.start()
+            self._exchange_info = cache
+            self.position_sizer.exchange_info = cache
+            self.order_executor.exchange_info = cache
+            self.scaled_tp_manager.exchange_info = cache
+        except Exception as e:
+            # Orders fall back to the configured minimums; never block trading on it
+            logger.error(f"Failed to load exchange info: {e}")
+    
+    def _stop_exchange_info(self):
+        """Stop refreshing symbol filters."""
+        if self._exchange_info is None:
+            return
+        
+        try:
+            self._exchange_info.stop()
+        except Exception as e:
+            logger.error(f"Failed to stop exchange info refresh: {e}")
+        finally:
+            self._exchange_info = None
+    
+    def _start_user_data_stream(self):
+        """Serve balances, positions and order fills from the user data stream."""
+        if not self.config.enable_user_data_stream or self._account_cache is not None:
+            return
+        if self.client is None or self.data_manager.websocket_manager is None:
+            return
+        
+        try:
+            cache = AccountStateCache()
+            cache.attach(self.data_manager.websocket_manager, self.client)
+            self._account_cache = cache
+            self.order_executor.account_cache = cache
+            self.scaled_tp_manager.account_cache = cache
+        except Exception as e:
+            # Every query falls back to REST; never block trading on it
+            logger.error(f"Failed to start user data stream: {e}")
+    
+    def _stop_user_data_stream(self):
+        """Close the user data stream and return queries to REST."""
+        if self._account_cache is None:
+            return
+        
+        try:
+            self._account_cache.detach()
+        except Exception as e:
+            logger.error(f"Failed to stop user data stream: {e}")
+        finally:
+            self.order_executor.account_cache = None
+            self.scaled_tp_manager.account_cache = None
+            self._account_cache = None
+    
+    def _start_frame_recorder(self, symbols: List[str]):
+        """Record the history and WebSocket frames of this session if configured."""
+        if not self.config.replay_record_file or self._frame_recorder is not None:
+            return
+        
+        try:
+            from src.market_replay import FrameRecorder
+            recorder = FrameRecorder(self.config.replay_record_file)
+            for symbol in symbols:
+                for timeframe, candles in self.data_manager._symbol_buffers.get(symbol, {}).items():
+                    recorder.record_history(symbol, timeframe, candles.to_list())
+            recorder.attach(self.data_manager, symbols)
+            self._frame_recorder = recorder
+            logger.info(f"Recording WebSocket frames to {self.config.replay_record_file}")
+        except Exception as e:
+            # Recording is diagnostic only; never block trading on it
+            logger.error(f"Failed to start frame recorder: {e}")
+    
+    def _stop_frame_recorder(self):
+        """Flush and close the frame recording."""
+        if self._frame_recorder is None:
+            return
+        
+        try:
+            self.data_manager.frame_recorder = None
+            self._frame_recorder.close()
+        except Exception as e:
+            logger.error(f"Failed to close frame recorder: {e}")
+        finally:
+            self._frame_recorder = None
+    
+    def _stop_heartbeat(self):
+        """Mark the heartbeat as stopped and release the file."""
+        if self._heartbeat is None:
+            return
+        
+        try:
+            self._heartbeat.mark_stopped(self._loop_iteration, self._last_candle_processed)
+            self._heartbeat.close()
+        except Exception as e:
+            logger.error(f"Failed to stop heartbeat: {e}")
+        finally:
+            self._heartbeat = None
+    
     def _update_portfolio_correlations(self, symbols: List[str]):
         """Update correlation matrix for portfolio management.
         
@@ -741,8 +1142,15 @@ class TradingBot:
         try:
             # CRITICAL FIX: Fetch FRESH data with use_cache=FALSE to ensure latest market data
             # This prevents the bot from using stale cached data for signal detection
-            candles_15m = self.data_manager.fetch_historical_data(days=2, timeframe="15m", symbol=symbol, use_cache=False)
-            candles_1h = self.data_manager.fetch_historical_data(days=2, timeframe="1h", symbol=symbol, use_cache=False)
+            with instrumentation.timer("stage.data_fetch"):
+                if self.data_manager.base_timeframe is not None:
+                    # Resampled from the base stream; only backfill if it stalled
+                    self.data_manager.refresh_stale_base(symbol)
+                    candles_15m = self.data_manager.get_latest_candles("15m", CANDLES_15M_2_DAYS, symbol=symbol)
+                    candles_1h = self.data_manager.get_latest_candles("1h", CANDLES_1H_2_DAYS, symbol=symbol)
+                else:
+                    candles_15m = self.data_manager.fetch_historical_data(days=2, timeframe="15m", symbol=symbol, use_cache=False)
+                    candles_1h = self.data_manager.fetch_historical_data(days=2, timeframe="1h", symbol=symbol, use_cache=False)
             
             # ALWAYS fetch additional timeframes if configured (regardless of feature manager state)
             # The feature manager controls whether the strategy USES the data, not whether we FETCH it
@@ -753,8 +1161,9 @@ class TradingBot:
             
             if self.config.enable_multi_timeframe:
                 logger.info(f"[{symbol}] FETCHING 5m and 4h data...")
-                candles_5m = self.data_manager.get_latest_candles("5m", 300, symbol=symbol)
-                candles_4h = self.data_manager.get_latest_candles("4h", 50, symbol=symbol)
+                with instrumentation.timer("stage.data_buffers"):
+                    candles_5m = self.data_manager.get_latest_candles("5m", 300, symbol=symbol)
+                    candles_4h = self.data_manager.get_latest_candles("4h", 50, symbol=symbol)
                 logger.info(f"[{symbol}] FETCHED 5m={len(candles_5m) if candles_5m else 0}, 4h={len(candles_4h) if candles_4h else 0}")
             else:
                 logger.warning(f"[{symbol}] Multi-timeframe is DISABLED in config!")
@@ -764,10 +1173,15 @@ class TradingBot:
                 return
             
             # Update indicators (strategy will check feature_manager internally)
-            self.strategy.update_indicators(candles_15m, candles_1h, candles_5m, candles_4h)
+            if self._indicator_bar.get(symbol) != candles_15m[-1].timestamp:
+                self._indicator_bar[symbol] = candles_15m[-1].timestamp
+                IndicatorCalculator.invalidate(symbol)
+            with instrumentation.timer("stage.update_indicators"), IndicatorCalculator.cache_scope(symbol):
+                self.strategy.update_indicators(candles_15m, candles_1h, candles_5m, candles_4h, symbol=symbol)
             
             # Get current price
             current_price = candles_15m[-1].close if candles_15m else 0.0
+            self._last_candle_processed = candles_15m[-1].timestamp
             
             # Store indicators for this symbol (for dashboard display)
             # This will be populated with signal value later after signal detection
@@ -789,7 +1203,8 @@ class TradingBot:
                 
                 # Update stops
                 atr = self.strategy.current_indicators.atr_15m
-                self.risk_manager.update_stops(active_position, current_price, atr)
+                with instrumentation.timer("stage.update_stops"):
+                    self.risk_manager.update_stops(active_position, current_price, atr)
                 
                 # Calculate current profit percentage
                 if active_position.side == "LONG":
@@ -799,10 +1214,11 @@ class TradingBot:
                 
                 # PRIORITY 1: Check for scaled take profit levels (if enabled)
                 if self.config.enable_scaled_take_profit:
-                    partial_close_action = self.scaled_tp_manager.check_take_profit_levels(
-                        active_position, 
-                        current_price
-                    )
+                    with instrumentation.timer("stage.scaled_tp_check"):
+                        partial_close_action = self.scaled_tp_manager.check_take_profit_levels(
+                            active_position, 
+                            current_price
+                        )
                     
                     if partial_close_action:
                         # Log TP level hit
@@ -1086,8 +1502,9 @@ class TradingBot:
                     ind = self.strategy.current_indicators
                     logger.info(f"[{symbol}] INDICATORS: ADX={ind.adx:.2f}, RVOL={ind.rvol:.2f}, SqzColor={ind.squeeze_color}, SqzVal={ind.squeeze_value:.4f}, Trend15m={ind.trend_15m}, Trend1h={ind.trend_1h}, PriceVsVWAP={ind.price_vs_vwap}")
                     
-                    long_signal = self.strategy.check_long_entry(symbol)
-                    short_signal = self.strategy.check_short_entry(symbol)
+                    with instrumentation.timer("stage.entry_checks"):
+                        long_signal = self.strategy.check_long_entry(symbol)
+                        short_signal = self.strategy.check_short_entry(symbol)
                     
                     # Update stored indicators with signal value
                     if symbol in self._symbol_indicators:
@@ -1259,6 +1676,7 @@ class TradingBot:
             
             # Save real-time state to binance_results.json for Streamlit dashboard
             self._save_realtime_state(positions, indicators)
+            self._persist_chart_candles()
             
             # Render dashboard
             dashboard = self.ui_display.render_dashboard(
@@ -1291,9 +1709,9 @@ class TradingBot:
             import json
             from datetime import datetime
             
-            # Calculate total PnL from closed trades
-            closed_trades = self.risk_manager.get_closed_trades()
-            total_pnl = sum(trade.pnl for trade in closed_trades)
+            # Session totals (the closed trade list only keeps recent trades)
+            trade_totals = self.risk_manager.get_trade_totals()
+            total_pnl = trade_totals["pnl"]
             total_pnl_percent = (total_pnl / self.wallet_balance * 100) if self.wallet_balance > 0 else 0.0
             
             # Get current price from primary symbol
@@ -1383,10 +1801,14 @@ class TradingBot:
                 "atr": indicators.get('atr_15m', indicators.get('atr', 0.0)),
                 "signal": indicators.get('signal', 'NONE'),
                 "symbols_data": symbols_data,  # NEW: Per-symbol market data
-                "total_trades": len(closed_trades),
-                "winning_trades": sum(1 for t in closed_trades if t.pnl > 0),
-                "losing_trades": sum(1 for t in closed_trades if t.pnl <= 0)
+                "total_trades": trade_totals["count"],
+                "winning_trades": trade_totals["winning"],
+                "losing_trades": trade_totals["count"] - trade_totals["winning"]
             }
+            if instrumentation.is_enabled():
+                state_data["instrumentation"] = instrumentation.snapshot()
+            if self._maintenance is not None and self._maintenance.last_report is not None:
+                state_data["maintenance"] = asdict(self._maintenance.last_report)
             
             # Save to file
             with open(self.config.log_file, 'w') as f:
@@ -1395,14 +1817,57 @@ class TradingBot:
         except Exception as e:
             logger.error(f"Error saving realtime state: {e}")
     
+    def _persist_chart_candles(self):
+        """Append newly closed candles to the candle store for the chart page.
+        
+        Only writes when a buffer has a closed candle newer than the last one
+        stored; the new rows are appended to the store's tail file, so the
+        cost is one small write per closed candle (plus an occasional
+        compaction of the series).
+        """
+        now_ms = int(time.time() * 1000)
+        
+        for symbol in self._get_trading_symbols():
+            for timeframe in ("5m", "15m", "1h", "4h"):
+                try:
+                    candles = self.data_manager.get_latest_candles(timeframe, 500, symbol=symbol)
+                    if not candles:
+                        continue
+                    
+                    # REST fetches include the still-forming candle; store closed ones only
+                    timeframe_ms = self.data_manager._get_timeframe_milliseconds(timeframe)
+                    closed = [c for c in candles if c.timestamp + timeframe_ms <= now_ms]
+                    if not closed:
+                        continue
+                    
+                    key = (symbol, timeframe)
+                    last_stored = self._candle_store_last_ts.get(key)
+                    if last_stored is None:
+                        last_stored = self.candle_store.last_timestamp(symbol, timeframe) or 0
+                    
+                    newest = max(c.timestamp for c in closed)
+                    if newest > last_stored:
+                        self.candle_store.append(
+                            symbol, timeframe, [c for c in closed if c.timestamp > last_stored]
+                        )
+                    self._candle_store_last_ts[key] = max(newest, last_stored)
+                except Exception as e:
+                    logger.debug(f"Error persisting {symbol} {timeframe} candles: {e}")
+    
     def _start_keyboard_listener(self):
         """Start keyboard listener for panic close (ESC key).
         
         Only available on systems with display support. Silently skips on headless servers.
         """
+        # Imported on first use; installed copies can still fail without a display
         if not KEYBOARD_AVAILABLE:
             logger.info("Keyboard listener not available (headless mode - use API/signals for panic close)")
             return
+        try:
+            from pynput import keyboard
+        except ImportError:
+            logger.info("Keyboard listener not available (headless mode - use API/signals for panic close)")
+            return
         
         try:
             def on_press(key):
@@ -1418,6 +1883,27 @@ class TradingBot:
         except Exception as e:
             logger.warning(f"Could not start keyboard listener: {e}. Running in headless mode.")
     
+    def _last_prices(self, positions: List[Position]) -> Dict[str, float]:
+        """Get the last 15m close of each position's own symbol.
+        
+        Args:
+            positions: Positions to price
+            
+        Returns:
+            Dictionary of symbol -> last close (the entry price if the
+            symbol's candles are unavailable)
+        """
+        prices: Dict[str, float] = {}
+        for position in positions:
+            try:
+                candles = self.data_manager.get_latest_candles("15m", 1, symbol=position.symbol)
+            except Exception as e:
+                logger.warning(f"Could not get last price for {position.symbol}: {e}")
+                candles = []
+            last_close = candles[-1].close if candles else 0.0
+            prices[position.symbol] = last_close if last_close > 0 else position.entry_price
+        return prices
+    
     def _trigger_panic_close(self):
         """Trigger emergency panic close of all positions."""
         if self._panic_triggered:
@@ -1431,21 +1917,33 @@ class TradingBot:
             candles_15m = self.data_manager.get_latest_candles("15m", 1)
             current_price = candles_15m[-1].close if candles_15m else 0.0
             
-            # Close all positions
-            closed_trades = self.risk_manager.close_all_positions(current_price)
+            # Each position exits at its own symbol's last price unless the
+            # close order reports a fill price
+            exit_prices = self._last_prices(self.risk_manager.get_all_active_positions())
             
-            # Execute close orders (if in LIVE mode)
+            # Execute close orders (if in LIVE mode) as concurrent batches;
+            # positions whose order failed stay open so they can be retried
+            failed_symbols: List[str] = []
             if self.config.run_mode == "LIVE":
-                for trade in closed_trades:
-                    side = "SELL" if trade.side == "LONG" else "BUY"
-                    # Note: In production, we'd need to get the actual position quantity
-                    # For now, we use the trade quantity
-                    self.order_executor.place_market_order(
-                        symbol=self.config.symbol,
-                        side=side,
-                        quantity=trade.quantity,
-                        reduce_only=True
-                    )
+                results = self.order_executor.close_positions(self.risk_manager.get_all_active_positions())
+                for symbol, result in results.items():
+                    if not result.success:
+                        failed_symbols.append(symbol)
+                    elif float(result.order.get("avgPrice") or 0) > 0:
+                        exit_prices[symbol] = float(result.order["avgPrice"])
+            
+            # Close all positions
+            closed_trades = self.risk_manager.close_all_positions(
+                current_price, exit_prices=exit_prices, keep_symbols=failed_symbols
+            )
+            for trade in closed_trades:
+                self.scaled_tp_manager.reset_tracking(trade.symbol)
+            
+            if failed_symbols:
+                self.ui_display.show_notification(
+                    f"Panic close failed for {', '.join(failed_symbols)} - positions still open!",
+                    "ERROR"
+                )
             
             # Calculate total PnL
             total_pnl = sum(trade.pnl for trade in closed_trades)
@@ -1490,6 +1988,7 @@ class TradingBot:
             
             # Stop WebSocket streams
             if self.config.run_mode in ["PAPER", "LIVE"]:
+                self._stop_user_data_stream()
                 self.data_manager.stop_websocket_streams()
                 logger.info("WebSocket streams stopped")
             
@@ -1502,60 +2001,52 @@ class TradingBot:
                         "WARNING"
                     )
                     
-                    # Try to get current price, use entry price as fallback
-                    try:
-                        candles_15m = self.data_manager.get_latest_candles("15m", 1)
-                        current_price = candles_15m[-1].close if candles_15m else 0.0
-                    except:
-                        current_price = 0.0
+                    # Close each position at its own symbol's last price
+                    # (entry price if the symbol has no candles)
+                    closed_trades = self.risk_manager.close_all_positions(
+                        0.0, exit_prices=self._last_prices(active_positions)
+                    )
                     
-                    # If we can't get current price, use position entry prices
-                    if current_price <= 0 and active_positions:
-                        # Close positions individually with their own prices
-                        for pos in active_positions:
-                            try:
-                                symbol_candles = self.data_manager.get_latest_candles("15m", 1, symbol=pos.symbol)
-                                pos_price = symbol_candles[-1].close if symbol_candles else pos.entry_price
-                                trade = self.risk_manager.close_position(pos, pos_price, "PANIC")
-                                if trade:
-                                    self.logger.log_trade(trade)
-                            except Exception as e:
-                                logger.error(f"Error closing position {pos.symbol}: {e}")
-                    else:
-                        # Close all with same price
-                        closed_trades = self.risk_manager.close_all_positions(current_price)
-                        
-                        # Log trades
-                        for trade in closed_trades:
-                            self.logger.log_trade(trade)
+                    # Log trades
+                    for trade in closed_trades:
+                        self.logger.log_trade(trade)
             
             # Save final performance metrics (if in PAPER or LIVE mode)
             if self.config.run_mode in ["PAPER", "LIVE"]:
-                trades = self.risk_manager.get_closed_trades()
-                if trades:
-                    # Calculate metrics
-                    total_trades = len(trades)
-                    winning_trades = sum(1 for t in trades if t.pnl > 0)
-                    losing_trades = sum(1 for t in trades if t.pnl <= 0)
-                    win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-                    total_pnl = sum(t.pnl for t in trades)
-                    
-                    metrics = PerformanceMetrics(
-                        total_trades=total_trades,
-                        winning_trades=winning_trades,
-                        losing_trades=losing_trades,
-                        win_rate=win_rate,
-                        total_pnl=total_pnl
+                # Session totals: the closed trade list only keeps recent trades
+                trade_totals = self.risk_manager.get_trade_totals()
+                if trade_totals["count"]:
+                    # Measure against the balance the session started with
+                    start_balance = self.wallet_balance - trade_totals["pnl"]
+                    metrics = performance_analytics.to_performance_metrics(
+                        performance_analytics.metrics_from_totals(
+                            trade_totals, start_balance, self.risk_manager.get_closed_trades()
+                        ),
+                        start_balance
                     )
                     
                     self.logger.save_performance_metrics(metrics, self.config.log_file)
             
+            # Final snapshot, only once the event loop has run so a failed
+            # startup cannot overwrite a good snapshot with empty buffers
+            if (self.config.run_mode in ["PAPER", "LIVE"] and self.config.state_snapshot_file
+                    and self._loop_iteration > 0):
+                self._save_state_snapshot(self._get_trading_symbols())
+            
             self.logger.log_system_event("Shutdown complete")
             self.ui_display.show_notification("Shutdown complete", "SUCCESS")
         
         except Exception as e:
             self.logger.log_error(e, "Error during shutdown")
             logger.error(f"Shutdown error: {e}")
+        
+        finally:
+            self._stop_heartbeat()
+            self._stop_maintenance()
+            self._stop_exchange_info()
+            self._stop_frame_recorder()
+            instrumentation.stop_text_endpoint(self._metrics_server)
+            self._metrics_server = None
 
 
 def main():
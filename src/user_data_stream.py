@@ -0,0 +1,310 @@
+"""Account, position and order state kept current from the futures user data stream.
+
+Balance checks and order verification used to be REST calls: every margin
+check fetched ``futures_account`` (a weight-5 endpoint) and every partial
+close polled ``futures_get_order`` until it saw a fill. Binance pushes the
+same information over the user data stream (``ACCOUNT_UPDATE`` and
+``ORDER_TRADE_UPDATE`` events), so AccountStateCache subscribes to it once
+and answers those queries from memory.
+
+The listenKey is created and kept alive by ThreadedWebsocketManager's
+futures user socket, which shares the manager DataManager already runs for
+the kline streams.
+
+The stream does not carry ``availableBalance`` (it moves with margin use and
+unrealized PnL), so the cache keeps the value of the last REST snapshot and
+treats it as stale after an ``ACCOUNT_UPDATE`` or once it is older than
+BALANCE_MAX_AGE_SECONDS. Callers refresh it over REST in that case, which
+still happens only when the account actually changed instead of on every
+check. Whenever the stream is not live every getter returns None and callers
+fall back to REST.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from src import instrumentation
+
+
+logger = logging.getLogger(__name__)
+
+
+# Order states after which an order never changes again
+FINAL_ORDER_STATUSES = frozenset({"FILLED", "CANCELED", "EXPIRED", "EXPIRED_IN_MATCH", "REJECTED"})
+
+# Seconds a REST snapshot of availableBalance is served from memory
+BALANCE_MAX_AGE_SECONDS = 60.0
+
+# Order states kept for lookups (oldest finished orders are dropped first)
+MAX_CACHED_ORDERS = 500
+
+# Minimum seconds between attempts to resubscribe a dead stream
+RESUBSCRIBE_INTERVAL_SECONDS = 30.0
+
+
+def _order_from_event(order: Dict[str, Any], event_time: Optional[int]) -> Dict[str, Any]:
+    """Convert the ``o`` payload of ORDER_TRADE_UPDATE to the futures_get_order shape."""
+    return {
+        "orderId": order["i"],
+        "symbol": order["s"],
+        "clientOrderId": order.get("c"),
+        "side": order.get("S"),
+        "type": order.get("o"),
+        "status": order["X"],
+        "origQty": order.get("q", "0"),
+        "executedQty": order.get("z", "0"),
+        "avgPrice": order.get("ap", "0"),
+        "reduceOnly": order.get("R", False),
+        "updateTime": order.get("T", event_time),
+    }
+
+
+class AccountStateCache:
+    """Thread-safe cache of balances, positions and orders fed by the user data stream.
+
+    Attributes:
+        connected: Whether the stream is subscribed and the cache seeded
+        events: Number of stream events applied
+    """
+
+    def __init__(self, balance_max_age: float = BALANCE_MAX_AGE_SECONDS):
+        """Initialize an empty cache.
+
+        Args:
+            balance_max_age: Seconds a REST snapshot of availableBalance is
+                served before it must be refreshed
+        """
+        self.balance_max_age = balance_max_age
+        self.connected = False
+        self.events = 0
+        self._changed = threading.Condition()
+        self._wallet: Dict[str, float] = {}
+        self._available: Dict[str, float] = {}
+        self._available_at: Optional[float] = None  # monotonic time of the snapshot
+        self._positions: Dict[tuple, float] = {}  # (symbol, positionSide) -> amount
+        self._positions_seeded = False
+        self._orders: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._manager = None
+        self._socket: Optional[str] = None
+        self._last_attach = 0.0
+
+    # ------------------------------------------------------------------
+    # Subscription
+    # ------------------------------------------------------------------
+
+    def attach(self, websocket_manager, client) -> None:
+        """Subscribe to the futures user data stream and seed from REST.
+
+        The socket is opened before the REST snapshot is taken so no event
+        between the two is missed.
+
+        Args:
+            websocket_manager: Running ThreadedWebsocketManager
+            client: Binance client used for the seed snapshot
+
+        Raises:
+            AttributeError: If the manager has no futures user socket
+            BinanceAPIException: If the seed request fails
+        """
+        self._last_attach = time.monotonic()
+        self.detach()
+        self._socket = websocket_manager.start_futures_user_socket(callback=self.handle_message)
+        self._manager = websocket_manager
+
+        instrumentation.increment("rest.futures_account")
+        self.seed_account(client.futures_account())
+        self.connected = True
+        logger.info("Subscribed to the futures user data stream")
+
+    def ensure_attached(self, websocket_manager, client) -> bool:
+        """Resubscribe if the stream died or the WebSocket manager was replaced.
+
+        Attempts are rate limited to one per RESUBSCRIBE_INTERVAL_SECONDS.
+
+        Returns:
+            True if the stream is live after the call
+        """
+        if self.connected and websocket_manager is self._manager:
+            return True
+        if websocket_manager is None or time.monotonic() - self._last_attach < RESUBSCRIBE_INTERVAL_SECONDS:
+            return False
+        try:
+            self.attach(websocket_manager, client)
+        except Exception as e:
+            logger.warning(f"Could not resubscribe to the user data stream: {e}")
+        return self.connected
+
+    def detach(self) -> None:
+        """Close the user data socket (the manager itself keeps running)."""
+        manager, socket = self._manager, self._socket
+        self.connected = False
+        self._manager = None
+        self._socket = None
+        if manager is not None and socket is not None:
+            try:
+                manager.stop_socket(socket)
+            except Exception as e:
+                logger.warning(f"Error closing user data stream: {e}")
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def seed_account(self, account_info: Dict[str, Any]) -> None:
+        """Replace balances and positions with a futures_account response."""
+        with self._changed:
+            for asset in account_info.get("assets", []):
+                self._wallet[asset["asset"]] = float(asset.get("walletBalance", 0.0))
+                self._available[asset["asset"]] = float(asset.get("availableBalance", 0.0))
+            self._available_at = time.monotonic()
+            if "positions" in account_info:
+                self._positions = {
+                    (p["symbol"], p.get("positionSide", "BOTH")): float(p["positionAmt"])
+                    for p in account_info["positions"]
+                    if float(p["positionAmt"]) != 0
+                }
+                self._positions_seeded = True
+            self._changed.notify_all()
+
+    def handle_message(self, msg: Dict[str, Any]) -> None:
+        """WebSocket callback: apply one user data stream event."""
+        try:
+            with instrumentation.timer("user_stream.event"):
+                self.apply_event(msg)
+        except Exception as e:
+            logger.error(f"Error applying user data event: {e}")
+
+    def apply_event(self, msg: Dict[str, Any]) -> None:
+        """Apply an ACCOUNT_UPDATE, ORDER_TRADE_UPDATE or control event."""
+        event = msg.get("e")
+        if event == "ACCOUNT_UPDATE":
+            update = msg.get("a", {})
+            with self._changed:
+                for balance in update.get("B", []):
+                    self._wallet[balance["a"]] = float(balance["wb"])
+                # Margin moved; the next balance read refreshes over REST
+                self._available_at = None
+                for position in update.get("P", []):
+                    key = (position["s"], position.get("ps", "BOTH"))
+                    amount = float(position["pa"])
+                    if amount == 0:
+                        self._positions.pop(key, None)
+                    else:
+                        self._positions[key] = amount
+                self.events += 1
+                self._changed.notify_all()
+        elif event == "ORDER_TRADE_UPDATE":
+            order = _order_from_event(msg["o"], msg.get("T"))
+            with self._changed:
+                self._orders[order["orderId"]] = order
+                self._orders.move_to_end(order["orderId"])
+                self._trim_orders()
+                self.events += 1
+                self._changed.notify_all()
+        elif event in ("listenKeyExpired", "error"):
+            logger.warning(f"User data stream interrupted ({event}), falling back to REST")
+            with self._changed:
+                self.connected = False
+                self._changed.notify_all()
+
+    def _trim_orders(self) -> None:
+        """Drop the oldest finished orders beyond MAX_CACHED_ORDERS (lock held)."""
+        excess = len(self._orders) - MAX_CACHED_ORDERS
+        if excess <= 0:
+            return
+        for order_id in [i for i, o in self._orders.items() if o["status"] in FINAL_ORDER_STATUSES][:excess]:
+            del self._orders[order_id]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_available_balance(self, asset: str = "USDT") -> Optional[float]:
+        """Get the cached available balance of an asset.
+
+        Returns:
+            Available balance, or None if the stream is not live, the asset is
+            unknown or the snapshot is stale (refresh it over REST)
+        """
+        with self._changed:
+            if (not self.connected or self._available_at is None
+                    or time.monotonic() - self._available_at > self.balance_max_age):
+                return None
+            return self._available.get(asset)
+
+    def get_wallet_balance(self, asset: str = "USDT") -> Optional[float]:
+        """Get the wallet balance of an asset as of the latest event (None if not live)."""
+        with self._changed:
+            return self._wallet.get(asset) if self.connected else None
+
+    def get_position_amounts(self) -> Optional[Dict[str, float]]:
+        """Get signed open position sizes by symbol.
+
+        Returns:
+            Dictionary of symbol -> amount, or None if the stream is not live
+            or positions were never seeded
+        """
+        with self._changed:
+            if not self.connected or not self._positions_seeded:
+                return None
+            amounts: Dict[str, float] = {}
+            for (symbol, _side), amount in self._positions.items():
+                amounts[symbol] = amounts.get(symbol, 0.0) + amount
+            return {symbol: amount for symbol, amount in amounts.items() if amount != 0}
+
+    def get_order(self, order_id: int) -> Optional[Dict[str, Any]]:
+        """Get the latest known state of an order (futures_get_order shape), or None."""
+        with self._changed:
+            order = self._orders.get(order_id)
+            return dict(order) if order is not None else None
+
+    def find_order_by_client_id(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Get the latest known state of an order by its client order ID, or None."""
+        with self._changed:
+            for order in reversed(self._orders.values()):
+                if order.get("clientOrderId") == client_order_id:
+                    return dict(order)
+            return None
+
+    def wait_for_order(self, order_id: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """Block until an order reaches a final state.
+
+        Args:
+            order_id: Exchange order ID
+            timeout: Maximum seconds to wait
+
+        Returns:
+            The final order state, or the latest known state (None if no event
+            was seen) when the timeout expires or the stream drops
+        """
+        return self.wait_for_orders([order_id], timeout).get(order_id)
+
+    def wait_for_orders(self, order_ids: Iterable[int], timeout: float) -> Dict[int, Dict[str, Any]]:
+        """Block until several orders reach a final state, against one deadline.
+
+        Args:
+            order_ids: Exchange order IDs
+            timeout: Maximum seconds to wait for all of them together
+
+        Returns:
+            Dictionary of order ID -> final state, or the latest known state
+            when the timeout expires or the stream drops (orders with no
+            event seen are left out)
+        """
+        order_ids = set(order_ids)
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                states = {i: self._orders[i] for i in order_ids if i in self._orders}
+                if len(states) == len(order_ids) and all(
+                    state["status"] in FINAL_ORDER_STATUSES for state in states.values()
+                ):
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.connected:
+                    break
+                self._changed.wait(remaining)
+            return {order_id: dict(state) for order_id, state in states.items()}
@@ -0,0 +1,516 @@
+"""Vectorized indicator series and entry masks for the event-skipping backtest.
+
+BacktestEngine.run_backtest recomputes every indicator on a sliding window
+(the last 201 15m candles and the last 101 1h candles) for every bar. The
+functions here compute the same per-bar quantities for all bars at once:
+
+- windowed_atr reproduces IndicatorCalculator.calculate_atr on each window
+  bit for bit, so stop updates can skip update_indicators entirely.
+- entry_candidates evaluates the entry conditions of
+  check_long_entry/check_short_entry (VWAP side and trend on both
+  timeframes, squeeze momentum and color, ADX, RVOL, EMA overextension) as
+  masks.
+  The comparisons are relaxed by MASK_TOLERANCE so the masks are a superset
+  of the real signals: a bar outside the mask can never produce an entry,
+  and bars inside it are confirmed with the real strategy code.
+- indicator_series and entry_masks split that evaluation into the
+  threshold-independent part and the cheap ADX/RVOL threshold step, so
+  parameter sweeps compute the series once.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.candle_array import MONDAY_OFFSET_MS, WEEK_MS
+from src.indicators import squeeze_momentum_series
+
+
+# Window sizes used by BacktestEngine.run_backtest
+WINDOW_15M = 201
+WINDOW_1H = 101
+WARMUP_15M = 50
+MIN_CANDLES_1H = 30
+
+# EMA overextension lookback used by the strategy
+EMA_LOOKBACK = 20
+
+# Relative slack on every mask comparison (covers prefix-sum rounding)
+MASK_TOLERANCE = 1e-6
+
+
+@dataclass
+class BacktestArrays:
+    """Per-bar arrays over the 15m series used by the event-skipping backtest.
+
+    Attributes:
+        valid: Bars the bar-by-bar loop evaluates (warmup done, enough 1h data)
+        long_entry: Bars where a long entry is possible
+        short_entry: Bars where a short entry is possible
+        atr: ATR of each bar's 15m window (as the strategy computes it)
+        high: 15m highs
+        low: 15m lows
+        close: 15m closes
+    """
+    valid: np.ndarray
+    long_entry: np.ndarray
+    short_entry: np.ndarray
+    atr: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    @property
+    def candidates(self) -> np.ndarray:
+        """Bars where either entry is possible."""
+        return self.long_entry | self.short_entry
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Calculate the true range of every bar.
+
+    Args:
+        high: Highs
+        low: Lows
+        close: Closes
+
+    Returns:
+        True range per bar; element 0 (no previous close) is NaN
+    """
+    tr = np.full(len(close), np.nan)
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum(
+            np.maximum(high[1:] - low[1:], np.abs(high[1:] - prev_close)),
+            np.abs(low[1:] - prev_close)
+        )
+    return tr
+
+
+def _scalar_atr(true_ranges: list, period: int) -> float:
+    """ATR of one window, following IndicatorCalculator.calculate_atr exactly."""
+    if len(true_ranges) < period:
+        return 0.0
+    atr = sum(true_ranges[:period]) / period
+    multiplier = 2.0 / (period + 1)
+    for value in true_ranges[period:]:
+        atr = (value * multiplier) + (atr * (1 - multiplier))
+    return atr
+
+
+def windowed_atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    window: int = WINDOW_15M
+) -> np.ndarray:
+    """Calculate the ATR of every bar's trailing window.
+
+    Bar i uses candles [max(0, i - window + 1), i], the same slice
+    run_backtest passes to the strategy. Full windows are computed column-wise
+    with the same operation order as calculate_atr, so results are identical
+    to the scalar implementation, not merely close.
+
+    Args:
+        high: Highs
+        low: Lows
+        close: Closes
+        period: ATR period
+        window: Window length in bars
+
+    Returns:
+        ATR per bar (0.0 where the window is too short)
+    """
+    n = len(close)
+    result = np.zeros(n)
+    tr = true_range(high, low, close)
+    n_tr = window - 1
+
+    # Partial windows at the start of the series
+    for i in range(min(n, window - 1)):
+        result[i] = _scalar_atr(tr[1:i + 1].tolist(), period)
+
+    n_full = n - (window - 1)
+    if n_full <= 0 or n_tr < period:
+        return result
+
+    # Bar i's true ranges are tr[i - n_tr + 1 .. i]; step t is the slice below
+    atr = np.zeros(n_full)
+    for t in range(period):
+        atr = atr + tr[1 + t:1 + t + n_full]
+    atr = atr / period
+
+    multiplier = 2.0 / (period + 1)
+    decay = 1 - multiplier
+    for t in range(period, n_tr):
+        atr = (tr[1 + t:1 + t + n_full] * multiplier) + (atr * decay)
+
+    result[window - 1:] = atr
+    return result
+
+
+def _ewm_step(weighted: np.ndarray, values: np.ndarray, alpha: float) -> np.ndarray:
+    """One step of pandas' ewm(alpha, adjust=False) mean; NaN until the first observation."""
+    smoothed = ((1 - alpha) * weighted + alpha * values) / ((1 - alpha) + alpha)
+    return np.where(np.isnan(weighted), values, np.where(np.isnan(values), weighted, smoothed))
+
+
+def windowed_adx(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    window: int = WINDOW_15M
+) -> np.ndarray:
+    """Calculate the ADX of every bar's trailing window.
+
+    Follows IndicatorCalculator.calculate_adx on candles[i - window + 1:i + 1]:
+    the first row of each window has no previous bar (no directional
+    movement, true range = high - low) and every Wilder smoothing restarts at
+    the window start. All full windows are stepped together, one vectorized
+    operation per bar of the window. Results agree with the pandas
+    implementation up to rounding; bars without a full window, or whose
+    directional index has gaps, are NaN (unknown).
+
+    Args:
+        high: Highs
+        low: Lows
+        close: Closes
+        period: ADX period
+        window: Window length in bars
+
+    Returns:
+        ADX per bar, NaN where unknown
+    """
+    n = len(close)
+    result = np.full(n, np.nan)
+    n_full = n - (window - 1)
+    if n_full <= 0:
+        return result
+
+    alpha = 1 / period
+    high_diff = np.concatenate([[np.nan], np.diff(high)])
+    low_diff = np.concatenate([[np.nan], -np.diff(low)])
+    with np.errstate(invalid="ignore"):
+        plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+        minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
+    tr = true_range(high, low, close)
+
+    # First row of each window: no previous bar within the window
+    first = slice(0, n_full)
+    plus_smooth = np.zeros(n_full)
+    minus_smooth = np.zeros(n_full)
+    tr_smooth = high[first] - low[first]
+    adx = np.full(n_full, np.nan)
+    gaps = np.zeros(n_full, dtype=bool)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for t in range(window):
+            if t > 0:
+                rows = slice(t, t + n_full)
+                plus_smooth = _ewm_step(plus_smooth, plus_dm[rows], alpha)
+                minus_smooth = _ewm_step(minus_smooth, minus_dm[rows], alpha)
+                tr_smooth = _ewm_step(tr_smooth, tr[rows], alpha)
+            plus_di = 100 * plus_smooth / tr_smooth
+            minus_di = 100 * minus_smooth / tr_smooth
+            dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            # A missing DX after the first observation changes pandas' weights
+            gaps |= np.isnan(dx) & ~np.isnan(adx)
+            adx = _ewm_step(adx, dx, alpha)
+
+    adx[gaps] = np.nan
+    result[window - 1:] = adx
+    return result
+
+
+def weekly_anchors(timestamps: np.ndarray, anchor_fn: Callable[[int], int]) -> np.ndarray:
+    """Calculate the weekly VWAP anchor of every bar.
+
+    The anchor function is called once per calendar week rather than per bar,
+    so the result matches the strategy's own anchor (including its timezone
+    handling) at negligible cost.
+
+    Args:
+        timestamps: Bar open times in milliseconds
+        anchor_fn: Maps a timestamp to its weekly anchor (StrategyEngine._get_weekly_anchor)
+
+    Returns:
+        Anchor timestamp per bar
+    """
+    weeks = (timestamps - MONDAY_OFFSET_MS) // WEEK_MS
+    _, first_index, inverse = np.unique(weeks, return_index=True, return_inverse=True)
+    anchors = np.array([anchor_fn(int(timestamps[idx])) for idx in first_index], dtype=np.int64)
+    return anchors[inverse]
+
+
+def windowed_vwap(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    timestamps: np.ndarray,
+    end: np.ndarray,
+    start: np.ndarray,
+    anchors: np.ndarray
+) -> np.ndarray:
+    """Calculate anchored VWAP over arbitrary [start, end] windows.
+
+    Mirrors IndicatorCalculator.calculate_vwap on candles[start:end + 1]
+    restricted to candles at or after the anchor. Prefix sums make this
+    O(n), at the cost of rounding differences well inside MASK_TOLERANCE.
+
+    Args:
+        high: Highs
+        low: Lows
+        close: Closes
+        volume: Volumes
+        timestamps: Bar open times in milliseconds
+        end: Last index of each window (inclusive)
+        start: First index of each window
+        anchors: Anchor timestamp of each window
+
+    Returns:
+        VWAP per window: 0.0 where no candle is anchored, NaN where the
+        anchored volume is too small to resolve from the prefix sums
+    """
+    typical = (high + low + close) / 3.0
+    tpv_sum = np.concatenate([[0.0], np.cumsum(typical * volume)])
+    vol_sum = np.concatenate([[0.0], np.cumsum(volume)])
+
+    first = np.maximum(start, np.searchsorted(timestamps, anchors, side="left"))
+    first = np.minimum(first, end + 1)
+    cumulative_volume = vol_sum[end + 1] - vol_sum[first]
+    cumulative_tpv = tpv_sum[end + 1] - tpv_sum[first]
+
+    vwap = np.zeros(len(end))
+    anchored = first <= end
+    resolved = anchored & (cumulative_volume > MASK_TOLERANCE * vol_sum[end + 1])
+    vwap[anchored & ~resolved] = np.nan
+    vwap[resolved] = cumulative_tpv[resolved] / cumulative_volume[resolved]
+    return vwap
+
+
+def _rolling(values: np.ndarray, length: int, reducer) -> np.ndarray:
+    """Apply a reducer over trailing windows; NaN until the window is full."""
+    result = np.full(len(values), np.nan)
+    if len(values) >= length:
+        windows = np.lib.stride_tricks.sliding_window_view(values, length)
+        result[length - 1:] = reducer(windows, axis=1)
+    return result
+
+
+def _above(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Relaxed a > b."""
+    return a > b - MASK_TOLERANCE * np.abs(b)
+
+
+def _below(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Relaxed a < b."""
+    return a < b + MASK_TOLERANCE * np.abs(b)
+
+
+def _vwap_side(price: np.ndarray, vwap: np.ndarray, above: bool) -> np.ndarray:
+    """Relaxed price vs VWAP check; unresolved (NaN) VWAPs stay possible."""
+    unresolved = np.isnan(vwap)
+    side = _above(price, vwap) if above else _below(price, vwap)
+    return unresolved | ((vwap != 0) & side)
+
+
+@dataclass
+class IndicatorSeries:
+    """Threshold-independent per-bar series behind the entry masks.
+
+    Everything here depends only on the candles and the indicator periods,
+    so parameter sweeps over adx_threshold/rvol_threshold (or exit
+    parameters) compute it once and derive masks with entry_masks.
+
+    Attributes:
+        valid: Bars the bar-by-bar loop evaluates (warmup done, enough 1h data)
+        long_setup: Bars passing every long condition except ADX and RVOL
+        short_setup: Bars passing every short condition except ADX and RVOL
+        adx: ADX of each bar's 15m window (NaN where unknown)
+        volume: 15m volumes
+        mean_volume: Mean of the previous rvol_period volumes
+        atr: ATR of each bar's 15m window (as the strategy computes it)
+        high: 15m highs
+        low: 15m lows
+        close: 15m closes
+    """
+    valid: np.ndarray
+    long_setup: np.ndarray
+    short_setup: np.ndarray
+    adx: np.ndarray
+    volume: np.ndarray
+    mean_volume: np.ndarray
+    atr: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+
+def indicator_series(
+    candles_15m: np.ndarray,
+    candles_1h: np.ndarray,
+    config,
+    anchor_fn: Callable[[int], int]
+) -> IndicatorSeries:
+    """Compute the threshold-independent series for every bar.
+
+    Args:
+        candles_15m: Structured 15m candle array (CANDLE_DTYPE)
+        candles_1h: Structured 1h candle array (CANDLE_DTYPE)
+        config: Config with atr_period, adx_period and rvol_period
+        anchor_fn: Weekly anchor function of the strategy
+
+    Returns:
+        IndicatorSeries for the 15m series
+    """
+    n = len(candles_15m)
+    n_1h = len(candles_1h)
+    timestamps = candles_15m["timestamp"]
+    high = candles_15m["high"]
+    low = candles_15m["low"]
+    close = candles_15m["close"]
+    volume = candles_15m["volume"]
+
+    bars = np.arange(n)
+    atr = windowed_atr(high, low, close, config.atr_period, WINDOW_15M)
+
+    # 1h window positions, matching run_backtest's approximate alignment
+    index_1h = np.minimum(bars // 4, max(n_1h - 1, 0))
+    valid = (bars >= WARMUP_15M) & (index_1h >= MIN_CANDLES_1H - 1) & (n_1h > 0)
+
+    if not valid.any():
+        empty = np.zeros(n, dtype=bool)
+        unknown = np.full(n, np.nan)
+        return IndicatorSeries(
+            valid, empty, empty.copy(), unknown, volume, unknown.copy(), atr, high, low, close
+        )
+
+    anchors = weekly_anchors(timestamps, anchor_fn)
+
+    # Price vs VWAP and trend on the 15m window
+    vwap_15m = windowed_vwap(
+        high, low, close, volume, timestamps,
+        bars, np.maximum(0, bars - (WINDOW_15M - 1)), anchors
+    )
+
+    # Trend on the 1h window
+    close_1h_bar = np.zeros(n)
+    vwap_1h = np.zeros(n)
+    if n_1h:
+        close_1h = candles_1h["close"]
+        close_1h_bar = close_1h[index_1h]
+        vwap_1h = windowed_vwap(
+            candles_1h["high"], candles_1h["low"], close_1h, candles_1h["volume"],
+            candles_1h["timestamp"], index_1h,
+            np.maximum(0, index_1h - (WINDOW_1H - 1)), anchors
+        )
+
+    # Squeeze momentum: each value only needs the last 39 bars, so the series
+    # over the whole history equals the strategy's per-window value; the
+    # color compares it with the previous bar's momentum
+    momentum = squeeze_momentum_series(high, low, close)
+    prev_momentum = np.concatenate([[np.nan], momentum[:-1]])
+    momentum_slack = MASK_TOLERANCE * close
+
+    # RVOL: current volume over the mean of the previous rvol_period volumes
+    mean_volume = np.full(n, np.nan)
+    mean_volume[1:] = _rolling(volume, config.rvol_period, np.mean)[:-1]
+
+    # Overextension check: EMA of the last 20 closes reduces to their mean
+    ema = _rolling(close, EMA_LOOKBACK, np.mean)
+
+    adx = windowed_adx(high, low, close, config.adx_period, WINDOW_15M)
+
+    common = valid & np.isfinite(momentum) & np.isfinite(prev_momentum)
+
+    long_setup = (
+        common
+        & _vwap_side(close, vwap_15m, above=True)
+        & _vwap_side(close_1h_bar, vwap_1h, above=True)
+        & (momentum > -momentum_slack)
+        & (momentum > prev_momentum - momentum_slack)
+        & _below(close, ema * 1.05)
+    )
+    short_setup = (
+        common
+        & _vwap_side(close, vwap_15m, above=False)
+        & _vwap_side(close_1h_bar, vwap_1h, above=False)
+        & (momentum < momentum_slack)
+        & (momentum < prev_momentum + momentum_slack)
+        & _above(close, ema * 0.95)
+    )
+
+    return IndicatorSeries(
+        valid, long_setup, short_setup, adx, volume, mean_volume, atr, high, low, close
+    )
+
+
+def entry_masks(
+    series: IndicatorSeries,
+    adx_threshold: float,
+    rvol_threshold: float,
+    start: int = 0,
+    end: Optional[int] = None
+) -> BacktestArrays:
+    """Apply the ADX and RVOL thresholds to precomputed series.
+
+    Masks only get looser as the thresholds drop, so the masks for the
+    lowest thresholds of a sweep cover the masks of every other setting.
+
+    Args:
+        series: Threshold-independent series from indicator_series
+        adx_threshold: Minimum ADX
+        rvol_threshold: Minimum relative volume
+        start: First bar to evaluate (earlier bars are only history)
+        end: Bar after the last one to evaluate (None for all)
+
+    Returns:
+        BacktestArrays restricted to bars in [start, end)
+    """
+    n = len(series.valid)
+    in_range = np.zeros(n, dtype=bool)
+    in_range[start:n if end is None else end] = True
+    valid = series.valid & in_range
+
+    relative_volume_ok = (
+        _above(series.volume, rvol_threshold * series.mean_volume) & (series.mean_volume > 0)
+    )
+    # ADX strength (unknown windows stay possible)
+    adx_ok = np.isnan(series.adx) | _above(series.adx, np.full(n, float(adx_threshold)))
+    common = valid & relative_volume_ok & adx_ok
+
+    return BacktestArrays(
+        valid,
+        series.long_setup & common,
+        series.short_setup & common,
+        series.atr,
+        series.high,
+        series.low,
+        series.close
+    )
+
+
+def entry_candidates(
+    candles_15m: np.ndarray,
+    candles_1h: np.ndarray,
+    config,
+    anchor_fn: Callable[[int], int]
+) -> BacktestArrays:
+    """Evaluate the backtest's per-bar arrays and entry masks for every bar.
+
+    Args:
+        candles_15m: Structured 15m candle array (CANDLE_DTYPE)
+        candles_1h: Structured 1h candle array (CANDLE_DTYPE)
+        config: Config with atr_period, adx_period, adx_threshold,
+            rvol_period and rvol_threshold
+        anchor_fn: Weekly anchor function of the strategy
+
+    Returns:
+        BacktestArrays for the 15m series
+    """
+    series = indicator_series(candles_15m, candles_1h, config, anchor_fn)
+    return entry_masks(series, config.adx_threshold, config.rvol_threshold)
@@ -1,6 +1,6 @@
 """Volume Profile Analyzer for identifying key support/resistance levels."""
 
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable
 import time
 import threading
 from concurrent.futures import ThreadPoolExecutor, Future
@@ -18,6 +18,12 @@ class VolumeProfileAnalyzer:
     - VAH/VAL (Value Area High/Low): Bounds containing 70% of volume
     
     These levels act as magnets for price and high-probability trade zones.
+    
+    refresh() recomputes a symbol's profile once its candles have advanced by
+    volume_profile_update_interval of candle time, optionally on the worker
+    thread. Finished profiles are published with a single assignment, and
+    readers take one reference to the published profile, so they always see
+    a complete profile (the old one until the new one is ready).
     """
     
     def __init__(self, config: Config):
@@ -31,6 +37,11 @@ class VolumeProfileAnalyzer:
         self.current_profile: Optional[VolumeProfile] = None
         self.last_update: int = 0
         
+        # Published profile per symbol and the candle time (ms) it was computed at
+        self._profiles: Dict[Optional[str], VolumeProfile] = {}
+        self._data_times: Dict[Optional[str], int] = {}
+        self._refreshes: Dict[Optional[str], Future] = {}
+        
         # Thread pool for async calculations
         self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="volume_profile")
         self._calculation_future: Optional[Future] = None
@@ -53,6 +64,19 @@ class VolumeProfileAnalyzer:
         Args:
             candles: List of candles for lookback period (typically 7 days)
             
+        Returns:
+            VolumeProfile object with calculated levels
+        """
+        profile = self._build_profile(candles)
+        self._publish(profile)
+        return profile
+    
+    def _build_profile(self, candles: List[Candle]) -> VolumeProfile:
+        """Compute a volume profile without publishing it.
+        
+        Args:
+            candles: List of candles for lookback period
+            
         Returns:
             VolumeProfile object with calculated levels
         """
@@ -140,10 +164,6 @@ class VolumeProfileAnalyzer:
         # Identify Value Area
         profile.val, profile.vah = self.identify_value_area(profile)
         
-        # Update current profile and timestamp
-        self.current_profile = profile
-        self.last_update = profile.timestamp
-        
         self.logger.log_system_event(
             f"Volume profile calculated: num_candles={len(candles)}, num_bins={len(price_levels)}, "
             f"total_volume={total_volume:.2f}, poc={profile.poc:.2f}, "
@@ -153,6 +173,103 @@ class VolumeProfileAnalyzer:
         
         return profile
     
+    def _publish(self, profile: VolumeProfile, symbol: Optional[str] = None) -> None:
+        """Make a finished profile visible to readers (one reference swap each).
+        
+        Args:
+            profile: Fully computed profile
+            symbol: Symbol the profile belongs to
+        """
+        self._profiles[symbol] = profile
+        self.current_profile = profile
+        self.last_update = profile.timestamp
+    
+    def get_profile(self, symbol: Optional[str] = None) -> Optional[VolumeProfile]:
+        """Get the published profile of a symbol.
+        
+        Args:
+            symbol: Symbol to look up (None = most recently published profile)
+            
+        Returns:
+            VolumeProfile, or None if none has been published yet
+        """
+        if symbol is None:
+            return self.current_profile
+        return self._profiles.get(symbol)
+    
+    def needs_refresh(self, candles: List[Candle], symbol: Optional[str] = None) -> bool:
+        """Check whether a symbol's candles advanced enough to recompute its profile.
+        
+        Args:
+            candles: Current lookback candles of the symbol
+            symbol: Symbol the candles belong to
+            
+        Returns:
+            True if no profile was computed yet, the latest candle is at least
+            volume_profile_update_interval newer than the one the profile was
+            computed at, or the history moved backwards (e.g. reloaded)
+        """
+        if not candles:
+            return False
+        data_time = self._data_times.get(symbol)
+        if data_time is None:
+            return True
+        elapsed_ms = candles[-1].timestamp - data_time
+        return elapsed_ms < 0 or elapsed_ms >= self.config.volume_profile_update_interval * 1000
+    
+    def refresh(self, candles: List[Candle], symbol: Optional[str] = None, background: bool = True) -> bool:
+        """Recompute a symbol's profile if its candles advanced (see needs_refresh).
+        
+        Args:
+            candles: Current lookback candles of the symbol
+            symbol: Symbol the candles belong to
+            background: Compute on the worker thread and return immediately;
+                the previous profile stays published until the new one is ready
+            
+        Returns:
+            True if a recompute was started (or done, when not in background)
+        """
+        with self._lock:
+            pending = self._refreshes.get(symbol)
+            if pending is not None and not pending.done():
+                return False
+            if not self.needs_refresh(candles, symbol):
+                return False
+            self._data_times[symbol] = candles[-1].timestamp
+            if background:
+                self._refreshes[symbol] = self._executor.submit(self._refresh, list(candles), symbol)
+                return True
+        
+        self._refresh(candles, symbol)
+        return True
+    
+    def _refresh(self, candles: List[Candle], symbol: Optional[str]) -> None:
+        """Compute and publish a symbol's profile (retried on the next call if it fails)."""
+        try:
+            self._publish(self._build_profile(candles), symbol)
+        except Exception as e:
+            self._data_times.pop(symbol, None)
+            self.logger.log_system_event(f"Error refreshing volume profile for {symbol}: {e}", "ERROR")
+    
+    def wait_for_refresh(self, symbol: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Block until a symbol's background refresh (if any) has finished.
+        
+        Args:
+            symbol: Symbol to wait for
+            timeout: Maximum seconds to wait (None = no limit)
+            
+        Returns:
+            True if no refresh is pending afterwards
+        """
+        pending = self._refreshes.get(symbol)
+        if pending is None:
+            return True
+        try:
+            pending.result(timeout=timeout)
+        except Exception:
+            return pending.done()
+        return True
+    
     def identify_poc(self, profile: VolumeProfile) -> float:
         """Identify Point of Control (price level with maximum volume).
         
@@ -241,17 +358,21 @@ class VolumeProfileAnalyzer:
         
         return (val, vah)
     
-    def is_near_key_level(self, price: float, threshold: Optional[float] = None) -> bool:
+    def is_near_key_level(self, price: float, threshold: Optional[float] = None,
+                          symbol: Optional[str] = None) -> bool:
         """Check if price is near a key level (POC, VAH, or VAL).
         
         Args:
             price: Current price to check
             threshold: Distance threshold as percentage (default: from config)
+            symbol: Symbol whose profile is used (None = most recent profile)
             
         Returns:
             True if price is within threshold of any key level
         """
-        if self.current_profile is None:
+        # One snapshot, so a concurrent refresh cannot mix levels of two profiles
+        profile = self.get_profile(symbol)
+        if profile is None:
             return False
         
         if threshold is None:
@@ -259,9 +380,9 @@ class VolumeProfileAnalyzer:
         
         # Check distance to each key level
         key_levels = [
-            self.current_profile.poc,
-            self.current_profile.vah,
-            self.current_profile.val
+            profile.poc,
+            profile.vah,
+            profile.val
         ]
         
         for level in key_levels:
@@ -276,31 +397,33 @@ class VolumeProfileAnalyzer:
         
         return False
     
-    def get_volume_at_price(self, price: float) -> float:
+    def get_volume_at_price(self, price: float, symbol: Optional[str] = None) -> float:
         """Get volume at a specific price level.
         
         Finds the nearest price bin and returns its volume.
         
         Args:
             price: Price level to query
+            symbol: Symbol whose profile is used (None = most recent profile)
             
         Returns:
             Volume at that price level, or 0.0 if no profile available
         """
-        if self.current_profile is None or not self.current_profile.price_levels:
+        profile = self.get_profile(symbol)
+        if profile is None or not profile.price_levels:
             return 0.0
         
         # Find nearest price level
         min_distance = float('inf')
         nearest_idx = 0
         
-        for i, price_level in enumerate(self.current_profile.price_levels):
+        for i, price_level in enumerate(profile.price_levels):
             distance = abs(price - price_level)
             if distance < min_distance:
                 min_distance = distance
                 nearest_idx = i
         
-        return self.current_profile.volumes[nearest_idx]
+        return profile.volumes[nearest_idx]
     
     def calculate_volume_profile_async(
         self, 
@@ -0,0 +1,645 @@
+"""Walk-forward optimization for the backtest strategy parameters.
+
+Parameters are tuned on rolling in-sample windows and judged only on the
+out-of-sample window that follows each of them. The out-of-sample trades of
+all folds are stitched into one track record, and the parameters picked per
+fold show how stable the optimum is over time.
+
+Every parameter in PARAMETERS leaves the indicator values untouched
+(adx_threshold and rvol_threshold only gate entries, the rest only change
+exits), so the expensive work is done once per symbol for the whole study:
+
+- vectorized_signals.indicator_series over the full history
+- the strategy's indicator values on every bar any combination can enter
+  (the entry masks of the loosest thresholds), computed in parallel
+
+Each fold and combination then runs BacktestEngine.run_event_backtest over
+its bar range of the full candle lists, so indicator windows at fold
+boundaries see the same history as a continuous backtest.
+"""
+
+import copy
+import itertools
+import logging
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src import performance_analytics, vectorized_signals
+from src.backtest_engine import BacktestEngine
+from src.candle_array import candles_to_array
+from src.config import Config
+from src.models import Candle, IndicatorState
+from src.position_sizer import PositionSizer
+from src.risk_manager import RiskManager
+from src.strategy import StrategyEngine
+
+logger = logging.getLogger(__name__)
+
+
+# Parameters that can be optimized without recomputing indicators
+PARAMETERS = (
+    "adx_threshold",
+    "rvol_threshold",
+    "stop_loss_atr_multiplier",
+    "trailing_stop_atr_multiplier",
+    "scaled_tp_levels",
+)
+
+# Metrics from performance_analytics.calculate_metrics usable as objective
+OBJECTIVES = ("sharpe_ratio", "total_pnl", "roi", "profit_factor", "win_rate")
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# History needed before the first traded bar (one full 15m indicator window)
+WARMUP_MS = (vectorized_signals.WINDOW_15M - 1) * 15 * 60 * 1000
+
+# Bars per indicator precomputation task
+INDICATOR_CHUNK_BARS = 500
+
+
+@dataclass
+class Fold:
+    """One walk-forward step.
+
+    Attributes:
+        index: Fold number (0-based)
+        in_sample_start: In-sample window start in milliseconds (inclusive)
+        in_sample_end: In-sample window end in milliseconds (exclusive)
+        out_of_sample_start: Out-of-sample window start in milliseconds
+        out_of_sample_end: Out-of-sample window end in milliseconds (exclusive)
+    """
+    index: int
+    in_sample_start: int
+    in_sample_end: int
+    out_of_sample_start: int
+    out_of_sample_end: int
+
+
+@dataclass
+class FoldResult:
+    """Optimization outcome of one fold.
+
+    Attributes:
+        fold: The fold
+        parameters: Best in-sample parameter combination
+        in_sample_score: Objective of the best combination in sample
+        out_of_sample_score: Objective of that combination out of sample
+        in_sample_metrics: Pooled in-sample metrics of the best combination
+        out_of_sample_metrics: Pooled out-of-sample metrics
+        combinations: Number of combinations evaluated
+    """
+    fold: Fold
+    parameters: Dict[str, Any]
+    in_sample_score: float
+    out_of_sample_score: float
+    in_sample_metrics: Dict
+    out_of_sample_metrics: Dict
+    combinations: int
+
+
+@dataclass
+class WalkForwardResult:
+    """Stitched out-of-sample results of a walk-forward study.
+
+    Attributes:
+        folds: Per-fold results in time order
+        trades: Stitched out-of-sample trades (TRADE_DTYPE, in fold order)
+        metrics: Metrics of the stitched out-of-sample trades
+        stability: Per-parameter stability of the fold optima
+        efficiency: Mean out-of-sample score over mean in-sample score
+        elapsed: Wall-clock duration in seconds
+    """
+    folds: List[FoldResult]
+    trades: np.ndarray
+    metrics: Dict
+    stability: Dict[str, Dict]
+    efficiency: float
+    elapsed: float = 0.0
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "metrics": self.metrics,
+            "stability": self.stability,
+            "efficiency": self.efficiency,
+            "elapsed": self.elapsed,
+            "folds": [
+                {
+                    "index": result.fold.index,
+                    "in_sample": [result.fold.in_sample_start, result.fold.in_sample_end],
+                    "out_of_sample": [result.fold.out_of_sample_start, result.fold.out_of_sample_end],
+                    "parameters": result.parameters,
+                    "in_sample_score": result.in_sample_score,
+                    "out_of_sample_score": result.out_of_sample_score,
+                    "in_sample_metrics": result.in_sample_metrics,
+                    "out_of_sample_metrics": result.out_of_sample_metrics,
+                    "combinations": result.combinations,
+                }
+                for result in self.folds
+            ],
+        }
+
+
+@dataclass
+class SymbolData:
+    """Candles and shared indicator data of one symbol.
+
+    Attributes:
+        symbol: Trading pair symbol
+        candles_15m: 15-minute candles
+        candles_1h: 1-hour candles
+        timestamps: 15m open times in milliseconds
+        series: Threshold-independent indicator series of the 15m candles
+        indicator_cache: Strategy indicator values by 15m bar index
+    """
+    symbol: str
+    candles_15m: List[Candle]
+    candles_1h: List[Candle]
+    timestamps: np.ndarray
+    series: vectorized_signals.IndicatorSeries
+    indicator_cache: Dict[int, IndicatorState] = field(default_factory=dict)
+
+    def bar_range(self, start_ms: int, end_ms: int) -> Tuple[int, int]:
+        """Return the 15m bar index range opening in [start_ms, end_ms)."""
+        start = int(np.searchsorted(self.timestamps, start_ms, side="left"))
+        end = int(np.searchsorted(self.timestamps, end_ms, side="left"))
+        return start, end
+
+
+def make_folds(
+    start_ms: int,
+    end_ms: int,
+    in_sample_days: float,
+    out_of_sample_days: float,
+    step_days: Optional[float] = None
+) -> List[Fold]:
+    """Split a time range into rolling in-sample/out-of-sample folds.
+
+    Args:
+        start_ms: First tradable time in milliseconds
+        end_ms: End of the data in milliseconds (exclusive)
+        in_sample_days: In-sample window length in days
+        out_of_sample_days: Out-of-sample window length in days
+        step_days: Shift between folds in days (defaults to the out-of-sample
+            length, so out-of-sample windows tile without overlap)
+
+    Returns:
+        Folds whose out-of-sample window ends within the range
+
+    Raises:
+        ValueError: If a window length or the step is not positive
+    """
+    if in_sample_days <= 0 or out_of_sample_days <= 0:
+        raise ValueError("in_sample_days and out_of_sample_days must be positive")
+    step_days = out_of_sample_days if step_days is None else step_days
+    if step_days <= 0:
+        raise ValueError(f"step_days must be positive, got {step_days}")
+
+    in_sample_ms = int(in_sample_days * DAY_MS)
+    out_of_sample_ms = int(out_of_sample_days * DAY_MS)
+    step_ms = int(step_days * DAY_MS)
+
+    folds = []
+    fold_start = start_ms
+    while fold_start + in_sample_ms + out_of_sample_ms <= end_ms:
+        in_sample_end = fold_start + in_sample_ms
+        folds.append(Fold(
+            index=len(folds),
+            in_sample_start=fold_start,
+            in_sample_end=in_sample_end,
+            out_of_sample_start=in_sample_end,
+            out_of_sample_end=in_sample_end + out_of_sample_ms
+        ))
+        fold_start += step_ms
+    return folds
+
+
+def _validate_space(space: Dict[str, Sequence]) -> None:
+    """Check that a parameter space only holds supported, non-empty axes."""
+    if not space:
+        raise ValueError("Parameter space cannot be empty")
+    for name, values in space.items():
+        if name not in PARAMETERS:
+            raise ValueError(f"Unsupported parameter '{name}', expected one of {PARAMETERS}")
+        if len(values) == 0:
+            raise ValueError(f"Parameter '{name}' has no candidate values")
+
+
+def parameter_grid(space: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """Expand a parameter space into every combination.
+
+    Args:
+        space: Candidate values per parameter name
+
+    Returns:
+        List of parameter dicts in itertools.product order
+    """
+    _validate_space(space)
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def sample_parameters(space: Dict[str, Sequence], n_iter: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Draw distinct combinations from a parameter space at random.
+
+    The grid is never materialized: combination numbers are drawn without
+    replacement and decoded into per-parameter indices.
+
+    Args:
+        space: Candidate values per parameter name
+        n_iter: Number of combinations to draw (capped at the grid size)
+        seed: Random seed
+
+    Returns:
+        List of parameter dicts
+    """
+    _validate_space(space)
+    names = list(space)
+    shape = tuple(len(space[name]) for name in names)
+    size = math.prod(shape)
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(size, size=min(n_iter, size), replace=False)
+    indices = np.unravel_index(picks, shape)
+    return [
+        {name: space[name][int(indices[axis][k])] for axis, name in enumerate(names)}
+        for k in range(len(picks))
+    ]
+
+
+def apply_parameters(config: Config, parameters: Dict[str, Any]) -> Config:
+    """Return a copy of config with the given parameters set."""
+    config = copy.copy(config)
+    for name, value in parameters.items():
+        setattr(config, name, copy.deepcopy(value))
+    return config
+
+
+def parameter_stability(chosen: List[Dict[str, Any]]) -> Dict[str, Dict]:
+    """Summarize how much the per-fold optima move between folds.
+
+    Args:
+        chosen: Best parameters of each fold in time order
+
+    Returns:
+        Per parameter: values, mode, mode_frequency (share of folds picking
+        the mode) and changes (number of fold-to-fold changes); numeric
+        parameters also get mean, std and cv (std over |mean|)
+    """
+    stability = {}
+    if not chosen:
+        return stability
+
+    for name in chosen[0]:
+        values = [parameters[name] for parameters in chosen]
+        keys = [repr(value) for value in values]
+        counts: Dict[str, int] = {}
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+        mode_key = max(counts, key=counts.get)
+
+        summary = {
+            "values": values,
+            "mode": values[keys.index(mode_key)],
+            "mode_frequency": counts[mode_key] / len(values),
+            "changes": sum(1 for a, b in zip(keys, keys[1:]) if a != b),
+        }
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            numeric = np.asarray(values, dtype=float)
+            mean = float(numeric.mean())
+            std = float(numeric.std())
+            summary.update({
+                "mean": mean,
+                "std": std,
+                "cv": std / abs(mean) if mean else 0.0,
+            })
+        stability[name] = summary
+    return stability
+
+
+# Per-process data of the worker pool (set once by _init_worker)
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(config: Config, datasets: Dict[str, SymbolData], initial_balance: float) -> None:
+    """Install the shared study data in a worker process."""
+    _WORKER["config"] = config
+    _WORKER["datasets"] = datasets
+    _WORKER["initial_balance"] = initial_balance
+
+
+def _make_engine(config: Config) -> BacktestEngine:
+    """Build a fresh backtest engine for one run."""
+    return BacktestEngine(config, StrategyEngine(config), RiskManager(config, PositionSizer(config)))
+
+
+def _precompute_chunk(task: Tuple[str, np.ndarray]) -> Tuple[str, Dict[int, IndicatorState]]:
+    """Compute the strategy's indicator values on a chunk of bars."""
+    symbol, bars = task
+    data = _WORKER["datasets"][symbol]
+    engine = _make_engine(_WORKER["config"])
+    return symbol, engine.precompute_indicators(data.candles_15m, data.candles_1h, bars)
+
+
+def _evaluate(task: Tuple[str, Dict[str, Any], int, int]) -> np.ndarray:
+    """Backtest one parameter combination on one symbol's bar range."""
+    symbol, parameters, start, end = task
+    data = _WORKER["datasets"][symbol]
+    config = apply_parameters(_WORKER["config"], parameters)
+    config.symbol = symbol
+
+    engine = _make_engine(config)
+    engine.run_event_backtest(
+        data.candles_15m,
+        data.candles_1h,
+        initial_balance=_WORKER["initial_balance"],
+        series=data.series,
+        indicator_cache=data.indicator_cache,
+        start=start,
+        end=end
+    )
+    return performance_analytics.trades_to_array(engine.get_trades())
+
+
+class WalkForwardOptimizer:
+    """Rolling walk-forward grid/random search over backtest parameters."""
+
+    def __init__(
+        self,
+        config: Config,
+        space: Dict[str, Sequence],
+        in_sample_days: float = 90,
+        out_of_sample_days: float = 30,
+        step_days: Optional[float] = None,
+        search: str = "grid",
+        n_iter: int = 50,
+        objective: str = "sharpe_ratio",
+        min_trades: int = 10,
+        n_jobs: int = 1,
+        initial_balance: float = 10000.0,
+        seed: int = 0
+    ):
+        """Initialize WalkForwardOptimizer.
+
+        Args:
+            config: Base configuration (parameters outside the space are kept)
+            space: Candidate values per parameter (names from PARAMETERS)
+            in_sample_days: In-sample window length in days
+            out_of_sample_days: Out-of-sample window length in days
+            step_days: Shift between folds (defaults to out_of_sample_days)
+            search: "grid" for every combination, "random" for n_iter draws
+            n_iter: Number of combinations per fold for random search
+            objective: Metric maximized in sample (one of OBJECTIVES)
+            min_trades: Minimum pooled in-sample trades for a combination to
+                be eligible
+            n_jobs: Worker processes (1 runs everything in this process)
+            initial_balance: Starting balance per symbol
+            seed: Seed for random search (each fold draws with seed + index)
+
+        Raises:
+            ValueError: If the space, search mode or objective is invalid, or
+                the configuration needs the bar-by-bar backtest
+        """
+        _validate_space(space)
+        if search not in ("grid", "random"):
+            raise ValueError(f"search must be 'grid' or 'random', got {search}")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {OBJECTIVES}, got {objective}")
+        if n_jobs < 1:
+            raise ValueError(f"n_jobs must be at least 1, got {n_jobs}")
+        if initial_balance <= 0:
+            raise ValueError(f"initial_balance must be positive, got {initial_balance}")
+        if not _make_engine(config)._supports_event_skipping():
+            raise ValueError(
+                "Walk-forward optimization requires a configuration without adaptive features "
+                "(adaptive thresholds, multi-timeframe, volume profile, regime detection, ML)"
+            )
+
+        self.config = config
+        self.space = space
+        self.in_sample_days = in_sample_days
+        self.out_of_sample_days = out_of_sample_days
+        self.step_days = step_days
+        self.search = search
+        self.n_iter = n_iter
+        self.objective = objective
+        self.min_trades = min_trades
+        self.n_jobs = n_jobs
+        self.initial_balance = initial_balance
+        self.seed = seed
+
+    def combinations(self, fold_index: int = 0) -> List[Dict[str, Any]]:
+        """Return the parameter combinations searched in a fold."""
+        if self.search == "grid":
+            return parameter_grid(self.space)
+        return sample_parameters(self.space, self.n_iter, self.seed + fold_index)
+
+    def run(self, data: Dict[str, Tuple[List[Candle], List[Candle]]]) -> WalkForwardResult:
+        """Run the walk-forward study.
+
+        Args:
+            data: (candles_15m, candles_1h) per symbol
+
+        Returns:
+            WalkForwardResult with stitched out-of-sample metrics
+
+        Raises:
+            ValueError: If no data is given or the common history is too short
+                for a single fold
+        """
+        started = time.perf_counter()
+        if not data:
+            raise ValueError("No symbol data given")
+
+        datasets = {symbol: self._prepare(symbol, c15, c1h) for symbol, (c15, c1h) in data.items()}
+
+        # Folds cover the time range every symbol has data for
+        start_ms = max(int(d.timestamps[0]) for d in datasets.values()) + WARMUP_MS
+        end_ms = min(int(d.timestamps[-1]) for d in datasets.values()) + 1
+        folds = make_folds(start_ms, end_ms, self.in_sample_days, self.out_of_sample_days, self.step_days)
+        if not folds:
+            raise ValueError("Not enough common history for one in-sample + out-of-sample window")
+
+        fold_combinations = [self.combinations(fold.index) for fold in folds]
+        logger.info(
+            f"[WALK-FORWARD] {len(folds)} folds x {len(fold_combinations[0])} combinations "
+            f"on {len(datasets)} symbols"
+        )
+
+        self._precompute(datasets, folds, fold_combinations)
+
+        pool = None
+        if self.n_jobs > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_init_worker,
+                initargs=(self.config, datasets, self.initial_balance)
+            )
+            run_tasks = lambda tasks: list(pool.map(_evaluate, tasks, chunksize=self._chunksize(len(tasks))))
+        else:
+            _init_worker(self.config, datasets, self.initial_balance)
+            run_tasks = lambda tasks: [_evaluate(task) for task in tasks]
+
+        try:
+            results = self._search(datasets, folds, fold_combinations, run_tasks)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            _WORKER.clear()
+
+        trades = [trades for _, trades in results]
+        fold_results = [fold_result for fold_result, _ in results]
+        stitched = self._pool_trades(trades)
+        metrics = performance_analytics.calculate_metrics(
+            stitched, self.initial_balance * len(datasets)
+        )
+
+        in_sample_mean = float(np.mean([r.in_sample_score for r in fold_results]))
+        out_of_sample_mean = float(np.mean([r.out_of_sample_score for r in fold_results]))
+        efficiency = out_of_sample_mean / in_sample_mean if in_sample_mean > 0 else 0.0
+
+        result = WalkForwardResult(
+            folds=fold_results,
+            trades=stitched,
+            metrics=metrics,
+            stability=parameter_stability([r.parameters for r in fold_results]),
+            efficiency=efficiency,
+            elapsed=time.perf_counter() - started
+        )
+        logger.info(
+            f"[WALK-FORWARD] Done in {result.elapsed:.1f}s: {metrics['total_trades']} out-of-sample trades, "
+            f"{self.objective} {metrics[self.objective]:.2f}, efficiency {efficiency:.2f}"
+        )
+        return result
+
+    def _prepare(self, symbol: str, candles_15m: List[Candle], candles_1h: List[Candle]) -> SymbolData:
+        """Compute the threshold-independent series of one symbol."""
+        if not candles_15m or not candles_1h:
+            raise ValueError(f"Candle lists for {symbol} cannot be empty")
+        array_15m = candles_to_array(candles_15m)
+        strategy = StrategyEngine(self.config)
+        series = vectorized_signals.indicator_series(
+            array_15m, candles_to_array(candles_1h), self.config, strategy._get_weekly_anchor
+        )
+        return SymbolData(symbol, candles_15m, candles_1h, array_15m["timestamp"], series)
+
+    def _precompute(
+        self,
+        datasets: Dict[str, SymbolData],
+        folds: List[Fold],
+        fold_combinations: List[List[Dict[str, Any]]]
+    ) -> None:
+        """Fill every symbol's indicator cache for all bars any run can enter.
+
+        The loosest thresholds searched give entry masks covering those of
+        every combination, so after this no backtest recomputes indicators.
+        """
+        all_combinations = [c for combinations in fold_combinations for c in combinations]
+        adx_threshold = min(c.get("adx_threshold", self.config.adx_threshold) for c in all_combinations)
+        rvol_threshold = min(c.get("rvol_threshold", self.config.rvol_threshold) for c in all_combinations)
+
+        tasks = []
+        for symbol, data in datasets.items():
+            start, end = data.bar_range(folds[0].in_sample_start, folds[-1].out_of_sample_end)
+            masks = vectorized_signals.entry_masks(data.series, adx_threshold, rvol_threshold, start, end)
+            bars = np.flatnonzero(masks.candidates)
+            n_chunks = max(1, math.ceil(len(bars) / INDICATOR_CHUNK_BARS))
+            tasks.extend((symbol, chunk) for chunk in np.array_split(bars, n_chunks))
+
+        if self.n_jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_init_worker,
+                initargs=(self.config, datasets, self.initial_balance)
+            ) as pool:
+                chunks = list(pool.map(_precompute_chunk, tasks))
+        else:
+            _init_worker(self.config, datasets, self.initial_balance)
+            try:
+                chunks = [_precompute_chunk(task) for task in tasks]
+            finally:
+                _WORKER.clear()
+
+        for symbol, states in chunks:
+            datasets[symbol].indicator_cache.update(states)
+
+    def _search(
+        self,
+        datasets: Dict[str, SymbolData],
+        folds: List[Fold],
+        fold_combinations: List[List[Dict[str, Any]]],
+        run_tasks
+    ) -> List[Tuple[FoldResult, np.ndarray]]:
+        """Pick the best in-sample combination per fold and test it out of sample."""
+        symbols = list(datasets)
+
+        # All in-sample runs of all folds go out as one batch to keep workers busy
+        tasks = []
+        for fold, combinations in zip(folds, fold_combinations):
+            ranges = [datasets[s].bar_range(fold.in_sample_start, fold.in_sample_end) for s in symbols]
+            for parameters in combinations:
+                tasks.extend((s, parameters, start, end) for s, (start, end) in zip(symbols, ranges))
+        in_sample_trades = run_tasks(tasks)
+
+        best = []
+        offset = 0
+        for fold, combinations in zip(folds, fold_combinations):
+            scored = []
+            for parameters in combinations:
+                pooled = self._pool_trades(in_sample_trades[offset:offset + len(symbols)])
+                offset += len(symbols)
+                metrics = self._metrics(pooled, len(symbols))
+                scored.append((self._score(metrics), metrics, parameters))
+            # Ties keep the earliest combination
+            score, metrics, parameters = max(scored, key=lambda item: item[0])
+            best.append((score, metrics, parameters, len(combinations)))
+
+        tasks = []
+        for fold, (_, _, parameters, _) in zip(folds, best):
+            for s in symbols:
+                start, end = datasets[s].bar_range(fold.out_of_sample_start, fold.out_of_sample_end)
+                tasks.append((s, parameters, start, end))
+        out_of_sample_trades = run_tasks(tasks)
+
+        results = []
+        for k, (fold, (score, metrics, parameters, evaluated)) in enumerate(zip(folds, best)):
+            pooled = self._pool_trades(out_of_sample_trades[k * len(symbols):(k + 1) * len(symbols)])
+            oos_metrics = self._metrics(pooled, len(symbols))
+            results.append((
+                FoldResult(
+                    fold=fold,
+                    parameters=parameters,
+                    in_sample_score=score if math.isfinite(score) else 0.0,
+                    out_of_sample_score=float(oos_metrics[self.objective]),
+                    in_sample_metrics=metrics,
+                    out_of_sample_metrics=oos_metrics,
+                    combinations=evaluated
+                ),
+                pooled
+            ))
+        return results
+
+    def _chunksize(self, n_tasks: int) -> int:
+        """Task batch size per worker round trip."""
+        return max(1, n_tasks // (self.n_jobs * 8))
+
+    def _metrics(self, trades: np.ndarray, n_symbols: int) -> Dict:
+        """Pooled metrics on the combined starting balance of all symbols."""
+        return performance_analytics.calculate_metrics(trades, self.initial_balance * n_symbols)
+
+    def _score(self, metrics: Dict) -> float:
+        """Objective value, or -inf for combinations with too few trades."""
+        if metrics["total_trades"] < self.min_trades:
+            return -math.inf
+        return float(metrics[self.objective])
+
+    @staticmethod
+    def _pool_trades(trades: List[np.ndarray]) -> np.ndarray:
+        """Concatenate trade arrays in the given order."""
+        if not trades:
+            return np.zeros(0, dtype=performance_analytics.TRADE_DTYPE)
+        return np.concatenate(trades)
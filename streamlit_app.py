@@ -808,78 +808,71 @@ def show_chart_page():
     # Initialize data provider and chart generator
     data_provider = StreamlitDataProvider()
     
-    # Import chart generator here to avoid circular imports
+    # Import chart modules here to avoid circular imports
     from src.streamlit_charts import ChartGenerator
+    from src.chart_data_service import CandleStore, ChartDataService, timeframe_range
     chart_generator = ChartGenerator()
     
     # Get config for symbol
     config = data_provider.get_config()
-    symbol = config.get('symbol', 'N/A')
+    symbols = [config.get('symbol', 'BTCUSDT')]
+    if config.get('enable_portfolio_management') and config.get('portfolio_symbols'):
+        symbols = list(config['portfolio_symbols'])
     
-    st.subheader(f"Chart for {symbol}")
-    
-    # Timeframe selector
-    col1, col2 = st.columns([1, 3])
+    # Chart controls
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
+        symbol = st.selectbox("Symbol", symbols, index=0)
+    
+    with col2:
         timeframe = st.selectbox(
             "Select Timeframe",
             ["5m", "15m", "1h", "4h"],
             index=1  # Default to 15m
         )
     
-    with col2:
-        st.info(f"Displaying {timeframe} candlesticks")
+    with col3:
+        range_days = st.selectbox(
+            "Range",
+            [1, 7, 30, 90, 180],
+            index=1,
+            format_func=lambda d: f"{d} day" if d == 1 else f"{d} days"
+        )
+    
+    with col4:
+        max_points = st.number_input(
+            "Max points (≈ chart width px)",
+            min_value=100,
+            max_value=5000,
+            value=1200,
+            step=100
+        )
+    
+    st.subheader(f"Chart for {symbol}")
     
     # Get positions for marking entries
     positions = data_provider.get_open_positions()
     
-    # For now, create sample candle data since we don't have historical data access
-    # In a real implementation, this would fetch from Binance API or cached data
-    st.warning("⚠️ Chart functionality requires historical data access. Displaying placeholder.")
-    
-    # Create placeholder candles for demonstration
-    import pandas as pd
-    from datetime import datetime, timedelta
+    # Read candles from the bot's candle store and downsample to the chart width
+    store = CandleStore(config.get('candle_store_dir', 'data/candles'))
+    service = ChartDataService(store=store)
+    chart_data = service.get_chart_data(
+        symbol,
+        timeframe,
+        max_points=int(max_points),
+        positions=positions,
+        **timeframe_range(range_days)
+    )
     
-    # Generate sample data
-    current_price = data_provider.get_market_data().get('current_price', 50000.0)
-    
-    if current_price > 0:
-        # Generate 100 sample candles
-        candles = []
-        base_time = datetime.now() - timedelta(hours=100)
-        
-        for i in range(100):
-            # Simple random walk for demo
-            import random
-            variation = random.uniform(-0.02, 0.02)
-            open_price = current_price * (1 + variation)
-            close_price = current_price * (1 + random.uniform(-0.02, 0.02))
-            high_price = max(open_price, close_price) * (1 + random.uniform(0, 0.01))
-            low_price = min(open_price, close_price) * (1 - random.uniform(0, 0.01))
-            
-            candles.append({
-                'timestamp': base_time + timedelta(hours=i),
-                'open': open_price,
-                'high': high_price,
-                'low': low_price,
-                'close': close_price,
-                'volume': random.uniform(100, 1000)
-            })
-            
-            current_price = close_price
-        
-        # Create price chart
-        fig = chart_generator.create_price_chart(
-            candles=candles,
-            positions=positions,
-            atr_bands=None  # Could add ATR bands if we calculate them
+    if chart_data.is_empty:
+        st.warning(
+            f"⚠️ No stored {timeframe} candles for {symbol} in the selected range. "
+            "The bot writes closed candles to the candle store while running in PAPER or LIVE mode."
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.error("Unable to load price data")
+    
+    fig = chart_generator.create_price_chart(candles=chart_data)
+    st.plotly_chart(fig, use_container_width=True)
     
     st.divider()
     
@@ -893,12 +886,12 @@ def show_chart_page():
         st.write("**Symbol:**", symbol)
     
     with col2:
-        st.write("**Candles Displayed:**", "100")
-        st.write("**Chart Type:**", "Candlestick")
+        st.write("**Candles in Range:**", f"{chart_data.source_points:,}")
+        st.write("**Points Displayed:**", f"{len(chart_data.candles):,}")
     
     with col3:
-        if positions:
-            st.write("**Position Markers:**", f"{len(positions)} shown")
+        if chart_data.markers:
+            st.write("**Position Markers:**", f"{len(chart_data.markers)} shown")
         else:
             st.write("**Position Markers:**", "None")
     
@@ -911,23 +904,15 @@ def show_chart_page():
     with col1:
         st.write("🟢 **Green Triangle Up:** Long position entry")
         st.write("🔴 **Red Triangle Down:** Short position entry")
+        st.write("🟠 **Orange Line:** Weekly anchored VWAP")
     
     with col2:
-        st.write("**Gray Dashed Lines:** ATR bands (when available)")
+        st.write("**Gray Dashed Lines:** ATR bands (close ± 2 × ATR)")
         st.write("**Candlesticks:** Green = bullish, Red = bearish")
+        st.write("**Downsampling:** Each point keeps its bucket's open, high, low and close")
     
     st.divider()
     st.caption("Chart auto-refreshes every 5 seconds")
-    
-    # Note about implementation
-    st.info("""
-    **Note:** Full chart functionality requires integration with historical data source.
-    Current implementation shows sample data for demonstration purposes.
-    To enable real data:
-    1. Add historical data fetching to StreamlitDataProvider
-    2. Connect to Binance API or use cached candle data
-    3. Implement ATR band calculations
-    """)
 
 
 def show_trade_history_page():
@@ -1354,6 +1339,36 @@ def _display_trade_table(trades: list, mode: str):
     st.caption(f"Showing {len(trades)} trades • Filtered by: {time_filter} • Auto-refreshes every 5 seconds")
 
 
+@st.cache_data(max_entries=16, show_spinner="Running Monte Carlo simulation...")
+def _monte_carlo_risk(returns, method: str, n_paths: int, leverage_scale: float, ruin_level: float) -> dict:
+    """Run the Monte Carlo simulation, cached across reruns.
+    
+    The page reruns every 5 seconds and a 100k-path simulation takes seconds,
+    so results are cached on the trade returns (hashed by content) and the
+    simulation settings; only new trades or new settings rerun it.
+    
+    Returns:
+        Dictionary with the figures the page displays
+    """
+    from src import monte_carlo
+    
+    result = monte_carlo.simulate(
+        returns,
+        n_paths=n_paths,
+        method=method,
+        leverage_scale=leverage_scale,
+        ruin_level=ruin_level,
+        seed=42
+    )
+    return {
+        'ruin_probability': result.ruin_probability,
+        'loss_probability': result.loss_probability,
+        'summary': result.summary(),
+        'n_paths': result.n_paths,
+        'n_trades': result.n_trades,
+    }
+
+
 def show_analytics_page():
     """Display analytics page."""
     # Initialize data provider and chart generator
@@ -1414,45 +1429,22 @@ def show_analytics_page():
         st.warning(f"No trades found in the selected time period ({time_period})")
         return
     
-    # Calculate metrics
-    total_trades = len(filtered_trades)
-    winning_trades = sum(1 for t in filtered_trades if t.get('pnl', 0) > 0)
-    losing_trades = sum(1 for t in filtered_trades if t.get('pnl', 0) < 0)
-    win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-    
-    total_pnl = sum(t.get('pnl', 0) for t in filtered_trades)
+    # Calculate metrics (shared with the backtest engine)
+    from src import performance_analytics
+    trade_array = performance_analytics.trades_to_array(filtered_trades)
+    metrics = performance_analytics.calculate_metrics(trade_array, 0.0)
+    
+    total_trades = metrics['total_trades']
+    winning_trades = metrics['winning_trades']
+    losing_trades = int((trade_array['pnl'] < 0).sum())
+    breakeven_trades = total_trades - winning_trades - losing_trades
+    win_rate = metrics['win_rate']
+    total_pnl = metrics['total_pnl']
     avg_profit = total_pnl / total_trades if total_trades > 0 else 0.0
-    
-    avg_win = sum(t.get('pnl', 0) for t in filtered_trades if t.get('pnl', 0) > 0) / winning_trades if winning_trades > 0 else 0.0
-    avg_loss = sum(t.get('pnl', 0) for t in filtered_trades if t.get('pnl', 0) < 0) / losing_trades if losing_trades > 0 else 0.0
-    
-    # Calculate Sharpe ratio
-    returns = [t.get('pnl_percent', t.get('return_percentage', 0)) for t in filtered_trades]
-    if returns and len(returns) > 1:
-        import statistics
-        mean_return = statistics.mean(returns)
-        std_dev = statistics.stdev(returns)
-        risk_free_rate = 0.0  # Assuming 0% risk-free rate
-        sharpe_ratio = (mean_return - risk_free_rate) / std_dev if std_dev > 0 else 0.0
-    else:
-        sharpe_ratio = 0.0
-    
-    # Calculate maximum drawdown
-    cumulative_pnl = []
-    running_total = 0
-    for trade in filtered_trades:
-        running_total += trade.get('pnl', 0)
-        cumulative_pnl.append(running_total)
-    
-    max_drawdown = 0.0
-    if cumulative_pnl:
-        peak = cumulative_pnl[0]
-        for value in cumulative_pnl:
-            if value > peak:
-                peak = value
-            drawdown = peak - value
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+    avg_win = metrics['average_win']
+    avg_loss = metrics['average_loss']
+    sharpe_ratio = metrics['sharpe_ratio']
+    max_drawdown = metrics['max_drawdown']
     
     # Display key metrics
     st.subheader(f"Performance Metrics ({time_period})")
@@ -1514,15 +1506,14 @@ def show_analytics_page():
         st.subheader("Trade Statistics")
         st.write(f"**Winning Trades:** {winning_trades}")
         st.write(f"**Losing Trades:** {losing_trades}")
-        st.write(f"**Breakeven Trades:** {total_trades - winning_trades - losing_trades}")
+        st.write(f"**Breakeven Trades:** {breakeven_trades}")
         st.write("")
-        st.write(f"**Best Trade:** ${max(t.get('pnl', 0) for t in filtered_trades):,.2f}")
-        st.write(f"**Worst Trade:** ${min(t.get('pnl', 0) for t in filtered_trades):,.2f}")
+        st.write(f"**Best Trade:** ${trade_array['pnl'].max():,.2f}")
+        st.write(f"**Worst Trade:** ${trade_array['pnl'].min():,.2f}")
         st.write("")
         
-        if avg_loss != 0:
-            profit_factor = abs(avg_win * winning_trades / (avg_loss * losing_trades)) if losing_trades > 0 else float('inf')
-            st.write(f"**Profit Factor:** {profit_factor:.2f}")
+        if losing_trades > 0:
+            st.write(f"**Profit Factor:** {metrics['profit_factor']:.2f}")
         
         if losing_trades > 0 and winning_trades > 0:
             expectancy = (win_rate / 100 * avg_win) - ((1 - win_rate / 100) * abs(avg_loss))
@@ -1537,32 +1528,84 @@ def show_analytics_page():
     
     with col1:
         st.write("**By Side:**")
-        long_trades = [t for t in filtered_trades if t.get('side', '').upper() == 'LONG']
-        short_trades = [t for t in filtered_trades if t.get('side', '').upper() == 'SHORT']
-        
-        if long_trades:
-            long_pnl = sum(t.get('pnl', 0) for t in long_trades)
-            long_win_rate = sum(1 for t in long_trades if t.get('pnl', 0) > 0) / len(long_trades) * 100
-            st.write(f"Long: {len(long_trades)} trades, ${long_pnl:,.2f} PnL, {long_win_rate:.1f}% win rate")
+        for side, data in performance_analytics.breakdown(trade_array, "side").items():
+            st.write(f"{side.title()}: {data['trades']} trades, ${data['total_pnl']:,.2f} PnL, {data['win_rate']:.1f}% win rate")
         
-        if short_trades:
-            short_pnl = sum(t.get('pnl', 0) for t in short_trades)
-            short_win_rate = sum(1 for t in short_trades if t.get('pnl', 0) > 0) / len(short_trades) * 100
-            st.write(f"Short: {len(short_trades)} trades, ${short_pnl:,.2f} PnL, {short_win_rate:.1f}% win rate")
+        by_symbol = performance_analytics.breakdown(trade_array, "symbol")
+        if len(by_symbol) > 1:
+            st.write("")
+            st.write("**By Symbol:**")
+            for symbol, data in sorted(by_symbol.items(), key=lambda x: x[1]['total_pnl'], reverse=True):
+                st.write(f"{symbol}: {data['trades']} trades, ${data['total_pnl']:,.2f} PnL, {data['win_rate']:.1f}% win rate")
     
     with col2:
         st.write("**By Exit Reason:**")
-        exit_reasons = {}
-        for trade in filtered_trades:
-            reason = trade.get('exit_reason', 'UNKNOWN')
-            if reason not in exit_reasons:
-                exit_reasons[reason] = {'count': 0, 'pnl': 0}
-            exit_reasons[reason]['count'] += 1
-            exit_reasons[reason]['pnl'] += trade.get('pnl', 0)
-        
-        for reason, data in sorted(exit_reasons.items(), key=lambda x: x[1]['count'], reverse=True):
-            st.write(f"{reason}: {data['count']} trades, ${data['pnl']:,.2f} PnL")
+        exit_reasons = performance_analytics.breakdown(trade_array, "exit_reason")
+        for reason, data in sorted(exit_reasons.items(), key=lambda x: x[1]['trades'], reverse=True):
+            st.write(f"{reason}: {data['trades']} trades, ${data['total_pnl']:,.2f} PnL")
     
+    # Daily drawdown and rolling Sharpe
+    st.divider()
+    st.subheader("Drawdown & Rolling Sharpe")
+    import numpy as np
+    starting_balance = max(data_provider.get_balance_and_pnl().get('balance', 0.0) - total_pnl, 0.0)
+    daily = performance_analytics.daily_returns(trade_array, starting_balance)
+    # Prepend the starting balance so a losing first day shows as drawdown
+    underwater = performance_analytics.underwater_curve(
+        np.concatenate(([starting_balance], daily.equity))
+    )[1:]
+    rolling = performance_analytics.rolling_sharpe(daily.returns, window=7) if starting_balance > 0 else None
+    underwater_chart = chart_generator.create_underwater_chart(daily.day, underwater, rolling)
+    st.plotly_chart(underwater_chart, use_container_width=True)
+
+    # Monte Carlo risk of the same trades in other orders and at other leverages
+    st.divider()
+    st.subheader("🎲 Monte Carlo Risk")
+
+    if starting_balance <= 0 or total_trades < 10:
+        st.info("ℹ️ Monte Carlo analysis needs at least 10 trades and a known starting balance.")
+    else:
+        from src import monte_carlo
+
+        config_leverage = data_provider.get_config().get('leverage', 1) or 1
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            mc_method = st.selectbox("Resampling", ["block", "bootstrap"], key="mc_method")
+        with col2:
+            mc_paths = st.selectbox("Paths", [10_000, 50_000, 100_000], index=0, key="mc_paths")
+        with col3:
+            mc_leverage = st.number_input("Leverage", min_value=1, max_value=125, value=int(config_leverage), key="mc_leverage")
+        with col4:
+            mc_ruin = st.slider("Ruin at drawdown (%)", min_value=10, max_value=100, value=50, step=5, key="mc_ruin")
+
+        returns = monte_carlo.trade_returns(trade_array, starting_balance)
+        result = _monte_carlo_risk(
+            returns, mc_method, int(mc_paths), mc_leverage / config_leverage, 1 - mc_ruin / 100
+        )
+        summary = result['summary']
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Ruin Probability", f"{result['ruin_probability'] * 100:.2f}%")
+        with col2:
+            st.metric("Loss Probability", f"{result['loss_probability'] * 100:.1f}%")
+        with col3:
+            st.metric("Median Max Drawdown", f"{summary['max_drawdown']['p50'] * 100:.1f}%")
+        with col4:
+            st.metric("95th pct Max Drawdown", f"{summary['max_drawdown']['p95'] * 100:.1f}%")
+
+        import pandas as pd
+        percentile_table = pd.DataFrame({
+            "Max Drawdown (%)": {k: v * 100 for k, v in summary['max_drawdown'].items()},
+            "Terminal Equity (x)": summary['terminal_equity'],
+            "Recovery (trades)": summary['time_to_recovery'],
+        }).T
+        st.dataframe(percentile_table.style.format("{:.2f}"), use_container_width=True)
+        st.caption(
+            f"{result['n_paths']:,} {mc_method} resamples of {result['n_trades']} trades at {mc_leverage}x "
+            f"(trades recorded at {config_leverage}x)"
+        )
+
     # Scaled Take Profit Analytics Section
     st.divider()
     st.subheader("📊 Scaled Take Profit Analytics")
@@ -1486,3 +1486,169 @@ class TestBacktestScaledTP:
         assert backtest_engine_scaled_tp.feature_metrics['scaled_take_profit']['partial_closes'] == 1
         assert backtest_engine_scaled_tp.feature_metrics['scaled_take_profit']['tp1_hits'] == 1
         assert backtest_engine_scaled_tp.feature_metrics['scaled_take_profit']['total_partial_profit'] > 0
+    
+    def _intrabar_position(self):
+        """Create a long position whose 15m bar spans both the stop and TP1."""
+        from src.models import Position
+        
+        position = Position(
+            symbol="BTCUSDT",
+            side="LONG",
+            entry_price=50000.0,
+            quantity=0.1,
+            leverage=3,
+            stop_loss=49000.0,
+            trailing_stop=49000.0,
+            entry_time=0,
+            original_quantity=0.1
+        )
+        candle = Candle(timestamp=900_000, open=50000.0, high=51600.0, low=48900.0, close=49500.0, volume=100.0)
+        return position, candle
+    
+    def test_intrabar_take_profit_before_stop(self, backtest_engine_scaled_tp):
+        """With 5m bars, a TP touched before the stop is taken before stopping out."""
+        from src.intrabar_resolver import IntrabarResolver
+        
+        position, candle = self._intrabar_position()
+        backtest_engine_scaled_tp._intrabar_resolver = IntrabarResolver([
+            Candle(timestamp=900_000, open=50000.0, high=51600.0, low=50000.0, close=51000.0, volume=1.0),
+            Candle(timestamp=1_200_000, open=51000.0, high=51100.0, low=48900.0, close=49200.0, volume=1.0),
+            Candle(timestamp=1_500_000, open=49200.0, high=49600.0, low=49100.0, close=49500.0, volume=1.0),
+        ])
+        
+        exit_reason = backtest_engine_scaled_tp._check_exit_conditions_scaled_tp(position, candle, candle.close)
+        
+        assert exit_reason == "TRAILING_STOP"
+        assert position.tp_levels_hit == [1]
+        assert position.partial_exits[0]['exit_time'] == 900_000
+        assert backtest_engine_scaled_tp.feature_metrics['scaled_take_profit']['tp1_hits'] == 1
+        # The moved stop fills at its own level, not the 15m low
+        stop_fill = backtest_engine_scaled_tp.trades[0].exit_price
+        assert stop_fill == pytest.approx(backtest_engine_scaled_tp.apply_fees_and_slippage(position.partial_exits[0]['new_stop_loss'], "SELL"))
+    
+    def test_intrabar_stop_before_take_profit(self, backtest_engine_scaled_tp):
+        """With 5m bars, a stop touched first closes the position without partials."""
+        from src.intrabar_resolver import IntrabarResolver
+        
+        position, candle = self._intrabar_position()
+        backtest_engine_scaled_tp._intrabar_resolver = IntrabarResolver([
+            Candle(timestamp=900_000, open=50000.0, high=50100.0, low=48900.0, close=49100.0, volume=1.0),
+            Candle(timestamp=1_200_000, open=49100.0, high=51600.0, low=49050.0, close=51000.0, volume=1.0),
+        ])
+        
+        exit_reason = backtest_engine_scaled_tp._check_exit_conditions_scaled_tp(position, candle, candle.close)
+        
+        assert exit_reason == "TRAILING_STOP"
+        assert position.tp_levels_hit == []
+        assert backtest_engine_scaled_tp.trades[0].exit_price == pytest.approx(
+            backtest_engine_scaled_tp.apply_fees_and_slippage(49000.0, "SELL")
+        )
+
+
+class TestEventBacktest:
+    """Regression tests: event-skipping backtest must match the bar-by-bar path."""
+    
+    @staticmethod
+    def _engine(scaled_tp=False):
+        config = Config()
+        config.symbol = "BTCUSDT"
+        config.adx_threshold = 15.0
+        config.rvol_threshold = 0.8
+        config.enable_scaled_take_profit = scaled_tp
+        config.scaled_tp_levels = [
+            {"profit_pct": 0.01, "close_pct": 0.40},
+            {"profit_pct": 0.02, "close_pct": 0.30},
+            {"profit_pct": 0.03, "close_pct": 0.30}
+        ]
+        return BacktestEngine(config, StrategyEngine(config), RiskManager(config, PositionSizer(config)))
+    
+    @staticmethod
+    def _trade_key(trade):
+        return (trade.side, trade.entry_price, trade.exit_price, trade.quantity, trade.pnl, trade.exit_reason)
+    
+    @pytest.mark.parametrize("scaled_tp,with_5m", [(False, False), (True, True)])
+    def test_matches_bar_by_bar(self, scaled_tp, with_5m):
+        """Same trades and equity curve as run_backtest on a regression fixture."""
+        from src.candle_array import to_candles
+        from src.synthetic_data import generate_multi_timeframe
+        
+        data = generate_multi_timeframe(1000, base_timeframe="5m", timeframes=("5m", "15m", "1h"), seed=1)
+        candles_15m = to_candles(data["15m"])
+        candles_1h = to_candles(data["1h"])
+        candles_5m = to_candles(data["5m"]) if with_5m else None
+        
+        reference = self._engine(scaled_tp)
+        expected = reference.run_backtest(candles_15m, candles_1h, 10000.0, candles_5m=candles_5m)
+        engine = self._engine(scaled_tp)
+        metrics = engine.run_event_backtest(candles_15m, candles_1h, 10000.0, candles_5m=candles_5m)
+        
+        assert len(reference.trades) > 0
+        assert [self._trade_key(t) for t in engine.trades] == [self._trade_key(t) for t in reference.trades]
+        assert engine.equity_curve == reference.equity_curve
+        assert metrics['total_pnl'] == expected['total_pnl']
+    
+    def test_falls_back_with_stateful_features(self):
+        """Strategies with adaptive features run through run_backtest."""
+        from unittest.mock import patch
+        
+        engine = self._engine()
+        engine.strategy.volume_profile_analyzer = object()
+        
+        with patch.object(engine, 'run_backtest', return_value={'total_trades': 0}) as run_backtest:
+            result = engine.run_event_backtest([], [], 10000.0)
+        
+        run_backtest.assert_called_once()
+        assert result == {'total_trades': 0}
+    
+    def test_run_settings_do_not_leak(self):
+        """Indicator caching and inline volume profiles apply only while a run lasts."""
+        from src.candle_array import to_candles
+        from src.indicators import IndicatorCalculator
+        from src.synthetic_data import generate_multi_timeframe
+        
+        IndicatorCalculator.disable_caching()
+        engine = self._engine()
+        engine.strategy.background_volume_profile = True
+        assert not IndicatorCalculator.caching_enabled()
+        
+        seen = []
+        update_indicators = engine.strategy.update_indicators
+        
+        def recording_update(*args, **kwargs):
+            seen.append((IndicatorCalculator.caching_enabled(), engine.strategy.background_volume_profile))
+            return update_indicators(*args, **kwargs)
+        
+        engine.strategy.update_indicators = recording_update
+        data = generate_multi_timeframe(400, base_timeframe="15m", timeframes=("15m", "1h"), seed=2)
+        engine.run_backtest(to_candles(data["15m"]), to_candles(data["1h"]), 10000.0)
+        
+        assert seen and set(seen) == {(True, False)}
+        assert not IndicatorCalculator.caching_enabled()
+        assert engine.strategy.background_volume_profile
+    
+    def test_indicator_cache_and_bar_range(self):
+        """Cached indicator values reproduce a fresh run; ranges bound the trades."""
+        from src.candle_array import to_candles
+        from src.synthetic_data import generate_multi_timeframe
+        
+        data = generate_multi_timeframe(900, base_timeframe="15m", timeframes=("15m", "1h"), seed=4)
+        candles_15m = to_candles(data["15m"])
+        candles_1h = to_candles(data["1h"])
+        
+        reference = self._engine()
+        reference.run_event_backtest(candles_15m, candles_1h, 10000.0, start=300, end=700)
+        
+        cache = {}
+        engine = self._engine()
+        engine.run_event_backtest(candles_15m, candles_1h, 10000.0, indicator_cache=cache, start=300, end=700)
+        assert cache
+        
+        # Second run hits the cache only
+        cached = self._engine()
+        cached.run_event_backtest(candles_15m, candles_1h, 10000.0, indicator_cache=cache, start=300, end=700)
+        
+        assert len(reference.trades) > 0
+        assert [self._trade_key(t) for t in cached.trades] == [self._trade_key(t) for t in reference.trades]
+        assert cached.equity_curve == reference.equity_curve
+        assert len(reference.equity_curve) == 1 + 400
+        assert reference.risk_mgr.get_active_position("BTCUSDT") is None
@@ -0,0 +1,181 @@
+"""Unit tests for the benchmark suite.
+
+Tests cover:
+- Running a subset of benchmarks and recording timings
+- Size clamping to each benchmark's max_bars
+- Baseline save/load and regression detection
+- Import-time profiling and lazy loading of optional subsystems
+- Retained-memory measurement and memory-per-symbol benchmarks
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from src import benchmark
+
+
+def make_report(timings):
+    """Build a minimal report from {key: median seconds}."""
+    return {
+        "results": {
+            key: {"name": key.split("@")[0], "n_bars": int(key.split("@")[1]), "repeats": 1,
+                  "best_s": value, "median_s": value, "mean_s": value, "setup_s": 0.0, "error": None}
+            for key, value in timings.items()
+        }
+    }
+
+
+class TestRunSuite:
+    """Unit tests for running benchmarks."""
+
+    def test_run_subset_records_timings(self):
+        """Selected benchmarks run once per size and report positive timings."""
+        report = benchmark.run_suite(
+            names=["synthetic", "indicators.atr"], sizes=[1000, 2000], repeats=1
+        )
+
+        assert set(report["results"]) == {
+            "synthetic.generate_ohlcv@1000", "synthetic.generate_ohlcv@2000",
+            "indicators.atr@1000", "indicators.atr@2000",
+        }
+        for result in report["results"].values():
+            assert result["error"] is None
+            assert result["median_s"] > 0
+
+    def test_sizes_clamped_to_max_bars(self):
+        """Sizes above a benchmark's cap run at the cap once."""
+        cap = benchmark.BENCHMARKS["ml.training_set"].max_bars
+        report = benchmark.run_suite(
+            names=["ml.training_set"], sizes=[cap * 10, cap * 100], repeats=1
+        )
+        assert list(report["results"]) == [f"ml.training_set@{cap}"]
+
+    def test_select_by_prefix(self):
+        """Prefix selection matches whole name components only."""
+        names = [case.name for case in benchmark.select_benchmarks(["indicators"])]
+        assert names and all(name.startswith("indicators.") for name in names)
+        assert benchmark.select_benchmarks(["indicators.at"]) == []
+
+    def test_failing_benchmark_records_error(self):
+        """Exceptions are captured as errors instead of aborting the suite."""
+        def setup(n_bars, seed):
+            raise RuntimeError("boom")
+
+        result = benchmark.run_benchmark(benchmark.BenchmarkCase("broken.case", setup), 10)
+        assert result.error == "boom"
+
+
+class TestBaselines:
+    """Unit tests for baseline storage and comparison."""
+
+    def test_save_and_load_round_trip(self):
+        """Reports survive a JSON round trip."""
+        report = make_report({"indicators.atr@1000": 0.01})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "nested", "baseline.json")
+            benchmark.save_report(report, path)
+            assert benchmark.load_report(path) == report
+
+    def test_compare_flags_regressions(self):
+        """Slowdowns beyond the threshold are regressions; speedups are improvements."""
+        baseline = make_report({
+            "a@1000": 1.0, "b@1000": 1.0, "c@1000": 1.0, "gone@1000": 1.0
+        })
+        current = make_report({
+            "a@1000": 1.1, "b@1000": 1.5, "c@1000": 0.5, "new@1000": 1.0
+        })
+
+        comparisons = {c.key: c for c in benchmark.compare_reports(baseline, current, threshold=0.2)}
+
+        assert comparisons["a@1000"].status == "OK"
+        assert comparisons["b@1000"].status == "REGRESSION"
+        assert comparisons["b@1000"].ratio == pytest.approx(1.5)
+        assert comparisons["c@1000"].status == "IMPROVED"
+        assert comparisons["gone@1000"].status == "MISSING"
+        assert comparisons["new@1000"].status == "NEW"
+        assert benchmark.has_regressions(comparisons.values())
+
+    def test_no_regressions_within_threshold(self):
+        """Comparing a report against itself finds no regressions."""
+        report = make_report({"a@1000": 0.2, "b@1000": 0.3})
+        comparisons = benchmark.compare_reports(report, report)
+        assert not benchmark.has_regressions(comparisons)
+        assert "a@1000" in benchmark.format_comparison(comparisons)
+
+
+class TestImportTime:
+    """Unit tests for the import-time benchmarks."""
+
+    def test_parse_importtime(self):
+        """Header lines are skipped and cumulative times keyed by module."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      2000 |      54321 | src.config\n"
+            "unrelated line\n"
+        )
+        assert benchmark.parse_importtime(output) == {"_io": 120, "src.config": 54321}
+
+    def test_backtest_engine_skips_live_only_dependencies(self):
+        """Backtest workers load neither python-binance nor scikit-learn."""
+        profile = benchmark.import_time_profile("src.backtest_engine")
+        assert "src.backtest_engine" in profile
+        assert "binance" not in profile
+        assert "sklearn" not in profile
+        assert "src.ml_predictor" not in profile
+
+    def test_trading_bot_defers_optional_subsystems(self):
+        """Importing the bot does not load subsystems its config may not use."""
+        profile = benchmark.import_time_profile("src.trading_bot")
+        for module in ("src.backtest_engine", "src.portfolio_backtest", "src.portfolio_manager",
+                       "src.market_replay", "src.heartbeat", "src.ml_predictor", "src.volume_profile_analyzer",
+                       "pynput", "psutil", "sklearn"):
+            assert module not in profile, module
+
+    def test_import_failure_raises(self):
+        """A module that fails to import is reported instead of timed."""
+        with pytest.raises(RuntimeError):
+            benchmark.import_time_profile("src.no_such_module")
+
+    def test_startup_benchmarks_registered(self):
+        """Startup cases run once per suite, whatever sizes are requested."""
+        report = benchmark.run_suite(names=["startup.import_backtest_engine"], sizes=[1000, 10000], repeats=1)
+        assert list(report["results"]) == ["startup.import_backtest_engine@1"]
+        assert report["results"]["startup.import_backtest_engine@1"]["error"] is None
+
+
+class TestMemory:
+    """Unit tests for the memory benchmarks."""
+
+    def test_measure_memory_counts_retained_allocations(self):
+        """Memory held by the return value is counted; temporaries are not."""
+        retained = benchmark.measure_memory(lambda: bytearray(1_000_000))
+        temporary = benchmark.measure_memory(lambda: len(bytearray(1_000_000)))
+
+        assert 1_000_000 <= retained < 1_100_000
+        assert temporary < 10_000
+
+    def test_symbol_buffer_memory_grows_linearly(self):
+        """Buffer memory per symbol stays flat as the portfolio grows."""
+        report = benchmark.run_suite(names=["memory.symbol_buffers"], sizes=[1, 4, 1000], repeats=1)
+
+        results = report["results"]
+        assert list(results) == ["memory.symbol_buffers@1", "memory.symbol_buffers@4", "memory.symbol_buffers@50"]
+        per_symbol = [result["memory_bytes"] / result["n_bars"] for result in results.values()]
+        assert per_symbol[0] > 0
+        assert max(per_symbol) / min(per_symbol) < 1.2
+        assert "Memory/n" in benchmark.format_report(report)
+
+    def test_compare_memory_skips_timing_only_results(self):
+        """Comparing by memory ignores benchmarks that do not record it."""
+        baseline = make_report({"a@1000": 1.0, "m@10": 1.0})
+        current = make_report({"a@1000": 1.0, "m@10": 1.0})
+        baseline["results"]["m@10"]["memory_bytes"] = 1000
+        current["results"]["m@10"]["memory_bytes"] = 2000
+
+        comparisons = benchmark.compare_reports(baseline, current, metric="memory_bytes")
+
+        assert [(c.key, c.status) for c in comparisons] == [("m@10", "REGRESSION")]
+        assert "1000B" in benchmark.format_comparison(comparisons, metric="memory_bytes")
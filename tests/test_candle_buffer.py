@@ -0,0 +1,123 @@
+"""Property-based and unit tests for the keyed candle buffer.
+
+Tests cover:
+- Upsert/extend keep one candle per open time, sorted, bounded by maxlen
+- Point, floor, nearest and range lookups
+- deque-compatible operations (indexing, pop, popleft, clear)
+- Time-based trimming and compaction of dropped entries
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from src.candle_buffer import CandleBuffer
+from src.models import Candle
+
+
+def make_candle(timestamp, close=1.0):
+    return Candle(timestamp=timestamp, open=1.0, high=2.0, low=0.5, close=close, volume=10.0)
+
+
+class TestCandleBufferProperties:
+    """Property-based tests against a dict reference model."""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        operations=st.lists(
+            st.one_of(
+                st.tuples(st.just("upsert"), st.integers(min_value=0, max_value=60)),
+                st.tuples(st.just("extend"), st.lists(st.integers(min_value=0, max_value=60), max_size=15)),
+                st.tuples(st.just("drop_before"), st.integers(min_value=0, max_value=60)),
+            ),
+            max_size=40,
+        ),
+        maxlen=st.one_of(st.none(), st.integers(min_value=1, max_value=20)),
+    )
+    def test_matches_reference_model(self, operations, maxlen):
+        """The buffer holds the newest maxlen distinct open times, latest write wins."""
+        buffer = CandleBuffer(maxlen=maxlen)
+        model = {}
+        for step, (name, arg) in enumerate(operations):
+            if name == "upsert":
+                candle = make_candle(arg, close=step)
+                full = maxlen is not None and len(model) >= maxlen
+                if arg in model or not (full and arg < min(model)):
+                    model[arg] = candle
+                buffer.upsert(candle)
+            elif name == "extend":
+                candles = [make_candle(t, close=step) for t in arg]
+                for candle in candles:
+                    model[candle.timestamp] = candle
+                buffer.extend(candles)
+            else:
+                model = {t: c for t, c in model.items() if t >= arg}
+                buffer.drop_before(arg)
+            if maxlen is not None:
+                model = {t: model[t] for t in sorted(model)[-maxlen:]}
+
+            assert buffer.timestamps() == sorted(model)
+            assert buffer.to_list() == [model[t] for t in sorted(model)]
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        timestamps=st.sets(st.integers(min_value=0, max_value=1000), min_size=1, max_size=30),
+        query=st.integers(min_value=-10, max_value=1010),
+    )
+    def test_lookups_match_linear_scan(self, timestamps, query):
+        buffer = CandleBuffer((make_candle(t) for t in timestamps), maxlen=None)
+        ordered = sorted(timestamps)
+
+        below = [t for t in ordered if t <= query]
+        floor = buffer.floor(query)
+        assert (floor.timestamp if floor else None) == (below[-1] if below else None)
+        assert buffer.nearest(query).timestamp == min(ordered, key=lambda t: (abs(t - query), t))
+        assert [c.timestamp for c in buffer.range(query, query + 100)] == [
+            t for t in ordered if query <= t <= query + 100
+        ]
+        assert (buffer.get(query) is not None) == (query in timestamps)
+
+
+class TestCandleBufferUnit:
+    """Unit tests for CandleBuffer."""
+
+    def test_latest_bar_update_replaces_in_place(self):
+        buffer = CandleBuffer([make_candle(0), make_candle(1)], maxlen=3)
+
+        assert buffer.append(make_candle(1, close=5.0)) is False
+        assert buffer.append(make_candle(2)) is True
+        assert buffer.append(make_candle(3)) is True
+
+        assert buffer.timestamps() == [1, 2, 3]
+        assert buffer[0].close == 5.0
+        assert buffer[-1].timestamp == 3
+        assert [c.timestamp for c in buffer[1:]] == [2, 3]
+
+    def test_full_buffer_ignores_older_candles(self):
+        buffer = CandleBuffer([make_candle(t) for t in range(5, 10)], maxlen=5)
+
+        assert buffer.upsert(make_candle(1)) is False
+        assert buffer.timestamps() == [5, 6, 7, 8, 9]
+
+    def test_deque_operations(self):
+        buffer = CandleBuffer([make_candle(t) for t in range(3)])
+
+        assert buffer.popleft().timestamp == 0
+        assert buffer.pop().timestamp == 2
+        assert len(buffer) == 1 and buffer
+        buffer.clear()
+        assert not buffer
+        with pytest.raises(IndexError):
+            buffer.pop()
+        with pytest.raises(IndexError):
+            buffer[0]
+        assert buffer.maxlen == 500
+
+    def test_trimming_compacts_dropped_entries(self):
+        buffer = CandleBuffer(maxlen=10)
+        for t in range(1000):
+            buffer.upsert(make_candle(t))
+
+        assert buffer.timestamps() == list(range(990, 1000))
+        assert len(buffer._times) < 100
+        assert buffer.drop_before(995) == 5
+        assert buffer.latest(3) == buffer.to_list()[-3:]
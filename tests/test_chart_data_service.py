@@ -0,0 +1,283 @@
+"""Property-based and unit tests for the chart data service.
+
+Tests cover:
+- OHLC-preserving downsampling bounded by max_points
+- VWAP and ATR overlays matching IndicatorCalculator
+- Candle store persistence, range loading and tail-file appends
+- Chart payload building from buffers and store
+"""
+
+import os
+import tempfile
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src.candle_array import CANDLE_DTYPE, candles_to_array, merge_candle_arrays
+from src.chart_data_service import (
+    CandleStore,
+    ChartData,
+    ChartDataService,
+    calculate_atr_series,
+    calculate_vwap_series,
+    downsample_ohlc,
+    slice_time_range,
+)
+from src.indicators import IndicatorCalculator
+from src.models import Candle
+
+
+FIVE_MIN_MS = 5 * 60 * 1000
+
+
+def make_candles(n: int, start: int = 1_700_000_000_000, seed: int = 0) -> np.ndarray:
+    """Create a random-walk structured candle array."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.append(100.0, close[:-1])
+    spread = rng.uniform(0.1, 2.0, n)
+    candles = np.empty(n, dtype=CANDLE_DTYPE)
+    candles["timestamp"] = start + np.arange(n) * FIVE_MIN_MS
+    candles["open"] = open_
+    candles["close"] = close
+    candles["high"] = np.maximum(open_, close) + spread
+    candles["low"] = np.minimum(open_, close) - spread
+    candles["volume"] = rng.uniform(10, 1000, n)
+    return candles
+
+
+def to_candle_objects(arr: np.ndarray):
+    """Convert a structured array back to Candle objects."""
+    return [
+        Candle(int(r["timestamp"]), float(r["open"]), float(r["high"]),
+               float(r["low"]), float(r["close"]), float(r["volume"]))
+        for r in arr
+    ]
+
+
+# Feature: chart-data-service, Property 1: OHLC Envelope Preservation
+@given(
+    n=st.integers(min_value=1, max_value=3000),
+    max_points=st.integers(min_value=1, max_value=500),
+    seed=st.integers(min_value=0, max_value=1000)
+)
+@settings(max_examples=100, deadline=None)
+def test_downsample_preserves_ohlc_envelope(n, max_points, seed):
+    """For any candle series, downsampling must stay within max_points and keep
+    the first open, last close, global high/low and total volume."""
+    candles = make_candles(n, seed=seed)
+    result = downsample_ohlc(candles, max_points)
+
+    assert len(result) <= max_points
+    assert result["open"][0] == candles["open"][0]
+    assert result["close"][-1] == candles["close"][-1]
+    assert result["high"].max() == candles["high"].max()
+    assert result["low"].min() == candles["low"].min()
+    assert np.isclose(result["volume"].sum(), candles["volume"].sum())
+    assert np.all(np.diff(result["timestamp"]) > 0)
+
+
+class TestOverlays:
+    """Unit tests for overlay calculations."""
+
+    def test_atr_series_matches_indicator_calculator(self):
+        """ATR series must equal IndicatorCalculator.calculate_atr at each bar."""
+        candles = make_candles(80, seed=3)
+        objects = to_candle_objects(candles)
+        atr = calculate_atr_series(candles, 14)
+
+        assert np.all(np.isnan(atr[:14]))
+        for i in (14, 15, 40, 79):
+            expected = IndicatorCalculator.calculate_atr(objects[:i + 1], 14)
+            assert atr[i] == pytest.approx(expected, rel=1e-9)
+
+    def test_vwap_series_matches_indicator_calculator(self):
+        """VWAP series must equal the weekly anchored VWAP and reset on Monday."""
+        # Start on a Sunday so the series crosses a weekly anchor
+        sunday = 1_700_352_000_000  # 2023-11-19 00:00 UTC
+        candles = make_candles(600, start=sunday, seed=5)
+        objects = to_candle_objects(candles)
+        vwap = calculate_vwap_series(candles)
+
+        monday = sunday + 24 * 60 * 60 * 1000
+        first_monday_idx = int(np.searchsorted(candles["timestamp"], monday))
+        for i in (0, 100, first_monday_idx, first_monday_idx + 50, 599):
+            anchor = sunday - 6 * 24 * 60 * 60 * 1000 if i < first_monday_idx else monday
+            expected = IndicatorCalculator.calculate_vwap(objects[:i + 1], anchor)
+            assert vwap[i] == pytest.approx(expected, rel=1e-9)
+
+
+class TestArrayHelpers:
+    """Unit tests for array conversion and merging."""
+
+    def test_candles_to_array_from_dicts_and_objects(self):
+        """Dicts and Candle objects convert to the same structured array."""
+        arr = make_candles(5)
+        from_objects = candles_to_array(to_candle_objects(arr))
+        from_dicts = candles_to_array([
+            {name: r[name] for name in CANDLE_DTYPE.names} for r in arr
+        ])
+        np.testing.assert_array_equal(from_objects, arr)
+        np.testing.assert_array_equal(from_dicts, arr)
+        assert len(candles_to_array([])) == 0
+
+    def test_merge_deduplicates_with_later_source_winning(self):
+        """Overlapping timestamps keep the candle from the later array."""
+        old = make_candles(10, seed=1)
+        new = make_candles(10, start=int(old["timestamp"][5]), seed=2)
+        merged = merge_candle_arrays(old, new)
+
+        assert len(merged) == 15
+        assert np.all(np.diff(merged["timestamp"]) > 0)
+        np.testing.assert_array_equal(merged[5:], new)
+
+    def test_slice_time_range_is_inclusive(self):
+        """Range slicing includes both bounds."""
+        candles = make_candles(10)
+        ts = candles["timestamp"]
+        result = slice_time_range(candles, int(ts[2]), int(ts[6]))
+        np.testing.assert_array_equal(result["timestamp"], ts[2:7])
+
+
+class TestCandleStore:
+    """Unit tests for CandleStore."""
+
+    def test_append_and_load_round_trip(self):
+        """Appended candles load back sorted and deduplicated."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = CandleStore(os.path.join(temp_dir, "candles"))
+            candles = make_candles(100)
+
+            store.append("BTCUSDT", "5m", candles[:60])
+            count = store.append("BTCUSDT", "5m", to_candle_objects(candles[50:]))
+
+            assert count == 100
+            np.testing.assert_array_equal(store.load("BTCUSDT", "5m"), candles)
+            assert store.last_timestamp("BTCUSDT", "5m") == int(candles["timestamp"][-1])
+
+    def test_load_range_and_missing(self):
+        """Range loads return only the requested rows; missing files are empty."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = CandleStore(temp_dir)
+            candles = make_candles(50)
+            store.append("ETHUSDT", "15m", candles)
+
+            ts = candles["timestamp"]
+            result = store.load("ETHUSDT", "15m", int(ts[10]), int(ts[19]))
+            assert len(result) == 10
+            assert len(store.load("ETHUSDT", "1h")) == 0
+            assert store.last_timestamp("ETHUSDT", "1h") is None
+
+    def test_max_rows_drops_oldest(self):
+        """Store keeps only the newest max_rows candles."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = CandleStore(temp_dir, max_rows=30)
+            candles = make_candles(50)
+            store.append("BTCUSDT", "5m", candles)
+
+            np.testing.assert_array_equal(store.load("BTCUSDT", "5m"), candles[-30:])
+
+
+    def test_appends_go_to_tail_until_compaction(self):
+        """Appends leave the .npy file untouched until the tail is compacted."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = CandleStore(temp_dir, compact_rows=11)
+            candles = make_candles(40)
+            store.append("BTCUSDT", "5m", candles[:20])
+            npy_stat = os.stat(store.path("BTCUSDT", "5m"))
+
+            for i in range(20, 29):
+                assert store.append("BTCUSDT", "5m", candles[i:i + 1]) == i + 1
+            # A revised last candle replaces the stored one
+            revised = candles[28:29].copy()
+            revised["close"] = 1.0
+            assert store.append("BTCUSDT", "5m", revised) == 29
+
+            after = os.stat(store.path("BTCUSDT", "5m"))
+            assert (after.st_mtime_ns, after.st_size) == (npy_stat.st_mtime_ns, npy_stat.st_size)
+            loaded = store.load("BTCUSDT", "5m")
+            assert len(loaded) == 29 and loaded["close"][-1] == 1.0
+            assert store.last_timestamp("BTCUSDT", "5m") == int(candles["timestamp"][28])
+            assert len(store.load("BTCUSDT", "5m", int(candles["timestamp"][25]))) == 4
+
+            # The eleventh tail row triggers a compaction
+            assert store.append("BTCUSDT", "5m", candles[29:30]) == 30
+            assert not os.path.exists(store.tail_path("BTCUSDT", "5m"))
+            loaded = np.load(store.path("BTCUSDT", "5m"))
+            assert len(loaded) == 30 and loaded["close"][28] == 1.0
+
+    def test_partial_tail_row_ignored(self):
+        """A row still being written to the tail is not read."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = CandleStore(temp_dir)
+            candles = make_candles(12)
+            store.append("BTCUSDT", "5m", candles[:10])
+            store.append("BTCUSDT", "5m", candles[10:11])
+            with open(store.tail_path("BTCUSDT", "5m"), "ab") as f:
+                f.write(candles[11:12].tobytes()[:20])
+
+            np.testing.assert_array_equal(store.load("BTCUSDT", "5m"), candles[:11])
+
+            store.replace("BTCUSDT", "5m", candles[:5])
+            np.testing.assert_array_equal(store.load("BTCUSDT", "5m"), candles[:5])
+
+
+class TestChartDataService:
+    """Unit tests for ChartDataService."""
+
+    def test_payload_bounded_by_max_points(self):
+        """Months of 5m candles reduce to at most max_points per series."""
+        candles = make_candles(30_000)
+        service = ChartDataService()
+        data = service.build_chart_data("BTCUSDT", "5m", candles, max_points=800)
+
+        assert isinstance(data, ChartData)
+        assert data.source_points == 30_000
+        assert len(data.candles) <= 800
+        assert len(data.vwap) == len(data.candles)
+        assert len(data.atr_upper) == len(data.candles)
+        assert len(data.atr_lower) == len(data.candles)
+        assert np.all(data.atr_upper[~np.isnan(data.atr_upper)] >= data.atr_lower[~np.isnan(data.atr_lower)])
+
+        payload = data.to_dict()
+        assert len(payload["close"]) == len(data.candles)
+
+    def test_merges_store_and_buffers(self):
+        """Store history and live buffers are merged without duplicates."""
+        candles = make_candles(200)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = CandleStore(temp_dir)
+            store.append("BTCUSDT", "15m", candles[:150])
+
+            data_manager = Mock()
+            # Buffers may contain the same candle twice after repeated fetches
+            buffer = to_candle_objects(candles[120:]) + to_candle_objects(candles[190:])
+            data_manager.get_latest_candles.return_value = buffer
+
+            service = ChartDataService(data_manager=data_manager, store=store)
+            result = service.get_candles("BTCUSDT", "15m")
+
+            np.testing.assert_array_equal(result, candles)
+
+    def test_markers_within_range_only(self):
+        """Only positions for the symbol inside the charted range are marked."""
+        candles = make_candles(100)
+        ts = candles["timestamp"]
+        positions = [
+            {"symbol": "BTCUSDT", "side": "LONG", "entry_price": 101.0, "entry_time": int(ts[10])},
+            {"symbol": "BTCUSDT", "side": "SHORT", "entry_price": 99.0, "entry_time": int(ts[0]) - FIVE_MIN_MS},
+            {"symbol": "ETHUSDT", "side": "LONG", "entry_price": 10.0, "entry_time": int(ts[20])},
+        ]
+        data = ChartDataService().build_chart_data("BTCUSDT", "5m", candles, positions=positions)
+
+        assert len(data.markers) == 1
+        assert data.markers[0]["time"] == int(ts[10])
+        assert data.markers[0]["side"] == "LONG"
+
+    def test_empty_source_returns_empty_chart(self):
+        """No candles yields an empty ChartData."""
+        data = ChartDataService().get_chart_data("BTCUSDT", "5m")
+        assert data.is_empty
+        assert data.source_points == 0
@@ -5,6 +5,7 @@ from hypothesis import given, strategies as st, assume, settings
 from datetime import datetime
 from unittest.mock import Mock, MagicMock, patch
 import time
+from collections import deque
 
 from src.data_manager import DataManager
 from src.models import Candle
@@ -536,6 +537,46 @@ class TestDataManagerUnit:
         # First candle should be from index 100 (600 - 500)
         assert data_manager.candles_15m[0].open == 30100.0
 
+    
+    def test_legacy_buffers_are_views_of_primary_symbol(self):
+        """candles_15m etc. share config.symbol's buffer instead of copying it."""
+        config = Config()
+        config.symbol = "BTCUSDT"
+        data_manager = DataManager(config, client=Mock())
+        candle = Candle(timestamp=1609459200000, open=1.0, high=1.0, low=1.0, close=1.0, volume=1.0)
+        
+        data_manager.on_candle_update(candle, '15m')
+        data_manager.on_candle_update(candle, '15m', symbol="ETHUSDT")
+        
+        assert data_manager.candles_15m is data_manager._symbol_buffers["BTCUSDT"]["15m"]
+        assert list(data_manager.candles_15m) == [candle]
+        
+        later = Candle(timestamp=1609460100000, open=2.0, high=2.0, low=2.0, close=2.0, volume=1.0)
+        data_manager.candles_15m = deque([candle, later, candle], maxlen=500)
+        assert data_manager.get_latest_candles('15m', 10) == [candle, later]
+        assert data_manager.get_latest_candles('15m', 10, symbol="ETHUSDT") == [candle]
+    
+    def test_refetch_and_updates_do_not_duplicate_candles(self):
+        """Repeated fetches and WebSocket updates keep one candle per open time."""
+        config = Config()
+        config.symbol = "BTCUSDT"
+        data_manager = DataManager(config, client=Mock())
+        klines = [
+            [1609459200000 + i * 900000, "1.0", "2.0", "0.5", "1.5", "10.0", 0, "0", 0, "0", "0", "0"]
+            for i in range(10)
+        ]
+        data_manager.client.futures_klines.return_value = klines
+        
+        data_manager.fetch_historical_data(days=1, timeframe='15m', use_cache=False)
+        data_manager.fetch_historical_data(days=1, timeframe='15m', use_cache=False)
+        updated = Candle(timestamp=klines[-1][0], open=1.0, high=3.0, low=0.5, close=2.5, volume=20.0)
+        data_manager.on_candle_update(updated, '15m')
+        
+        candles = data_manager.get_latest_candles('15m', 100)
+        assert [c.timestamp for c in candles] == [k[0] for k in klines]
+        assert candles[-1] is updated
+        assert data_manager._find_candle_at_timestamp('15m', klines[3][0] + 60000).timestamp == klines[3][0]
+
 
 class TestMultiTimeframeDataManager:
     """Unit tests for multi-timeframe data management."""
@@ -0,0 +1,139 @@
+"""Property-based and unit tests for candle history validation and repair.
+
+Tests cover:
+- Vectorized gap, duplicate and out-of-order detection matches a scalar scan
+- Sorting and deduplicating candles
+- Targeted refetches of only the missing ranges, with per-symbol metrics
+- Repairing streamed buffers after a WebSocket reconnect
+"""
+
+import time
+from dataclasses import replace
+from unittest.mock import Mock
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from src.candle_array import to_candles
+from src.config import Config
+from src.data_manager import DataManager
+from src.data_quality import GAP_TOLERANCE, find_issues, normalize_candles
+from src.synthetic_data import generate_ohlcv
+
+
+FIFTEEN_MIN_MS = 900_000
+
+
+def kline(candle):
+    return [candle.timestamp, str(candle.open), str(candle.high), str(candle.low),
+            str(candle.close), str(candle.volume)]
+
+
+def serving_client(source, drop=()):
+    """Mock client answering futures_klines from source, omitting open times in drop on the first call."""
+    client = Mock()
+    calls = []
+
+    def futures_klines(symbol, interval, startTime=None, endTime=None, limit=None):
+        calls.append((startTime, endTime))
+        candles = [c for c in source
+                   if (startTime is None or c.timestamp >= startTime) and (endTime is None or c.timestamp <= endTime)]
+        if len(calls) == 1:
+            candles = [c for c in candles if c.timestamp not in drop]
+        return [kline(c) for c in candles][:limit]
+
+    client.futures_klines.side_effect = futures_klines
+    return client, calls
+
+
+def make_manager(client=None):
+    config = Config()
+    config.symbol = "BTCUSDT"
+    return DataManager(config, client)
+
+
+class TestFindIssuesProperties:
+    """Property-based tests for the vectorized validator."""
+
+    @settings(max_examples=200, deadline=None)
+    @given(steps=st.lists(st.sampled_from([0, 1, 1, 1, 1, 2, 3, 7, -1]), min_size=0, max_size=60))
+    def test_matches_scalar_scan(self, steps):
+        interval = FIFTEEN_MIN_MS
+        timestamps = [1_700_000_100_000]
+        for step in steps:
+            timestamps.append(timestamps[-1] + step * interval)
+
+        report = find_issues(timestamps, interval)
+
+        unique = sorted(set(timestamps))
+        gaps = [(a, b) for a, b in zip(unique, unique[1:]) if b - a > interval * GAP_TOLERANCE]
+        assert report.candles == len(timestamps)
+        assert report.duplicates == len(timestamps) - len(unique)
+        assert report.out_of_order == sum(1 for a, b in zip(timestamps, timestamps[1:]) if b < a)
+        assert report.gaps == [(a + interval, b - 1) for a, b in gaps]
+        assert report.missing_bars == sum((b - a) // interval - 1 for a, b in gaps)
+        assert report.is_clean == (not gaps and len(unique) == len(timestamps) and report.out_of_order == 0)
+
+
+class TestDataQualityUnit:
+    """Unit tests for normalize_candles and the metrics."""
+
+    def test_normalize_keeps_latest_copy_in_order(self):
+        candles = to_candles(generate_ohlcv(5, timeframe="15m"))
+        revised = replace(candles[2], close=1.0)
+
+        result = normalize_candles([candles[3], candles[0], candles[2], candles[1], revised, candles[4]])
+
+        assert [c.timestamp for c in result] == [c.timestamp for c in candles]
+        assert result[2].close == 1.0
+        assert normalize_candles([]) == []
+
+
+class TestGapRepair:
+    """Test DataManager refetching only the missing ranges."""
+
+    def test_fetch_refetches_only_missing_ranges(self):
+        source = to_candles(generate_ohlcv(200, timeframe="15m", start_time=int(time.time() * 1000) - 200 * FIFTEEN_MIN_MS))
+        dropped = {source[i].timestamp for i in (20, 21, 22, 90, 150)}
+        client, calls = serving_client(source, drop=dropped)
+        data_manager = make_manager(client)
+
+        candles = data_manager.fetch_historical_data(days=3, timeframe="15m", use_cache=False)
+
+        assert candles == source
+        assert calls[1:] == [
+            (source[20].timestamp, source[23].timestamp - 1),
+            (source[90].timestamp, source[91].timestamp - 1),
+            (source[150].timestamp, source[151].timestamp - 1),
+        ]
+        metrics = data_manager.get_data_quality()["BTCUSDT"]["15m"]
+        assert metrics["gaps"] == 3 and metrics["missing_bars"] == 5
+        assert metrics["refetches"] == 3 and metrics["refetched_bars"] == 5
+        assert metrics["unrepaired_gaps"] == 0
+
+    def test_unfillable_gap_still_rejected(self):
+        source = to_candles(generate_ohlcv(50, timeframe="15m", start_time=int(time.time() * 1000) - 50 * FIFTEEN_MIN_MS))
+        del source[10:12]
+        client, calls = serving_client(source)
+        data_manager = make_manager(client)
+
+        with pytest.raises(ValueError, match="1 gap"):
+            data_manager.fetch_historical_data(days=1, timeframe="15m", use_cache=False)
+        assert len(calls) == 2
+        assert data_manager.get_data_quality()["BTCUSDT"]["15m"]["unrepaired_gaps"] == 1
+
+    def test_reconnect_repairs_buffers(self):
+        now_ms = int(time.time() * 1000)
+        start = (now_ms // FIFTEEN_MIN_MS - 120) * FIFTEEN_MIN_MS
+        source = to_candles(generate_ohlcv(121, timeframe="15m", start_time=start))
+        client, calls = serving_client(source)
+        data_manager = make_manager(client)
+        data_manager.stream_timeframes = lambda: ["15m"]
+        # A hole inside the buffer and a stream that stopped 20 bars ago
+        data_manager.load_buffer("ETHUSDT", "15m", source[:40] + source[45:100])
+
+        added = data_manager.repair_buffers()
+
+        assert added == 5 + 21
+        assert data_manager.get_latest_candles("15m", 500, symbol="ETHUSDT") == source
+        assert calls[0] == (source[40].timestamp, source[45].timestamp - 1)
@@ -0,0 +1,244 @@
+"""Property-based and unit tests for the exchange symbol-metadata cache.
+
+Tests cover:
+- Vectorized step and tick rounding matches the scalar path
+- Parsing futures_exchange_info filters and minimum order quantities
+- Loading once, persisting, refreshing stale files and falling back on errors
+- PositionSizer, ScaledTakeProfitManager and OrderExecutor using symbol filters
+- Rejection and retry rates per 1000 orders
+"""
+
+import json
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from src.config import Config
+from src.exchange_info import (
+    ExchangeInfoCache,
+    SymbolFilters,
+    floor_to_step,
+    is_quantity_rounded,
+    round_to_tick,
+)
+from src.market_replay import FRAME_DTYPE, FRAME_KLINE, FakeExchangeClient, FrameLog
+from src.models import Position
+from src.order_executor import OrderExecutor
+from src.position_sizer import PositionSizer
+from src.scaled_tp_manager import ScaledTakeProfitManager
+
+
+# XAUUSDT-style symbol: coarse lot step and a minimum notional
+GOLD_FILTERS = {"tick_size": 0.01, "step_size": 0.01, "min_qty": 0.01, "max_qty": 1000.0, "min_notional": 5.0}
+
+
+def fake_exchange(price=2500.0):
+    """Fake exchange quoting BTCUSDT (default filters) and XAUUSDT (gold filters)."""
+    symbols = ["BTCUSDT", "XAUUSDT"]
+    frames = np.zeros(len(symbols), dtype=FRAME_DTYPE)
+    for index in range(len(symbols)):
+        frames[index] = (FRAME_KLINE, 1, 0, index, 1, 1, 0, price, price, price, price, 1.0)
+    client = FakeExchangeClient(
+        FrameLog(frames=frames, symbols=symbols, intervals=["5m"]),
+        initial_balance=1e6, symbol_filters={"XAUUSDT": GOLD_FILTERS}
+    )
+    for frame in frames:
+        client.apply_frame(frame)
+    return client
+
+
+def loaded_cache(client=None):
+    cache = ExchangeInfoCache(client or fake_exchange())
+    assert cache.load()
+    return cache
+
+
+def executor_for(client):
+    executor = OrderExecutor(Config(), client=client)
+    executor._authenticated = True
+    executor._permissions_validated = True
+    executor.base_backoff = 0.0
+    return executor
+
+
+class TestRoundingProperties:
+    """Property-based tests for step and tick rounding."""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        quantities=st.lists(st.floats(min_value=0, max_value=1e5, allow_nan=False), min_size=1, max_size=50),
+        step=st.sampled_from([1.0, 0.1, 0.01, 0.001, 0.0001, 10.0]),
+    )
+    def test_floor_to_step_is_largest_multiple_below(self, quantities, step):
+        """Rounded quantities are whole steps, never larger and less than one step smaller."""
+        rounded = floor_to_step(np.array(quantities), step)
+
+        for quantity, value in zip(quantities, rounded):
+            assert is_quantity_rounded(value, step)
+            assert value <= quantity + step * 1e-6
+            assert quantity - value < step * (1 + 1e-6)
+            assert value == floor_to_step(quantity, step)
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        start=st.floats(min_value=0.5, max_value=5e4),
+        tick=st.sampled_from([0.1, 0.01, 0.001, 0.5]),
+    )
+    def test_price_ladder_rounds_to_nearest_tick(self, start, tick):
+        ladder = start * np.array([1.0, 1.03, 1.05, 1.08])
+
+        rounded = round_to_tick(ladder, tick)
+
+        assert rounded.shape == ladder.shape
+        assert np.all(np.abs(rounded - ladder) <= tick / 2 + 1e-9)
+        assert all(is_quantity_rounded(price, tick) for price in rounded)
+
+
+class TestSymbolFilters:
+    """Unit tests for SymbolFilters."""
+
+    def test_parses_exchange_info_entry(self):
+        entry = {
+            "symbol": "XAUUSDT",
+            "filters": [
+                {"filterType": "PRICE_FILTER", "tickSize": "0.01"},
+                {"filterType": "LOT_SIZE", "stepSize": "0.001", "minQty": "0.001", "maxQty": "500"},
+                {"filterType": "MARKET_LOT_SIZE", "stepSize": "0.01", "minQty": "0.01", "maxQty": "100"},
+                {"filterType": "MIN_NOTIONAL", "notional": "5"},
+            ],
+        }
+
+        filters = SymbolFilters.from_exchange(entry)
+
+        assert filters.step_size == 0.001 and filters.market_step_size == 0.01
+        assert filters.round_quantity(0.0199) == 0.01
+        assert filters.round_quantity(0.0199, market=False) == 0.019
+        # 5 USDT at 2500 is 0.002, raised to the market minimum of 0.01
+        assert filters.min_order_quantity(2500.0) == 0.01
+        assert filters.min_order_quantity(100.0) == 0.05
+        assert filters.check_order(0.01, 100.0) is not None
+        assert filters.check_order(0.01, 100.0, reduce_only=True) is None
+        assert filters.check_order(101.0) is not None
+
+
+class TestExchangeInfoCache:
+    """Test loading, persisting and refreshing the cache."""
+
+    def test_loads_once_and_persists(self, tmp_path):
+        path = str(tmp_path / "exchange_info.json")
+        client = Mock(wraps=fake_exchange())
+        first = ExchangeInfoCache(client, cache_file=path)
+
+        assert first.load()
+        assert first.get("XAUUSDT").step_size == 0.01
+        assert first.get("UNKNOWN") is None
+        assert first.round_quantity("UNKNOWN", 0.123456) == 0.123456
+
+        second = ExchangeInfoCache(client, cache_file=path)
+        assert second.load()
+        assert second.get("XAUUSDT") == first.get("XAUUSDT")
+        client.futures_exchange_info.assert_called_once()
+
+    def test_stale_file_refreshed_and_kept_on_failure(self, tmp_path):
+        path = tmp_path / "exchange_info.json"
+        ExchangeInfoCache(fake_exchange(), cache_file=str(path)).load()
+        data = json.loads(path.read_text())
+        data["fetched_at"] = time.time() - 7200
+        path.write_text(json.dumps(data))
+
+        client = Mock()
+        client.futures_exchange_info.side_effect = RuntimeError("down")
+        cache = ExchangeInfoCache(client, cache_file=str(path), max_age_seconds=3600)
+
+        assert cache.load()
+        client.futures_exchange_info.assert_called_once()
+        assert cache.get("XAUUSDT").min_notional == 5.0
+
+    def test_background_refresh(self):
+        client = Mock(wraps=fake_exchange())
+        cache = ExchangeInfoCache(client, max_age_seconds=0.01)
+        cache.start()
+        deadline = time.time() + 5
+        while client.futures_exchange_info.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        cache.stop()
+
+        assert client.futures_exchange_info.call_count >= 2
+        assert cache.symbols == 2
+
+
+class TestFilterConsumers:
+    """Test sizing, partial closes and orders using the symbol filters."""
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        wallet_balance=st.floats(min_value=100, max_value=1e5),
+        atr=st.floats(min_value=0.5, max_value=500),
+    )
+    def test_position_size_is_accepted_by_exchange(self, wallet_balance, atr):
+        sizer = PositionSizer(Config())
+        sizer.exchange_info = loaded_cache()
+
+        result = sizer.calculate_position_size(wallet_balance, 2500.0, atr, symbol="XAUUSDT")
+
+        filters = sizer.exchange_info.get("XAUUSDT")
+        assert is_quantity_rounded(result["quantity"], filters.step_size)
+        assert result["margin_required"] == pytest.approx(result["quantity"] * 2500.0 / sizer.config.leverage)
+        if result["margin_required"] < wallet_balance * 0.99:
+            assert filters.check_order(result["quantity"], 2500.0) is None
+
+    def test_partial_close_uses_symbol_minimum(self):
+        config = Config(enable_scaled_take_profit=True, scaled_tp_min_order_size=0.001)
+        manager = ScaledTakeProfitManager(config)
+        manager.exchange_info = loaded_cache()
+        position = Position(
+            symbol="XAUUSDT", side="LONG", entry_price=2500.0, quantity=0.02, leverage=1,
+            stop_loss=2400.0, trailing_stop=2400.0, entry_time=0, unrealized_pnl=0.0, original_quantity=0.02
+        )
+
+        # Every partial rounds down below the 0.01 lot (0.001 would have been sent and rejected)
+        assert manager._check_minimum_order_size(position, 0.008, 1, 0.4)["action"] == "fallback"
+        assert manager.check_take_profit_levels(position, 2575.0) is None
+
+        position.quantity = position.original_quantity = 0.05
+        action = manager.check_take_profit_levels(position, 2575.0)
+        assert action.quantity == 0.02
+
+    def test_orders_rounded_before_sending(self):
+        client = fake_exchange()
+        executor = executor_for(client)
+
+        with pytest.raises(Exception):
+            executor.place_market_order("XAUUSDT", "BUY", 0.0123)
+        assert client.rejections == 3
+        assert executor.order_stats.per_thousand() == {"rejected_per_1k": 1000.0, "retried_per_1k": 2000.0 / 3}
+
+        executor.exchange_info = loaded_cache(client)
+        order = executor.place_market_order("XAUUSDT", "BUY", 0.0123)
+        stop = executor.place_stop_loss_order("XAUUSDT", "SELL", 0.01, 2400.004)
+
+        assert float(order["executedQty"]) == 0.01
+        assert float(stop["stopPrice"]) == 2400.0
+        with pytest.raises(ValueError, match="below minimum"):
+            executor.place_market_order("XAUUSDT", "BUY", 0.005)
+        assert executor.order_stats.blocked == 1
+        assert client.rejections == 3
+
+    def test_batch_legs_breaking_filters_are_not_sent(self):
+        client = fake_exchange()
+        executor = executor_for(client)
+        executor.exchange_info = loaded_cache(client)
+        orders = [
+            {"symbol": "XAUUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.0571},
+            {"symbol": "XAUUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.005},
+        ]
+
+        results = executor.place_batch_orders(orders)
+
+        assert results[0].success and results[0].request["quantity"] == 0.05
+        assert not results[1].success and results[1].attempts == 0
+        assert executor.order_stats.submitted == 1
+        assert client.rejections == 0
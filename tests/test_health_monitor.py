@@ -419,3 +419,27 @@ def test_health_check_result_is_healthy():
     result.websocket_connected = True
     result.critical_errors = ["Error 1"]
     assert result.is_healthy() is False
+
+
+def test_health_check_includes_instrumentation_snapshot():
+    """Health checks carry the instrumentation snapshot only when enabled."""
+    from src import instrumentation
+    
+    monitor = HealthMonitor()
+    registry = instrumentation.get_instrumentation()
+    previous = registry.enabled
+    try:
+        registry.enabled = False
+        assert monitor.perform_health_check().instrumentation == {}
+        
+        registry.enabled = True
+        registry.reset()
+        with instrumentation.timer("stage.update_indicators", symbol="BTCUSDT"):
+            pass
+        
+        result = monitor.perform_health_check()
+        assert result.instrumentation["timers"]["stage.update_indicators"]["count"] == 1
+        assert "BTCUSDT" in result.instrumentation["timers"]["stage.update_indicators"]["symbols"]
+    finally:
+        registry.enabled = previous
+        registry.reset()
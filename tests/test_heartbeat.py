@@ -0,0 +1,211 @@
+"""Property-based and unit tests for the bot heartbeat module.
+
+Tests cover:
+- Round-trip of heartbeat fields through the memory-mapped file
+- Liveness detection (running, stopped, stale, dead PID)
+- Graceful handling of missing and corrupted heartbeat files
+- Retrying reads that overlap a write (seqlock)
+"""
+
+import os
+import struct
+import tempfile
+import time
+from unittest.mock import patch
+
+from hypothesis import given, strategies as st, settings
+
+from src.heartbeat import (
+    HeartbeatWriter,
+    HeartbeatRecord,
+    read_heartbeat,
+    HEARTBEAT_SIZE
+)
+
+
+# Feature: bot-heartbeat, Property 1: Heartbeat Round Trip
+@given(
+    loop_iteration=st.integers(min_value=0, max_value=2**63 - 1),
+    last_candle_time=st.integers(min_value=0, max_value=2**62),
+    loop_latency_ms=st.floats(min_value=0.0, max_value=1e6, allow_nan=False),
+    mode=st.sampled_from(["BACKTEST", "PAPER", "LIVE"])
+)
+@settings(max_examples=50, deadline=None)
+def test_heartbeat_round_trip(loop_iteration, last_candle_time, loop_latency_ms, mode):
+    """For any published heartbeat, a reader must see exactly the fields written."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "heartbeat.bin")
+        writer = HeartbeatWriter(path, mode)
+        try:
+            writer.beat(loop_iteration, last_candle_time, loop_latency_ms)
+            record = read_heartbeat(path)
+        finally:
+            writer.close()
+
+        assert record is not None
+        assert record.pid == os.getpid()
+        assert record.mode == mode
+        assert record.status == "running"
+        assert record.loop_iteration == loop_iteration
+        assert record.last_candle_time == last_candle_time
+        assert record.loop_latency_ms == loop_latency_ms
+
+
+class TestHeartbeatWriter:
+    """Unit tests for HeartbeatWriter."""
+
+    def test_creates_fixed_size_file(self):
+        """Heartbeat file has a fixed size regardless of contents."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "nested", "heartbeat.bin")
+            writer = HeartbeatWriter(path, "PAPER")
+            writer.beat(10, 1700000000000, 1.5)
+            writer.close()
+
+            assert os.path.getsize(path) == HEARTBEAT_SIZE
+
+    def test_initial_record_is_running(self):
+        """A new writer publishes a running record immediately."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "heartbeat.bin")
+            writer = HeartbeatWriter(path, "LIVE")
+            record = read_heartbeat(path)
+            writer.close()
+
+            assert record is not None
+            assert record.status == "running"
+            assert record.loop_iteration == 0
+
+    def test_mark_stopped(self):
+        """mark_stopped publishes a stopped record that is not alive."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "heartbeat.bin")
+            writer = HeartbeatWriter(path, "PAPER")
+            writer.beat(5)
+            writer.mark_stopped(5, 123)
+            writer.close()
+
+            record = read_heartbeat(path)
+            assert record.status == "stopped"
+            assert record.loop_iteration == 5
+            assert record.last_candle_time == 123
+            assert not record.is_alive()
+
+    def test_writer_reuses_existing_file(self):
+        """A restarted bot overwrites the previous heartbeat."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "heartbeat.bin")
+            first = HeartbeatWriter(path, "PAPER", pid=1)
+            first.mark_stopped(99)
+            first.close()
+
+            second = HeartbeatWriter(path, "LIVE")
+            second.beat(1)
+            second.close()
+
+            record = read_heartbeat(path)
+            assert record.mode == "LIVE"
+            assert record.pid == os.getpid()
+            assert record.loop_iteration == 1
+
+    def test_beat_after_close_is_noop(self):
+        """Beating after close must not raise."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "heartbeat.bin")
+            writer = HeartbeatWriter(path, "PAPER")
+            writer.close()
+            writer.beat(1)
+            writer.close()
+
+
+class TestReadHeartbeat:
+    """Unit tests for read_heartbeat and HeartbeatRecord."""
+
+    def test_missing_file_returns_none(self):
+        """Missing heartbeat file returns None."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert read_heartbeat(os.path.join(temp_dir, "missing.bin")) is None
+
+    def test_corrupted_file_returns_none(self):
+        """Files with the wrong magic or size return None."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            short_path = os.path.join(temp_dir, "short.bin")
+            with open(short_path, "wb") as f:
+                f.write(b"BBHB")
+            assert read_heartbeat(short_path) is None
+
+            garbage_path = os.path.join(temp_dir, "garbage.bin")
+            with open(garbage_path, "wb") as f:
+                f.write(b"\xff" * HEARTBEAT_SIZE)
+            assert read_heartbeat(garbage_path) is None
+
+    def test_write_in_progress_returns_none(self):
+        """A record with an odd sequence number is never returned."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "heartbeat.bin")
+            writer = HeartbeatWriter(path, "PAPER")
+            writer.close()
+
+            with open(path, "r+b") as f:
+                f.seek(8)
+                f.write(struct.pack("<Q", 7))
+
+            assert read_heartbeat(path) is None
+
+    def test_write_during_copy_is_retried(self):
+        """A record copied while a write landed is discarded and read again."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "heartbeat.bin")
+            writer = HeartbeatWriter(path, "PAPER")
+            writer.beat(loop_iteration=1)
+            real_open = open
+            opens = []
+
+            def open_with_racing_write(*args, **kwargs):
+                handle = real_open(*args, **kwargs)
+                opens.append(handle)
+                if len(opens) == 1:
+                    # A complete write lands between the record copy and the seq re-read
+                    real_seek = handle.seek
+                    handle.seek = lambda offset: (writer.beat(loop_iteration=2), real_seek(offset))[1]
+                return handle
+
+            with patch("builtins.open", side_effect=open_with_racing_write):
+                assert read_heartbeat(path, max_retries=1) is None
+            opens.clear()
+            with patch("builtins.open", side_effect=open_with_racing_write):
+                record = read_heartbeat(path)
+            writer.close()
+
+            assert len(opens) == 2
+            assert record.loop_iteration == 2
+
+    def test_stale_heartbeat_is_not_alive(self):
+        """A heartbeat older than the stale threshold is not alive."""
+        record = HeartbeatRecord(
+            pid=os.getpid(),
+            mode="LIVE",
+            status="running",
+            loop_iteration=1,
+            last_candle_time=0,
+            loop_latency_ms=0.0,
+            updated_at=time.time() - 120
+        )
+        assert not record.is_alive(stale_after_seconds=30)
+        assert record.is_alive(stale_after_seconds=300)
+
+    def test_dead_pid_is_not_alive(self):
+        """A fresh heartbeat from a vanished process is not alive."""
+        record = HeartbeatRecord(
+            pid=12345,
+            mode="LIVE",
+            status="running",
+            loop_iteration=1,
+            last_candle_time=0,
+            loop_latency_ms=0.0,
+            updated_at=time.time()
+        )
+        with patch("src.heartbeat.psutil.pid_exists", return_value=False):
+            assert not record.is_alive()
+        with patch("src.heartbeat.psutil.pid_exists", return_value=True):
+            assert record.is_alive()
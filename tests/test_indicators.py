@@ -1,9 +1,18 @@
 """Property-based and unit tests for technical indicators."""
 
+import numpy as np
 import pytest
-from hypothesis import given, strategies as st, assume
-from src.indicators import IndicatorCalculator
+from hypothesis import given, settings, strategies as st, assume
+from src import instrumentation
+from src.candle_array import to_candles
+from src.indicators import (
+    IndicatorCalculator,
+    squeeze_color,
+    squeeze_delta,
+    squeeze_momentum_series,
+)
 from src.models import Candle
+from src.synthetic_data import generate_ohlcv
 
 
 # Helper strategy for generating valid candles
@@ -359,3 +368,159 @@ class TestIndicatorCalculator:
         assert result['value'] == 0.0
         assert result['is_squeezed'] == False
         assert result['color'] == 'gray'
+
+
+
+def trending_candles(count, start=1609459200000, step_ms=900000):
+    """Rising 15m candles with distinct prices."""
+    return [
+        Candle(timestamp=start + i * step_ms, open=100.0 + i, high=102.0 + i,
+               low=99.0 + i, close=101.0 + i, volume=10.0 + i)
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def indicator_cache():
+    """Enable a fresh shared indicator cache for one test and disable it afterwards."""
+    IndicatorCalculator.disable_caching()
+    IndicatorCalculator.enable_caching(max_entries=8)
+    yield IndicatorCalculator._cache
+    IndicatorCalculator.disable_caching()
+
+
+class TestIndicatorCache:
+    """Unit tests for the shared content-keyed indicator cache."""
+    
+    def test_cached_values_match_uncached(self, indicator_cache):
+        candles = trending_candles(60)
+        
+        first = IndicatorCalculator.calculate_atr(candles, 14)
+        second = IndicatorCalculator.calculate_atr(candles, 14)
+        IndicatorCalculator.disable_caching()
+        
+        assert first == second == IndicatorCalculator.calculate_atr(candles, 14)
+        assert indicator_cache.hits == 1 and indicator_cache.misses == 1
+    
+    def test_windows_sharing_last_candle_are_separate(self, indicator_cache):
+        """A shorter window ending on the same candle is a different entry."""
+        candles = trending_candles(60)
+        
+        full = IndicatorCalculator.calculate_vwap(candles, 0)
+        tail = IndicatorCalculator.calculate_vwap(candles[-20:], 0)
+        
+        IndicatorCalculator.calculate_atr(candles, 14)
+        IndicatorCalculator.calculate_atr(candles, 7)
+        
+        assert full != tail
+        assert indicator_cache.hits == 0 and indicator_cache.misses == 4
+    
+    def test_in_progress_candle_change_misses(self, indicator_cache):
+        candles = trending_candles(30)
+        before = IndicatorCalculator.calculate_vwap(candles, 0)
+        last = candles[-1]
+        candles[-1] = Candle(last.timestamp, last.open, last.high + 50.0, last.low, last.close + 40.0, last.volume + 5.0)
+        
+        assert IndicatorCalculator.calculate_vwap(candles, 0) != before
+        assert indicator_cache.hits == 0
+    
+    def test_least_recently_used_evicted(self, indicator_cache):
+        windows = [trending_candles(30, start=1609459200000 + i * 900000) for i in range(9)]
+        for candles in windows:
+            IndicatorCalculator.calculate_vwap(candles, 0)
+        
+        assert IndicatorCalculator.get_cache_stats()["size"] == 8
+        IndicatorCalculator.calculate_vwap(windows[0], 0)
+        assert indicator_cache.hits == 0
+        IndicatorCalculator.calculate_vwap(windows[-1], 0)
+        assert indicator_cache.hits == 1
+    
+    def test_symbol_scopes_and_invalidation(self, indicator_cache):
+        candles = trending_candles(60)
+        with IndicatorCalculator.cache_scope("BTCUSDT"):
+            IndicatorCalculator.calculate_atr(candles, 14)
+            IndicatorCalculator.calculate_adx(candles, 14)
+        with IndicatorCalculator.cache_scope("ETHUSDT"):
+            IndicatorCalculator.calculate_atr(candles, 14)
+        
+        assert indicator_cache.hits == 0
+        assert IndicatorCalculator.invalidate("BTCUSDT") == 2
+        assert IndicatorCalculator.get_cache_stats()["size"] == 1
+        with IndicatorCalculator.cache_scope("ETHUSDT"):
+            IndicatorCalculator.calculate_atr(candles, 14)
+        assert indicator_cache.hits == 1
+    
+    def test_squeeze_result_is_copied(self, indicator_cache):
+        candles = trending_candles(60)
+        result = IndicatorCalculator.calculate_squeeze_momentum(candles)
+        result['color'] = 'mutated'
+        
+        assert IndicatorCalculator.calculate_squeeze_momentum(candles)['color'] != 'mutated'
+        assert indicator_cache.hits == 1
+    
+    def test_hit_rates_reported_to_instrumentation(self, indicator_cache):
+        candles = trending_candles(60)
+        instrumentation.configure(True)
+        try:
+            for _ in range(4):
+                IndicatorCalculator.calculate_rvol(candles, 20)
+            
+            snapshot = instrumentation.snapshot()
+            assert snapshot["counters"]["cache.indicator.rvol.hit"]["total"] == 3
+            assert snapshot["cache_hit_rates"]["cache.indicator.rvol"] == 75.0
+        finally:
+            instrumentation.configure(False)
+    
+    def test_caching_disabled_is_a_no_op(self):
+        IndicatorCalculator.disable_caching()
+        
+        with IndicatorCalculator.cache_scope("BTCUSDT"):
+            assert IndicatorCalculator.calculate_atr(trending_candles(30), 14) > 0
+        assert IndicatorCalculator.invalidate("BTCUSDT") == 0
+        assert IndicatorCalculator.get_cache_stats() is None
+
+
+def reference_squeeze_momentum(high, low, close, length=20):
+    """Direct LazyBear definition: per-window extremes, SMA and np.polyfit."""
+    values = np.full(len(close), np.nan)
+    delta = np.full(len(close), np.nan)
+    for i in range(length - 1, len(close)):
+        window = slice(i - length + 1, i + 1)
+        midpoint = (high[window].max() + low[window].min()) / 2
+        delta[i] = close[i] - (midpoint + close[window].mean()) / 2
+    for i in range(2 * length - 2, len(close)):
+        slope, intercept = np.polyfit(np.arange(length), delta[i - length + 1:i + 1], 1)
+        values[i] = intercept + slope * (length - 1)
+    return values
+
+
+class TestSqueezeMomentum:
+    """Test the rolling linear-regression squeeze momentum."""
+    
+    @settings(max_examples=25, deadline=None)
+    @given(seed=st.integers(min_value=0, max_value=10_000), length=st.integers(min_value=2, max_value=30))
+    def test_series_matches_polyfit_reference(self, seed, length):
+        data = generate_ohlcv(150, timeframe="15m", seed=seed)
+        
+        series = squeeze_momentum_series(data["high"], data["low"], data["close"], length)
+        reference = reference_squeeze_momentum(data["high"], data["low"], data["close"], length)
+        
+        assert np.array_equal(np.isnan(series), np.isnan(reference))
+        np.testing.assert_allclose(series, reference, rtol=1e-9, atol=1e-9 * data["close"].max())
+    
+    def test_calculator_uses_last_window_only(self):
+        data = generate_ohlcv(300, timeframe="15m", seed=11)
+        candles = to_candles(data)
+        series = squeeze_momentum_series(data["high"], data["low"], data["close"])
+        
+        for end in (40, 120, 300):
+            result = IndicatorCalculator.calculate_squeeze_momentum(candles[:end])
+            assert result['value'] == pytest.approx(series[end - 1], rel=1e-12, abs=1e-12)
+            assert result['color'] == squeeze_color(series[end - 1], series[end - 2])
+            assert result == IndicatorCalculator.calculate_squeeze_momentum(candles[end - 40:end])
+        
+        # While warming up the regression covers the delta values available
+        warmup = IndicatorCalculator.calculate_squeeze_momentum(candles[:25])
+        delta = squeeze_delta(data["high"][:25], data["low"][:25], data["close"][:25])[19:]
+        slope, intercept = np.polyfit(np.arange(6), delta, 1)
+        assert warmup['value'] == pytest.approx(intercept + slope * 5)
@@ -0,0 +1,148 @@
+"""Property-based and unit tests for the hot-path instrumentation module.
+
+Tests cover:
+- Histogram percentiles within bucket precision of exact percentiles
+- Per-stage and per-symbol timers, counters and cache hit rates
+- No-op behaviour while disabled
+- Text rendering and the local HTTP endpoint
+"""
+
+import json
+import urllib.request
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src import instrumentation
+from src.instrumentation import Instrumentation, LatencyHistogram, render_text
+
+
+@pytest.fixture
+def registry():
+    """Enable the process-wide registry for one test and restore it afterwards."""
+    registry = instrumentation.get_instrumentation()
+    previous = registry.enabled
+    registry.enabled = True
+    registry.reset()
+    yield registry
+    registry.enabled = previous
+    registry.reset()
+
+
+# Feature: hot-path-instrumentation, Property 1: Histogram Percentile Precision
+@given(
+    durations_us=st.lists(st.integers(min_value=0, max_value=10**9), min_size=1, max_size=300),
+    percent=st.sampled_from([50.0, 90.0, 99.0, 100.0])
+)
+@settings(max_examples=100, deadline=None)
+def test_histogram_percentile_precision(durations_us, percent):
+    """For any set of durations, a histogram percentile must be within the
+    bucket precision (~6%) of the exact nearest-rank percentile."""
+    histogram = LatencyHistogram()
+    for value in durations_us:
+        histogram.record(value / 1_000_000)
+
+    ordered = sorted(durations_us)
+    rank = max(1, int(np.ceil(percent / 100 * len(ordered))))
+    exact_ms = ordered[rank - 1] / 1000.0
+
+    assert histogram.count == len(durations_us)
+    assert histogram.percentile(percent) == pytest.approx(exact_ms, rel=0.07, abs=0.001)
+    assert histogram.to_dict()["max_ms"] == max(durations_us) / 1000.0
+
+
+class TestRegistry:
+    """Unit tests for timers, counters and snapshots."""
+
+    def test_disabled_registry_records_nothing(self):
+        """Timers, counters and decorators are no-ops while disabled."""
+        registry = Instrumentation(enabled=False)
+        with registry.timer("stage.data_fetch"):
+            pass
+        registry.increment("rest.futures_klines")
+
+        snapshot = registry.snapshot()
+        assert snapshot["timers"] == {}
+        assert snapshot["counters"] == {}
+
+    def test_timer_records_aggregate_and_symbol(self, registry):
+        """Symbol-labelled timers update both the stage and the symbol entry."""
+        with instrumentation.symbol_scope("BTCUSDT"):
+            with instrumentation.timer("stage.update_indicators"):
+                pass
+        with instrumentation.timer("stage.update_indicators", symbol="ETHUSDT"):
+            pass
+        with instrumentation.timer("stage.update_indicators"):
+            pass
+
+        stage = instrumentation.snapshot()["timers"]["stage.update_indicators"]
+        assert stage["count"] == 3
+        assert stage["symbols"]["BTCUSDT"]["count"] == 1
+        assert stage["symbols"]["ETHUSDT"]["count"] == 1
+
+    def test_timed_decorator_preserves_result_and_exceptions(self, registry):
+        """Decorated functions return normally and are timed even when raising."""
+        @instrumentation.timed("order.place_market_order")
+        def place(value):
+            if value < 0:
+                raise ValueError("negative")
+            return value * 2
+
+        assert place(2) == 4
+        with pytest.raises(ValueError):
+            place(-1)
+
+        assert instrumentation.snapshot()["timers"]["order.place_market_order"]["count"] == 2
+
+    def test_counters_and_cache_hit_rates(self, registry):
+        """Counters sum per name and symbol; hit/miss pairs yield hit rates."""
+        instrumentation.increment("rest.futures_klines", symbol="BTCUSDT")
+        instrumentation.increment("rest.futures_klines", 2, symbol="ETHUSDT")
+        for _ in range(3):
+            instrumentation.increment("cache.indicators.hit")
+        instrumentation.increment("cache.indicators.miss")
+
+        snapshot = instrumentation.snapshot()
+        assert snapshot["counters"]["rest.futures_klines"]["total"] == 3
+        assert snapshot["counters"]["rest.futures_klines"]["symbols"] == {"BTCUSDT": 1, "ETHUSDT": 2}
+        assert snapshot["cache_hit_rates"]["cache.indicators"] == pytest.approx(75.0)
+
+    def test_snapshot_is_json_serializable(self, registry):
+        """Snapshots can be written to the dashboard state file."""
+        with instrumentation.timer("loop.process_symbol", symbol="BTCUSDT"):
+            pass
+        instrumentation.increment("rest.futures_account")
+
+        assert json.loads(json.dumps(instrumentation.snapshot()))["timers"]
+
+
+class TestTextExport:
+    """Unit tests for text rendering and the local endpoint."""
+
+    def test_render_text_contains_metrics(self, registry):
+        """Rendered text lists quantiles, counts and counters with labels."""
+        with instrumentation.timer("stage.entry_checks", symbol="BTCUSDT"):
+            pass
+        instrumentation.increment("rest.futures_create_order")
+
+        text = render_text()
+        assert 'stage_latency_ms{stage="stage.entry_checks",quantile="0.99"}' in text
+        assert 'stage_latency_ms_count{stage="stage.entry_checks",symbol="BTCUSDT"} 1' in text
+        assert 'counter_total{name="rest.futures_create_order"} 1' in text
+
+    def test_text_endpoint_serves_snapshot(self, registry):
+        """The local endpoint serves text at /metrics and JSON at /json."""
+        instrumentation.increment("rest.futures_klines")
+        server = instrumentation.start_text_endpoint(0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                text = response.read().decode("utf-8")
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/json", timeout=5) as response:
+                data = json.loads(response.read())
+        finally:
+            instrumentation.stop_text_endpoint(server)
+
+        assert 'counter_total{name="rest.futures_klines"} 1' in text
+        assert data["counters"]["rest.futures_klines"]["total"] == 1
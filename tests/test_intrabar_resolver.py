@@ -0,0 +1,150 @@
+"""Property-based and unit tests for intrabar first-touch resolution.
+
+Tests cover:
+- Vectorized first touch matching a bar-by-bar reference loop
+- Window boundaries and open-ended windows
+- Same-bar stop/TP ambiguity and gap fills
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src.candle_array import to_candles
+from src.intrabar_resolver import IntrabarResolver, STOP, TAKE_PROFIT
+from src.models import Candle
+from src.synthetic_data import generate_ohlcv
+
+
+def reference_first_touch(candles, side, stop, take_profits, start_ms, end_ms):
+    """Bar-by-bar reference: (kind, index) of the first touched level."""
+    for index, candle in enumerate(candles):
+        if candle.timestamp < start_ms or candle.timestamp >= end_ms:
+            continue
+        if side == "LONG":
+            stop_hit = candle.low <= stop
+            tp_hit = any(candle.high >= tp for tp in take_profits)
+        else:
+            stop_hit = candle.high >= stop
+            tp_hit = any(candle.low <= tp for tp in take_profits)
+        if stop_hit or tp_hit:
+            return ("TP" if tp_hit and not stop_hit else "ANY", index)
+    return None
+
+
+# Feature: intrabar-resolver, Property 1: First Touch Matches Bar-by-Bar Search
+@given(
+    seed=st.integers(min_value=0, max_value=10_000),
+    side=st.sampled_from(["LONG", "SHORT"]),
+    stop_distance=st.floats(min_value=0.001, max_value=0.05),
+    tp_distances=st.lists(st.floats(min_value=0.001, max_value=0.08), min_size=0, max_size=3),
+    start=st.integers(min_value=0, max_value=150),
+    length=st.integers(min_value=1, max_value=200)
+)
+@settings(max_examples=100, deadline=None)
+def test_first_touch_matches_reference_loop(seed, side, stop_distance, tp_distances, start, length):
+    """The vectorized search finds the same first bar as a plain loop."""
+    candles = to_candles(generate_ohlcv(300, timeframe="5m", seed=seed))
+    resolver = IntrabarResolver(candles)
+    entry = candles[start].open
+    sign = 1 if side == "LONG" else -1
+    stop = entry * (1 - sign * stop_distance)
+    take_profits = [entry * (1 + sign * d) for d in tp_distances]
+    start_ms = candles[start].timestamp
+    end_ms = start_ms + length * 300_000
+
+    touch = resolver.first_touch(side, stop, take_profits, start_ms, end_ms)
+    expected = reference_first_touch(candles, side, stop, take_profits, start_ms, end_ms)
+
+    if expected is None:
+        assert touch is None
+        return
+
+    assert touch is not None
+    assert touch.index == expected[1]
+    assert touch.timestamp == candles[expected[1]].timestamp
+    if expected[0] == "TP":
+        assert touch.kind == TAKE_PROFIT
+        assert touch.levels
+    if touch.kind == STOP:
+        # Fill is never better than the stop
+        assert (touch.price <= stop) if side == "LONG" else (touch.price >= stop)
+
+
+def make_candle(timestamp, open_, high, low, close):
+    """Create a candle with unit volume."""
+    return Candle(timestamp=timestamp, open=open_, high=high, low=low, close=close, volume=1.0)
+
+
+class TestIntrabarResolver:
+    """Unit tests for IntrabarResolver."""
+
+    @pytest.fixture
+    def resolver(self):
+        """Three 5m bars: TP touched first, then the stop."""
+        return IntrabarResolver([
+            make_candle(0, 100.0, 101.0, 99.5, 100.5),
+            make_candle(300_000, 100.5, 103.5, 100.0, 103.0),
+            make_candle(600_000, 103.0, 103.2, 97.0, 97.5),
+        ])
+
+    def test_take_profit_before_stop(self, resolver):
+        """A 15m bar touching both levels resolves to the earlier 5m touch."""
+        touch = resolver.first_touch("LONG", 98.0, [102.0, 103.0, 105.0], 0, 900_000)
+
+        assert touch.kind == TAKE_PROFIT
+        assert touch.index == 1
+        assert touch.levels == (0, 1)
+        assert touch.price == 102.0
+
+    def test_search_resumes_after_touch(self, resolver):
+        """Starting after the TP bar finds the later stop touch."""
+        touch = resolver.first_touch("LONG", 98.0, [105.0], 300_001, 900_000)
+
+        assert touch.kind == STOP
+        assert touch.index == 2
+        assert touch.price == 98.0
+
+    def test_no_touch_and_empty_window(self, resolver):
+        """Untouched levels and windows without bars return None."""
+        assert resolver.first_touch("LONG", 90.0, [110.0], 0) is None
+        assert resolver.first_touch("LONG", 98.0, [102.0], 900_000, 1_800_000) is None
+        assert not resolver.covers(900_000, 1_800_000)
+        assert resolver.covers(0, 900_000)
+
+    def test_same_bar_touch_is_conservative(self):
+        """When one bar touches stop and TP from a neutral open, the stop wins."""
+        resolver = IntrabarResolver([make_candle(0, 100.0, 103.0, 97.0, 100.0)])
+        touch = resolver.first_touch("SHORT", 102.0, [98.0], 0, 300_000)
+
+        assert touch.kind == STOP
+        assert touch.ambiguous
+        assert touch.price == 102.0
+
+    def test_gap_through_level_uses_open(self):
+        """A bar opening beyond a level decides the order and fills at the open."""
+        resolver = IntrabarResolver([make_candle(0, 104.0, 104.5, 97.0, 98.0)])
+
+        touch = resolver.first_touch("LONG", 98.0, [102.0], 0, 300_000)
+        assert touch.kind == TAKE_PROFIT
+        assert touch.price == 104.0
+
+        touch = resolver.first_touch("SHORT", 103.0, [90.0], 0, 300_000)
+        assert touch.kind == STOP
+        assert touch.price == 104.0
+
+    def test_accepts_structured_array(self):
+        """Structured candle arrays and Candle lists give identical results."""
+        array = generate_ohlcv(500, timeframe="1m", seed=3)
+        from_array = IntrabarResolver(array)
+        from_candles = IntrabarResolver(to_candles(array))
+
+        entry = float(array["open"][10])
+        args = ("LONG", entry * 0.99, [entry * 1.01], int(array["timestamp"][10]))
+        assert from_array.first_touch(*args) == from_candles.first_touch(*args)
+        np.testing.assert_array_equal(from_array.timestamps, from_candles.timestamps)
+
+    def test_invalid_side(self, resolver):
+        """Unknown sides are rejected."""
+        with pytest.raises(ValueError):
+            resolver.first_touch("FLAT", 98.0, [102.0], 0)
@@ -0,0 +1,274 @@
+"""Property-based and unit tests for scheduled data retention and compaction.
+
+Tests cover:
+- DataManager buffer trimming, cache eviction and dropping untraded symbols
+- Gzipping rotated logs and reading them back on the dashboard
+- Removing stale temporary files only
+- Rolling stored candles up into coarser timeframes
+- MaintenanceScheduler passes, error isolation and thread lifecycle
+"""
+
+import gzip
+import os
+import time
+
+import numpy as np
+from hypothesis import given, settings, strategies as st
+
+from src import instrumentation
+from src.candle_array import aggregate_ohlcv, to_candles
+from src.chart_data_service import CandleStore
+from src.config import Config
+from src.data_manager import DataManager
+from src.maintenance import (
+    MaintenanceReport,
+    MaintenanceScheduler,
+    compress_rotated_logs,
+    remove_stale_temp_files,
+    roll_up_candle_store,
+)
+from src.streamlit_data_provider import StreamlitDataProvider
+from src.synthetic_data import generate_ohlcv
+
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def make_config(**overrides):
+    config = Config()
+    config.symbol = "BTCUSDT"
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
+
+
+def recent_candles(n_bars, timeframe="5m", seed=0):
+    """Candles ending at the current time."""
+    interval_ms = {"5m": 300_000, "15m": 900_000, "1h": 3_600_000, "4h": 14_400_000}[timeframe]
+    start = (int(time.time() * 1000) // interval_ms - n_bars) * interval_ms
+    return generate_ohlcv(n_bars, timeframe=timeframe, seed=seed, start_time=start)
+
+
+class TestDataManagerRetention:
+    """Test the DataManager retention hooks used by the scheduler."""
+
+    def test_cleanup_keeps_full_buffer_span(self):
+        """Candles a full buffer spans are kept, older ones trimmed."""
+        data_manager = DataManager(make_config())
+        stale = to_candles(recent_candles(20 * 288, "5m"))[0]
+        data_manager.load_buffer("BTCUSDT", "5m", [stale] + to_candles(recent_candles(499, "5m")))
+        # 500 4h candles span 83 days, beyond the 7-day lookback
+        data_manager.load_buffer("BTCUSDT", "4h", to_candles(recent_candles(400, "4h")))
+        buffer_5m = data_manager.candles_5m
+
+        removed = data_manager.cleanup_old_data(lookback_days=7)
+
+        assert removed["5m"] == 1
+        assert removed["4h"] == 0
+        assert len(data_manager.candles_4h) == 400
+        assert data_manager.candles_5m is buffer_5m
+
+    def test_evict_expired_cache(self):
+        data_manager = DataManager(make_config())
+        now = time.time()
+        data_manager._data_cache = {
+            "BTCUSDT": {
+                "15m": {"data": [], "timestamp": now},
+                "1h": {"data": [], "timestamp": now - 3 * data_manager._cache_ttl_seconds},
+            },
+            "ETHUSDT": {"15m": {"data": [], "timestamp": 0}},
+        }
+
+        assert data_manager.evict_expired_cache() == 2
+        assert data_manager._data_cache == {"BTCUSDT": {"15m": {"data": [], "timestamp": now}}}
+
+    def test_drop_symbols_keeps_primary_symbol(self):
+        data_manager = DataManager(make_config())
+        for symbol in ["BTCUSDT", "ETHUSDT", "SOLUSDT"]:
+            data_manager.load_buffer(symbol, "15m", to_candles(recent_candles(10, "15m")))
+        data_manager._data_cache["SOLUSDT"] = {"15m": {"data": [], "timestamp": time.time()}}
+
+        dropped = data_manager.drop_symbols(["ETHUSDT"])
+
+        assert dropped == ["SOLUSDT"]
+        assert set(data_manager._symbol_buffers) == {"BTCUSDT", "ETHUSDT"}
+        assert "SOLUSDT" not in data_manager._data_cache
+        assert len(data_manager.candles_15m) == 10
+
+
+class TestFileCompaction:
+    """Test log compression and temporary file removal."""
+
+    def test_compress_rotated_logs(self, tmp_path):
+        lines = "".join(f"2024-01-31 12:00:00 | INFO | line {i}\n" for i in range(500))
+        (tmp_path / "trades_paper.log.2024-01-31").write_text(lines)
+        (tmp_path / "trades_paper.log").write_text("current\n")
+        (tmp_path / "system.log.2024-01-30.gz").write_bytes(gzip.compress(b"old\n"))
+
+        report = MaintenanceReport(started_at=time.time())
+        compress_rotated_logs(str(tmp_path), report)
+
+        assert sorted(os.listdir(tmp_path)) == [
+            "system.log.2024-01-30.gz", "trades_paper.log", "trades_paper.log.2024-01-31.gz",
+        ]
+        with gzip.open(tmp_path / "trades_paper.log.2024-01-31.gz", "rt") as f:
+            assert f.read() == lines
+        assert report.logs_compressed == 1
+        assert report.bytes_read == len(lines)
+        assert 0 < report.bytes_freed < len(lines)
+
+    def test_dashboard_reads_gzipped_trade_logs(self, tmp_path):
+        trade = (
+            '2024-01-31 12:00:00 | INFO | TRADE_EXECUTED: {"symbol": "BTCUSDT", '
+            '"side": "LONG", "entry_price": 100.0, "exit_price": 110.0, "pnl": 10.0}\n'
+        )
+        (tmp_path / "trades_paper.log.2024-01-31.gz").write_bytes(gzip.compress(trade.encode()))
+        (tmp_path / "trades_paper.log").write_text("")
+        provider = StreamlitDataProvider(logs_dir=str(tmp_path))
+        provider.get_config = lambda: {"run_mode": "PAPER"}
+
+        trades = provider._parse_trade_logs()
+
+        assert len(trades) == 1
+        assert trades[0]["pnl"] == 10.0
+
+    def test_remove_only_stale_temp_files(self, tmp_path):
+        stale = tmp_path / "BTCUSDT_5m.npy.tmp"
+        fresh = tmp_path / "state_snapshot.npz.tmp"
+        kept = tmp_path / "BTCUSDT_5m.npy"
+        for path in (stale, fresh, kept):
+            path.write_bytes(b"x" * 100)
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        os.utime(kept, (old, old))
+
+        report = MaintenanceReport(started_at=time.time())
+        remove_stale_temp_files([str(tmp_path), str(tmp_path / "missing")], report)
+
+        assert not stale.exists()
+        assert fresh.exists() and kept.exists()
+        assert report.temp_files_removed == 1
+        assert report.bytes_freed == 100
+
+
+class TestCandleRollUp:
+    """Test rolling stored candles up into coarser timeframes."""
+
+    @settings(max_examples=20, deadline=None)
+    @given(n_bars=st.integers(min_value=1, max_value=3000), rollup_days=st.integers(min_value=1, max_value=10))
+    def test_roll_up_preserves_history(self, tmp_path_factory, n_bars, rollup_days):
+        """Every stored interval stays covered and aggregates match the source."""
+        store = CandleStore(str(tmp_path_factory.mktemp("candles")))
+        candles = generate_ohlcv(n_bars, timeframe="5m", seed=n_bars)
+        store.append("BTCUSDT", "5m", candles)
+        now_ms = int(candles["timestamp"][-1]) + 300_000
+
+        report = MaintenanceReport(started_at=time.time())
+        roll_up_candle_store(store, rollup_days, report, now_ms=now_ms)
+
+        fine = store.load("BTCUSDT", "5m")
+        cutoff = (now_ms - rollup_days * DAY_MS) // 900_000 * 900_000
+        assert np.all(fine["timestamp"] >= cutoff)
+        assert report.candles_rolled_up >= n_bars - len(fine)
+
+        # Re-expanding every timeframe to 5m volume covers the original total
+        total_volume = sum(store.load("BTCUSDT", tf)["volume"].sum() for tf in ["5m", "15m", "1h", "4h"])
+        assert np.isclose(total_volume, candles["volume"].sum())
+        assert store.load("BTCUSDT", "15m")["high"].max(initial=0) <= candles["high"].max()
+
+    def test_existing_coarse_candles_win(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        candles = generate_ohlcv(288 * 2, timeframe="5m", seed=1)
+        fetched_15m = aggregate_ohlcv(candles, "15m")[:10].copy()
+        fetched_15m["close"] = -1.0
+        store.append("BTCUSDT", "5m", candles)
+        store.append("BTCUSDT", "15m", fetched_15m)
+        now_ms = int(candles["timestamp"][-1]) + 300_000
+
+        roll_up_candle_store(store, 1, MaintenanceReport(started_at=time.time()), now_ms=now_ms)
+
+        stored_15m = store.load("BTCUSDT", "15m")
+        assert np.all(stored_15m["close"][:10] == -1.0)
+        assert len(stored_15m) == len(aggregate_ohlcv(candles[:288], "15m"))
+        assert len(store.load("BTCUSDT", "5m")) == 288
+
+    def test_recent_candles_untouched(self, tmp_path):
+        store = CandleStore(str(tmp_path))
+        store.append("BTCUSDT", "5m", recent_candles(100))
+
+        report = MaintenanceReport(started_at=time.time())
+        roll_up_candle_store(store, 30, report)
+
+        assert report.candles_rolled_up == 0
+        assert store.series() == [("BTCUSDT", "5m")]
+
+
+class TestMaintenanceScheduler:
+    """Test scheduled maintenance passes."""
+
+    def test_run_once_records_cost(self, tmp_path):
+        instrumentation.configure(True)
+        try:
+            log_dir = tmp_path / "logs"
+            log_dir.mkdir()
+            (log_dir / "system.log.2024-01-31").write_text("x\n" * 1000)
+            data_manager = DataManager(make_config())
+            data_manager.load_buffer("ETHUSDT", "15m", to_candles(recent_candles(10, "15m")))
+            store = CandleStore(str(tmp_path / "candles"))
+            store.append("BTCUSDT", "5m", generate_ohlcv(600, timeframe="5m"))
+
+            scheduler = MaintenanceScheduler(
+                make_config(candle_store_rollup_days=1),
+                data_manager=data_manager,
+                candle_store=store,
+                symbols_provider=lambda: ["BTCUSDT"],
+                log_dir=str(log_dir)
+            )
+            report = scheduler.run_once()
+
+            assert scheduler.last_report is report
+            assert report.errors == []
+            assert report.symbols_dropped == ["ETHUSDT"]
+            assert report.logs_compressed == 1
+            assert report.candles_rolled_up >= 600
+            assert report.wall_s > 0
+
+            snapshot = instrumentation.snapshot()
+            assert snapshot["timers"]["maintenance.run"]["count"] == 1
+            assert snapshot["counters"]["maintenance.candles_rolled_up"]["total"] == report.candles_rolled_up
+        finally:
+            instrumentation.configure(False)
+
+    def test_failing_step_does_not_stop_pass(self, tmp_path):
+        class BrokenDataManager:
+            def evict_expired_cache(self):
+                raise RuntimeError("boom")
+
+            def drop_symbols(self, symbols):
+                raise RuntimeError("boom")
+
+        log_dir = tmp_path / "logs"
+        log_dir.mkdir()
+        (log_dir / "errors.log.2024-01-31").write_text("error\n")
+        scheduler = MaintenanceScheduler(
+            make_config(), data_manager=BrokenDataManager(),
+            symbols_provider=lambda: [], log_dir=str(log_dir)
+        )
+
+        report = scheduler.run_once()
+
+        assert [error.split(":")[0] for error in report.errors] == ["evict_cache", "trim_buffers"]
+        assert report.logs_compressed == 1
+
+    def test_thread_runs_on_interval_and_stops(self, tmp_path):
+        scheduler = MaintenanceScheduler(make_config(), log_dir=str(tmp_path))
+        scheduler.interval_seconds = 0.01
+
+        scheduler.start()
+        deadline = time.time() + 5
+        while scheduler.last_report is None and time.time() < deadline:
+            time.sleep(0.01)
+        scheduler.stop()
+
+        assert scheduler.last_report is not None
+        assert scheduler._thread is None
@@ -6,7 +6,7 @@ from hypothesis import given, strategies as st, settings
 from src.config import Config
 from src.models import Candle
 from src.indicators import IndicatorCalculator
-from src.market_regime_detector import MarketRegimeDetector, RegimeParameters
+from src.market_regime_detector import MarketRegimeDetector, RegimeParameters, MAX_REGIME_HISTORY
 
 
 # Helper function to generate candles
@@ -441,6 +441,18 @@ class TestMarketRegimeDetectorUnit:
         for entry in detector.regime_history:
             assert entry['timestamp'] > old_time
     
+    def test_regime_history_capped(self):
+        """Frequent updates cannot grow the history past MAX_REGIME_HISTORY."""
+        config = Config()
+        detector = MarketRegimeDetector(config, IndicatorCalculator())
+        current_time = int(time.time())
+        
+        for i in range(MAX_REGIME_HISTORY + 50):
+            detector.record_regime("RANGING", current_time + i)
+        
+        assert len(detector.regime_history) == MAX_REGIME_HISTORY
+        assert detector.regime_history[-1]['timestamp'] == current_time + MAX_REGIME_HISTORY + 49
+    
     def test_atr_percentile_calculation(self):
         """Test ATR percentile calculation.
         
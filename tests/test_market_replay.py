@@ -0,0 +1,342 @@
+"""Property-based and unit tests for the market replay harness.
+
+Tests cover:
+- Frame file round trips, including torn trailing records
+- FrameRecorder capturing kline, mark-price and history frames
+- Synthesized recordings (history split and delivery order)
+- FakeExchangeClient klines, fills, fees, stops and margin checks
+- ReplayDriver feeding DataManager._handle_kline_message on schedule
+- A PAPER-mode TradingBot running end-to-end against a replay
+"""
+
+import json
+import time
+
+import numpy as np
+import pytest
+from binance.exceptions import BinanceAPIException
+from hypothesis import given, settings, strategies as st
+
+from src.config import Config
+from src.data_manager import DataManager
+from src.market_replay import (
+    FRAME_DTYPE,
+    FRAME_HISTORY,
+    FRAME_KLINE,
+    FRAME_MARK_PRICE,
+    FakeExchangeClient,
+    FrameLog,
+    FrameRecorder,
+    ReplayDriver,
+    frame_to_kline_message,
+    load_frames,
+    run_bot_replay,
+    save_frames,
+    synthesize_frames,
+)
+from src.models import Candle
+from src.synthetic_data import generate_multi_timeframe
+
+
+DAY_5M = 288
+
+
+def make_log(n_days=4, live_days=1, seed=3, updates_per_bar=0, symbols=("BTCUSDT",)):
+    """Synthetic recording with (n_days - live_days) days of history."""
+    candles = {}
+    for k, symbol in enumerate(symbols):
+        candles[symbol] = generate_multi_timeframe(n_days * DAY_5M, base_timeframe="5m", seed=seed + k)
+    first = candles[symbols[0]]["5m"]["timestamp"]
+    live_start = int(first[int((n_days - live_days) * DAY_5M)])
+    return synthesize_frames(candles, live_start=live_start, updates_per_bar=updates_per_bar), candles
+
+
+def kline_message(symbol, interval, open_time, price, closed=True):
+    return {
+        "e": "kline", "E": open_time + 1, "s": symbol,
+        "k": {"t": open_time, "s": symbol, "i": interval, "o": str(price), "h": str(price + 1),
+              "l": str(price - 1), "c": str(price), "v": "10", "x": closed},
+    }
+
+
+def priced_client(price=100.0, balance=10000.0, **kwargs):
+    """Fake exchange with a single BTCUSDT price."""
+    frames = np.zeros(1, dtype=FRAME_DTYPE)
+    frames[0] = (FRAME_MARK_PRICE, 0, 0, 0, 1, 1, 0, price, price, 0.0, price, 0.0)
+    log = FrameLog(frames=frames, symbols=["BTCUSDT"], intervals=["5m"])
+    client = FakeExchangeClient(log, initial_balance=balance, **kwargs)
+    client.apply_frame(frames[0])
+    return client
+
+
+def set_price(client, price):
+    frame = np.zeros(1, dtype=FRAME_DTYPE)[0]
+    frame["kind"] = FRAME_KLINE
+    frame["close"] = price
+    frame["event_time"] = client.clock_ms + 1
+    client.apply_frame(frame)
+
+
+class TestFrameFiles:
+    """Recording format and recorder."""
+
+    def test_save_load_round_trip(self, tmp_path):
+        log, _ = make_log(n_days=2, updates_per_bar=1)
+        path = str(tmp_path / "session.frames")
+        save_frames(log, path)
+        loaded = load_frames(path)
+
+        assert loaded.symbols == log.symbols
+        assert loaded.intervals == log.intervals
+        assert np.array_equal(loaded.frames, log.frames)
+        assert (tmp_path / "session.frames").stat().st_size == len(log.frames) * FRAME_DTYPE.itemsize
+
+    def test_load_ignores_torn_trailing_record(self, tmp_path):
+        log, _ = make_log(n_days=2)
+        path = str(tmp_path / "session.frames")
+        save_frames(log, path)
+        with open(path, "ab") as f:
+            f.write(b"\x00" * (FRAME_DTYPE.itemsize // 2))
+
+        assert len(load_frames(path).frames) == len(log.frames)
+
+    def test_load_rejects_foreign_header(self, tmp_path):
+        path = str(tmp_path / "other.frames")
+        open(path, "wb").close()
+        with open(path + ".json", "w") as f:
+            json.dump({"format": "other", "version": 1}, f)
+        with pytest.raises(ValueError):
+            load_frames(path)
+
+    def test_recorder_captures_klines_marks_and_history(self, tmp_path):
+        path = str(tmp_path / "live.frames")
+        history = [Candle(timestamp=t * 300_000, open=1.0, high=2.0, low=0.5, close=1.5, volume=3.0) for t in range(3)]
+        with FrameRecorder(path, flush_every=2) as recorder:
+            recorder.record_history("ETHUSDT", "5m", history)
+            recorder.record_kline(kline_message("BTCUSDT", "15m", 900_000, 101.5, closed=False), "15m")
+            recorder.record_mark_price({"stream": "btcusdt@markPrice@1s", "data": {
+                "e": "markPriceUpdate", "E": 5, "s": "BTCUSDT", "p": "101.2", "i": "101.1",
+                "P": "101.3", "r": "0.0001", "T": 28_800_000}})
+            recorder.record_mark_price({"e": "error", "m": "ignored"})
+        log = load_frames(path)
+
+        assert log.symbols == ["ETHUSDT", "BTCUSDT"]
+        assert log.intervals == ["5m", "15m"]
+        assert log.frames["kind"].tolist() == [FRAME_HISTORY] * 3 + [FRAME_KLINE, FRAME_MARK_PRICE]
+        assert log.frames["open_time"][:3].tolist() == [0, 300_000, 600_000]
+
+        message = frame_to_kline_message(log.frames[3], log.symbols, log.intervals)
+        assert message["k"]["s"] == "BTCUSDT" and message["k"]["i"] == "15m"
+        assert message["k"]["x"] is False
+        assert float(message["k"]["c"]) == 101.5
+        assert log.frames[4]["close"] == pytest.approx(101.2)
+        assert log.frames[4]["low"] == pytest.approx(0.0001)
+
+    def test_data_manager_records_every_kline_frame(self, tmp_path):
+        path = str(tmp_path / "dm.frames")
+        data_manager = DataManager(Config(), client=None)
+        recorder = FrameRecorder(path)
+        recorder.attach(data_manager, ["BTCUSDT"])
+
+        data_manager._handle_kline_message(kline_message("BTCUSDT", "5m", 0, 100.0, closed=False), "5m")
+        data_manager._handle_kline_message(kline_message("BTCUSDT", "5m", 0, 100.5), "5m")
+        recorder.close()
+
+        frames = load_frames(path).frames
+        assert frames["closed"].tolist() == [0, 1]
+        assert len(data_manager.get_latest_candles("5m", 10, symbol="BTCUSDT")) == 1
+
+    def test_synthesized_frames_split_history_and_order_delivery(self):
+        log, candles = make_log(n_days=3, live_days=1, updates_per_bar=2)
+        history, live = log.history(), log.live()
+        live_start = int(candles["BTCUSDT"]["5m"]["timestamp"][2 * DAY_5M])
+
+        assert np.all(history["open_time"] + 299_999 < live_start + 3 * 3_600_000 * 4)
+        assert np.all(np.diff(live["recv_time"]) >= 0)
+        assert np.all(live["recv_time"] >= live_start - 1)
+        closed_5m = live[(live["kind"] == FRAME_KLINE) & (live["closed"] == 1) & (live["interval"] == 0)]
+        assert len(closed_5m) == DAY_5M
+        assert np.sum(live["kind"] == FRAME_MARK_PRICE) == DAY_5M
+        assert np.sum((live["kind"] == FRAME_KLINE) & (live["closed"] == 0)) == 2 * np.sum(live["closed"] == 1)
+        assert log.streams() == ["btcusdt@kline_15m", "btcusdt@kline_1h", "btcusdt@kline_4h", "btcusdt@kline_5m"]
+
+
+class TestFakeExchangeClient:
+    """Simulated exchange state."""
+
+    def test_klines_follow_replay_clock(self):
+        log, candles = make_log(n_days=2, live_days=1, updates_per_bar=1)
+        client = FakeExchangeClient(log)
+        history_15m = candles["BTCUSDT"]["15m"][:96]
+
+        # A wall-clock window is shifted to end at the replay clock
+        now_ms = int(time.time() * 1000)
+        klines = client.futures_klines(symbol="BTCUSDT", interval="15m",
+                                       startTime=now_ms - 86_400_000, endTime=now_ms)
+        assert [k[0] for k in klines] == history_15m["timestamp"].tolist()
+        assert float(klines[-1][4]) == pytest.approx(history_15m["close"][-1])
+
+        # An in-progress update appears as the last (open) bar
+        live = log.live()
+        first_update = np.flatnonzero((live["closed"] == 0) & (live["interval"] == log.intervals.index("15m")))[0]
+        for frame in live[:first_update + 1]:
+            client.apply_frame(frame)
+        klines = client.futures_klines(symbol="BTCUSDT", interval="15m", limit=3)
+        assert len(klines) == 3
+        assert klines[-1][0] == live[first_update]["open_time"]
+
+    def test_account_validates_for_bot_startup(self):
+        client = priced_client()
+        account = client.futures_account()
+
+        assert float(account["assets"][0]["availableBalance"]) == 10000.0
+        assert client.get_account_api_permissions()["enableFutures"] is True
+        assert client.futures_get_open_orders() == []
+
+    @given(
+        entry=st.floats(min_value=1.0, max_value=1000.0),
+        exit_move=st.floats(min_value=-0.2, max_value=0.2),
+        quantity=st.floats(min_value=0.01, max_value=5.0),
+        side=st.sampled_from(["BUY", "SELL"]),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_round_trip_pnl_and_fees(self, entry, exit_move, quantity, side):
+        """Wallet change equals realized PnL minus taker fees on both legs."""
+        client = priced_client(entry, balance=1e9)
+        opened = client.futures_create_order(symbol="BTCUSDT", side=side, type="MARKET", quantity=quantity)
+        exit_price = entry * (1 + exit_move)
+        set_price(client, exit_price)
+        closing_side = "SELL" if side == "BUY" else "BUY"
+        closed = client.futures_create_order(symbol="BTCUSDT", side=closing_side, type="MARKET",
+                                             quantity=quantity, reduceOnly=True)
+
+        direction = 1 if side == "BUY" else -1
+        entry_fill = float(opened["avgPrice"])
+        exit_fill = float(closed["avgPrice"])
+        assert entry_fill == pytest.approx(entry * (1 + direction * client.slippage))
+        expected_pnl = (exit_fill - entry_fill) * quantity * direction
+        expected_fees = (entry_fill + exit_fill) * quantity * client.fee_rate
+        assert client.realized_pnl == pytest.approx(expected_pnl, rel=1e-9, abs=1e-6)
+        assert client.fees_paid == pytest.approx(expected_fees)
+        assert client.wallet_balance == pytest.approx(1e9 + expected_pnl - expected_fees)
+        assert client.summary()["open_positions"] == {}
+
+    def test_reduce_only_without_position_is_rejected(self):
+        client = priced_client()
+        with pytest.raises(BinanceAPIException) as exc_info:
+            client.futures_create_order(symbol="BTCUSDT", side="SELL", type="MARKET", quantity=1.0, reduceOnly=True)
+        assert exc_info.value.code == -2022
+        assert client.rejections == 1
+
+    def test_insufficient_margin_is_rejected(self):
+        client = priced_client(price=100.0, balance=100.0, leverage=10)
+        with pytest.raises(BinanceAPIException) as exc_info:
+            client.futures_create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=11.0)
+        assert exc_info.value.code == -2019
+
+        client.futures_create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=9.0)
+        assert client.summary()["open_positions"] == {"BTCUSDT": 9.0}
+
+    def test_stop_market_triggers_on_last_price(self):
+        client = priced_client(price=100.0)
+        client.futures_create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=2.0)
+        stop = client.futures_create_order(symbol="BTCUSDT", side="SELL", type="STOP_MARKET",
+                                           stopPrice=95.0, quantity=2.0, reduceOnly=True)
+        assert len(client.futures_get_open_orders(symbol="BTCUSDT")) == 1
+
+        set_price(client, 96.0)
+        assert client.futures_get_order(symbol="BTCUSDT", orderId=stop["orderId"])["status"] == "NEW"
+
+        set_price(client, 94.0)
+        order = client.futures_get_order(symbol="BTCUSDT", orderId=stop["orderId"])
+        assert order["status"] == "FILLED"
+        assert float(order["avgPrice"]) == pytest.approx(94.0 * (1 - client.slippage))
+        assert client.futures_get_open_orders() == []
+        assert client.summary()["open_positions"] == {}
+
+    def test_cancelled_stop_never_fills(self):
+        client = priced_client(price=100.0)
+        client.futures_create_order(symbol="BTCUSDT", side="SELL", type="MARKET", quantity=1.0)
+        stop = client.futures_create_order(symbol="BTCUSDT", side="BUY", type="STOP_MARKET",
+                                           stopPrice=105.0, quantity=1.0, reduceOnly=True)
+        client.futures_cancel_order(symbol="BTCUSDT", orderId=stop["orderId"])
+        set_price(client, 110.0)
+
+        assert client.futures_get_order(symbol="BTCUSDT", orderId=stop["orderId"])["status"] == "CANCELED"
+        assert client.summary()["open_positions"] == {"BTCUSDT": -1.0}
+
+
+class TestReplayDriver:
+    """Dispatching recordings into the DataManager."""
+
+    def test_rejects_out_of_range_speed(self):
+        log, _ = make_log(n_days=2)
+        with pytest.raises(ValueError):
+            ReplayDriver(log, speed=1001)
+        with pytest.raises(ValueError):
+            ReplayDriver(log, speed=-1)
+
+    def test_feeds_data_manager_buffers(self):
+        log, candles = make_log(n_days=2, live_days=1, updates_per_bar=1)
+        client = FakeExchangeClient(log)
+        data_manager = DataManager(Config(), client)
+        driver = ReplayDriver(log, client, speed=0, stream_timeout=1.0)
+        data_manager.websocket_manager = driver.websocket_manager
+        data_manager.start_websocket_streams(symbol="BTCUSDT")
+
+        stats = driver.run()
+
+        live_15m = candles["BTCUSDT"]["15m"][96:]
+        buffered = data_manager.get_latest_candles("15m", 500, symbol="BTCUSDT")
+        assert [c.timestamp for c in buffered] == live_15m["timestamp"].tolist()
+        assert stats.frames == len(log.live())
+        assert stats.closed_candles == np.sum(log.live()["closed"] == 1)
+        assert stats.dropped == np.sum(log.live()["kind"] == FRAME_MARK_PRICE)
+        assert stats.handler_errors == 0
+        assert client.clock_ms == int(log.live()["event_time"].max())
+
+    def test_throttled_replay_follows_schedule(self):
+        log, _ = make_log(n_days=2, live_days=1)
+        # One recorded day at 1000x takes ~86 s; replay only the first hour
+        live = log.live()
+        hour = live[live["recv_time"] < live["recv_time"][0] + 3_600_000]
+        short = FrameLog(frames=np.concatenate([log.history(), hour]), symbols=log.symbols, intervals=log.intervals)
+
+        stats = ReplayDriver(short, speed=1000, stream_timeout=0.0).run()
+
+        assert stats.market_seconds == pytest.approx(3600, abs=300)
+        assert stats.wall_seconds >= stats.market_seconds / 1000 * 0.99
+        assert stats.achieved_speed == pytest.approx(1000, rel=0.25)
+        assert stats.dropped == stats.frames
+
+
+class TestBotReplay:
+    """The live loop running offline."""
+
+    def test_paper_bot_runs_against_replay(self, tmp_path):
+        log, _ = make_log(n_days=3, live_days=0.25)
+        config = Config()
+        config.run_mode = "PAPER"
+        config.symbol = "BTCUSDT"
+        config.heartbeat_file = str(tmp_path / "heartbeat.bin")
+        config.candle_store_dir = str(tmp_path / "candles")
+        config.replay_record_file = str(tmp_path / "rerecorded.frames")
+        client = FakeExchangeClient(log)
+
+        from src.trading_bot import TradingBot
+        bot = TradingBot(config, client=client)
+        stats = run_bot_replay(bot, ReplayDriver(log, client, speed=1000))
+
+        assert stats.frames == len(log.live())
+        assert stats.handler_errors == 0
+        assert stats.loop_iterations > 0
+        assert not bot.running
+        assert bot._last_candle_processed > 0
+
+        # The live session was itself recorded and replays to the same candles
+        rerecorded = load_frames(config.replay_record_file)
+        assert np.sum(rerecorded.frames["kind"] == FRAME_HISTORY) > 0
+        replayed = log.live()
+        recorded = rerecorded.live()
+        closed = lambda frames: frames[(frames["kind"] == FRAME_KLINE) & (frames["closed"] == 1)]
+        assert np.array_equal(np.sort(closed(recorded)["open_time"]), np.sort(closed(replayed)["open_time"]))
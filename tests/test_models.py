@@ -334,3 +334,26 @@ class TestDataModels:
         assert status.remaining_size_pct == 0.0
         assert status.next_tp_level is None
         assert status.next_tp_price is None
+    
+    def test_hot_models_are_slotted(self):
+        """High-volume models have no per-instance __dict__ but keep dataclass behavior."""
+        position = Position(
+            symbol="BTCUSDT", side="LONG", entry_price=30000.0, quantity=0.1, leverage=3,
+            stop_loss=29000.0, trailing_stop=29000.0, entry_time=1609459200000
+        )
+        other = Position(
+            symbol="BTCUSDT", side="LONG", entry_price=30000.0, quantity=0.1, leverage=3,
+            stop_loss=29000.0, trailing_stop=29000.0, entry_time=1609459200000
+        )
+        
+        for instance in (Candle(1, 1.0, 1.0, 1.0, 1.0, 1.0), position, Signal("EXIT", 1, 1.0),
+                         IndicatorState(), Trade("BTCUSDT", "LONG", 1.0, 2.0, 1.0, 1.0, 100.0, 1, 2, "SIGNAL_EXIT")):
+            assert not hasattr(instance, "__dict__")
+        
+        # Mutable defaults are still per instance
+        position.partial_exits.append({"quantity": 0.05})
+        assert other.partial_exits == []
+        assert IndicatorState().squeeze_color == "gray"
+        
+        with pytest.raises(AttributeError):
+            position.unknown_field = 1.0
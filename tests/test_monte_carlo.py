@@ -0,0 +1,150 @@
+"""Property-based and unit tests for Monte Carlo trade resampling.
+
+Tests cover:
+- Vectorized path statistics matching a per-path reference loop
+- Bootstrap and circular block bootstrap index layout
+- Trade returns reproducing the realized equity curve
+- Leverage scaling and input validation
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src import monte_carlo as mc
+from src import performance_analytics as pa
+from src.models import Trade
+
+
+def reference_path(returns, ruin_level):
+    """Per-path reference: (max drawdown, terminal, longest underwater run, ruined)."""
+    equity = 1.0
+    peak = 1.0
+    max_drawdown = 0.0
+    underwater = longest = 0
+    ruined = False
+    for r in returns:
+        equity *= max(1.0 + r, mc.WIPEOUT_EQUITY)
+        ruined = ruined or equity <= ruin_level
+        if equity >= peak:
+            peak = equity
+            underwater = 0
+        else:
+            underwater += 1
+            longest = max(longest, underwater)
+            max_drawdown = max(max_drawdown, 1 - equity / peak)
+    return max_drawdown, equity, longest, ruined
+
+
+# Feature: monte-carlo, Property 1: Path Statistics Match a Per-Path Loop
+@given(
+    seed=st.integers(min_value=0, max_value=10_000),
+    n_trades=st.integers(min_value=1, max_value=60),
+    scale=st.floats(min_value=0.0, max_value=5.0),
+    ruin_level=st.floats(min_value=0.0, max_value=0.9)
+)
+@settings(max_examples=100, deadline=None)
+def test_path_stats_match_reference_loop(seed, n_trades, scale, ruin_level):
+    """Drawdown, terminal equity, recovery time and ruin equal a plain loop."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0, 0.08, 25)
+    indices = mc.resample_indices(rng, len(returns), 8, n_trades)
+    log_returns = np.log(np.maximum(1.0 + scale * returns, mc.WIPEOUT_EQUITY))
+    log_ruin = np.log(max(ruin_level, mc.RUIN_FLOOR))
+
+    max_drawdown, terminal, recovery, ruined = mc._path_stats(log_returns, indices, log_ruin)
+
+    for k in range(len(indices)):
+        expected = reference_path(scale * returns[indices[k]], ruin_level)
+        assert max_drawdown[k] == pytest.approx(expected[0], abs=1e-9)
+        assert terminal[k] == pytest.approx(expected[1], rel=1e-9)
+        assert recovery[k] == expected[2]
+        if abs(expected[1]) > 1e-9 and not np.isclose(np.log(max(expected[1], 1e-300)), log_ruin):
+            assert ruined[k] == expected[3]
+
+
+class TestResampling:
+    """Unit tests for index generation and returns."""
+
+    def test_block_indices_are_circular_runs(self):
+        rng = np.random.default_rng(0)
+        indices = mc.resample_indices(rng, 10, 50, 23, method="block", block_size=5)
+
+        assert indices.shape == (50, 23)
+        assert indices.min() >= 0 and indices.max() < 10
+        blocks = indices[:, :20].reshape(50, 4, 5)
+        assert np.all(np.diff(blocks, axis=2) % 10 == 1)
+
+    def test_bootstrap_indices_cover_table(self):
+        indices = mc.resample_indices(np.random.default_rng(1), 7, 1000, 30)
+
+        assert indices.dtype == np.int32
+        assert set(np.unique(indices)) == set(range(7))
+
+    def test_trade_returns_compound_to_equity(self):
+        pnls = [120.0, -80.0, 45.5, -300.0, 210.0]
+        trades = [
+            Trade(symbol="BTCUSDT", side="LONG", entry_price=100.0, exit_price=101.0, quantity=1.0,
+                  pnl=pnl, pnl_percent=0.0, entry_time=i, exit_time=1000 - i, exit_reason="TAKE_PROFIT")
+            for i, pnl in enumerate(pnls)
+        ]
+        returns = mc.trade_returns(trades, 5000.0)
+        equity = pa.equity_from_trades(pa.trades_to_array(trades), 5000.0)
+
+        np.testing.assert_allclose(5000.0 * np.cumprod(1 + returns), equity[1:])
+        assert len(mc.trade_returns([], 5000.0)) == 0
+
+
+class TestSimulate:
+    """Unit tests for the simulation entry points."""
+
+    RETURNS = np.random.default_rng(3).normal(0.003, 0.03, 200)
+
+    def test_summary_and_reproducibility(self):
+        result = mc.simulate(self.RETURNS, n_paths=2000, method="block", block_size=10, seed=7)
+        again = mc.simulate(self.RETURNS, n_paths=2000, method="block", block_size=10, seed=7)
+        summary = result.summary()
+
+        np.testing.assert_array_equal(result.terminal_equity, again.terminal_equity)
+        assert summary["n_trades"] == 200
+        assert summary["block_size"] == 10
+        dd = summary["max_drawdown"]
+        assert 0 <= dd["p5"] <= dd["p50"] <= dd["p95"] < 1
+        assert 0.0 <= summary["ruin_probability"] <= 1.0
+
+    def test_chunks_do_not_change_results(self, monkeypatch):
+        full = mc.simulate(self.RETURNS, n_paths=300, seed=5)
+        monkeypatch.setattr(mc, "CHUNK_ELEMENTS", 1000)
+        chunked = mc.simulate(self.RETURNS, n_paths=300, seed=5)
+
+        np.testing.assert_array_equal(full.max_drawdown, chunked.max_drawdown)
+        np.testing.assert_array_equal(full.time_to_recovery, chunked.time_to_recovery)
+
+    def test_leverage_scaling(self):
+        results = mc.simulate_many(self.RETURNS, [0.0, 1.0, 20.0], n_paths=2000, seed=2)
+
+        flat, base, levered = results
+        assert np.all(flat.terminal_equity == 1.0)
+        assert flat.ruin_probability == 0.0
+        assert levered.ruin_probability > base.ruin_probability
+        assert np.median(levered.max_drawdown) > np.median(base.max_drawdown)
+
+        ruin = mc.ruin_by_leverage(self.RETURNS, 10, [10, 200], n_paths=2000, seed=2)
+        assert ruin[10] == base.ruin_probability
+        assert ruin[200] == levered.ruin_probability
+
+    def test_total_loss_trade_is_ruin(self):
+        result = mc.simulate([0.1, -1.5], n_paths=500, ruin_level=0.0, seed=1)
+
+        assert result.ruin_probability == pytest.approx(0.75, abs=0.06)
+        assert np.isfinite(result.max_drawdown).all()
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            mc.simulate(self.RETURNS, method="jackknife")
+        with pytest.raises(ValueError):
+            mc.simulate([], n_paths=10)
+        with pytest.raises(ValueError):
+            mc.simulate(self.RETURNS, ruin_level=1.0)
+        with pytest.raises(ValueError):
+            mc.trade_returns([], 0.0)
@@ -840,3 +840,168 @@ def test_trading_operations_require_permissions():
     # Should raise error if permissions not validated
     with pytest.raises(ValueError, match="permissions not validated"):
         executor.place_market_order("BTCUSDT", "BUY", 0.001)
+
+
+# ============================================================================
+# Batch Order Tests
+# ============================================================================
+
+def _exchange_with_positions(symbols, price=100.0, quantity=1.0):
+    """Fake exchange holding a long position in each symbol."""
+    import numpy as np
+    from src.market_replay import FRAME_DTYPE, FRAME_KLINE, FakeExchangeClient, FrameLog
+
+    frames = np.zeros(len(symbols), dtype=FRAME_DTYPE)
+    for index in range(len(symbols)):
+        frames[index] = (FRAME_KLINE, 1, 0, index, 1, 1, 0, price, price, price, price, 1.0)
+    client = FakeExchangeClient(FrameLog(frames=frames, symbols=list(symbols), intervals=["5m"]),
+                                initial_balance=1e9)
+    for frame in frames:
+        client.apply_frame(frame)
+    for symbol in symbols:
+        client.futures_create_order(symbol=symbol, side="BUY", type="MARKET", quantity=quantity)
+    return client
+
+
+def _position(symbol, quantity=1.0):
+    from src.models import Position
+    return Position(symbol=symbol, side="LONG", entry_price=100.0, quantity=quantity, leverage=1,
+                    stop_loss=90.0, trailing_stop=95.0, entry_time=0, unrealized_pnl=0.0)
+
+
+def _batch_executor(client):
+    executor = OrderExecutor(Config(), client=client)
+    executor._authenticated = True
+    executor._permissions_validated = True
+    executor.base_backoff = 0.0
+    return executor
+
+
+# Feature: batch orders, one result per leg and transient legs retried alone
+@given(
+    n_symbols=st.integers(min_value=1, max_value=12),
+    transient=st.sets(st.integers(min_value=0, max_value=11)),
+    rejected=st.sets(st.integers(min_value=0, max_value=11)),
+)
+@settings(max_examples=30, deadline=None)
+def test_batch_close_reports_each_leg(n_symbols, transient, rejected):
+    """Every position closes except permanently rejected legs; transient failures are retried."""
+    symbols = [f"S{i}USDT" for i in range(n_symbols)]
+    client = _exchange_with_positions(symbols)
+    for index in transient - rejected:
+        if index < n_symbols:
+            client.fail_next_orders(symbols[index], count=1, code=-1001)
+    for index in rejected:
+        if index < n_symbols:
+            client.fail_next_orders(symbols[index], count=5, code=-2022)
+    executor = _batch_executor(client)
+    
+    results = executor.close_positions([_position(symbol) for symbol in symbols])
+    
+    open_positions = {p["symbol"] for p in client.futures_position_information() if float(p["positionAmt"]) != 0}
+    for index, symbol in enumerate(symbols):
+        result = results[symbol]
+        if index in rejected:
+            assert not result.success and result.error_code == -2022 and result.attempts == 1
+            assert symbol in open_positions
+        else:
+            assert result.success and result.order["status"] == "FILLED"
+            assert result.attempts == (2 if index in transient else 1)
+            assert symbol not in open_positions
+
+
+def test_batch_orders_are_chunked_and_concurrent():
+    """Orders are sent in requests of at most BATCH_ORDER_LIMIT legs."""
+    from src.order_executor import BATCH_ORDER_LIMIT
+    
+    symbols = [f"S{i}USDT" for i in range(12)]
+    client = _exchange_with_positions(symbols)
+    batch_sizes = []
+    original = client.futures_place_batch_order
+    
+    def recording_batch(batchOrders, **kwargs):
+        batch_sizes.append(len(batchOrders))
+        assert all(isinstance(value, str) for order in batchOrders for value in order.values())
+        return original(batchOrders=batchOrders, **kwargs)
+    
+    client.futures_place_batch_order = recording_batch
+    results = _batch_executor(client).place_stop_loss_orders([_position(symbol) for symbol in symbols])
+    
+    assert sorted(batch_sizes) == [2, BATCH_ORDER_LIMIT, BATCH_ORDER_LIMIT]
+    assert all(r.success and r.order["type"] == "STOP_MARKET" for r in results.values())
+    assert float(results["S0USDT"].order["stopPrice"]) == 95.0
+    assert len(client.futures_get_open_orders()) == 12
+
+
+def test_batch_request_failure_retries_whole_batch():
+    """Legs of a failed request that the exchange never placed are resent."""
+    client = Mock()
+    client.futures_place_batch_order = Mock(side_effect=[
+        Exception("Connection reset"),
+        [{"orderId": 1, "status": "FILLED"}, {"code": -2019, "msg": "Margin is insufficient."}],
+    ])
+    client.futures_get_order = Mock(side_effect=BinanceAPIException(
+        None, 400, '{"code": -2013, "msg": "Order does not exist."}'
+    ))
+    executor = _batch_executor(client)
+    
+    results = executor.place_batch_orders([
+        {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.001},
+        {"symbol": "ETHUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.01},
+    ])
+    
+    assert results[0].success and results[0].attempts == 2
+    assert results[1].error_code == -2019
+    assert client.futures_place_batch_order.call_count == 2
+    assert client.futures_get_order.call_count == 2
+    first, second = (call.kwargs["batchOrders"] for call in client.futures_place_batch_order.call_args_list)
+    assert [leg["newClientOrderId"] for leg in first] == [leg["newClientOrderId"] for leg in second]
+    
+    with pytest.raises(ValueError, match="Invalid quantity"):
+        executor.place_batch_orders([{"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0}])
+
+
+def test_timed_out_batch_is_not_placed_twice():
+    """A batch that times out after the exchange placed it is looked up, not resubmitted."""
+    client = _exchange_with_positions(["BTCUSDT"])
+    original = client.futures_place_batch_order
+    calls = []
+    
+    def placed_then_timed_out(batchOrders, **kwargs):
+        calls.append(batchOrders)
+        original(batchOrders=batchOrders, **kwargs)
+        if len(calls) == 1:
+            raise Exception("Read timed out")
+        return original(batchOrders=batchOrders, **kwargs)
+    
+    client.futures_place_batch_order = placed_then_timed_out
+    results = _batch_executor(client).place_stop_loss_orders([_position("BTCUSDT")])
+    
+    result = results["BTCUSDT"]
+    assert result.success and result.attempts == 1
+    assert len(calls) == 1
+    assert len(client.futures_get_open_orders(symbol="BTCUSDT")) == 1
+    assert result.order["clientOrderId"] == calls[0][0]["newClientOrderId"]
+
+
+def test_only_unaccepted_errors_are_resubmitted_blindly():
+    """-1003/-1008 legs are resent without a lookup; -1007 legs are looked up first."""
+    client = _exchange_with_positions(["AUSDT", "BUSDT", "CUSDT"])
+    client.fail_next_orders("AUSDT", count=1, code=-1003)
+    client.fail_next_orders("BUSDT", count=1, code=-1008)
+    client.fail_next_orders("CUSDT", count=1, code=-1007)
+    lookups = []
+    original = client.futures_get_order
+    
+    def recording_lookup(**kwargs):
+        lookups.append(kwargs["symbol"])
+        return original(**kwargs)
+    
+    client.futures_get_order = recording_lookup
+    results = _batch_executor(client).place_stop_loss_orders(
+        [_position(symbol) for symbol in ("AUSDT", "BUSDT", "CUSDT")]
+    )
+    
+    assert all(r.success and r.attempts == 2 for r in results.values())
+    assert lookups == ["CUSDT"]
+    assert len(client.futures_get_open_orders()) == 3
@@ -0,0 +1,222 @@
+"""Property-based and unit tests for the vectorized performance analytics module.
+
+Tests cover:
+- Summary metrics matching straightforward per-trade loops
+- Session metrics from running trade totals
+- Drawdown and underwater curves
+- Daily returns and rolling Sharpe ratio
+- Per-symbol / per-exit-reason breakdowns
+"""
+
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src.models import Trade
+from src import performance_analytics as pa
+
+
+def make_trades(pnls, symbols=None, reasons=None, start=1_700_000_000_000, spacing=3_600_000):
+    """Create Trade objects with the given PnLs."""
+    trades = []
+    for i, pnl in enumerate(pnls):
+        entry_time = start + i * spacing
+        trades.append(Trade(
+            symbol=symbols[i] if symbols else "BTCUSDT",
+            side="LONG" if i % 2 == 0 else "SHORT",
+            entry_price=100.0,
+            exit_price=100.0 + pnl,
+            quantity=1.0,
+            pnl=pnl,
+            pnl_percent=pnl,
+            entry_time=entry_time,
+            exit_time=entry_time + spacing // 2,
+            exit_reason=reasons[i] if reasons else "STOP_LOSS"
+        ))
+    return trades
+
+
+# Feature: performance-analytics, Property 1: Vectorized Metrics Match Reference
+@given(
+    pnls=st.lists(
+        st.floats(min_value=-500, max_value=500, allow_nan=False, allow_infinity=False),
+        min_size=1,
+        max_size=200
+    )
+)
+@settings(max_examples=100, deadline=None)
+def test_metrics_match_reference_loop(pnls):
+    """For any trade list, vectorized metrics must equal a plain Python loop."""
+    trades = make_trades(pnls)
+    initial_balance = 10000.0
+    metrics = pa.calculate_metrics(trades, initial_balance)
+
+    wins = [p for p in pnls if p > 0]
+    losses = [p for p in pnls if p < 0]
+
+    equity = initial_balance
+    peak = equity
+    max_dd = 0.0
+    for p in pnls:
+        equity += p
+        peak = max(peak, equity)
+        max_dd = max(max_dd, peak - equity)
+
+    assert metrics["total_trades"] == len(pnls)
+    assert metrics["winning_trades"] == len(wins)
+    assert metrics["losing_trades"] == len(pnls) - len(wins)
+    assert metrics["total_pnl"] == pytest.approx(sum(pnls), abs=1e-6)
+    assert metrics["max_drawdown"] == pytest.approx(max_dd, abs=1e-6)
+    assert metrics["average_win"] == pytest.approx(np.mean(wins) if wins else 0.0)
+    assert metrics["average_loss"] == pytest.approx(np.mean(losses) if losses else 0.0)
+    assert metrics["largest_loss"] == (min(losses) if losses else 0.0)
+    assert metrics["average_trade_duration"] == 1_800_000
+
+
+# Feature: performance-analytics, Property 2: Running Totals Match Full Metrics
+@given(
+    pnls=st.lists(
+        st.floats(min_value=-500, max_value=500, allow_nan=False, allow_infinity=False),
+        min_size=1,
+        max_size=100
+    )
+)
+@settings(max_examples=50, deadline=None)
+def test_metrics_from_totals_match_full_trade_list(pnls):
+    """Totals kept trade by trade give the metrics of the full trade list."""
+    from src.config import Config
+    from src.position_sizer import PositionSizer
+    from src.risk_manager import RiskManager
+
+    trades = make_trades(pnls)
+    risk_manager = RiskManager(Config(), PositionSizer(Config()))
+    for trade in trades:
+        risk_manager._record_trade(trade)
+    initial_balance = 10000.0
+
+    expected = pa.calculate_metrics(trades, initial_balance)
+    actual = pa.metrics_from_totals(risk_manager.get_trade_totals(), initial_balance, trades)
+
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        if key != "max_drawdown_percent":
+            assert actual[key] == pytest.approx(expected[key], abs=1e-6), key
+    if expected["max_drawdown"] == pytest.approx(0.0, abs=1e-9):
+        assert actual["max_drawdown_percent"] == pytest.approx(0.0, abs=1e-6)
+    else:
+        assert 0 < actual["max_drawdown_percent"] <= expected["max_drawdown_percent"] + 1e-6
+
+
+class TestSummaryMetrics:
+    """Unit tests for calculate_metrics and conversions."""
+
+    def test_empty_trades(self):
+        """No trades yields all-zero metrics."""
+        metrics = pa.calculate_metrics([], 10000.0)
+        assert metrics["total_trades"] == 0
+        assert metrics["max_drawdown"] == 0.0
+        assert metrics["average_trade_duration"] == 0
+
+    def test_equity_curve_overrides_trade_equity(self):
+        """A supplied mark-to-market equity curve is used for drawdown."""
+        trades = make_trades([100.0, -50.0])
+        metrics = pa.calculate_metrics(trades, 10000.0, equity_curve=[10000, 9000, 10100, 10050])
+        assert metrics["max_drawdown"] == 1000.0
+        assert metrics["max_drawdown_percent"] == pytest.approx(10.0)
+
+    def test_profit_factor_and_sharpe(self):
+        """Profit factor and Sharpe follow the documented conventions."""
+        trades = make_trades([100.0, -50.0, 50.0])
+        metrics = pa.calculate_metrics(trades, 10000.0)
+
+        returns = np.array([1.0, -0.5, 0.5])
+        assert metrics["profit_factor"] == pytest.approx(3.0)
+        assert metrics["sharpe_ratio"] == pytest.approx(returns.mean() / returns.std() * np.sqrt(250))
+        assert metrics["roi"] == pytest.approx(1.0)
+
+    def test_trade_dicts_and_objects_agree(self):
+        """Trade dicts from the logs produce the same metrics as Trade objects."""
+        trades = make_trades([10.0, -5.0, 7.5])
+        dicts = [asdict(t) for t in trades]
+        dicts[0]["exit_time"] = pd.Timestamp(trades[0].exit_time, unit="ms", tz="UTC").isoformat()
+
+        assert pa.calculate_metrics(dicts, 1000.0) == pa.calculate_metrics(trades, 1000.0)
+
+    def test_to_performance_metrics_converts_duration(self):
+        """PerformanceMetrics uses seconds for average_trade_duration."""
+        trades = make_trades([10.0, -5.0])
+        performance = pa.to_performance_metrics(pa.calculate_metrics(trades, 1000.0), 1000.0)
+
+        assert performance.average_trade_duration == 1800
+        assert performance.total_pnl_percent == pytest.approx(0.5)
+        assert performance.average_loss == -5.0
+
+
+class TestCurves:
+    """Unit tests for drawdown, daily returns and rolling statistics."""
+
+    def test_underwater_curve(self):
+        """Underwater curve is distance below the running peak."""
+        underwater = pa.underwater_curve([100, 120, 90, 130, 117])
+        np.testing.assert_allclose(underwater, [0, 0, -30, 0, -13])
+        np.testing.assert_allclose(
+            pa.underwater_curve([100, 120, 90], percent=True), [0, 0, -25]
+        )
+
+    def test_daily_returns_fill_gaps(self):
+        """Daily buckets are contiguous and PnL sums per day."""
+        day = pa.DAY_MS
+        base = 19_000 * day
+        trades = make_trades([10.0, 20.0, -5.0], spacing=1)
+        trades[0].exit_time = base + 1000
+        trades[1].exit_time = base + 2000
+        trades[2].exit_time = base + 2 * day + 1000
+
+        daily = pa.daily_returns(trades, 1000.0)
+
+        np.testing.assert_array_equal(daily.day, [base, base + day, base + 2 * day])
+        np.testing.assert_allclose(daily.pnl, [30.0, 0.0, -5.0])
+        np.testing.assert_allclose(daily.returns, [0.03, 0.0, -5.0 / 1030.0])
+        np.testing.assert_allclose(daily.equity, [1030.0, 1030.0, 1025.0])
+
+    def test_rolling_sharpe_matches_pandas(self):
+        """Rolling Sharpe equals a pandas rolling mean/std reference."""
+        rng = np.random.default_rng(7)
+        returns = rng.normal(0.001, 0.02, 300)
+        result = pa.rolling_sharpe(returns, window=30, periods_per_year=365)
+
+        series = pd.Series(returns)
+        expected = (series.rolling(30).mean() / series.rolling(30).std(ddof=0) * np.sqrt(365)).to_numpy()
+
+        assert np.all(np.isnan(result[:29]))
+        np.testing.assert_allclose(result[29:], expected[29:], rtol=1e-6)
+
+
+class TestBreakdowns:
+    """Unit tests for grouped breakdowns."""
+
+    def test_breakdown_by_symbol_and_reason(self):
+        """Breakdown totals add up to the overall figures."""
+        trades = make_trades(
+            [10.0, -5.0, 20.0, -8.0],
+            symbols=["BTCUSDT", "ETHUSDT", "BTCUSDT", "ETHUSDT"],
+            reasons=["TAKE_PROFIT", "STOP_LOSS", "TAKE_PROFIT", "TRAILING_STOP"]
+        )
+
+        by_symbol = pa.breakdown(trades, "symbol")
+        assert by_symbol["BTCUSDT"]["trades"] == 2
+        assert by_symbol["BTCUSDT"]["total_pnl"] == 30.0
+        assert by_symbol["BTCUSDT"]["win_rate"] == 100.0
+        assert by_symbol["ETHUSDT"]["gross_loss"] == 13.0
+
+        by_reason = pa.breakdown(trades, "exit_reason")
+        assert set(by_reason) == {"TAKE_PROFIT", "STOP_LOSS", "TRAILING_STOP"}
+        assert sum(v["total_pnl"] for v in by_reason.values()) == pytest.approx(17.0)
+
+    def test_breakdown_rejects_unknown_field(self):
+        """Only trade categorical fields can be used for breakdowns."""
+        with pytest.raises(ValueError):
+            pa.breakdown(make_trades([1.0]), "pnl")
@@ -0,0 +1,124 @@
+"""Property-based and unit tests for the portfolio backtest.
+
+Tests cover:
+- A single-symbol portfolio reproducing the event-skipping backtest
+- Shared balance and equity curve over a merged multi-symbol timeline
+- Correlation-aware allocation capping correlated positions
+- Portfolio risk limits rejecting entries
+"""
+
+import numpy as np
+import pytest
+
+from src.backtest_engine import BacktestEngine
+from src.candle_array import to_candles
+from src.config import Config
+from src.portfolio_backtest import PortfolioBacktestEngine
+from src.position_sizer import PositionSizer
+from src.risk_manager import RiskManager
+from src.strategy import StrategyEngine
+from src.synthetic_data import generate_multi_timeframe
+
+
+def make_data(seeds, n_bars=1100):
+    """Synthetic 15m/1h arrays per symbol, all starting at the same time."""
+    data = {}
+    for k, seed in enumerate(seeds):
+        bars = generate_multi_timeframe(n_bars - 100 * k, base_timeframe="15m", timeframes=("15m", "1h"), seed=seed)
+        data[f"SYM{k}USDT"] = (bars["15m"], bars["1h"])
+    return data
+
+
+def permissive_config():
+    """Config whose portfolio limits never bind."""
+    config = Config()
+    config.portfolio_max_single_allocation = 1.0
+    config.portfolio_max_total_risk = 100.0
+    return config
+
+
+class TestPortfolioBacktest:
+    """End-to-end tests on synthetic data."""
+
+    def test_single_symbol_matches_event_backtest(self):
+        """With non-binding limits one symbol trades exactly as on its own."""
+        config = permissive_config()
+        config.symbol = "SYM0USDT"
+        data = make_data([21])
+        candles_15m, candles_1h = (to_candles(a) for a in data["SYM0USDT"])
+
+        single = BacktestEngine(config, StrategyEngine(config), RiskManager(config, PositionSizer(config)))
+        expected = single.run_event_backtest(candles_15m, candles_1h, 10000.0)
+
+        portfolio = PortfolioBacktestEngine(config)
+        result = portfolio.run(data, 10000.0)
+
+        assert expected['total_trades'] > 0
+        assert [(t.entry_price, t.exit_price, t.pnl) for t in portfolio.get_trades()] == [
+            (t.entry_price, t.exit_price, t.pnl) for t in single.get_trades()
+        ]
+        np.testing.assert_allclose(portfolio.get_equity_curve(), single.get_equity_curve())
+        assert result['total_pnl'] == pytest.approx(expected['total_pnl'])
+        assert result['portfolio']['opened'] == result['portfolio']['signals']
+
+    def test_shared_balance_over_merged_timeline(self):
+        """All symbols trade from one balance and one equity curve."""
+        portfolio = PortfolioBacktestEngine(permissive_config())
+        result = portfolio.run(make_data([21, 22, 23]), 10000.0)
+        trades = portfolio.get_trades()
+        stats = result['portfolio']
+
+        assert {t.symbol for t in trades} == {"SYM0USDT", "SYM1USDT", "SYM2USDT"}
+        assert stats['symbols'] == 3
+        assert stats['max_concurrent_positions'] >= 2
+        assert stats['opened'] + stats['rejected_by_allocation'] == stats['signals']
+        assert len(portfolio.equity_curve) == stats['timeline_bars'] + 1
+        assert portfolio.current_balance == pytest.approx(10000.0 + sum(t.pnl for t in trades))
+        assert set(result['per_symbol']) == {t.symbol for t in trades}
+
+    def test_correlated_symbols_share_exposure_limit(self):
+        """Identical symbols signal together and split the correlated allocation."""
+        config = Config()
+        config.portfolio_max_total_risk = 100.0
+        same = make_data([21])["SYM0USDT"]
+        portfolio = PortfolioBacktestEngine(config)
+        result = portfolio.run({"AAAUSDT": same, "BBBUSDT": same}, 10000.0)
+        stats = result['portfolio']
+        correlations = portfolio.risk_mgr.portfolio_manager.correlation_matrix
+
+        assert stats['correlation_updates'] > 0
+        assert correlations[("AAAUSDT", "BBBUSDT")] == pytest.approx(1.0)
+        assert stats['reduced_by_allocation'] > 0
+
+        # Both legs of a simultaneous entry get half the correlated exposure
+        trades = portfolio.get_trades()
+        by_symbol = {s: [t for t in trades if t.symbol == s] for s in ("AAAUSDT", "BBBUSDT")}
+        assert len(by_symbol["AAAUSDT"]) == len(by_symbol["BBBUSDT"]) > 0
+        for a, b in zip(by_symbol["AAAUSDT"], by_symbol["BBBUSDT"]):
+            assert a.quantity == pytest.approx(b.quantity)
+            margin = a.quantity * a.entry_price / config.leverage
+            assert margin <= max(portfolio.equity_curve) * config.portfolio_correlation_max_exposure / 2 + 1e-6
+
+    def test_total_risk_limit_rejects_entries(self):
+        """A zero portfolio risk budget rejects every signal."""
+        config = Config()
+        config.portfolio_max_total_risk = 0.0
+        portfolio = PortfolioBacktestEngine(config)
+        result = portfolio.run(make_data([21, 22]), 10000.0)
+        stats = result['portfolio']
+
+        assert stats['signals'] > 0
+        assert stats['rejected_by_risk'] == stats['signals']
+        assert result['total_trades'] == 0
+        assert portfolio.equity_curve[-1] == 10000.0
+
+    def test_rejects_invalid_setup(self):
+        with pytest.raises(ValueError):
+            PortfolioBacktestEngine(Config()).run({}, 10000.0)
+        with pytest.raises(ValueError):
+            PortfolioBacktestEngine(Config()).run(make_data([21]), 0.0)
+
+        adaptive = Config()
+        adaptive.enable_volume_profile = True
+        with pytest.raises(ValueError):
+            PortfolioBacktestEngine(adaptive).run(make_data([21]), 10000.0)
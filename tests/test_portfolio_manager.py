@@ -522,3 +522,39 @@ def test_update_pnl():
     
     manager.update_pnl("BTCUSDT", -50.0)
     assert manager.per_symbol_pnl["BTCUSDT"] == 50.0
+
+
+# Feature: portfolio-backtest, Property 1: Vectorized correlation matrix matches pairwise build
+@given(
+    lengths=st.lists(st.integers(min_value=5, max_value=60), min_size=2, max_size=5),
+    seed=st.integers(min_value=0, max_value=10_000)
+)
+@settings(max_examples=50, deadline=None)
+def test_update_correlation_matrix_matches_build(lengths, seed):
+    """update_correlation_matrix produces the coefficients of build_correlation_matrix."""
+    import numpy as np
+    
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{k}USDT" for k in range(len(lengths))]
+    config = Config()
+    config.portfolio_symbols = symbols
+    config.portfolio_max_symbols = len(symbols)
+    
+    common = rng.normal(0, 0.01, max(lengths))
+    closes = {}
+    for symbol, length in zip(symbols, lengths):
+        returns = 0.7 * common[-length:] + rng.normal(0, 0.01, length)
+        closes[symbol] = 100.0 * np.cumprod(1 + returns)
+    price_data = {
+        symbol: [Candle(timestamp=i, open=c, high=c, low=c, close=c, volume=1.0) for i, c in enumerate(values)]
+        for symbol, values in closes.items()
+    }
+    
+    built = PortfolioManager(config)
+    built.build_correlation_matrix(price_data)
+    vectorized = PortfolioManager(config)
+    vectorized.update_correlation_matrix(closes)
+    
+    assert set(vectorized.correlation_matrix) == set(built.correlation_matrix)
+    for pair, correlation in built.correlation_matrix.items():
+        assert vectorized.correlation_matrix[pair] == pytest.approx(correlation, abs=1e-9)
@@ -0,0 +1,191 @@
+"""Property-based and unit tests for local multi-timeframe resampling.
+
+Tests cover:
+- Incremental resampling matches batch resampling and epoch-aligned aggregation
+- Bucket alignment, partial bars, gaps and corrected base candles
+- DataManager deriving coarser timeframes from one base stream
+- Paged base history fetches resampled into every timeframe
+"""
+
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from src.candle_array import aggregate_ohlcv, to_candles
+from src.config import Config
+from src.data_manager import DataManager
+from src.models import Candle
+from src.resampler import CandleResampler, bucket_start, can_resample, resample_candles
+from src.synthetic_data import DEFAULT_START_TIME, generate_ohlcv
+
+
+FIVE_MIN_MS = 300_000
+
+
+def make_config(**overrides):
+    config = Config()
+    config.symbol = "BTCUSDT"
+    config.candle_base_timeframe = "5m"
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
+
+
+def kline(candle):
+    return [candle.timestamp, str(candle.open), str(candle.high), str(candle.low),
+            str(candle.close), str(candle.volume)]
+
+
+class TestResamplerProperties:
+    """Property-based tests for resampling."""
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        n_bars=st.integers(min_value=1, max_value=400),
+        offset=st.integers(min_value=0, max_value=47),
+        base_timeframe=st.sampled_from(["1m", "5m"]),
+    )
+    def test_incremental_matches_batch(self, n_bars, offset, base_timeframe):
+        """Streaming base candles one by one yields exactly the batch-resampled bars."""
+        base_ms = 60_000 if base_timeframe == "1m" else FIVE_MIN_MS
+        candles = to_candles(generate_ohlcv(
+            n_bars, timeframe=base_timeframe, seed=n_bars, start_time=DEFAULT_START_TIME + offset * base_ms
+        ))
+        timeframes = ["5m", "15m", "1h", "4h"]
+        resampler = CandleResampler(base_timeframe, timeframes)
+
+        emitted = {tf: [] for tf in resampler.timeframes}
+        for candle in candles:
+            for timeframe, bar in resampler.update(candle):
+                emitted[timeframe].append(bar)
+
+        for timeframe in resampler.timeframes:
+            assert emitted[timeframe] == resample_candles(candles, base_timeframe, timeframe)
+            partial = resample_candles(candles, base_timeframe, timeframe, include_partial=True)
+            if len(partial) > len(emitted[timeframe]):
+                assert resampler.partial(timeframe) == partial[-1]
+            else:
+                assert resampler.partial(timeframe) is None
+
+    @settings(max_examples=30, deadline=None)
+    @given(n_bars=st.integers(min_value=48, max_value=600), timeframe=st.sampled_from(["15m", "1h", "4h"]))
+    def test_complete_buckets_match_aggregation(self, n_bars, timeframe):
+        """Complete buckets equal the epoch-aligned aggregation of the base candles."""
+        raw = generate_ohlcv(n_bars, timeframe="5m", seed=1)
+        expected = aggregate_ohlcv(raw, timeframe)
+        resampled = resample_candles(to_candles(raw), "5m", timeframe)
+
+        assert len(resampled) in (len(expected), len(expected) - 1)
+        assert [c.timestamp for c in resampled] == expected["timestamp"][:len(resampled)].tolist()
+        assert np.allclose([c.volume for c in resampled], expected["volume"][:len(resampled)])
+        assert np.allclose([c.high for c in resampled], expected["high"][:len(resampled)])
+
+
+class TestResamplerUnit:
+    """Unit tests for CandleResampler and resample_candles."""
+
+    def test_alignment_and_supported_targets(self):
+        assert bucket_start(DEFAULT_START_TIME + 7 * FIVE_MIN_MS, 3_600_000) == DEFAULT_START_TIME
+        assert can_resample("5m", "15m") and can_resample("1m", "5m")
+        assert not can_resample("5m", "5m") and not can_resample("5m", "7m") and not can_resample("5m", "x")
+        assert CandleResampler("5m", ["1m", "15m", "15m", "7m"]).timeframes == ["15m"]
+        with pytest.raises(ValueError):
+            CandleResampler("15m", ["1h"])
+        with pytest.raises(ValueError):
+            resample_candles([], "5m", "7m")
+
+    def test_history_starting_mid_bucket_skips_first_bucket(self):
+        candles = to_candles(generate_ohlcv(6, timeframe="5m", start_time=DEFAULT_START_TIME + FIVE_MIN_MS))
+
+        resampled = resample_candles(candles, "5m", "15m")
+
+        assert [c.timestamp for c in resampled] == [DEFAULT_START_TIME + 3 * FIVE_MIN_MS]
+        assert resampled[0].open == candles[2].open
+        assert resampled[0].close == candles[4].close
+
+    def test_gap_emits_previous_bucket_when_next_starts(self):
+        candles = to_candles(generate_ohlcv(6, timeframe="5m"))
+        resampler = CandleResampler("5m", ["15m"])
+
+        assert resampler.update(candles[0]) == []
+        assert resampler.update(candles[1]) == []
+        # The third 5m candle of the first bucket never arrives
+        completed = resampler.update(candles[3])
+
+        assert completed == [("15m", resample_candles(candles[:2], "5m", "15m", include_partial=True)[0])]
+        assert resampler.partial("15m").open == candles[3].open
+
+    def test_corrected_candle_re_emits_completed_bucket(self):
+        candles = to_candles(generate_ohlcv(3, timeframe="5m"))
+        resampler = CandleResampler("5m", ["15m"])
+        first = resampler.seed(candles)
+        corrected = Candle(candles[2].timestamp, candles[2].open, 1e6, candles[2].low, 99.0, candles[2].volume)
+
+        completed = resampler.update(corrected)
+
+        assert len(first) == 1
+        assert completed[0][1].high == 1e6 and completed[0][1].close == 99.0
+        assert completed[0][1].volume == first[0][1].volume
+        # Late candles of an older bucket are ignored
+        assert resampler.update(to_candles(generate_ohlcv(1, start_time=DEFAULT_START_TIME - FIVE_MIN_MS))[0]) == []
+
+
+class TestDataManagerResampling:
+    """Test DataManager building coarser timeframes from the base stream."""
+
+    def test_streams_only_base_timeframe(self):
+        data_manager = DataManager(make_config(timeframe_weights={"15m": 1.0, "30m": 0.5, "7m": 0.1}))
+
+        assert data_manager.stream_timeframes() == ["5m"]
+        assert data_manager.resampled_timeframes() == ["15m", "1h", "4h", "30m"]
+        assert DataManager(make_config(candle_base_timeframe="")).stream_timeframes() == ["5m", "15m", "1h", "4h"]
+
+    def test_base_candle_updates_build_coarser_candles(self):
+        data_manager = DataManager(make_config())
+        callback = Mock()
+        data_manager.on_candle_callback = callback
+        candles = to_candles(generate_ohlcv(24, timeframe="5m"))
+
+        for candle in candles:
+            data_manager.on_candle_update(candle, "5m", symbol="ETHUSDT")
+
+        assert data_manager.get_latest_candles("15m", 100, symbol="ETHUSDT") == resample_candles(candles, "5m", "15m")
+        assert len(data_manager.get_latest_candles("1h", 100, symbol="ETHUSDT")) == 2
+        assert data_manager.get_latest_candles("4h", 100, symbol="ETHUSDT") == []
+        assert data_manager.get_partial_candle("4h", symbol="ETHUSDT").volume == pytest.approx(
+            sum(c.volume for c in candles))
+        timeframes = [call.args[1] for call in callback.call_args_list]
+        assert timeframes.count("5m") == 24 and timeframes.count("15m") == 8 and timeframes.count("1h") == 2
+
+    def test_fetch_resampled_history_pages_base_timeframe(self, monkeypatch):
+        monkeypatch.setattr("src.data_manager.HISTORY_PAGE_LIMIT", 500)
+        now_ms = int(time.time() * 1000)
+        start = (now_ms // FIVE_MIN_MS - 3 * 288) * FIVE_MIN_MS
+        source = to_candles(generate_ohlcv(3 * 288 + 1, timeframe="5m", start_time=start))
+
+        def futures_klines(symbol, interval, startTime, endTime, limit):
+            return [kline(c) for c in source if startTime <= c.timestamp <= endTime][:limit]
+
+        client = Mock()
+        client.futures_klines.side_effect = futures_klines
+        data_manager = DataManager(make_config(), client)
+
+        history = data_manager.fetch_resampled_history(days=2, symbol="ETHUSDT")
+
+        assert client.futures_klines.call_count == 2
+        assert {call.kwargs["interval"] for call in client.futures_klines.call_args_list} == {"5m"}
+        assert len(history["5m"]) in (576, 577)
+        closed = history["5m"][:-1]
+        for timeframe in ["15m", "1h", "4h"]:
+            assert history[timeframe] == resample_candles(closed, "5m", timeframe)
+            assert data_manager.get_latest_candles(timeframe, 500, symbol="ETHUSDT")[-1] == history[timeframe][-1]
+        assert data_manager.refresh_stale_base("ETHUSDT") is False
+
+    def test_fetch_resampled_history_requires_base_timeframe(self):
+        data_manager = DataManager(make_config(candle_base_timeframe=""), Mock())
+
+        with pytest.raises(ValueError, match="candle_base_timeframe"):
+            data_manager.fetch_resampled_history(days=1)
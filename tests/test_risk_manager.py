@@ -1,6 +1,7 @@
 """Property-based and unit tests for RiskManager."""
 
 import pytest
+from collections import deque
 from hypothesis import given, strategies as st, settings
 from src.config import Config
 from src.models import Position, Signal
@@ -428,6 +429,24 @@ def test_close_position_with_profit(risk_manager):
     assert not risk_manager.has_active_position("BTCUSDT")
 
 
+def test_closed_trades_bounded_with_session_totals(risk_manager, monkeypatch):
+    """Only recent trades stay in memory; totals cover every closed trade."""
+    monkeypatch.setattr(risk_manager, "closed_trades", deque(maxlen=3))
+    signal = Signal(type="LONG_ENTRY", timestamp=1000000, price=50000.0, indicators={})
+    
+    for exit_price in [51000.0, 49000.0, 51000.0, 51000.0, 49000.0]:
+        position = risk_manager.open_position(signal=signal, wallet_balance=10000.0, atr=100.0)
+        risk_manager.close_position(position=position, exit_price=exit_price, reason="SIGNAL_EXIT")
+    
+    trades = risk_manager.get_closed_trades()
+    totals = risk_manager.get_trade_totals()
+    assert len(trades) == 3
+    assert totals["count"] == 5
+    assert totals["winning"] == 3
+    # The last three closes were win, win, loss
+    assert totals["pnl"] == pytest.approx(3 * trades[0].pnl + 2 * trades[-1].pnl)
+
+
 def test_close_position_with_loss(risk_manager):
     """Test closing a position with loss."""
     # Create a long position
@@ -495,6 +514,23 @@ def test_invalid_exit_reason(risk_manager):
         )
 
 
+def test_panic_close_uses_fill_prices_and_keeps_failed_legs(risk_manager):
+    """Positions whose close order failed stay open; the rest exit at their fill price."""
+    for symbol in ["BTCUSDT", "ETHUSDT", "SOLUSDT"]:
+        risk_manager.active_positions[symbol] = Position(
+            symbol=symbol, side="LONG", entry_price=100.0, quantity=1.0, leverage=3,
+            stop_loss=95.0, trailing_stop=95.0, entry_time=1000000, unrealized_pnl=0.0
+        )
+    
+    trades = risk_manager.close_all_positions(
+        105.0, exit_prices={"ETHUSDT": 110.0}, keep_symbols=["SOLUSDT"]
+    )
+    
+    assert {t.symbol: t.exit_price for t in trades} == {"BTCUSDT": 105.0, "ETHUSDT": 110.0}
+    assert list(risk_manager.active_positions) == ["SOLUSDT"]
+    assert risk_manager.is_signal_generation_enabled() == False
+
+
 # ===== INTEGRATION TESTS FOR ENHANCED RISK MANAGEMENT =====
 
 def test_advanced_exit_manager_integration(config, position_sizer):
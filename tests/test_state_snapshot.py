@@ -0,0 +1,329 @@
+"""Property-based and unit tests for warm-restart state snapshots.
+
+Tests cover:
+- Snapshot save/load round trips (candles, positions, TP tracking, state)
+- Missing, corrupt and incompatible snapshot files
+- Capturing overlapping buffers as one candle per open time
+- StrategyEngine.get_state / restore_state for the optional features
+- DataManager.fetch_tail extending restored buffers
+- TradingBot warm start against a simulated exchange
+"""
+
+import time
+
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from src.candle_array import CANDLE_DTYPE
+from src.config import Config
+from src.data_manager import DataManager
+from src.market_replay import FakeExchangeClient, synthesize_frames
+from src.models import Candle, Position, TPStatus
+from src.risk_manager import RiskManager
+from src.position_sizer import PositionSizer
+from src.scaled_tp_manager import ScaledTakeProfitManager
+from src.state_snapshot import (
+    BotSnapshot,
+    capture_snapshot,
+    load_snapshot,
+    restore_snapshot,
+    save_snapshot,
+)
+from src.strategy import StrategyEngine
+from src.synthetic_data import generate_multi_timeframe
+
+
+DAY_5M = 288
+
+
+def make_position(symbol="BTCUSDT", side="LONG", quantity=0.5):
+    return Position(symbol=symbol, side=side, entry_price=100.0, quantity=quantity, leverage=5,
+                    stop_loss=95.0, trailing_stop=96.0, entry_time=1_700_000_000_000,
+                    original_quantity=1.0, tp_levels_hit=[1],
+                    partial_exits=[{"tp_level": 1, "quantity": 0.5, "price": 103.0}])
+
+
+def make_components(config):
+    strategy = StrategyEngine(config)
+    risk_manager = RiskManager(config, PositionSizer(config))
+    scaled_tp_manager = ScaledTakeProfitManager(config)
+    data_manager = DataManager(config)
+    return data_manager, strategy, risk_manager, scaled_tp_manager
+
+
+def make_exchange(n_days=4, live_days=1, symbols=("BTCUSDT",)):
+    """Simulated exchange whose clock is at the end of the history."""
+    candles = {
+        symbol: generate_multi_timeframe(n_days * DAY_5M, base_timeframe="5m", seed=7 + k)
+        for k, symbol in enumerate(symbols)
+    }
+    live_start = int(candles[symbols[0]]["5m"]["timestamp"][(n_days - live_days) * DAY_5M])
+    log = synthesize_frames(candles, live_start=live_start)
+    return FakeExchangeClient(log), log
+
+
+def paper_config(tmp_path, **overrides):
+    config = Config()
+    config.run_mode = "PAPER"
+    config.symbol = "BTCUSDT"
+    config.heartbeat_file = str(tmp_path / "heartbeat.bin")
+    config.candle_store_dir = str(tmp_path / "candles")
+    config.state_snapshot_file = str(tmp_path / "state.npz")
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+class TestSnapshotFile:
+    """Unit tests for snapshot persistence."""
+
+    @given(
+        n_candles=st.integers(min_value=0, max_value=50),
+        quantity=st.floats(min_value=0.001, max_value=1000, allow_nan=False),
+        side=st.sampled_from(["LONG", "SHORT"]),
+    )
+    @settings(max_examples=100, deadline=None)
+    def test_round_trip(self, tmp_path_factory, n_candles, quantity, side):
+        """Everything written is read back unchanged."""
+        path = str(tmp_path_factory.mktemp("snap") / "state.npz")
+        candles = np.zeros(n_candles, dtype=CANDLE_DTYPE)
+        candles["timestamp"] = np.arange(n_candles) * 900_000
+        candles["close"] = np.linspace(100, 110, n_candles)
+        snapshot = BotSnapshot(
+            created_at=time.time(),
+            run_mode="PAPER",
+            candles={"BTCUSDT": {"15m": candles}},
+            positions=[make_position(side=side, quantity=quantity)],
+            tp_tracking={"BTCUSDT": TPStatus("BTCUSDT", [1], 0.6, 101.0, 2, 105.0)},
+            strategy_state={"previous_squeeze_color": "green", "ml_accuracy": [1.0, 0.0]},
+            risk_state={"current_regime": "TRENDING_BULLISH", "previous_regime": "RANGING"},
+        )
+
+        save_snapshot(snapshot, path)
+        loaded = load_snapshot(path)
+
+        assert loaded is not None
+        assert loaded.created_at == snapshot.created_at
+        assert np.array_equal(loaded.candles["BTCUSDT"]["15m"], candles)
+        assert loaded.positions == snapshot.positions
+        assert loaded.tp_tracking == snapshot.tp_tracking
+        assert loaded.strategy_state == snapshot.strategy_state
+        assert loaded.risk_state == snapshot.risk_state
+
+    def test_missing_corrupt_and_incompatible_files(self, tmp_path):
+        """Unusable files load as None instead of raising."""
+        assert load_snapshot(str(tmp_path / "missing.npz")) is None
+
+        corrupt = tmp_path / "corrupt.npz"
+        corrupt.write_bytes(b"not a snapshot")
+        assert load_snapshot(str(corrupt)) is None
+
+        path = str(tmp_path / "old.npz")
+        save_snapshot(BotSnapshot(created_at=time.time(), run_mode="PAPER"), path)
+        from src import state_snapshot
+        original = state_snapshot.SNAPSHOT_VERSION
+        state_snapshot.SNAPSHOT_VERSION = original + 1
+        try:
+            assert load_snapshot(path) is None
+        finally:
+            state_snapshot.SNAPSHOT_VERSION = original
+
+    def test_save_replaces_atomically(self, tmp_path):
+        """A new snapshot replaces the old one and leaves no temporary file."""
+        path = str(tmp_path / "state.npz")
+        save_snapshot(BotSnapshot(created_at=1.0, run_mode="PAPER"), path)
+        save_snapshot(BotSnapshot(created_at=2.0, run_mode="LIVE"), path)
+
+        loaded = load_snapshot(path)
+        assert (loaded.created_at, loaded.run_mode) == (2.0, "LIVE")
+        assert not (tmp_path / "state.npz.tmp").exists()
+
+
+class TestCaptureRestore:
+    """Unit tests for capturing and restoring bot components."""
+
+    def test_capture_deduplicates_overlapping_buffers(self):
+        """Buffers holding overlapping fetches are saved one candle per open time."""
+        config = Config()
+        data_manager, strategy, risk_manager, scaled_tp_manager = make_components(config)
+        candles = [Candle(timestamp=t * 900_000, open=1, high=2, low=0.5, close=1.5, volume=10) for t in range(20)]
+        buffer = data_manager._get_symbol_buffer("BTCUSDT", "15m")
+        buffer.extend(candles)
+        buffer.extend(candles[10:])  # repeated fetch
+
+        snapshot = capture_snapshot("PAPER", data_manager, strategy, risk_manager, scaled_tp_manager, ["BTCUSDT"])
+
+        saved = snapshot.candles["BTCUSDT"]["15m"]
+        assert saved["timestamp"].tolist() == [c.timestamp for c in candles]
+
+    def test_restore_skips_untraded_symbols(self):
+        """Candles, positions and TP tracking are restored for traded symbols only."""
+        config = Config()
+        data_manager, strategy, risk_manager, scaled_tp_manager = make_components(config)
+        candles = np.zeros(5, dtype=CANDLE_DTYPE)
+        candles["timestamp"] = np.arange(5) * 900_000
+        snapshot = BotSnapshot(
+            created_at=time.time(),
+            run_mode="PAPER",
+            candles={"BTCUSDT": {"15m": candles}, "ETHUSDT": {"15m": candles}},
+            positions=[make_position("BTCUSDT"), make_position("ETHUSDT")],
+            tp_tracking={
+                "BTCUSDT": TPStatus("BTCUSDT", [1], 0.6, 101.0, 2, 105.0),
+                "ETHUSDT": TPStatus("ETHUSDT", [1], 0.6, 101.0, 2, 105.0),
+            },
+            risk_state={"current_regime": "VOLATILE", "previous_regime": "RANGING"},
+        )
+
+        restored = restore_snapshot(snapshot, data_manager, strategy, risk_manager, scaled_tp_manager, ["BTCUSDT"])
+
+        assert restored == [("BTCUSDT", "15m")]
+        assert len(data_manager.candles_15m) == 5  # legacy buffer of the primary symbol
+        assert list(risk_manager.active_positions) == ["BTCUSDT"]
+        assert list(scaled_tp_manager._tp_tracking) == ["BTCUSDT"]
+        assert risk_manager.current_regime == "VOLATILE"
+
+    def test_strategy_state_round_trip(self):
+        """Regime history, adaptive thresholds and ML accuracy survive a restart."""
+        config = Config()
+        config.enable_regime_detection = True
+        config.enable_adaptive_thresholds = True
+        config.enable_ml_prediction = True
+        strategy = StrategyEngine(config)
+        strategy._last_candle_close_time = 123
+        strategy._previous_squeeze_color = "maroon"
+        strategy.market_regime_detector.current_regime = "TRENDING_BEARISH"
+        strategy.market_regime_detector.regime_history = [{"timestamp": 1, "regime": "TRENDING_BEARISH"}]
+        strategy.adaptive_threshold_manager.current_thresholds["adx"] = 31.0
+        strategy.adaptive_threshold_manager.volatility_percentile = 88.0
+        strategy.ml_predictor.accuracy_tracker.extend([1.0, 0.0, 1.0])
+
+        restarted = StrategyEngine(config)
+        restarted.restore_state(strategy.get_state())
+
+        assert restarted._last_candle_close_time == 123
+        assert restarted._previous_squeeze_color == "maroon"
+        assert restarted.market_regime_detector.current_regime == "TRENDING_BEARISH"
+        assert restarted.market_regime_detector.regime_history == [{"timestamp": 1, "regime": "TRENDING_BEARISH"}]
+        assert restarted.current_regime_params is not None
+        assert restarted.adaptive_threshold_manager.current_thresholds["adx"] == 31.0
+        assert restarted.adaptive_threshold_manager.volatility_percentile == 88.0
+        assert list(restarted.ml_predictor.accuracy_tracker) == [1.0, 0.0, 1.0]
+
+        # Feature state is ignored when the feature is disabled on restart
+        StrategyEngine(Config()).restore_state(strategy.get_state())
+
+
+class TestFetchTail:
+    """Unit tests for DataManager.fetch_tail."""
+
+    def test_tail_joins_restored_buffer(self):
+        """Only candles from the newest saved open time on are fetched and replaced."""
+        client, log = make_exchange()
+        data_manager = DataManager(Config(), client)
+        full = client.futures_klines("BTCUSDT", "15m", limit=300)
+        saved = [Candle(int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]))
+                 for k in full[:-40]]
+        saved[-1].close = -1.0  # stale in-progress copy
+        data_manager.load_buffer("BTCUSDT", "15m", saved)
+
+        received = data_manager.fetch_tail("BTCUSDT", "15m")
+
+        buffer = list(data_manager._get_symbol_buffer("BTCUSDT", "15m"))
+        assert received == 41
+        assert [c.timestamp for c in buffer] == [int(k[0]) for k in full]
+        assert buffer[-41].close == float(full[-41][4])
+
+    def test_empty_or_stale_buffer_refills(self):
+        """Without a usable buffer the most recent candles are fetched."""
+        client, _ = make_exchange()
+        data_manager = DataManager(Config(), client)
+        data_manager.load_buffer("BTCUSDT", "1h", [Candle(0, 1, 1, 1, 1, 1)])  # far older than any request reaches
+
+        data_manager.fetch_tail("BTCUSDT", "1h")
+        data_manager.fetch_tail("BTCUSDT", "4h")
+
+        latest = client.futures_klines("BTCUSDT", "1h", limit=1)[-1][0]
+        buffer = data_manager._get_symbol_buffer("BTCUSDT", "1h")
+        assert buffer[0].timestamp > 0
+        assert buffer[-1].timestamp == latest
+        assert len(data_manager._get_symbol_buffer("BTCUSDT", "4h")) > 0
+
+
+class TestWarmStart:
+    """Integration tests for TradingBot warm restarts."""
+
+    def _advance(self, client, log, n_frames):
+        for frame in log.live()[:n_frames]:
+            client.apply_frame(frame)
+
+    def test_bot_restores_snapshot_and_fetches_tail(self, tmp_path, monkeypatch):
+        """A restarted bot resumes positions and buffers without a full refetch."""
+        from src.trading_bot import TradingBot
+
+        client, log = make_exchange()
+        config = paper_config(tmp_path, enable_multi_timeframe=True)
+        first = TradingBot(config, client=client)
+        first._load_initial_data(["BTCUSDT"])
+        assert not first._warm_started
+        first.risk_manager.active_positions["BTCUSDT"] = make_position()
+        first.scaled_tp_manager._tp_tracking["BTCUSDT"] = TPStatus("BTCUSDT", [1], 0.5, 101.0, 2, 105.0)
+        first._save_state_snapshot(["BTCUSDT"])
+
+        # The market moves on while the bot is down
+        self._advance(client, log, 200)
+
+        restarted = TradingBot(config, client=client)
+        monkeypatch.setattr(restarted, "_fetch_multi_symbol_data",
+                            lambda *args, **kwargs: pytest.fail("full history refetched"))
+        restarted._load_initial_data(["BTCUSDT"])
+
+        assert restarted._warm_started
+        assert restarted.risk_manager.active_positions["BTCUSDT"] == make_position()
+        assert restarted.scaled_tp_manager._tp_tracking["BTCUSDT"].levels_hit == [1]
+        for timeframe in ("5m", "15m", "1h", "4h"):
+            buffer = list(restarted.data_manager._get_symbol_buffer("BTCUSDT", timeframe))
+            times = [c.timestamp for c in buffer]
+            assert times == sorted(set(times))
+            assert times[-1] == client.futures_klines("BTCUSDT", timeframe, limit=1)[-1][0]
+
+    def test_unusable_snapshot_falls_back_to_full_fetch(self, tmp_path):
+        """Snapshots from another mode, too old or missing timeframes are ignored."""
+        from src.trading_bot import TradingBot
+
+        client, _ = make_exchange()
+        config = paper_config(tmp_path, state_snapshot_max_age_hours=1.0)
+        bot = TradingBot(config, client=client)
+        bot._load_initial_data(["BTCUSDT"])
+        bot._save_state_snapshot(["BTCUSDT"])
+        assert bot._restore_state_snapshot(["BTCUSDT"])
+
+        config.run_mode = "LIVE"
+        assert not bot._restore_state_snapshot(["BTCUSDT"])
+        config.run_mode = "PAPER"
+
+        config.enable_multi_timeframe = True  # snapshot has no 5m/4h buffers
+        assert not bot._restore_state_snapshot(["BTCUSDT"])
+        config.enable_multi_timeframe = False
+
+        snapshot = load_snapshot(config.state_snapshot_file)
+        snapshot.created_at -= 2 * 3600
+        save_snapshot(snapshot, config.state_snapshot_file)
+        assert not bot._restore_state_snapshot(["BTCUSDT"])
+
+    def test_live_restart_drops_positions_closed_on_exchange(self, tmp_path):
+        """In LIVE mode only positions the exchange still holds are restored."""
+        from src.trading_bot import TradingBot
+
+        client, log = make_exchange(symbols=("BTCUSDT", "ETHUSDT"))
+        self._advance(client, log, 10)
+        config = paper_config(tmp_path, run_mode="LIVE", api_key="k", api_secret="s")
+        bot = TradingBot(config, client=client)
+        client.futures_create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+
+        bot.risk_manager.active_positions["BTCUSDT"] = make_position("BTCUSDT", quantity=0.5)
+        bot.risk_manager.active_positions["ETHUSDT"] = make_position("ETHUSDT")
+        bot._reconcile_restored_positions()
+
+        assert list(bot.risk_manager.active_positions) == ["BTCUSDT"]
+        assert bot.risk_manager.active_positions["BTCUSDT"].quantity == pytest.approx(0.01)
@@ -442,3 +442,59 @@ class TestTradeHistoryParsing:
             assert len(trades) == 2
             assert trades[0]["symbol"] == "XAGUSDT"
             assert trades[1]["symbol"] == "BTCUSDT"
+
+
+class TestDataProviderHeartbeat:
+    """Unit tests for heartbeat-based bot status."""
+    
+    def test_bot_status_from_live_heartbeat(self):
+        """Test that a fresh heartbeat reports the bot as running."""
+        from src.heartbeat import HeartbeatWriter
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logs_dir = os.path.join(temp_dir, "logs")
+            writer = HeartbeatWriter(os.path.join(logs_dir, "heartbeat.bin"), "PAPER")
+            writer.beat(42, 1770253337412, 12.5)
+            
+            provider = StreamlitDataProvider(
+                config_path=os.path.join(temp_dir, "config.json"),
+                logs_dir=logs_dir
+            )
+            status = provider.get_bot_status()
+            writer.close()
+            
+            assert status["is_running"] is True
+            assert status["status"] == "Running"
+            assert status["pid"] == os.getpid()
+            assert status["loop_iteration"] == 42
+            assert status["loop_latency_ms"] == 12.5
+            assert status["last_candle_time"] == 1770253337412
+            assert status["last_update"] is not None
+    
+    def test_bot_status_after_clean_shutdown(self):
+        """Test that a stopped heartbeat reports the bot as stopped."""
+        from src.heartbeat import HeartbeatWriter
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            heartbeat_path = os.path.join(temp_dir, "hb.bin")
+            writer = HeartbeatWriter(heartbeat_path, "LIVE")
+            writer.mark_stopped(7)
+            writer.close()
+            
+            provider = StreamlitDataProvider(
+                config_path=os.path.join(temp_dir, "config.json"),
+                heartbeat_path=heartbeat_path
+            )
+            
+            assert provider._is_bot_process_running() is False
+            assert provider.get_bot_status()["status"] == "Stopped"
+    
+    def test_bot_status_without_heartbeat(self):
+        """Test that a missing heartbeat reports the bot as stopped."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = StreamlitDataProvider(logs_dir=os.path.join(temp_dir, "logs"))
+            status = provider.get_bot_status()
+            
+            assert status["is_running"] is False
+            assert status["pid"] is None
+            assert status["loop_iteration"] == 0
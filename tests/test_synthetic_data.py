@@ -0,0 +1,100 @@
+"""Property-based and unit tests for the synthetic OHLCV generators.
+
+Tests cover:
+- Deterministic output for a given seed
+- OHLC consistency (low <= open/close <= high, positive volume)
+- Volatility regimes and volume seasonality
+- Higher-timeframe aggregation
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src import synthetic_data
+from src.candle_array import aggregate_ohlcv, timeframe_to_ms, to_candles
+from src.synthetic_data import generate_ohlcv
+
+
+# Feature: synthetic-data, Property 1: Valid Deterministic OHLCV
+@given(
+    n_bars=st.integers(min_value=1, max_value=5000),
+    seed=st.integers(min_value=0, max_value=10_000),
+    timeframe=st.sampled_from(["1m", "5m", "15m", "1h", "4h"])
+)
+@settings(max_examples=100, deadline=None)
+def test_generated_ohlcv_is_valid_and_deterministic(n_bars, seed, timeframe):
+    """For any size and seed, bars are valid OHLCV with evenly spaced timestamps
+    and the same seed always produces the same series."""
+    candles = generate_ohlcv(n_bars, timeframe=timeframe, seed=seed)
+
+    assert len(candles) == n_bars
+    assert np.all(candles["low"] <= np.minimum(candles["open"], candles["close"]))
+    assert np.all(candles["high"] >= np.maximum(candles["open"], candles["close"]))
+    assert np.all(candles["low"] > 0)
+    assert np.all(candles["volume"] > 0)
+    assert np.all(np.diff(candles["timestamp"]) == timeframe_to_ms(timeframe))
+    np.testing.assert_array_equal(candles, generate_ohlcv(n_bars, timeframe=timeframe, seed=seed))
+
+
+class TestGenerators:
+    """Unit tests for regimes, seasonality and helpers."""
+
+    def test_regimes_change_volatility(self):
+        """Bars in the volatile regime have larger returns than calm ones."""
+        rng = np.random.default_rng(1)
+        regime = synthetic_data.regime_path(200_000, rng, mean_regime_bars=500)
+        assert set(np.unique(regime)) == {0, 1, 2}
+        # Segments are contiguous: far fewer switches than bars
+        assert np.count_nonzero(np.diff(regime)) < 200_000 / 100
+
+        candles = generate_ohlcv(200_000, seed=1)
+        log_returns = np.diff(np.log(candles["close"]))
+        calm = log_returns[regime[1:] == 0].std()
+        volatile = log_returns[regime[1:] == 2].std()
+        assert volatile > 3 * calm
+
+    def test_volume_seasonality(self):
+        """Weekend bars carry less volume than weekday bars on average."""
+        candles = generate_ohlcv(50_000, timeframe="1h", seed=2)
+        weekday = ((candles["timestamp"] // synthetic_data.DAY_MS) + 3) % 7
+        assert candles["volume"][weekday >= 5].mean() < candles["volume"][weekday < 5].mean()
+
+    def test_million_bars_generated_quickly(self):
+        """Large series are generated vectorized."""
+        candles = generate_ohlcv(1_000_000, timeframe="1m", seed=3)
+        assert len(candles) == 1_000_000
+        assert np.isfinite(candles["close"]).all()
+
+    def test_aggregate_matches_manual_resample(self):
+        """Aggregated bars keep first open, max high, min low, last close, summed volume."""
+        candles = generate_ohlcv(96, timeframe="15m", seed=4)
+        hourly = aggregate_ohlcv(candles, "1h")
+
+        assert len(hourly) == 24
+        first = candles[:4]
+        assert hourly["open"][0] == first["open"][0]
+        assert hourly["high"][0] == first["high"].max()
+        assert hourly["low"][0] == first["low"].min()
+        assert hourly["close"][0] == first["close"][-1]
+        assert hourly["volume"][0] == pytest.approx(first["volume"].sum())
+
+    def test_correlated_closes(self):
+        """Generated symbols share the requested return correlation."""
+        closes = synthetic_data.generate_correlated_closes(20_000, 3, correlation=0.6, seed=5)
+        returns = np.diff(np.log(closes), axis=1)
+        corr = np.corrcoef(returns)
+        assert corr[0, 1] == pytest.approx(0.6, abs=0.05)
+
+    def test_to_candles_round_trip(self):
+        """Structured arrays convert to Candle objects field by field."""
+        candles = generate_ohlcv(10, seed=6)
+        objects = to_candles(candles)
+        assert objects[3].timestamp == candles["timestamp"][3]
+        assert objects[3].close == candles["close"][3]
+
+    def test_unknown_timeframe_rejected(self):
+        """Unsupported timeframes raise ValueError."""
+        assert timeframe_to_ms("30m") == 30 * 60_000
+        with pytest.raises(ValueError):
+            timeframe_to_ms("weekly")
@@ -6,6 +6,9 @@ from src.timeframe_coordinator import TimeframeCoordinator, TimeframeData, Timef
 from src.indicators import IndicatorCalculator
 from src.config import Config
 from src.models import Candle
+from src.resampler import resample_candles
+from src.candle_array import to_candles
+from src.synthetic_data import generate_ohlcv
 
 
 # Helper strategies for generating test data
@@ -68,6 +71,19 @@ def candle_strategy(draw, min_price=1000.0, max_price=100000.0):
     )
 
 
+def stream_windows(n_5m_bars, seed=1):
+    """Multi-timeframe windows as seen after each closed 15m bar of a 5m stream."""
+    base = to_candles(generate_ohlcv(n_5m_bars, timeframe="5m", seed=seed))
+    for end in range(3, n_5m_bars + 1, 3):
+        closed = base[:end]
+        yield (
+            closed[-300:],
+            resample_candles(closed, "5m", "15m")[-200:],
+            resample_candles(closed, "5m", "1h")[-100:],
+            resample_candles(closed, "5m", "4h")[-50:],
+        )
+
+
 class TestTimeframeCoordinator:
     """Unit tests for TimeframeCoordinator."""
     
@@ -118,6 +134,44 @@ class TestTimeframeCoordinator:
         assert analysis.timeframe_1h.trend == "NEUTRAL"
         assert analysis.timeframe_4h.trend == "NEUTRAL"
     
+    def test_unchanged_timeframes_are_not_recomputed(self, coordinator, config):
+        """The 4h analysis is reused until a new 4h candle closes; results match a fresh run."""
+        calls = []
+        analyze = coordinator._analyze_timeframe
+        coordinator._analyze_timeframe = lambda candles, timeframe: calls.append(timeframe) or analyze(candles, timeframe)
+        
+        for windows in stream_windows(3 * 16 * 12):
+            analysis = coordinator.analyze_all_timeframes(*windows, symbol="BTCUSDT")
+            fresh = TimeframeCoordinator(config, IndicatorCalculator()).analyze_all_timeframes(*windows)
+            assert analysis == fresh
+        
+        assert calls.count("15m") == calls.count("5m") == 16 * 12
+        assert calls.count("1h") <= 4 * 12 + 1
+        assert calls.count("4h") <= 12 + 1
+    
+    def test_repeated_call_returns_cached_analysis(self, coordinator):
+        windows = list(stream_windows(600))
+        
+        first = coordinator.analyze_all_timeframes(*windows[-1], symbol="BTCUSDT")
+        other = coordinator.analyze_all_timeframes(*windows[-2], symbol="ETHUSDT")
+        
+        assert coordinator.analyze_all_timeframes(*windows[-1], symbol="BTCUSDT") is first
+        assert coordinator.analyze_all_timeframes(*windows[-2], symbol="ETHUSDT") is other
+        coordinator.invalidate("BTCUSDT")
+        assert coordinator.analyze_all_timeframes(*windows[-1], symbol="BTCUSDT") is not first
+    
+    def test_revised_latest_candle_is_recomputed(self, coordinator):
+        candles_5m, candles_15m, candles_1h, candles_4h = list(stream_windows(600))[-1]
+        first = coordinator.analyze_all_timeframes(candles_5m, candles_15m, candles_1h, candles_4h)
+        last = candles_5m[-1]
+        revised = candles_5m[:-1] + [Candle(last.timestamp, last.open, last.high * 1.5, last.low, last.high * 1.4, last.volume)]
+        
+        analysis = coordinator.analyze_all_timeframes(revised, candles_15m, candles_1h, candles_4h)
+        
+        assert analysis is not first
+        assert analysis.timeframe_5m.volatility > first.timeframe_5m.volatility
+        assert analysis.timeframe_4h is first.timeframe_4h
+    
     def test_check_timeframe_alignment_all_bullish(self, coordinator):
         """Test alignment when all timeframes are bullish."""
         analysis = TimeframeAnalysis(
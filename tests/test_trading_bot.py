@@ -146,3 +146,137 @@ def test_trading_bot_mode_routing():
     # Note: We can't fully test LIVE mode without API credentials
     # but we can verify the config is set correctly
     assert config_live.run_mode == "LIVE"
+
+
+def test_live_panic_close_batches_orders_and_keeps_failed_positions():
+    """Panic close sends every close order at once and leaves failed legs open."""
+    import numpy as np
+    from src.market_replay import FRAME_DTYPE, FRAME_KLINE, FakeExchangeClient, FrameLog
+    from src.models import Position
+    from src.trading_bot import TradingBot
+    
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    frames = np.zeros(len(symbols), dtype=FRAME_DTYPE)
+    for index in range(len(symbols)):
+        frames[index] = (FRAME_KLINE, 1, 0, index, 1, 1, 0, 100.0, 100.0, 100.0, 100.0, 1.0)
+    client = FakeExchangeClient(FrameLog(frames=frames, symbols=symbols, intervals=["15m"]), slippage=0.0)
+    for frame in frames:
+        client.apply_frame(frame)
+    
+    config = Config()
+    config.run_mode = "LIVE"
+    config.enable_user_data_stream = False
+    bot = TradingBot(config, client=client)
+    bot.order_executor._authenticated = True
+    bot.order_executor._permissions_validated = True
+    for symbol in symbols:
+        client.futures_create_order(symbol=symbol, side="BUY", type="MARKET", quantity=1.0)
+        bot.risk_manager.active_positions[symbol] = Position(
+            symbol=symbol, side="LONG", entry_price=100.0, quantity=1.0, leverage=1,
+            stop_loss=95.0, trailing_stop=95.0, entry_time=0, unrealized_pnl=0.0
+        )
+    client.fail_next_orders("SOLUSDT", count=1, code=-2022)
+    
+    bot._trigger_panic_close()
+    
+    open_positions = {p["symbol"] for p in client.futures_position_information() if float(p["positionAmt"]) != 0}
+    assert open_positions == {"SOLUSDT"}
+    assert list(bot.risk_manager.active_positions) == ["SOLUSDT"]
+    assert not bot.running
+
+
+def test_paper_panic_close_exits_each_symbol_at_its_own_price():
+    """Each position closes at its own symbol's last close, not the primary symbol's."""
+    from unittest.mock import Mock
+    from src.models import Candle, Position
+    from src.trading_bot import TradingBot
+    
+    config = Config()
+    config.run_mode = "PAPER"
+    config.enable_user_data_stream = False
+    bot = TradingBot(config, client=Mock())
+    bot.logger = Mock()
+    last_close = {"BTCUSDT": 110.0, "ETHUSDT": 20.0}
+    bot.data_manager = Mock()
+    bot.data_manager.get_latest_candles.side_effect = lambda timeframe, count, symbol=None: (
+        [Candle(timestamp=0, open=1.0, high=1.0, low=1.0, close=last_close[symbol or "BTCUSDT"], volume=1.0)]
+        if (symbol or "BTCUSDT") in last_close else []
+    )
+    for symbol, entry_price in [("BTCUSDT", 100.0), ("ETHUSDT", 25.0), ("SOLUSDT", 50.0)]:
+        bot.risk_manager.active_positions[symbol] = Position(
+            symbol=symbol, side="LONG", entry_price=entry_price, quantity=1.0, leverage=1,
+            stop_loss=entry_price * 0.9, trailing_stop=entry_price * 0.9, entry_time=0, unrealized_pnl=0.0
+        )
+    
+    bot._trigger_panic_close()
+    
+    exits = {trade.symbol: trade.exit_price for trade in bot.risk_manager.get_closed_trades()}
+    # SOLUSDT has no candles and falls back to its entry price
+    assert exits == {"BTCUSDT": 110.0, "ETHUSDT": 20.0, "SOLUSDT": 50.0}
+
+
+def test_shutdown_metrics_measured_from_starting_balance():
+    """Saved shutdown metrics use the balance before the session's trades."""
+    from unittest.mock import Mock
+    from src.models import Trade
+    from src.trading_bot import TradingBot
+    
+    config = Config()
+    config.run_mode = "PAPER"
+    config.enable_user_data_stream = False
+    config.state_snapshot_file = ""
+    bot = TradingBot(config, client=Mock())
+    bot.data_manager = Mock()
+    bot.logger = Mock()
+    for index, pnl in enumerate([150.0, -50.0]):
+        bot.risk_manager._record_trade(Trade(
+            symbol="BTCUSDT", side="LONG", entry_price=100.0, exit_price=100.0 + pnl,
+            quantity=1.0, pnl=pnl, pnl_percent=pnl, entry_time=index * 1000,
+            exit_time=index * 1000 + 500, exit_reason="TAKE_PROFIT"
+        ))
+    bot.wallet_balance = 1100.0
+    
+    bot._shutdown()
+    
+    metrics = bot.logger.save_performance_metrics.call_args[0][0]
+    assert metrics.total_pnl == 100.0
+    assert metrics.total_pnl_percent == pytest.approx(10.0)
+    assert metrics.roi == pytest.approx(10.0)
+
+
+def test_shutdown_metrics_cover_trades_beyond_memory_limit():
+    """Shutdown metrics count every session trade, not only those kept in memory."""
+    from unittest.mock import Mock
+    from src.models import Trade
+    from src.risk_manager import MAX_CLOSED_TRADES
+    from src.trading_bot import TradingBot
+    
+    config = Config()
+    config.run_mode = "PAPER"
+    config.enable_user_data_stream = False
+    config.state_snapshot_file = ""
+    bot = TradingBot(config, client=Mock())
+    bot.data_manager = Mock()
+    bot.logger = Mock()
+    n_trades = MAX_CLOSED_TRADES + 500
+    for index in range(n_trades):
+        # The first 500 trades, later dropped from memory, are the winners
+        pnl = 2.0 if index < 500 else -0.5
+        bot.risk_manager._record_trade(Trade(
+            symbol="BTCUSDT", side="LONG", entry_price=100.0, exit_price=100.0 + pnl,
+            quantity=1.0, pnl=pnl, pnl_percent=pnl, entry_time=index * 1000,
+            exit_time=index * 1000 + 500, exit_reason="TAKE_PROFIT"
+        ))
+    bot.wallet_balance = 10500.0
+    
+    bot._shutdown()
+    
+    assert len(bot.risk_manager.get_closed_trades()) == MAX_CLOSED_TRADES
+    metrics = bot.logger.save_performance_metrics.call_args[0][0]
+    assert metrics.total_trades == n_trades
+    assert metrics.winning_trades == 500
+    assert metrics.total_pnl == pytest.approx(500.0)
+    # Started from 10000: 10500 less the session's 500 of P&L
+    assert metrics.total_pnl_percent == pytest.approx(5.0)
+    assert metrics.largest_win == 2.0
+    assert metrics.max_drawdown == pytest.approx(500.0)
@@ -0,0 +1,274 @@
+"""Property-based and unit tests for the user data stream account cache.
+
+Tests cover:
+- Positions and order states follow ACCOUNT_UPDATE / ORDER_TRADE_UPDATE events
+- Balance snapshots served from memory until an account event or expiry
+- Waiting for fill events instead of polling, with REST fallback
+- Subscription lifecycle (attach, resubscribe, detach)
+- OrderExecutor and ScaledTakeProfitManager reading from the cache
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from hypothesis import given, settings, strategies as st
+
+from src.config import Config
+from src.models import PartialCloseAction, Position
+from src.order_executor import OrderExecutor
+from src.scaled_tp_manager import ScaledTakeProfitManager
+from src.user_data_stream import MAX_CACHED_ORDERS, AccountStateCache
+
+
+ACCOUNT_INFO = {
+    "assets": [{"asset": "USDT", "walletBalance": "1000.0", "availableBalance": "800.0"}],
+    "positions": [
+        {"symbol": "BTCUSDT", "positionSide": "BOTH", "positionAmt": "0.010"},
+        {"symbol": "ETHUSDT", "positionSide": "BOTH", "positionAmt": "0"},
+    ],
+}
+
+
+def account_update(balances=(), positions=()):
+    return {
+        "e": "ACCOUNT_UPDATE",
+        "a": {
+            "B": [{"a": asset, "wb": str(wallet), "cw": str(wallet)} for asset, wallet in balances],
+            "P": [{"s": symbol, "pa": str(amount), "ep": "100.0", "ps": "BOTH"} for symbol, amount in positions],
+        },
+    }
+
+
+def order_update(order_id, status, filled="0", avg_price="0", symbol="BTCUSDT", client_order_id="x"):
+    return {
+        "e": "ORDER_TRADE_UPDATE",
+        "T": 1,
+        "o": {"s": symbol, "i": order_id, "c": client_order_id, "S": "SELL", "o": "MARKET", "X": status,
+              "q": "0.01", "z": filled, "ap": avg_price, "R": True},
+    }
+
+
+def live_cache():
+    client = Mock()
+    client.futures_account.return_value = ACCOUNT_INFO
+    cache = AccountStateCache()
+    cache.attach(Mock(), client)
+    return cache
+
+
+class TestAccountStateCacheProperties:
+    """Property-based tests for event application."""
+
+    @settings(max_examples=100, deadline=None)
+    @given(updates=st.lists(
+        st.tuples(st.sampled_from(["BTCUSDT", "ETHUSDT", "SOLUSDT"]), st.integers(min_value=-5, max_value=5)),
+        max_size=30,
+    ))
+    def test_positions_follow_latest_update(self, updates):
+        """Each symbol reports the amount of its latest ACCOUNT_UPDATE (zero = flat)."""
+        cache = live_cache()
+        expected = {"BTCUSDT": 0.01}
+        for symbol, amount in updates:
+            cache.apply_event(account_update(positions=[(symbol, amount)]))
+            expected[symbol] = float(amount)
+
+        assert cache.get_position_amounts() == {s: a for s, a in expected.items() if a != 0}
+
+    @settings(max_examples=50, deadline=None)
+    @given(n_orders=st.integers(min_value=1, max_value=MAX_CACHED_ORDERS + 100))
+    def test_order_cache_is_bounded_and_keeps_open_orders(self, n_orders):
+        cache = live_cache()
+        cache.apply_event(order_update(0, "NEW"))
+        for order_id in range(1, n_orders + 1):
+            cache.apply_event(order_update(order_id, "FILLED", "0.01", "100"))
+
+        assert len(cache._orders) <= MAX_CACHED_ORDERS
+        assert cache.get_order(0)["status"] == "NEW"
+        assert cache.get_order(n_orders)["status"] == "FILLED"
+
+
+class TestAccountStateCacheUnit:
+    """Unit tests for AccountStateCache."""
+
+    def test_not_live_until_attached(self):
+        cache = AccountStateCache()
+        cache.seed_account(ACCOUNT_INFO)
+
+        assert cache.get_available_balance() is None
+        assert cache.get_position_amounts() is None
+
+    def test_balance_served_until_account_changes(self):
+        cache = live_cache()
+
+        assert cache.get_available_balance("USDT") == 800.0
+        assert cache.get_available_balance("BNB") is None
+        cache.apply_event(account_update(balances=[("USDT", 990.0)]))
+
+        assert cache.get_available_balance("USDT") is None
+        assert cache.get_wallet_balance("USDT") == 990.0
+        cache.seed_account(ACCOUNT_INFO)
+        assert cache.get_available_balance("USDT") == 800.0
+
+    def test_balance_snapshot_expires(self):
+        cache = live_cache()
+        cache.balance_max_age = 0.0
+        time.sleep(0.01)
+
+        assert cache.get_available_balance() is None
+
+    def test_wait_for_order_returns_on_fill_event(self):
+        cache = live_cache()
+        cache.apply_event(order_update(7, "NEW"))
+        fill = threading.Timer(0.05, cache.handle_message, args=(order_update(7, "FILLED", "0.01", "101.5"),))
+        fill.start()
+
+        start = time.monotonic()
+        order = cache.wait_for_order(7, timeout=5.0)
+
+        assert time.monotonic() - start < 1.0
+        assert order["status"] == "FILLED"
+        assert order["executedQty"] == "0.01" and order["avgPrice"] == "101.5"
+        fill.join()
+
+    def test_wait_for_order_times_out_with_latest_state(self):
+        cache = live_cache()
+        cache.apply_event(order_update(7, "PARTIALLY_FILLED", "0.005", "100"))
+
+        assert cache.wait_for_order(7, timeout=0.05)["status"] == "PARTIALLY_FILLED"
+        assert cache.wait_for_order(8, timeout=0.01) is None
+
+    def test_stream_errors_fall_back_to_rest(self):
+        cache = live_cache()
+        cache.handle_message({"e": "error", "m": "socket closed"})
+
+        assert not cache.connected
+        assert cache.get_position_amounts() is None
+        cache.handle_message({"e": "ACCOUNT_UPDATE"})  # Malformed events are logged, not raised
+
+    def test_resubscribes_when_manager_replaced(self, monkeypatch):
+        monkeypatch.setattr("src.user_data_stream.RESUBSCRIBE_INTERVAL_SECONDS", 0.0)
+        client = Mock()
+        client.futures_account.return_value = ACCOUNT_INFO
+        old_manager, new_manager = Mock(), Mock()
+        old_manager.start_futures_user_socket.return_value = "old"
+        cache = AccountStateCache()
+        cache.attach(old_manager, client)
+
+        assert cache.ensure_attached(old_manager, client) is True
+        assert cache.ensure_attached(new_manager, client) is True
+
+        old_manager.stop_socket.assert_called_once_with("old")
+        new_manager.start_futures_user_socket.assert_called_once()
+        assert client.futures_account.call_count == 2
+        cache.detach()
+        assert not cache.connected
+
+
+class TestCacheConsumers:
+    """Test OrderExecutor and ScaledTakeProfitManager reading from the cache."""
+
+    def test_balance_and_positions_read_from_cache(self):
+        client = Mock()
+        executor = OrderExecutor(Config(), client=client)
+        executor.account_cache = live_cache()
+
+        assert executor.get_account_balance() == 800.0
+        assert executor.validate_margin_availability("BTCUSDT", 500.0) is True
+        assert executor.get_position_amounts() == {"BTCUSDT": 0.01}
+        client.futures_account.assert_not_called()
+        client.futures_position_information.assert_not_called()
+
+        # After an account event the next read refreshes the snapshot over REST
+        executor.account_cache.apply_event(account_update(balances=[("USDT", 900.0)]))
+        client.futures_account.return_value = ACCOUNT_INFO
+        assert executor.get_account_balance() == 800.0
+        assert executor.get_account_balance() == 800.0
+        client.futures_account.assert_called_once()
+
+    def test_market_order_awaits_fill_event(self):
+        client = Mock()
+        client.futures_create_order.return_value = {"orderId": 9, "status": "NEW", "executedQty": "0"}
+        executor = OrderExecutor(Config(), client=client)
+        executor._authenticated = True
+        executor._permissions_validated = True
+        executor.account_cache = live_cache()
+        threading.Timer(0.05, executor.account_cache.handle_message,
+                        args=(order_update(9, "FILLED", "0.01", "99.0"),)).start()
+
+        order = executor.place_market_order("BTCUSDT", "BUY", 0.01)
+
+        assert order["status"] == "FILLED"
+        assert order["avgPrice"] == "99.0"
+
+    def test_timed_out_batch_leg_found_in_cache(self):
+        """A leg placed despite a failed batch request is taken from the cache, not resent."""
+        executor = OrderExecutor(Config(), client=Mock())
+        executor._authenticated = True
+        executor._permissions_validated = True
+        executor.base_backoff = 0.0
+        executor.account_cache = live_cache()
+
+        def timed_out_batch(batchOrders):
+            leg = batchOrders[0]
+            executor.account_cache.apply_event(
+                order_update(7, "FILLED", leg["quantity"], "99.0", client_order_id=leg["newClientOrderId"])
+            )
+            raise Exception("Read timed out")
+
+        executor.client.futures_place_batch_order.side_effect = timed_out_batch
+
+        results = executor.place_batch_orders([
+            {"symbol": "BTCUSDT", "side": "SELL", "type": "MARKET", "quantity": 0.01, "reduceOnly": True},
+        ])
+
+        assert results[0].success and results[0].order["orderId"] == 7 and results[0].attempts == 1
+        executor.client.futures_place_batch_order.assert_called_once()
+        executor.client.futures_get_order.assert_not_called()
+
+    def test_batch_close_waits_for_fills_against_one_deadline(self):
+        """Lost fill events delay a batch close by one timeout, not one per leg."""
+        config = Config(order_fill_timeout_seconds=0.2)
+        executor = OrderExecutor(config, client=Mock())
+        executor._authenticated = True
+        executor._permissions_validated = True
+        executor.account_cache = live_cache()
+        executor.client.futures_place_batch_order.side_effect = lambda batchOrders: [
+            {"orderId": index, "status": "NEW"} for index, _ in enumerate(batchOrders)
+        ]
+        executor.account_cache.apply_event(order_update(0, "FILLED", "0.01", "99.0"))
+        positions = [
+            Position(symbol=f"S{i}USDT", side="LONG", entry_price=100.0, quantity=0.01, leverage=1,
+                     stop_loss=95.0, trailing_stop=95.0, entry_time=0, unrealized_pnl=0.0)
+            for i in range(5)
+        ]
+
+        started = time.monotonic()
+        results = executor.close_positions(positions)
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 2 * config.order_fill_timeout_seconds
+        assert results["S0USDT"].order["status"] == "FILLED"
+        assert all(results[f"S{i}USDT"].order["status"] == "NEW" for i in range(1, 5))
+
+    def test_partial_close_verified_from_fill_event(self):
+        config = Config(enable_scaled_take_profit=True, order_fill_timeout_seconds=2.0)
+        client = Mock()
+        client.futures_create_order.return_value = {"orderId": 5, "status": "NEW"}
+        manager = ScaledTakeProfitManager(config, client)
+        manager.account_cache = live_cache()
+        manager.account_cache.apply_event(order_update(5, "FILLED", "0.004", "103.0"))
+        position = Position(
+            symbol="BTCUSDT", side="LONG", entry_price=100.0, quantity=0.01, leverage=1,
+            stop_loss=95.0, trailing_stop=95.0, entry_time=0, unrealized_pnl=0.0
+        )
+        action = PartialCloseAction(
+            tp_level=1, profit_pct=0.03, close_pct=0.4, target_price=103.0,
+            quantity=0.004, new_stop_loss=100.0
+        )
+
+        result = manager.execute_partial_close(position, action)
+
+        assert result.success
+        assert result.fill_price == 103.0
+        client.futures_get_order.assert_not_called()
@@ -0,0 +1,109 @@
+"""Property-based and unit tests for vectorized backtest signals.
+
+Tests cover:
+- Windowed ATR/ADX matching the per-window IndicatorCalculator results
+- Windowed VWAP matching calculate_vwap
+- Entry masks never missing a bar where the strategy signals
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src.candle_array import to_candles
+from src.config import Config
+from src.indicators import IndicatorCalculator
+from src.strategy import StrategyEngine
+from src.synthetic_data import generate_multi_timeframe, generate_ohlcv
+from src import vectorized_signals as vs
+
+
+# Feature: event-skipping-backtest, Property 1: Windowed ATR Is Bit-Identical
+@given(
+    seed=st.integers(min_value=0, max_value=10_000),
+    period=st.integers(min_value=2, max_value=30),
+    window=st.integers(min_value=20, max_value=80)
+)
+@settings(max_examples=30, deadline=None)
+def test_windowed_atr_matches_calculate_atr(seed, period, window):
+    """Every bar's ATR equals calculate_atr on the same window exactly."""
+    array = generate_ohlcv(160, seed=seed)
+    candles = to_candles(array)
+    atr = vs.windowed_atr(array["high"], array["low"], array["close"], period, window)
+
+    for i in range(len(candles)):
+        expected = IndicatorCalculator.calculate_atr(candles[max(0, i - window + 1):i + 1], period)
+        assert atr[i] == expected
+
+
+class TestWindowedIndicators:
+    """Unit tests for windowed ADX and VWAP."""
+
+    def test_windowed_adx_matches_calculate_adx(self):
+        """Full-window ADX agrees with the pandas implementation."""
+        array = generate_ohlcv(320, seed=11)
+        candles = to_candles(array)
+        adx = vs.windowed_adx(array["high"], array["low"], array["close"], 14, 201)
+
+        assert np.all(np.isnan(adx[:200]))
+        for i in range(200, 320, 9):
+            expected = IndicatorCalculator.calculate_adx(candles[i - 200:i + 1], 14)
+            assert adx[i] == pytest.approx(expected, abs=1e-9)
+
+    def test_windowed_vwap_matches_calculate_vwap(self):
+        """Anchored VWAP over sliding windows matches the scalar calculation."""
+        array = generate_ohlcv(900, seed=2)
+        candles = to_candles(array)
+        strategy = StrategyEngine(Config())
+        bars = np.arange(len(array))
+        anchors = vs.weekly_anchors(array["timestamp"], strategy._get_weekly_anchor)
+        vwap = vs.windowed_vwap(
+            array["high"], array["low"], array["close"], array["volume"], array["timestamp"],
+            bars, np.maximum(0, bars - 200), anchors
+        )
+
+        for i in range(0, 900, 13):
+            expected = IndicatorCalculator.calculate_vwap(candles[max(0, i - 200):i + 1], int(anchors[i]))
+            assert vwap[i] == pytest.approx(expected, rel=1e-9)
+
+
+class TestEntryCandidates:
+    """Unit tests for the entry masks."""
+
+    def test_masks_cover_every_strategy_signal(self):
+        """Bars outside the masks never produce a signal from the real strategy."""
+        config = Config()
+        config.adx_threshold = 15.0
+        config.rvol_threshold = 0.8
+        strategy = StrategyEngine(config)
+
+        data = generate_multi_timeframe(900, base_timeframe="5m", timeframes=("15m", "1h"), seed=8)
+        candles_15m = to_candles(data["15m"])
+        candles_1h = to_candles(data["1h"])
+        arrays = vs.entry_candidates(data["15m"], data["1h"], config, strategy._get_weekly_anchor)
+
+        signals = 0
+        for i in np.flatnonzero(arrays.valid):
+            index_1h = min(i // 4, len(candles_1h) - 1)
+            strategy.update_indicators(
+                candles_15m[max(0, i - 200):i + 1],
+                candles_1h[max(0, index_1h - 100):index_1h + 1]
+            )
+            if strategy.check_long_entry():
+                signals += 1
+                assert arrays.long_entry[i]
+            if strategy.check_short_entry():
+                signals += 1
+                assert arrays.short_entry[i]
+
+        assert signals > 0
+        assert arrays.candidates.sum() < arrays.valid.sum()
+
+    def test_valid_bars_follow_warmup_and_1h_history(self):
+        """Valid bars start after the 15m warmup and with 30 1h candles available."""
+        data = generate_multi_timeframe(600, base_timeframe="15m", timeframes=("15m", "1h"), seed=1)
+        arrays = vs.entry_candidates(data["15m"], data["1h"], Config(), StrategyEngine(Config())._get_weekly_anchor)
+
+        first_valid = int(np.argmax(arrays.valid))
+        assert first_valid == max(vs.WARMUP_15M, 4 * (vs.MIN_CANDLES_1H - 1))
+        assert arrays.valid[first_valid:].all()
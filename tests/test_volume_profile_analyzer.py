@@ -5,6 +5,7 @@ from hypothesis import given, strategies as st, settings
 from src.volume_profile_analyzer import VolumeProfileAnalyzer
 from src.models import Candle, VolumeProfile
 from src.config import Config
+import threading
 import time
 
 
@@ -396,3 +397,71 @@ class TestVolumeProfileAnalyzer:
         # Both should succeed (update frequency is enforced by caller, not the analyzer)
         assert second_update >= first_update
         assert analyzer.current_profile is not None
+
+
+class TestBackgroundRefresh:
+    """Test data-driven background refresh and profile publishing."""
+    
+    def test_refresh_follows_candle_time(self):
+        config = Config()
+        config.volume_profile_update_interval = 3600
+        analyzer = VolumeProfileAnalyzer(config)
+        candles = create_candles(120)  # 1 minute apart
+        
+        assert analyzer.refresh(candles[:60], background=False)
+        assert not analyzer.refresh(candles[:60], background=False)
+        assert not analyzer.refresh(candles[:90], background=False)
+        assert analyzer.refresh(candles[:90], "ETHUSDT", background=False)
+        assert analyzer.refresh(candles[:120], background=False)
+        # History moved backwards (e.g. reloaded) recomputes immediately
+        assert analyzer.refresh(candles[:30], background=False)
+        assert analyzer.get_profile("ETHUSDT") is not None
+        assert analyzer.get_profile("BTCUSDT") is None
+    
+    def test_symbols_keep_separate_profiles(self):
+        analyzer = VolumeProfileAnalyzer(Config())
+        
+        analyzer.refresh(create_candles(50, base_price=50000.0), "BTCUSDT", background=False)
+        analyzer.refresh(create_candles(50, base_price=3000.0, price_range=60.0), "ETHUSDT", background=False)
+        
+        btc = analyzer.get_profile("BTCUSDT")
+        assert 50000.0 <= btc.poc <= 51100.0
+        assert analyzer.is_near_key_level(btc.poc, symbol="BTCUSDT")
+        assert not analyzer.is_near_key_level(btc.poc, symbol="ETHUSDT")
+        assert analyzer.get_volume_at_price(3030.0, symbol="ETHUSDT") > 0
+        assert analyzer.get_profile() is analyzer.get_profile("ETHUSDT")
+    
+    def test_signal_path_never_waits_on_refresh(self, monkeypatch):
+        """update_indicators and profile reads return while a recompute is blocked."""
+        from src.strategy import StrategyEngine
+        from src.candle_array import to_candles
+        from src.synthetic_data import generate_ohlcv
+        
+        config = Config()
+        config.enable_volume_profile = True
+        strategy = StrategyEngine(config)
+        analyzer = strategy.volume_profile_analyzer
+        candles_15m = to_candles(generate_ohlcv(700, timeframe="15m", seed=3))
+        candles_1h = to_candles(generate_ohlcv(200, timeframe="1h", seed=3))
+        strategy.update_indicators(candles_15m[:-100], candles_1h, symbol="BTCUSDT")
+        assert analyzer.wait_for_refresh("BTCUSDT", timeout=10)
+        old_profile = analyzer.get_profile("BTCUSDT")
+        
+        release = threading.Event()
+        build = analyzer._build_profile
+        monkeypatch.setattr(analyzer, "_build_profile", lambda candles: release.wait(10) and build(candles))
+        
+        start = time.perf_counter()
+        strategy.update_indicators(candles_15m, candles_1h, symbol="BTCUSDT")
+        strategy.get_volume_profile_size_adjustment()
+        strategy.get_advanced_features_data()
+        elapsed = time.perf_counter() - start
+        
+        assert elapsed < 2.0
+        assert analyzer.get_profile("BTCUSDT") is old_profile
+        assert strategy.get_advanced_features_data()["volume_profile"]["poc"] == old_profile.poc
+        
+        release.set()
+        assert analyzer.wait_for_refresh("BTCUSDT", timeout=10)
+        assert analyzer.get_profile("BTCUSDT") is not old_profile
+        assert analyzer.get_profile("BTCUSDT").poc > 0
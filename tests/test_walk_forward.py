@@ -0,0 +1,181 @@
+"""Property-based and unit tests for walk-forward optimization.
+
+Tests cover:
+- Fold layout (in-sample before out-of-sample, tiling out-of-sample windows)
+- Grid expansion, random sampling and parameter stability summaries
+- Out-of-sample trades matching standalone backtests of the fold optima
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from src.backtest_engine import BacktestEngine
+from src.candle_array import to_candles
+from src.config import Config
+from src.position_sizer import PositionSizer
+from src.risk_manager import RiskManager
+from src.strategy import StrategyEngine
+from src.synthetic_data import generate_multi_timeframe
+from src.walk_forward import (
+    DAY_MS,
+    WalkForwardOptimizer,
+    apply_parameters,
+    make_folds,
+    parameter_grid,
+    parameter_stability,
+    sample_parameters,
+)
+
+
+# Feature: walk-forward, Property 1: Out-of-Sample Windows Follow In-Sample Windows
+@given(
+    in_sample_days=st.integers(min_value=1, max_value=120),
+    out_of_sample_days=st.integers(min_value=1, max_value=60),
+    total_days=st.integers(min_value=1, max_value=800)
+)
+@settings(max_examples=100, deadline=None)
+def test_folds_tile_out_of_sample(in_sample_days, out_of_sample_days, total_days):
+    """Each out-of-sample window starts where its in-sample window ends and
+    consecutive out-of-sample windows neither overlap nor leave gaps."""
+    start = 1_600_000_000_000
+    end = start + total_days * DAY_MS
+    folds = make_folds(start, end, in_sample_days, out_of_sample_days)
+
+    assert len(folds) == max(0, (total_days - in_sample_days) // out_of_sample_days)
+    for fold in folds:
+        assert fold.in_sample_end - fold.in_sample_start == in_sample_days * DAY_MS
+        assert fold.out_of_sample_start == fold.in_sample_end
+        assert fold.out_of_sample_end <= end
+    for previous, current in zip(folds, folds[1:]):
+        assert current.out_of_sample_start == previous.out_of_sample_end
+
+
+class TestParameterSpace:
+    """Unit tests for grid/random search helpers."""
+
+    SPACE = {
+        "adx_threshold": [15.0, 20.0, 25.0],
+        "rvol_threshold": [0.8, 1.2],
+        "scaled_tp_levels": [
+            [{"profit_pct": 0.02, "close_pct": 1.0}],
+            [{"profit_pct": 0.01, "close_pct": 0.5}, {"profit_pct": 0.03, "close_pct": 0.5}],
+        ],
+    }
+
+    def test_grid_covers_every_combination(self):
+        grid = parameter_grid(self.SPACE)
+
+        assert len(grid) == 12
+        assert len({repr(sorted(c.items())) for c in grid}) == 12
+
+    def test_random_sample_is_distinct_subset(self):
+        grid = [repr(sorted(c.items())) for c in parameter_grid(self.SPACE)]
+        sample = sample_parameters(self.SPACE, 5, seed=3)
+        keys = [repr(sorted(c.items())) for c in sample]
+
+        assert len(set(keys)) == 5
+        assert set(keys) <= set(grid)
+        assert sample == sample_parameters(self.SPACE, 5, seed=3)
+        assert len(sample_parameters(self.SPACE, 100)) == 12
+
+    def test_rejects_unsupported_parameters(self):
+        with pytest.raises(ValueError):
+            parameter_grid({"atr_period": [10, 14]})
+        with pytest.raises(ValueError):
+            parameter_grid({"adx_threshold": []})
+
+    def test_apply_parameters_copies_config(self):
+        config = Config()
+        levels = self.SPACE["scaled_tp_levels"][1]
+        tuned = apply_parameters(config, {"adx_threshold": 30.0, "scaled_tp_levels": levels})
+
+        assert tuned.adx_threshold == 30.0
+        assert config.adx_threshold != 30.0
+        assert tuned.scaled_tp_levels == levels
+        assert tuned.scaled_tp_levels is not levels
+
+    def test_parameter_stability(self):
+        chosen = [
+            {"adx_threshold": 20.0, "scaled_tp_levels": [1]},
+            {"adx_threshold": 20.0, "scaled_tp_levels": [2]},
+            {"adx_threshold": 25.0, "scaled_tp_levels": [1]},
+        ]
+        stability = parameter_stability(chosen)
+
+        adx = stability["adx_threshold"]
+        assert adx["mode"] == 20.0
+        assert adx["mode_frequency"] == pytest.approx(2 / 3)
+        assert adx["changes"] == 1
+        assert adx["mean"] == pytest.approx(65 / 3)
+        assert stability["scaled_tp_levels"]["mode"] == [1]
+        assert stability["scaled_tp_levels"]["changes"] == 2
+        assert "mean" not in stability["scaled_tp_levels"]
+
+
+class TestWalkForwardOptimizer:
+    """End-to-end tests on synthetic data."""
+
+    @staticmethod
+    def _data(n_symbols=2, n_bars=1100):
+        data = {}
+        for k in range(n_symbols):
+            bars = generate_multi_timeframe(n_bars, base_timeframe="15m", timeframes=("15m", "1h"), seed=20 + k)
+            data[f"SYM{k}USDT"] = (to_candles(bars["15m"]), to_candles(bars["1h"]))
+        return data
+
+    def test_out_of_sample_trades_match_standalone_backtests(self):
+        """Stitched trades are the fold optima backtested on their own windows."""
+        config = Config()
+        space = {
+            "adx_threshold": [18.0, 24.0],
+            "rvol_threshold": [1.0, 1.3],
+            "trailing_stop_atr_multiplier": [1.5, 2.5],
+        }
+        data = self._data()
+        optimizer = WalkForwardOptimizer(
+            config, space, in_sample_days=4, out_of_sample_days=2, min_trades=1
+        )
+        result = optimizer.run(data)
+
+        assert len(result.folds) >= 2
+        assert set(result.stability) == set(space)
+
+        expected = []
+        for fold_result in result.folds:
+            assert fold_result.combinations == 8
+            for symbol, (candles_15m, candles_1h) in data.items():
+                tuned = apply_parameters(config, fold_result.parameters)
+                tuned.symbol = symbol
+                engine = BacktestEngine(tuned, StrategyEngine(tuned), RiskManager(tuned, PositionSizer(tuned)))
+                timestamps = np.array([c.timestamp for c in candles_15m])
+                start, end = np.searchsorted(
+                    timestamps, [fold_result.fold.out_of_sample_start, fold_result.fold.out_of_sample_end]
+                )
+                engine.run_event_backtest(candles_15m, candles_1h, 10000.0, start=int(start), end=int(end))
+                expected.extend((t.symbol, t.entry_price, t.exit_price, t.pnl) for t in engine.trades)
+
+        stitched = [
+            (str(t["symbol"]), float(t["entry_price"]), float(t["exit_price"]), float(t["pnl"]))
+            for t in result.trades
+        ]
+        assert expected
+        assert stitched == expected
+        assert result.metrics["total_trades"] == len(expected)
+        assert result.to_dict()["folds"][0]["parameters"] == result.folds[0].parameters
+
+    def test_rejects_invalid_setup(self):
+        config = Config()
+        with pytest.raises(ValueError):
+            WalkForwardOptimizer(config, {"adx_threshold": [20.0]}, objective="calmar")
+        with pytest.raises(ValueError):
+            WalkForwardOptimizer(config, {"adx_threshold": [20.0]}, search="bayes")
+
+        adaptive = Config()
+        adaptive.enable_volume_profile = True
+        with pytest.raises(ValueError):
+            WalkForwardOptimizer(adaptive, {"adx_threshold": [20.0]})
+
+        optimizer = WalkForwardOptimizer(config, {"adx_threshold": [20.0]}, in_sample_days=30)
+        with pytest.raises(ValueError):
+            optimizer.run(self._data(n_symbols=1, n_bars=600))